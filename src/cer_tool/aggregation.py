@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+语料级汇总模块
+逐对累加错误统计，内存占用与文件对数量无关；
+多个工作进程或分片的部分汇总可以通过 merge() 合并
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+
+def calculate_overall_accuracy(total_errors: int, total_ref_chars: int) -> float:
+    """
+    计算总体准确率，处理零参考字数边界。
+
+    规则与明细一致：
+    - total_ref_chars > 0: 1 - (total_errors / total_ref_chars)
+    - total_ref_chars == 0 且 total_errors == 0: 1.0
+    - total_ref_chars == 0 且 total_errors > 0: 0.0
+    """
+    if total_ref_chars > 0:
+        return 1.0 - (total_errors / total_ref_chars)
+    return 1.0 if total_errors == 0 else 0.0
+
+
+class CorpusAccumulator:
+    """
+    语料级指标累加器
+
+    只保存计数与逐对 CER 之和，O(1) 内存；
+    提供微平均 CER、宏平均 CER、平均准确率与总体准确率
+    """
+
+    def __init__(self) -> None:
+        self.pairs = 0
+        self.substitutions = 0
+        self.deletions = 0
+        self.insertions = 0
+        self.ref_length = 0
+        self.hyp_length = 0
+        self.cer_sum = 0.0
+
+    def update(self, substitutions: int, deletions: int, insertions: int,
+               ref_length: int, hyp_length: int, cer: Optional[float] = None) -> None:
+        """
+        累加一对文本的错误统计
+
+        Args:
+            substitutions (int): 替换数
+            deletions (int): 删除数
+            insertions (int): 插入数
+            ref_length (int): 参考文本长度
+            hyp_length (int): 假设文本长度
+            cer (Optional[float]): 该对的 CER，None 时按 calculate_cer 的边界语义计算
+        """
+        if cer is None:
+            if ref_length > 0:
+                cer = (substitutions + deletions + insertions) / ref_length
+            else:
+                cer = 1.0 if hyp_length > 0 else 0.0
+        self.pairs += 1
+        self.substitutions += substitutions
+        self.deletions += deletions
+        self.insertions += insertions
+        self.ref_length += ref_length
+        self.hyp_length += hyp_length
+        self.cer_sum += cer
+
+    def add_result(self, result: Dict[str, Any]) -> None:
+        """
+        累加 calculate_detailed_metrics 格式的结果字典
+
+        Args:
+            result (dict): 含 substitutions/deletions/insertions/ref_length/hyp_length/cer 的字典
+        """
+        self.update(result['substitutions'], result['deletions'], result['insertions'],
+                    result['ref_length'], result['hyp_length'], result['cer'])
+
+    @classmethod
+    def from_results(cls, results: Iterable[Dict[str, Any]]) -> "CorpusAccumulator":
+        """
+        由结果字典序列构建累加器
+
+        Args:
+            results (Iterable[dict]): calculate_detailed_metrics 格式的结果
+
+        Returns:
+            CorpusAccumulator: 累加器
+        """
+        accumulator = cls()
+        for result in results:
+            accumulator.add_result(result)
+        return accumulator
+
+    def merge(self, other: "CorpusAccumulator") -> "CorpusAccumulator":
+        """
+        合并另一个累加器（如其他工作进程或分片的部分汇总）
+
+        Args:
+            other (CorpusAccumulator): 待合并的累加器
+
+        Returns:
+            CorpusAccumulator: 自身，便于链式调用
+        """
+        self.pairs += other.pairs
+        self.substitutions += other.substitutions
+        self.deletions += other.deletions
+        self.insertions += other.insertions
+        self.ref_length += other.ref_length
+        self.hyp_length += other.hyp_length
+        self.cer_sum += other.cer_sum
+        return self
+
+    @property
+    def total_errors(self) -> int:
+        """错误总数"""
+        return self.substitutions + self.deletions + self.insertions
+
+    @property
+    def micro_cer(self) -> float:
+        """微平均 CER：错误总数 / 参考总字数，即 1 - 总体准确率"""
+        return 1.0 - self.overall_accuracy
+
+    @property
+    def macro_cer(self) -> float:
+        """宏平均 CER：逐对 CER 的算术平均，无数据时为 0.0"""
+        return self.cer_sum / self.pairs if self.pairs else 0.0
+
+    @property
+    def avg_accuracy(self) -> float:
+        """平均准确率：逐对准确率（1 - CER）的算术平均，无数据时为 0.0"""
+        return 1.0 - self.macro_cer if self.pairs else 0.0
+
+    @property
+    def overall_accuracy(self) -> float:
+        """总体准确率（calculate_overall_accuracy 语义）"""
+        return calculate_overall_accuracy(self.total_errors, self.ref_length)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        汇总指标
+
+        Returns:
+            dict: 文件对数、平均/微平均 CER、平均/总体准确率和各类错误总数
+        """
+        return {
+            "total_pairs": self.pairs,
+            "avg_cer": self.macro_cer,
+            "micro_cer": self.micro_cer,
+            "avg_accuracy": self.avg_accuracy,
+            "overall_accuracy": self.overall_accuracy,
+            "total_substitutions": self.substitutions,
+            "total_deletions": self.deletions,
+            "total_insertions": self.insertions,
+            "total_ref_length": self.ref_length,
+            "total_hyp_length": self.hyp_length,
+        }
+
+    def __repr__(self) -> str:
+        return (f"CorpusAccumulator(pairs={self.pairs}, micro_cer={self.micro_cer:.4f}, "
+                f"macro_cer={self.macro_cer:.4f})")
@@ -0,0 +1,765 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字符级对齐模块
+一次预处理、一次对齐，由同一份对齐结果派生错误统计、高亮文本与差异序列
+
+对齐结果以 opcodes 表示，格式与 python-Levenshtein / difflib 一致：
+(tag, i1, i2, j1, j2)，tag 取值 'equal' / 'replace' / 'delete' / 'insert'
+"""
+
+from collections import Counter
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 编辑操作：(操作类型, 参考位置, 假设位置)，与 Levenshtein.editops 格式一致
+EditOp = Tuple[str, int, int]
+# 对齐片段：(操作类型, 参考起点, 参考终点, 假设起点, 假设终点)
+Opcode = Tuple[str, int, int, int, int]
+# 精确分词结果：(词语, 开始位置, 结束位置)
+WordToken = Tuple[str, int, int]
+
+# DP 单元数（m·n）超过该阈值时，回退实现改用线性内存的分治回溯
+LINEAR_SPACE_THRESHOLD = 50_000_000
+# 分治回溯中直接保存全部列位向量的最大块宽（列数）
+_LINEAR_SPACE_BLOCK = 256
+# 批量计算时启用 NumPy 引擎的最小字符串对数量（单对时位并行实现更快）
+NUMPY_MIN_BATCH = 8
+# backend 参数的默认值：调用时自动检测 python-Levenshtein
+AUTO_BACKEND = 'auto'
+
+
+def load_levenshtein():
+    """
+    检测 python-Levenshtein 后端
+
+    Returns:
+        module: Levenshtein 模块；未安装时返回 None
+    """
+    try:
+        import Levenshtein
+        return Levenshtein
+    except ImportError:
+        return None
+
+
+def backtrack_editops(s1: str, s2: str) -> List[EditOp]:
+    """
+    使用动态规划+路径回溯计算编辑操作序列
+    朴素的 (m+1)x(n+1) 矩阵实现，作为其他回退后端的校验基准
+
+    Args:
+        s1 (str): 参考字符串
+        s2 (str): 假设字符串
+
+    Returns:
+        List[EditOp]: 按位置升序排列的编辑操作列表
+    """
+    m, n = len(s1), len(s2)
+
+    # 创建DP矩阵
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+
+    # 初始化第一行和第一列
+    for i in range(m + 1):
+        dp[i][0] = i  # 从s1[:i]到空字符串需要i次删除
+    for j in range(n + 1):
+        dp[0][j] = j  # 从空字符串到s2[:j]需要j次插入
+
+    # 填充DP矩阵
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            if s1[i-1] == s2[j-1]:
+                # 字符相同，无需编辑
+                dp[i][j] = dp[i-1][j-1]
+            else:
+                # 字符不同，选择代价最小的操作
+                dp[i][j] = min(
+                    dp[i-1][j-1] + 1,  # 替换
+                    dp[i-1][j] + 1,     # 删除
+                    dp[i][j-1] + 1      # 插入
+                )
+
+    # 路径回溯：优先级 匹配 → 替换 → 删除 → 插入
+    ops = []
+    i, j = m, n
+    while i > 0 or j > 0:
+        if i == 0:
+            # 只能插入
+            j -= 1
+            ops.append(('insert', i, j))
+        elif j == 0:
+            # 只能删除
+            i -= 1
+            ops.append(('delete', i, j))
+        elif s1[i-1] == s2[j-1]:
+            # 字符匹配，向左上移动
+            i -= 1
+            j -= 1
+        elif dp[i][j] == dp[i-1][j-1] + 1:
+            # 替换操作
+            i -= 1
+            j -= 1
+            ops.append(('replace', i, j))
+        elif dp[i][j] == dp[i-1][j] + 1:
+            # 删除操作
+            i -= 1
+            ops.append(('delete', i, j))
+        else:
+            # 插入操作
+            j -= 1
+            ops.append(('insert', i, j))
+
+    ops.reverse()
+    return ops
+
+
+def _pattern_masks(s1: str) -> Dict[str, int]:
+    """构建字符匹配位向量：bit i 置位表示 s1[i] 为该字符"""
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(s1):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    return peq
+
+
+def _bitparallel_columns(s1: str, s2: str) -> Tuple[List[int], List[int]]:
+    """
+    位并行（Myers/Hyyrö）逐列计算DP矩阵的纵向差分位向量
+
+    以 Python 任意精度整数作为长度为 m 的位向量，第 j 列的
+    Pv/Mv 的 bit i 分别表示 D[i+1][j] - D[i][j] 为 +1 / -1，
+    因此 D[i][j] = j + popcount(Pv_j 低 i 位) - popcount(Mv_j 低 i 位)
+
+    Args:
+        s1 (str): 参考字符串（纵向，长度 m > 0）
+        s2 (str): 假设字符串（横向）
+
+    Returns:
+        Tuple[List[int], List[int]]: 第 0..n 列的 (Pv, Mv) 位向量列表
+    """
+    mask = (1 << len(s1)) - 1
+    peq = _pattern_masks(s1)
+
+    pv, mv = mask, 0
+    pv_cols, mv_cols = [pv], [mv]
+    for char in s2:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        # 第 0 行的横向差分恒为 +1，移位时补 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        pv_cols.append(pv)
+        mv_cols.append(mv)
+
+    return pv_cols, mv_cols
+
+
+def bitparallel_distance(s1: str, s2: str) -> int:
+    """
+    位并行计算编辑距离，O(n·⌈m/w⌉) 次大整数运算，内存 O(m) 位
+
+    Args:
+        s1 (str): 参考字符串
+        s2 (str): 假设字符串
+
+    Returns:
+        int: 编辑距离
+    """
+    m = len(s1)
+    if m == 0:
+        return len(s2)
+    if not s2:
+        return m
+
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    peq = _pattern_masks(s1)
+
+    pv, mv, score = mask, 0, m
+    for char in s2:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        # 最后一行的横向差分即 D[m][j] 的变化量
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+
+    return score
+
+
+def bounded_distance(s1: str, s2: str, max_distance: int) -> Optional[int]:
+    """
+    阈值判定用的编辑距离：只关心是否超过上限 k，超过时尽早返回
+
+    先用长度差与字符计数两个 O(m+n) 下界快速排除；再逐列位并行计算，
+    并沿终点所在对角线 i - j = m - n 检查 Ukkonen 截断条件：
+    同一对角线上的 D 值单调不减，一旦超过 k 即可断定最终距离超过 k
+
+    Args:
+        s1 (str): 参考字符串
+        s2 (str): 假设字符串
+        max_distance (int): 编辑距离上限 k
+
+    Returns:
+        Optional[int]: 编辑距离；超过上限时返回 None
+    """
+    m, n = len(s1), len(s2)
+    k = max_distance
+    if k < 0 or abs(m - n) > k:
+        return None
+    if m == 0 or n == 0:
+        return max(m, n)
+    # 未能配对的字符至少各需要一次编辑
+    common = sum((Counter(s1) & Counter(s2)).values())
+    if max(m, n) - common > k:
+        return None
+
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    peq = _pattern_masks(s1)
+    offset = m - n
+
+    pv, mv, score = mask, 0, m
+    for j, char in enumerate(s2, 1):
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        # 终点对角线上的 D[j + offset][j]
+        i = j + offset
+        if i > 0:
+            low = (1 << i) - 1
+            if j + (pv & low).bit_count() - (mv & low).bit_count() > k:
+                return None
+
+    return score if score <= k else None
+
+
+def bitparallel_editops(s1: str, s2: str) -> List[EditOp]:
+    """
+    位并行计算DP矩阵后回溯编辑操作序列
+    回溯优先级与 backtrack_editops 相同（匹配 → 替换 → 删除 → 插入），
+    因此得到完全相同的编辑操作；矩阵以每列两个 m 位整数存储，
+    内存约为朴素实现的 1/64
+
+    Args:
+        s1 (str): 参考字符串
+        s2 (str): 假设字符串
+
+    Returns:
+        List[EditOp]: 按位置升序排列的编辑操作列表
+    """
+    m, n = len(s1), len(s2)
+    if m == 0:
+        return [('insert', 0, j) for j in range(n)]
+    if n == 0:
+        return [('delete', i, 0) for i in range(m)]
+
+    pv_cols, mv_cols = _bitparallel_columns(s1, s2)
+
+    def cell(i: int, j: int) -> int:
+        low = (1 << i) - 1
+        return j + (pv_cols[j] & low).bit_count() - (mv_cols[j] & low).bit_count()
+
+    ops = []
+    i, j = m, n
+    current = cell(i, j)
+    while i > 0 and j > 0:
+        if s1[i-1] == s2[j-1]:
+            # 字符匹配，向左上移动（代价不变）
+            i -= 1
+            j -= 1
+            continue
+        diagonal = cell(i - 1, j - 1)
+        if current == diagonal + 1:
+            # 替换操作
+            i -= 1
+            j -= 1
+            ops.append(('replace', i, j))
+            current = diagonal
+            continue
+        up = cell(i - 1, j)
+        if current == up + 1:
+            # 删除操作
+            i -= 1
+            ops.append(('delete', i, j))
+            current = up
+        else:
+            # 插入操作
+            j -= 1
+            ops.append(('insert', i, j))
+            current -= 1
+
+    # 剩余部分只能插入或删除
+    while j > 0:
+        j -= 1
+        ops.append(('insert', i, j))
+    while i > 0:
+        i -= 1
+        ops.append(('delete', i, j))
+
+    ops.reverse()
+    return ops
+
+
+def linear_space_editops(s1: str, s2: str, block: int = _LINEAR_SPACE_BLOCK) -> List[EditOp]:
+    """
+    线性内存的分治（Hirschberg 式）回溯，适用于超长文本
+
+    沿假设串方向二分：对右半部分递归回溯到中间列后，再回溯左半部分；
+    每层只保留一列位向量，仅在宽度不超过 block 的子块内保存全部列。
+    各列状态由左侧检查点重新推进得到，数值与全量计算完全相同，
+    回溯优先级也与 bitparallel_editops 一致，因此得到相同的编辑操作。
+    内存 O(m·(block + log n)) 位，时间 O(n·log(n/block)·⌈m/w⌉)
+
+    Args:
+        s1 (str): 参考字符串
+        s2 (str): 假设字符串
+        block (int): 直接保存全部列的最大块宽
+
+    Returns:
+        List[EditOp]: 按位置升序排列的编辑操作列表
+    """
+    m, n = len(s1), len(s2)
+    if m == 0:
+        return [('insert', 0, j) for j in range(n)]
+    if n == 0:
+        return [('delete', i, 0) for i in range(m)]
+
+    mask = (1 << m) - 1
+    peq = _pattern_masks(s1)
+    ops: List[EditOp] = []  # 逆序收集
+
+    def advance(pv: int, mv: int, j_from: int, j_to: int, keep: bool = False):
+        """从第 j_from 列状态推进到第 j_to 列；keep 时返回途经各列"""
+        pv_cols, mv_cols = [pv], [mv]
+        for char in s2[j_from:j_to]:
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+            if keep:
+                pv_cols.append(pv)
+                mv_cols.append(mv)
+        if keep:
+            return pv_cols, mv_cols
+        return pv, mv
+
+    def backtrack_block(lo: int, pv_lo: int, mv_lo: int, hi: int, i: int) -> int:
+        """在第 lo..hi 列内从 (i, hi) 回溯，返回路径到达第 lo 列时的行号"""
+        pv_cols: List[int]
+        mv_cols: List[int]
+        pv_cols, mv_cols = advance(pv_lo, mv_lo, lo, hi, keep=True)
+
+        def cell(ci: int, cj: int) -> int:
+            low = (1 << ci) - 1
+            k = cj - lo
+            return cj + (pv_cols[k] & low).bit_count() - (mv_cols[k] & low).bit_count()
+
+        j = hi
+        current = cell(i, j)
+        while i > 0 and j > lo:
+            if s1[i-1] == s2[j-1]:
+                i -= 1
+                j -= 1
+                continue
+            diagonal = cell(i - 1, j - 1)
+            if current == diagonal + 1:
+                i -= 1
+                j -= 1
+                ops.append(('replace', i, j))
+                current = diagonal
+                continue
+            up = cell(i - 1, j)
+            if current == up + 1:
+                i -= 1
+                ops.append(('delete', i, j))
+                current = up
+            else:
+                j -= 1
+                ops.append(('insert', i, j))
+                current -= 1
+
+        # 已到第 0 行：本块剩余部分只能插入
+        while j > lo:
+            j -= 1
+            ops.append(('insert', i, j))
+        return i
+
+    def solve(lo: int, pv_lo: int, mv_lo: int, hi: int, i: int) -> int:
+        if hi - lo <= block:
+            return backtrack_block(lo, pv_lo, mv_lo, hi, i)
+        mid = (lo + hi) // 2
+        pv_mid, mv_mid = advance(pv_lo, mv_lo, lo, mid)
+        i = solve(mid, pv_mid, mv_mid, hi, i)
+        return solve(lo, pv_lo, mv_lo, mid, i)
+
+    i = solve(0, mask, 0, n, m)
+    # 已到第 0 列：剩余部分只能删除
+    while i > 0:
+        i -= 1
+        ops.append(('delete', i, 0))
+
+    ops.reverse()
+    return ops
+
+
+def fallback_editops(s1: str, s2: str,
+                     linear_space_threshold: int = LINEAR_SPACE_THRESHOLD) -> List[EditOp]:
+    """
+    纯 Python 回退实现的编辑操作计算入口
+    DP 单元数不超过阈值时保存全部列位向量，超过时自动改用线性内存分治回溯；
+    两种方式结果完全相同
+
+    Args:
+        s1 (str): 参考字符串
+        s2 (str): 假设字符串
+        linear_space_threshold (int): 启用线性内存模式的 m·n 阈值
+
+    Returns:
+        List[EditOp]: 按位置升序排列的编辑操作列表
+    """
+    if len(s1) * len(s2) > linear_space_threshold:
+        return linear_space_editops(s1, s2)
+    return bitparallel_editops(s1, s2)
+
+
+def count_editops(editops: List[EditOp]) -> Tuple[int, int, int]:
+    """
+    统计编辑操作中各类操作的数量
+
+    Args:
+        editops (List[EditOp]): 编辑操作列表
+
+    Returns:
+        Tuple[int, int, int]: (替换数, 删除数, 插入数)
+    """
+    s = d = i = 0
+    for op in editops:
+        tag = op[0]
+        if tag == 'replace':
+            s += 1
+        elif tag == 'delete':
+            d += 1
+        elif tag == 'insert':
+            i += 1
+    return s, d, i
+
+
+def edit_ops_batch(pairs: List[Tuple[str, str]],
+                   linear_space_threshold: int = LINEAR_SPACE_THRESHOLD,
+                   backend: Any = AUTO_BACKEND) -> List[Tuple[int, int, int]]:
+    """
+    批量计算多对字符串的编辑操作数量
+    优先使用python-Levenshtein库；不可用时，若已安装 NumPy 且批量足够大，
+    交给 NumPy 批量引擎，否则逐对使用位并行DP路径回溯。各后端结果完全相同
+
+    Args:
+        pairs (List[Tuple[str, str]]): (参考字符串, 假设字符串) 列表
+        linear_space_threshold (int): 回退实现启用线性内存模式的 m·n 阈值
+        backend: 已解析的 Levenshtein 模块（None 表示不可用），默认调用时自动检测
+
+    Returns:
+        List[Tuple[int, int, int]]: 与输入顺序一致的 (替换数, 删除数, 插入数) 列表
+    """
+    if backend == AUTO_BACKEND:
+        backend = load_levenshtein()
+    if backend is not None:
+        return [count_editops(backend.editops(s1, s2)) for s1, s2 in pairs]
+
+    results: List[Tuple[int, int, int]] = [(0, 0, 0)] * len(pairs)
+    batch_indices = []
+    try:
+        from cer_tool.numpy_alignment import MAX_BATCH_CELLS, numpy_edit_ops_batch
+    except ImportError:
+        pass
+    else:
+        # 超大的单对仍交给线性内存回退实现，避免一次性分配完整矩阵
+        batch_indices = [
+            k for k, (s1, s2) in enumerate(pairs)
+            if (len(s1) + 1) * (len(s2) + 1) <= MAX_BATCH_CELLS
+            and len(s1) * len(s2) <= linear_space_threshold
+        ]
+        if len(batch_indices) < NUMPY_MIN_BATCH:
+            batch_indices = []
+
+    if batch_indices:
+        counts = numpy_edit_ops_batch([pairs[k] for k in batch_indices])
+        for k, value in zip(batch_indices, counts):
+            results[k] = value
+
+    handled = set(batch_indices)
+    for k, (s1, s2) in enumerate(pairs):
+        if k not in handled:
+            results[k] = count_editops(fallback_editops(s1, s2, linear_space_threshold))
+    return results
+
+
+def editops_to_opcodes(editops: List[EditOp], len1: int, len2: int) -> List[Opcode]:
+    """
+    将编辑操作序列转换为 opcodes，连续的同类操作合并为一个片段
+
+    Args:
+        editops (List[EditOp]): 按位置升序排列的编辑操作列表
+        len1 (int): 参考字符串长度
+        len2 (int): 假设字符串长度
+
+    Returns:
+        List[Opcode]: 覆盖两个字符串全长的对齐片段列表
+    """
+    opcodes: List[Opcode] = []
+
+    def _emit(tag, i1, i2, j1, j2):
+        # 与上一个片段同类且首尾相接时直接延长
+        if opcodes:
+            last = opcodes[-1]
+            if last[0] == tag and last[2] == i1 and last[4] == j1:
+                opcodes[-1] = (tag, last[1], i2, last[3], j2)
+                return
+        opcodes.append((tag, i1, i2, j1, j2))
+
+    i = j = 0
+    for tag, pi, pj in editops:
+        # 两个编辑操作之间的部分为匹配
+        if pi > i or pj > j:
+            _emit('equal', i, pi, j, pj)
+        if tag == 'replace':
+            _emit('replace', pi, pi + 1, pj, pj + 1)
+            i, j = pi + 1, pj + 1
+        elif tag == 'delete':
+            _emit('delete', pi, pi + 1, pj, pj)
+            i, j = pi + 1, pj
+        else:
+            _emit('insert', pi, pi, pj, pj + 1)
+            i, j = pi, pj + 1
+
+    if i < len1 or j < len2:
+        _emit('equal', i, len1, j, len2)
+
+    return opcodes
+
+
+def compute_opcodes(s1: str, s2: str,
+                    linear_space_threshold: int = LINEAR_SPACE_THRESHOLD,
+                    backend: Any = AUTO_BACKEND) -> List[Opcode]:
+    """
+    计算两个字符串的对齐片段
+    优先使用python-Levenshtein库，不可用时回退到位并行DP路径回溯
+
+    Args:
+        s1 (str): 参考字符串
+        s2 (str): 假设字符串
+        linear_space_threshold (int): 回退实现启用线性内存模式的 m·n 阈值
+        backend: 已解析的 Levenshtein 模块（None 表示不可用），默认调用时自动检测
+
+    Returns:
+        List[Opcode]: 对齐片段列表
+    """
+    if backend == AUTO_BACKEND:
+        backend = load_levenshtein()
+    if backend is not None:
+        return [tuple(op) for op in backend.opcodes(s1, s2)]
+    editops = fallback_editops(s1, s2, linear_space_threshold)
+    return editops_to_opcodes(editops, len(s1), len(s2))
+
+
+class AlignmentResult:
+    """
+    一次对齐的结果
+    错误统计、详细指标、高亮文本与差异序列均由同一组 opcodes 按需派生，
+    保证三种视图彼此一致
+
+    对齐本身是字符级的，不依赖分词器；词级输出（ref_tokens 等）仅在首次访问时
+    调用 tokenize 计算并缓存
+    """
+
+    def __init__(self, reference: str, hypothesis: str,
+                 opcodes: List[Opcode], tokenizer_name: str = "jieba",
+                 tokenize: Optional[Callable[[str], List[WordToken]]] = None):
+        """
+        初始化对齐结果
+
+        Args:
+            reference (str): 预处理后的参考文本
+            hypothesis (str): 预处理后的假设文本
+            opcodes (List[Opcode]): 对齐片段列表
+            tokenizer_name (str): 预处理时使用的分词器名称
+            tokenize (Callable): 精确分词函数，返回(词语, 开始, 结束)列表；
+                为 None 时词级输出按单字切分
+        """
+        self.reference = reference
+        self.hypothesis = hypothesis
+        self.opcodes = opcodes
+        self.tokenizer_name = tokenizer_name
+        self._tokenize = tokenize
+
+    def _word_tokens(self, text: str) -> List[WordToken]:
+        if self._tokenize is None:
+            return [(char, i, i + 1) for i, char in enumerate(text)]
+        return self._tokenize(text)
+
+    @cached_property
+    def ref_tokens(self) -> List[WordToken]:
+        """参考文本的精确分词结果（惰性计算）"""
+        return self._word_tokens(self.reference)
+
+    @cached_property
+    def hyp_tokens(self) -> List[WordToken]:
+        """假设文本的精确分词结果（惰性计算）"""
+        return self._word_tokens(self.hypothesis)
+
+    @property
+    def ref_positions(self) -> List[Tuple[str, int]]:
+        """参考文本的(字符, 位置)列表，由 ref_tokens 展开"""
+        return [(char, start + k) for word, start, _ in self.ref_tokens
+                for k, char in enumerate(word)]
+
+    @property
+    def hyp_positions(self) -> List[Tuple[str, int]]:
+        """假设文本的(字符, 位置)列表，由 hyp_tokens 展开"""
+        return [(char, start + k) for word, start, _ in self.hyp_tokens
+                for k, char in enumerate(word)]
+
+    @cached_property
+    def counts(self) -> Tuple[int, int, int]:
+        """(替换数, 删除数, 插入数)"""
+        s = d = i = 0
+        for tag, i1, i2, j1, j2 in self.opcodes:
+            if tag == 'replace':
+                s += i2 - i1
+            elif tag == 'delete':
+                d += i2 - i1
+            elif tag == 'insert':
+                i += j2 - j1
+        return s, d, i
+
+    @property
+    def substitutions(self) -> int:
+        return self.counts[0]
+
+    @property
+    def deletions(self) -> int:
+        return self.counts[1]
+
+    @property
+    def insertions(self) -> int:
+        return self.counts[2]
+
+    @property
+    def ref_length(self) -> int:
+        return len(self.reference)
+
+    @property
+    def hyp_length(self) -> int:
+        return len(self.hypothesis)
+
+    @property
+    def hits(self) -> int:
+        s, d, _ = self.counts
+        return self.ref_length - (s + d)
+
+    @property
+    def cer(self) -> float:
+        """
+        字符错误率
+        空参考时与 calculate_cer 语义一致：假设也为空记 0.0，否则记 1.0
+        """
+        if self.ref_length == 0:
+            return 1.0 if self.hyp_length > 0 else 0.0
+        return sum(self.counts) / self.ref_length
+
+    def to_metrics(self) -> Dict[str, Any]:
+        """
+        生成与 calculate_detailed_metrics 相同格式的指标字典
+        每次调用返回新的字典，调用方可以安全地追加字段
+
+        Returns:
+            dict: 包含各种错误指标的字典
+        """
+        s, d, i = self.counts
+        cer = self.cer
+        return {
+            'cer': cer,
+            'wer': cer,  # 对于中文，CER和WER相同
+            'mer': cer,  # 匹配错误率
+            'wil': cer,  # 词信息丢失率
+            'wip': 1.0 - cer,  # 词信息保留率
+            'hits': self.hits,  # 命中数
+            'substitutions': s,  # 替换错误数
+            'deletions': d,      # 删除错误数
+            'insertions': i,     # 插入错误数
+            'ref_length': self.ref_length,  # 参考文本长度
+            'hyp_length': self.hyp_length,  # 假设文本长度
+            'accuracy': 1.0 - cer,  # 准确率
+            'tokenizer': self.tokenizer_name  # 使用的分词器
+        }
+
+    @cached_property
+    def highlighted(self) -> Tuple[str, str]:
+        """(参考文本高亮版, 假设文本高亮版)，错误片段以方括号标出"""
+        ref, hyp = self.reference, self.hypothesis
+        ref_highlighted = []
+        hyp_highlighted = []
+
+        for tag, i1, i2, j1, j2 in self.opcodes:
+            if tag == 'equal':
+                ref_highlighted.append(ref[i1:i2])
+                hyp_highlighted.append(hyp[j1:j2])
+            elif tag == 'replace':
+                ref_highlighted.append(f"[{ref[i1:i2]}]")
+                hyp_highlighted.append(f"[{hyp[j1:j2]}]")
+            elif tag == 'delete':
+                ref_highlighted.append(f"[{ref[i1:i2]}]")
+            elif tag == 'insert':
+                hyp_highlighted.append(f"[{hyp[j1:j2]}]")
+
+        return ''.join(ref_highlighted), ''.join(hyp_highlighted)
+
+    @cached_property
+    def diff_sequence(self) -> str:
+        """逐字差异序列，格式同 difflib.Differ：'  '匹配、'- '仅参考、'+ '仅假设"""
+        ref, hyp = self.reference, self.hypothesis
+        parts: List[str] = []
+
+        for tag, i1, i2, j1, j2 in self.opcodes:
+            if tag == 'equal':
+                parts.extend('  ' + c for c in ref[i1:i2])
+                continue
+            if tag in ('replace', 'delete'):
+                parts.extend('- ' + c for c in ref[i1:i2])
+            if tag in ('replace', 'insert'):
+                parts.extend('+ ' + c for c in hyp[j1:j2])
+
+        return ''.join(parts)
+
+    def __repr__(self) -> str:
+        s, d, i = self.counts
+        return (f"AlignmentResult(ref_length={self.ref_length}, hyp_length={self.hyp_length}, "
+                f"S={s}, D={d}, I={i})")
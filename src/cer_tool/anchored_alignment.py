@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+锚点分段对齐模块
+面向讲座、播客等长文本：先找出参考与假设中各只出现一次、且顺序一致的
+n-gram 作为锚点（patience diff 思路），再只对锚点之间的空隙做完整对齐
+
+相似的长文本中空隙都很短，整体代价由 O(m·n) 降为接近线性；
+各空隙的对齐互相独立，可交给进程池/线程池并行计算。
+锚点位于最优对齐路径上时（相似文本中的常见情况），编辑距离与整体对齐一致；
+替换/删除/插入的拆分在等价路径间的取舍可能与整体对齐不同
+"""
+
+from bisect import bisect_left
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple
+
+from cer_tool.alignment import AUTO_BACKEND, LINEAR_SPACE_THRESHOLD, Opcode, compute_opcodes, load_levenshtein
+
+# 锚点 n-gram 的默认长度（字符数）
+ANCHOR_NGRAM = 6
+
+# 匹配块：(参考起点, 假设起点, 长度)
+MatchBlock = Tuple[int, int, int]
+
+
+def _unique_ngrams(text: str, ngram: int) -> Dict[str, int]:
+    """返回只出现一次的 n-gram 及其起点"""
+    positions: Dict[str, int] = {}
+    for start in range(len(text) - ngram + 1):
+        gram = text[start:start + ngram]
+        # 重复出现的 n-gram 标记为 -1
+        positions[gram] = -1 if gram in positions else start
+    return {gram: start for gram, start in positions.items() if start >= 0}
+
+
+def _longest_increasing_chain(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """按参考位置排序的候选对中，取假设位置严格递增的最长子序列（patience 排序）"""
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous: List[int] = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        slot = bisect_left(tails, j)
+        if slot == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[slot] = j
+            tail_index[slot] = index
+        previous[index] = tail_index[slot - 1] if slot > 0 else -1
+
+    chain: List[Tuple[int, int]] = []
+    index = tail_index[-1] if tail_index else -1
+    while index >= 0:
+        chain.append(pairs[index])
+        index = previous[index]
+    chain.reverse()
+    return chain
+
+
+def find_anchors(s1: str, s2: str, ngram: int = ANCHOR_NGRAM) -> List[MatchBlock]:
+    """
+    查找两个字符串之间的锚点匹配块
+
+    取两侧各只出现一次的 n-gram，按出现顺序求最长一致链，
+    合并同一对角线上相邻的锚点，并将每个匹配块向两侧扩展到最长
+
+    Args:
+        s1 (str): 参考字符串
+        s2 (str): 假设字符串
+        ngram (int): 锚点 n-gram 长度
+
+    Returns:
+        List[MatchBlock]: 按位置升序、互不重叠的 (参考起点, 假设起点, 长度) 列表
+    """
+    if ngram <= 0 or len(s1) < ngram or len(s2) < ngram:
+        return []
+
+    grams1 = _unique_ngrams(s1, ngram)
+    grams2 = _unique_ngrams(s2, ngram)
+    candidates = sorted(
+        (start, grams2[gram]) for gram, start in grams1.items() if gram in grams2
+    )
+    chain = _longest_increasing_chain(candidates)
+
+    # 合并同一对角线上重叠或相接的锚点，丢弃与上一块交叉的锚点
+    blocks: List[List[int]] = []
+    for i, j in chain:
+        if blocks:
+            bi, bj, length = blocks[-1]
+            if i - bi == j - bj and i <= bi + length:
+                blocks[-1][2] = max(length, i + ngram - bi)
+                continue
+            if i < bi + length or j < bj + length:
+                continue
+        blocks.append([i, j, ngram])
+
+    # 向两侧扩展匹配块，不越过相邻块
+    anchors: List[MatchBlock] = []
+    end1 = end2 = 0
+    for i, j, length in blocks:
+        # 上一块扩展后可能覆盖了本块的开头
+        overlap = max(end1 - i, end2 - j, 0)
+        i, j, length = i + overlap, j + overlap, length - overlap
+        if length <= 0:
+            continue
+        while i > end1 and j > end2 and s1[i - 1] == s2[j - 1]:
+            i, j, length = i - 1, j - 1, length + 1
+        while i + length < len(s1) and j + length < len(s2) and s1[i + length] == s2[j + length]:
+            length += 1
+        anchors.append((i, j, length))
+        end1, end2 = i + length, j + length
+
+    return anchors
+
+
+def _align_gap(gap: Tuple[str, str, int, bool]) -> List[Opcode]:
+    """对齐一段空隙（进程池任务，需为模块级函数；模块对象不可序列化，只传是否使用 Levenshtein）"""
+    s1, s2, linear_space_threshold, use_levenshtein = gap
+    backend = load_levenshtein() if use_levenshtein else None
+    return compute_opcodes(s1, s2, linear_space_threshold, backend)
+
+
+def anchored_opcodes(s1: str, s2: str,
+                     ngram: int = ANCHOR_NGRAM,
+                     linear_space_threshold: int = LINEAR_SPACE_THRESHOLD,
+                     executor: Optional[Executor] = None,
+                     backend: Any = AUTO_BACKEND) -> List[Opcode]:
+    """
+    锚点分段对齐：只对锚点之间的空隙做完整对齐
+
+    Args:
+        s1 (str): 参考字符串
+        s2 (str): 假设字符串
+        ngram (int): 锚点 n-gram 长度
+        linear_space_threshold (int): 空隙对齐启用线性内存模式的 m·n 阈值
+        executor (Optional[Executor]): 用于并行对齐空隙的执行器，None 时串行计算
+        backend: 已解析的 Levenshtein 模块（None 表示不可用），默认调用时自动检测
+
+    Returns:
+        List[Opcode]: 覆盖两个字符串全长的对齐片段列表
+    """
+    if backend == AUTO_BACKEND:
+        backend = load_levenshtein()
+    anchors = find_anchors(s1, s2, ngram)
+    if not anchors:
+        return compute_opcodes(s1, s2, linear_space_threshold, backend)
+
+    # 锚点之间（及首尾）的空隙，最后追加一个长度为 0 的哨兵锚点
+    segments: List[Tuple[int, int, int, int]] = []
+    end1 = end2 = 0
+    for i, j, length in anchors + [(len(s1), len(s2), 0)]:
+        segments.append((end1, i, end2, j))
+        end1, end2 = i + length, j + length
+
+    gaps = [
+        (s1[i1:i2], s2[j1:j2], linear_space_threshold, backend is not None)
+        for i1, i2, j1, j2 in segments if i2 > i1 or j2 > j1
+    ]
+    if executor is not None:
+        gap_results = iter(executor.map(_align_gap, gaps))
+    else:
+        gap_results = iter(map(_align_gap, gaps))
+
+    opcodes: List[Opcode] = []
+
+    def _emit(tag, i1, i2, j1, j2):
+        # 与上一个片段同类且首尾相接时直接延长
+        if opcodes:
+            last = opcodes[-1]
+            if last[0] == tag and last[2] == i1 and last[4] == j1:
+                opcodes[-1] = (tag, last[1], i2, last[3], j2)
+                return
+        opcodes.append((tag, i1, i2, j1, j2))
+
+    for (i1, i2, j1, j2), anchor in zip(segments, anchors + [None]):
+        if i2 > i1 or j2 > j1:
+            for tag, a1, a2, b1, b2 in next(gap_results):
+                _emit(tag, a1 + i1, a2 + i1, b1 + j1, b2 + j1)
+        if anchor is not None:
+            i, j, length = anchor
+            _emit('equal', i, i + length, j, j + length)
+
+    return opcodes
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列式批量结果模块
+批量计算时每对文本只保存几个整数，按列存放在 array 中，
+避免逐对构建 13 键字典；汇总指标直接由列计算
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, Tuple
+
+from cer_tool.aggregation import CorpusAccumulator
+
+
+class BatchMetrics:
+    """
+    批量计算结果（列式存储）
+
+    整数列（array('i')）：substitutions、deletions、insertions、ref_length、hyp_length
+    浮点列（array('d')）：cer
+    第 k 行对应输入中的第 k 对文本
+    """
+
+    def __init__(self, tokenizer_name: str = "jieba"):
+        """
+        初始化空的批量结果
+
+        Args:
+            tokenizer_name (str): 计算使用的分词器名称
+        """
+        self.tokenizer_name = tokenizer_name
+        self.substitutions = array('i')
+        self.deletions = array('i')
+        self.insertions = array('i')
+        self.ref_length = array('i')
+        self.hyp_length = array('i')
+        self.cer = array('d')
+
+    def append(self, substitutions: int, deletions: int, insertions: int,
+               ref_length: int, hyp_length: int) -> None:
+        """
+        追加一对文本的错误统计，CER 按 calculate_cer 的边界语义计算
+
+        Args:
+            substitutions (int): 替换数
+            deletions (int): 删除数
+            insertions (int): 插入数
+            ref_length (int): 参考文本长度
+            hyp_length (int): 假设文本长度
+        """
+        self.substitutions.append(substitutions)
+        self.deletions.append(deletions)
+        self.insertions.append(insertions)
+        self.ref_length.append(ref_length)
+        self.hyp_length.append(hyp_length)
+        if ref_length > 0:
+            self.cer.append((substitutions + deletions + insertions) / ref_length)
+        else:
+            self.cer.append(1.0 if hyp_length > 0 else 0.0)
+
+    def __len__(self) -> int:
+        return len(self.cer)
+
+    @property
+    def total_substitutions(self) -> int:
+        """替换总数"""
+        return sum(self.substitutions)
+
+    @property
+    def total_deletions(self) -> int:
+        """删除总数"""
+        return sum(self.deletions)
+
+    @property
+    def total_insertions(self) -> int:
+        """插入总数"""
+        return sum(self.insertions)
+
+    @property
+    def total_errors(self) -> int:
+        """错误总数"""
+        return self.total_substitutions + self.total_deletions + self.total_insertions
+
+    @property
+    def total_ref_length(self) -> int:
+        """参考文本总字数"""
+        return sum(self.ref_length)
+
+    @property
+    def total_hyp_length(self) -> int:
+        """假设文本总字数"""
+        return sum(self.hyp_length)
+
+    @property
+    def micro_cer(self) -> float:
+        """微平均 CER（CorpusAccumulator.micro_cer 语义）"""
+        return self.to_accumulator().micro_cer
+
+    @property
+    def macro_cer(self) -> float:
+        """宏平均 CER（CorpusAccumulator.macro_cer 语义）"""
+        return self.to_accumulator().macro_cer
+
+    @property
+    def overall_accuracy(self) -> float:
+        """总体准确率（CorpusAccumulator.overall_accuracy 语义）"""
+        return self.to_accumulator().overall_accuracy
+
+    def row(self, index: int) -> Tuple[int, int, int, int, int, float]:
+        """
+        获取单行结果
+
+        Args:
+            index (int): 行号
+
+        Returns:
+            Tuple: (替换数, 删除数, 插入数, 参考长度, 假设长度, CER)
+        """
+        return (self.substitutions[index], self.deletions[index], self.insertions[index],
+                self.ref_length[index], self.hyp_length[index], self.cer[index])
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int, int, float]]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def to_accumulator(self) -> CorpusAccumulator:
+        """
+        转换为语料级累加器，便于与其他批次或分片合并
+
+        各列按整列求和后直接填入，不逐行调用 update
+
+        Returns:
+            CorpusAccumulator: 累加了本批全部结果的累加器
+        """
+        accumulator = CorpusAccumulator()
+        accumulator.pairs = len(self)
+        accumulator.substitutions = self.total_substitutions
+        accumulator.deletions = self.total_deletions
+        accumulator.insertions = self.total_insertions
+        accumulator.ref_length = self.total_ref_length
+        accumulator.hyp_length = self.total_hyp_length
+        accumulator.cer_sum = sum(self.cer)
+        return accumulator
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        汇总指标（键名与 CorpusAccumulator.summary 一致）
+
+        Returns:
+            dict: CorpusAccumulator.summary 的全部字段，外加所用分词器名称
+        """
+        summary = self.to_accumulator().summary()
+        summary['tokenizer'] = self.tokenizer_name
+        return summary
+
+    def __repr__(self) -> str:
+        accumulator = self.to_accumulator()
+        return (f"BatchMetrics(pairs={len(self)}, micro_cer={accumulator.micro_cer:.4f}, "
+                f"macro_cer={accumulator.macro_cer:.4f})")
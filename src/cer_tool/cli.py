@@ -10,154 +10,880 @@ import json
 import sys
 import os
 import csv
-from pathlib import Path
-from typing import List, Optional
+import time
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures.thread import BrokenThreadPool
+from functools import partial
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from cer_tool import __version__
-from cer_tool.metrics import ASRMetrics
-from cer_tool.tokenizers import get_available_tokenizers, get_tokenizer_info
+from cer_tool.session import SESSION_BATCH_SIZE, EvaluationSession
+from cer_tool.aggregation import CorpusAccumulator
+from cer_tool.result_writer import (
+    DEFAULT_FLUSH_EVERY, RESULT_FIELDNAMES, STREAM_FORMATS, TRIAGE_FIELDNAMES,
+    StreamingResultWriter, is_triage_result, summary_sidecar_path,
+)
+from cer_tool.tokenizers import (
+    JiebaTokenizer, TokenizerError, clear_probe_cache, get_available_tokenizers, get_tokenizer,
+    get_tokenizer_metadata,
+)
 from cer_tool.file_utils import read_file_with_encodings
+from cer_tool.manifest import join_manifests, load_manifest
+from cer_tool.pairing import DEFAULT_EXTENSIONS, DirectoryPairing
+from cer_tool.prefetch import PREFETCH_WORKERS, PrefetchedPair, prefetch_file_pairs
+from cer_tool.profiling import STAGE_READ, StageProfiler
+
+if TYPE_CHECKING:
+    from cer_tool.server import RemoteSession
+
+# 顺序模式使用的评估会话：本地会话，或常驻评估服务上的远程会话（接口相同）
+AnySession = Union[EvaluationSession, "RemoteSession"]
 
 
 def process_single_pair(asr_file: str, ref_file: str, 
                        tokenizer: str, filter_fillers: bool,
-                       verbose: bool = False) -> Optional[dict]:
+                       verbose: bool = False,
+                       max_cer: Optional[float] = None,
+                       max_distance: Optional[int] = None,
+                       segmented: bool = False,
+                       session: Optional[AnySession] = None,
+                       relative_to: Optional[Tuple[str, str]] = None) -> Optional[dict]:
     """
     处理单个文件对
     
+    指定 max_cer 或 max_distance 时进入阈值判定模式：只计算 CER 是否超限，
+    结果包含 over_threshold 标记，不含替换/删除/插入统计
+
     Args:
         asr_file: ASR文件路径
         ref_file: 标注文件路径
         tokenizer: 分词器名称
         filter_fillers: 是否过滤语气词
         verbose: 是否显示详细信息
+        max_cer: CER 上限（阈值判定模式）
+        max_distance: 编辑距离上限（阈值判定模式）
+        segmented: 是否使用锚点分段对齐（长文本）
+        session: 复用的评估会话，None 时按参数新建
+        relative_to: (ASR根目录, 标注根目录)，给出时结果中记录相对路径而非文件名
         
     Returns:
         dict: 计算结果，失败返回 None
     """
     try:
-        # 读取文件
-        asr_text = read_file_with_encodings(asr_file)
-        ref_text = read_file_with_encodings(ref_file)
+        # 批处理时复用同一个会话，避免逐对重新加载分词器
+        if session is None:
+            session = EvaluationSession(tokenizer, filter_fillers, segmented=segmented,
+                                        max_cer=max_cer, max_distance=max_distance)
+
+        asr_text, ref_text = _read_pair_texts(asr_file, ref_file, session.profiler)
+    except Exception as e:
+        report_pair_error(asr_file, ref_file, e)
+        return None
+
+    return process_loaded_pair(asr_file, ref_file, asr_text, ref_text, session,
+                               filter_fillers, verbose, relative_to)
+
+
+def _read_pair_texts(asr_file: str, ref_file: str,
+                     profiler: Optional[StageProfiler]) -> Tuple[str, str]:
+    """读取文件对（ASR文本, 标注文本），启用性能剖析时记录读取耗时"""
+    if profiler is not None:
+        start = time.perf_counter()
+    asr_text = read_file_with_encodings(asr_file)
+    ref_text = read_file_with_encodings(ref_file)
+    if profiler is not None:
+        profiler.record(STAGE_READ, time.perf_counter() - start, len(asr_text) + len(ref_text))
+    return asr_text, ref_text
+
+
+def process_loaded_pair(asr_file: str, ref_file: str, asr_text: str, ref_text: str,
+                        session: AnySession, filter_fillers: bool,
+                        verbose: bool = False,
+                        relative_to: Optional[Tuple[str, str]] = None) -> Optional[dict]:
+    """
+    评估已读取的文件对
+
+    Args:
+        asr_file: ASR文件路径
+        ref_file: 标注文件路径
+        asr_text: ASR文件内容
+        ref_text: 标注文件内容
+        session: 评估会话
+        filter_fillers: 是否过滤语气词
+        verbose: 是否显示详细信息
+        relative_to: (ASR根目录, 标注根目录)，给出时结果中记录相对路径而非文件名
+
+    Returns:
+        dict: 计算结果，失败返回 None
+    """
+    try:
+        # 计算详细指标（阈值判定模式下只判定是否超限）
+        result = session.evaluate((ref_text, asr_text))
+        _annotate_file_result(result, asr_file, ref_file, filter_fillers, relative_to)
         
-        # 创建ASRMetrics实例
-        metrics = ASRMetrics(tokenizer_name=tokenizer)
+        if verbose:
+            print_pair_result(result)
         
-        # 计算详细指标
-        result = metrics.calculate_detailed_metrics(ref_text, asr_text, filter_fillers)
+        return result
         
-        # 添加文件信息
+    except Exception as e:
+        report_pair_error(asr_file, ref_file, e)
+        return None
+
+
+def process_loaded_pairs(items: Sequence[Tuple[str, str, str, str]], session: AnySession,
+                         filter_fillers: bool,
+                         relative_to: Optional[Tuple[str, str]] = None) -> List[Optional[dict]]:
+    """
+    批量评估已读取的文件对：整批交给 session.evaluate_batch（分词器按批调用）
+
+    整批评估出错时逐对重新评估，只有出错的文件对结果为 None
+
+    Args:
+        items: [(ASR文件路径, 标注文件路径, ASR文件内容, 标注文件内容), ...]
+        session: 评估会话
+        filter_fillers: 是否过滤语气词
+        relative_to: (ASR根目录, 标注根目录)，给出时结果中记录相对路径而非文件名
+
+    Returns:
+        List[Optional[dict]]: 与输入一一对应的计算结果，失败为 None
+    """
+    if not items:
+        return []
+    try:
+        results = session.evaluate_batch([(ref_text, asr_text) for _, _, asr_text, ref_text in items])
+    except Exception:
+        return [process_loaded_pair(asr_file, ref_file, asr_text, ref_text, session,
+                                    filter_fillers, relative_to=relative_to)
+                for asr_file, ref_file, asr_text, ref_text in items]
+    for (asr_file, ref_file, _, _), result in zip(items, results):
+        _annotate_file_result(result, asr_file, ref_file, filter_fillers, relative_to)
+    return list(results)
+
+
+def _annotate_file_result(result: dict, asr_file: str, ref_file: str, filter_fillers: bool,
+                          relative_to: Optional[Tuple[str, str]]) -> None:
+    """在结果中记录文件信息（递归配对时不同子目录可能有同名文件，记录相对路径）"""
+    if relative_to is None:
         result['asr_file'] = os.path.basename(asr_file)
         result['ref_file'] = os.path.basename(ref_file)
-        result['filter_fillers'] = filter_fillers
-        
-        if verbose:
-            print(f"\n处理: {result['asr_file']} <-> {result['ref_file']}")
-            print(f"  CER: {result['cer']:.4f}")
-            print(f"  准确率: {result['accuracy']:.4f}")
-            print(f"  替换: {result['substitutions']}, 删除: {result['deletions']}, 插入: {result['insertions']}")
-        
+    else:
+        result['asr_file'] = os.path.relpath(asr_file, relative_to[0]).replace(os.sep, '/')
+        result['ref_file'] = os.path.relpath(ref_file, relative_to[1]).replace(os.sep, '/')
+    result['filter_fillers'] = filter_fillers
+
+
+def report_pair_error(asr_file: str, ref_file: str, error: Exception):
+    """报告文件对处理错误（无论 verbose 与否，错误都需要报告）"""
+    print("\n错误: 处理文件对时出错", file=sys.stderr)
+    print(f"  ASR文件: {asr_file}", file=sys.stderr)
+    print(f"  标注文件: {ref_file}", file=sys.stderr)
+    print(f"  错误信息: {str(error)}", file=sys.stderr)
+
+
+def print_pair_result(result: dict):
+    """打印单个文件对的详细结果（verbose 模式）"""
+    print(f"\n处理: {result['asr_file']} <-> {result['ref_file']}")
+    if is_triage_result(result):
+        print(f"  CER: {format_triage_cer(result)}")
+        return
+    print(f"  CER: {result['cer']:.4f}")
+    print(f"  准确率: {result['accuracy']:.4f}")
+    print(f"  替换: {result['substitutions']}, 删除: {result['deletions']}, 插入: {result['insertions']}")
+
+
+def process_text_pair(utt_id: str, ref_text: str, hyp_text: str,
+                      session: AnySession) -> Optional[dict]:
+    """
+    处理清单中的一对语句（不涉及文件读写）
+
+    Args:
+        utt_id: 语句ID
+        ref_text: 参考文本
+        hyp_text: 假设文本
+        session: 评估会话
+
+    Returns:
+        dict: 计算结果（asr_file / ref_file 字段为语句ID），失败返回 None
+    """
+    try:
+        result = session.evaluate((ref_text, hyp_text))
+        _annotate_text_result(result, utt_id, session)
         return result
-        
     except Exception as e:
-        # 无论 verbose 与否，错误都需要报告
-        print(f"\n错误: 处理文件对时出错", file=sys.stderr)
-        print(f"  ASR文件: {asr_file}", file=sys.stderr)
-        print(f"  标注文件: {ref_file}", file=sys.stderr)
-        print(f"  错误信息: {str(e)}", file=sys.stderr)
+        print(f"\n错误: 处理语句 {utt_id} 时出错: {str(e)}", file=sys.stderr)
         return None
 
 
-def batch_process_directory(asr_dir: str, ref_dir: str,
-                           tokenizer: str, filter_fillers: bool,
-                           output_file: str = None,
-                           output_format: str = "text",
-                           verbose: bool = False) -> List[dict]:
+def process_text_pairs(items: Sequence[Tuple[str, str, str]],
+                       session: AnySession) -> List[Optional[dict]]:
     """
-    批处理目录中的文件
+    批量处理清单中的语句对：整批交给 session.evaluate_batch（分词器按批调用）
+
+    整批评估出错时逐对重新评估，只有出错的语句结果为 None
+
+    Args:
+        items: [(语句ID, 参考文本, 假设文本), ...]
+        session: 评估会话
+
+    Returns:
+        List[Optional[dict]]: 与输入一一对应的计算结果，失败为 None
+    """
+    if not items:
+        return []
+    try:
+        results = session.evaluate_batch([(ref_text, hyp_text) for _, ref_text, hyp_text in items])
+    except Exception:
+        return [process_text_pair(utt_id, ref_text, hyp_text, session)
+                for utt_id, ref_text, hyp_text in items]
+    for (utt_id, _, _), result in zip(items, results):
+        _annotate_text_result(result, utt_id, session)
+    return list(results)
+
+
+def _annotate_text_result(result: dict, utt_id: str, session: AnySession) -> None:
+    """在结果中记录语句ID（asr_file / ref_file 字段同为语句ID）"""
+    result['utt_id'] = utt_id
+    result['asr_file'] = utt_id
+    result['ref_file'] = utt_id
+    result['filter_fillers'] = session.filter_fillers
+
+
+def _evaluate_file_task(task: Tuple[str, str], session: AnySession,
+                        relative_to: Optional[Tuple[str, str]] = None) -> Optional[dict]:
+    """任务函数：读取并评估一个文件对"""
+    asr_file, ref_file = task
+    return process_single_pair(
+        asr_file, ref_file, session.tokenizer_name, session.filter_fillers,
+        max_cer=session.max_cer, max_distance=session.max_distance,
+        segmented=session.segmented, session=session, relative_to=relative_to
+    )
+
+
+def _evaluate_text_task(task: Tuple[str, str, str], session: AnySession) -> Optional[dict]:
+    """任务函数：评估清单中的一对语句"""
+    utt_id, ref_text, hyp_text = task
+    return process_text_pair(utt_id, ref_text, hyp_text, session)
+
+
+def _evaluate_file_tasks(tasks: List[Tuple[str, str]], session: AnySession,
+                         relative_to: Optional[Tuple[str, str]] = None) -> List[Optional[dict]]:
+    """批量任务函数：依次读取一批文件对，读取成功的整批评估"""
+    items = []
+    for asr_file, ref_file in tasks:
+        try:
+            texts: Optional[Tuple[str, str]] = _read_pair_texts(asr_file, ref_file, session.profiler)
+        except Exception as e:
+            items.append(PrefetchedPair(asr_file, ref_file, None, e))
+        else:
+            items.append(PrefetchedPair(asr_file, ref_file, texts, None))
+    return _evaluate_read_pairs(items, session, session.filter_fillers, relative_to)
+
+
+def _evaluate_text_tasks(tasks: List[Tuple[str, str, str]],
+                         session: AnySession) -> List[Optional[dict]]:
+    """批量任务函数：整批评估清单中的语句对"""
+    return process_text_pairs(tasks, session)
+
+
+def _evaluate_read_pairs(items: List[PrefetchedPair], session: AnySession, filter_fillers: bool,
+                         relative_to: Optional[Tuple[str, str]]) -> List[Optional[dict]]:
+    """整批评估已读取的文件对，读取失败的文件对报告错误并返回 None（顺序与输入一致）"""
+    results: List[Optional[dict]] = [None] * len(items)
+    loaded = []
+    indices = []
+    for index, item in enumerate(items):
+        if item.error is not None:
+            report_pair_error(item.asr_file, item.ref_file, item.error)
+            continue
+        # 读取成功（error 为 None）时 texts 必定存在
+        assert item.texts is not None
+        asr_text, ref_text = item.texts
+        loaded.append((item.asr_file, item.ref_file, asr_text, ref_text))
+        indices.append(index)
+    for index, result in zip(indices, process_loaded_pairs(loaded, session, filter_fillers,
+                                                           relative_to)):
+        results[index] = result
+    return results
+
+
+# 并行执行方式：进程池（默认）或线程池
+EXECUTOR_PROCESS = "process"
+EXECUTOR_THREAD = "thread"
+EXECUTORS = (EXECUTOR_PROCESS, EXECUTOR_THREAD)
+
+# 批处理开始信息中并行工作单位的名称
+EXECUTOR_LABELS = {EXECUTOR_PROCESS: "进程", EXECUTOR_THREAD: "线程"}
+
+# 顺序模式下每批评估的文件对（语句对）数量
+SEQUENTIAL_BATCH_SIZE = SESSION_BATCH_SIZE
+
+# 并行模式下每个工作进程（或线程）对应的最多未取回任务块数；
+# 窗口满时停止读取惰性输入（背压），内存占用与任务总数无关
+PARALLEL_WINDOW_PER_WORKER = 4
+
+# 进程池模式下每次提交的任务数，摊薄进程间通信开销
+PROCESS_TASK_CHUNK = 16
+
+# 工作进程内复用的评估会话（由 _init_worker 创建）
+_worker_session: Optional[EvaluationSession] = None
+
+# 线程池模式下每个工作线程复用的评估会话（由 _init_thread_worker 创建）
+_thread_state = threading.local()
+
+
+def _init_worker(tokenizer: str, filter_fillers: bool,
+                 max_cer: Optional[float], max_distance: Optional[int], segmented: bool,
+                 cache_file: Optional[str], profile: bool):
+    """工作进程初始化：每个进程只创建一次评估会话（加载一次分词器、打开一次缓存）"""
+    global _worker_session
+    _worker_session = EvaluationSession(tokenizer, filter_fillers, segmented=segmented,
+                                        max_cer=max_cer, max_distance=max_distance,
+                                        cache_file=cache_file,
+                                        profiler=StageProfiler() if profile else None)
+
+
+def _init_thread_worker(sessions: List[EvaluationSession], tokenizer: str, filter_fillers: bool,
+                        max_cer: Optional[float], max_distance: Optional[int], segmented: bool,
+                        cache_file: Optional[str], profile: bool):
+    """
+    工作线程初始化：每个线程创建一个评估会话（各自的 SQLite 连接与计时器）；
+    分词器单例由工厂在线程间共享，并发请求时只初始化一次
+    """
+    _thread_state.session = EvaluationSession(tokenizer, filter_fillers, segmented=segmented,
+                                              max_cer=max_cer, max_distance=max_distance,
+                                              cache_file=cache_file,
+                                              profiler=StageProfiler() if profile else None)
+    sessions.append(_thread_state.session)
+
+
+def _run_task_in_thread(task_fn: Callable[..., Optional[dict]], task: tuple) -> Optional[dict]:
+    """在工作线程中用本线程的会话执行一个任务"""
+    return task_fn(task, _thread_state.session)
+
+
+def _run_profiled_task_in_thread(task_fn: Callable[..., Optional[dict]],
+                                 task: tuple) -> Tuple[Optional[dict], StageProfiler]:
+    """执行一个任务，并把本任务的计时统计随结果交给主线程合并"""
+    result = task_fn(task, _thread_state.session)
+    return result, _thread_state.session.profiler.drain()
+
+
+def _run_task_chunk(run: Callable[[tuple], object], chunk: List[tuple]) -> List[object]:
+    """在工作进程（或线程）中依次执行一块任务"""
+    return [run(task) for task in chunk]
+
+
+def _map_windowed(pool: Executor, run: Callable[[tuple], object], tasks: Iterable[tuple],
+                  jobs: int, chunksize: int = 1) -> Iterator:
+    """
+    按输入顺序产出 run(task) 的结果，最多 jobs × PARALLEL_WINDOW_PER_WORKER 个任务块在途
+
+    与 Executor.map 不同，惰性输入随结果的取回逐步读取，不会一次展开并提交全部任务；
+    生成器被提前关闭时取消尚未开始的任务块
+    """
+    depth = max(1, jobs * PARALLEL_WINDOW_PER_WORKER)
+    pending = iter(tasks)
+    window: "deque[Future]" = deque()
+
+    def _fill():
+        # 窗口未满时继续提交任务块（背压：窗口满则等待结果被消费）
+        while len(window) < depth:
+            chunk = list(islice(pending, chunksize))
+            if not chunk:
+                return
+            window.append(pool.submit(_run_task_chunk, run, chunk))
+
+    try:
+        _fill()
+        while window:
+            results = window.popleft().result()
+            _fill()
+            yield from results
+    finally:
+        for future in window:
+            future.cancel()
+
+
+def _iter_threaded_results(tasks: Iterable[tuple], task_fn: Callable, jobs: int,
+                           session_args: tuple,
+                           profiler: Optional[StageProfiler]) -> Iterator[Optional[dict]]:
+    """线程池模式：按输入顺序产出结果，结束时关闭各线程的会话"""
+    sessions: List[EvaluationSession] = []
+    try:
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="cer-eval",
+                                initializer=_init_thread_worker,
+                                initargs=(sessions,) + session_args) as pool:
+            if profiler is None:
+                yield from _map_windowed(pool, partial(_run_task_in_thread, task_fn), tasks, jobs)
+                return
+            for result, partial_profile in _map_windowed(
+                    pool, partial(_run_profiled_task_in_thread, task_fn), tasks, jobs):
+                profiler.merge(partial_profile)
+                yield result
+    except BrokenThreadPool as e:
+        # 工作线程初始化失败（如分词器不可用）
+        print(f"错误: 并行工作线程初始化失败: {str(e)}", file=sys.stderr)
+    finally:
+        for session in sessions:
+            session.close()
+
+
+def _run_task_in_worker(task_fn: Callable[..., Optional[dict]], task: tuple) -> Optional[dict]:
+    """在工作进程中用本进程的会话执行一个任务"""
+    return task_fn(task, _worker_session)
+
+
+def _run_profiled_task_in_worker(task_fn: Callable[..., Optional[dict]],
+                                 task: tuple) -> Tuple[Optional[dict], StageProfiler]:
+    """执行一个任务，并把本任务的计时统计随结果返回主进程"""
+    session = _worker_session
+    # 性能剖析模式下工作进程初始化时已创建会话与计时器
+    assert session is not None and session.profiler is not None
+    result = task_fn(task, session)
+    return result, session.profiler.drain()
+
+
+def _open_session(tokenizer: str, filter_fillers: bool,
+                  max_cer: Optional[float], max_distance: Optional[int], segmented: bool,
+                  cache_file: Optional[str],
+                  profiler: Optional[StageProfiler],
+                  remote: Optional["RemoteSession"] = None) -> Optional[AnySession]:
+    """创建顺序模式的评估会话（已连接评估服务时直接使用远程会话），失败时报告错误并返回 None"""
+    if remote is not None:
+        return remote
+    try:
+        return EvaluationSession(tokenizer, filter_fillers, segmented=segmented,
+                                 max_cer=max_cer, max_distance=max_distance,
+                                 cache_file=cache_file, profiler=profiler)
+    except Exception as e:
+        print(f"错误: 分词器 {tokenizer} 初始化失败: {str(e)}", file=sys.stderr)
+        return None
+
+
+def _connect_server(args: argparse.Namespace,
+                    profiler: Optional[StageProfiler]) -> Optional["RemoteSession"]:
+    """
+    --server auto：连接常驻评估服务并建立会话（一次连接，不预先 ping）
+
+    服务未运行、版本不一致或连接出错时返回 None，调用方回退到本地计算
+    """
+    from cer_tool.server import connect_session, default_socket_path
+    try:
+        return connect_session(args.socket or default_socket_path(),
+                               tokenizer_name=args.tokenizer, filter_fillers=args.filter_fillers,
+                               segmented=args.segmented, max_cer=args.max_cer,
+                               max_distance=args.max_distance, cache_file=args.cache,
+                               profiler=profiler)
+    except Exception as e:
+        print(f"警告: 连接评估服务失败: {str(e)}，改为本地计算", file=sys.stderr)
+        return None
+
+
+def _iter_prefetched_results(file_pairs: Iterable[Tuple[str, str]], prefetch: int,
+                             tokenizer: str, filter_fillers: bool,
+                             max_cer: Optional[float], max_distance: Optional[int],
+                             segmented: bool, cache_file: Optional[str],
+                             profiler: Optional[StageProfiler],
+                             relative_to: Optional[Tuple[str, str]],
+                             remote: Optional["RemoteSession"] = None
+                             ) -> Iterator[Optional[dict]]:
+    """顺序计算文件对，同时由线程池预读后续文件"""
+    session = _open_session(tokenizer, filter_fillers, max_cer, max_distance, segmented,
+                            cache_file, profiler, remote)
+    if session is None:
+        return
+    with session:
+        # 预读结果按批交给会话（依赖分词器的预处理步骤整批调用分词器）
+        prefetched = prefetch_file_pairs(file_pairs, workers=prefetch, profiler=profiler)
+        while True:
+            chunk = list(islice(prefetched, SEQUENTIAL_BATCH_SIZE))
+            if not chunk:
+                return
+            yield from _evaluate_read_pairs(chunk, session, filter_fillers, relative_to)
+
+
+def _iter_task_results(tasks: Iterable[tuple], task_fn: Callable,
+                       tokenizer: str, filter_fillers: bool,
+                       jobs: int, max_cer: Optional[float],
+                       max_distance: Optional[int], segmented: bool,
+                       cache_file: Optional[str],
+                       profiler: Optional[StageProfiler],
+                       executor: str = EXECUTOR_PROCESS,
+                       remote: Optional["RemoteSession"] = None,
+                       batch_fn: Optional[Callable[..., List[Optional[dict]]]] = None
+                       ) -> Iterator[Optional[dict]]:
+    """
+    按输入顺序产出每个任务的结果，jobs > 1 时使用进程池（或线程池）
+
+    顺序模式下给出 batch_fn 时每次取 SEQUENTIAL_BATCH_SIZE 个任务整批评估
+    """
+    session_args = (tokenizer, filter_fillers, max_cer, max_distance, segmented, cache_file,
+                    profiler is not None)
+
+    # 只预取两个任务判断是否值得启动并行执行器，其余输入保持惰性
+    tasks = iter(tasks)
+    head: List[tuple] = list(islice(tasks, 2)) if jobs > 1 else []
+    if jobs <= 1 or len(head) <= 1:
+        session = _open_session(tokenizer, filter_fillers, max_cer, max_distance, segmented,
+                                cache_file, profiler, remote)
+        if session is None:
+            return
+        with session:
+            pending = chain(head, tasks)
+            if batch_fn is None:
+                for task in pending:
+                    yield task_fn(task, session)
+                return
+            while True:
+                chunk = list(islice(pending, SEQUENTIAL_BATCH_SIZE))
+                if not chunk:
+                    return
+                yield from batch_fn(chunk, session)
+        return
+
+    if executor == EXECUTOR_THREAD:
+        yield from _iter_threaded_results(chain(head, tasks), task_fn, jobs, session_args, profiler)
+        return
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=session_args) as pool:
+            if profiler is None:
+                yield from _map_windowed(pool, partial(_run_task_in_worker, task_fn),
+                                         chain(head, tasks), jobs, PROCESS_TASK_CHUNK)
+                return
+            # 性能剖析：合并各工作进程随结果返回的计时统计
+            for result, partial_profile in _map_windowed(
+                    pool, partial(_run_profiled_task_in_worker, task_fn),
+                    chain(head, tasks), jobs, PROCESS_TASK_CHUNK):
+                profiler.merge(partial_profile)
+                yield result
+    except BrokenProcessPool as e:
+        # 工作进程初始化失败（如分词器不可用）
+        print(f"错误: 并行工作进程异常退出: {str(e)}", file=sys.stderr)
+
+
+def iter_pair_results(file_pairs: Iterable[Tuple[str, str]],
+                      tokenizer: str, filter_fillers: bool,
+                      jobs: int = 1,
+                      max_cer: Optional[float] = None,
+                      max_distance: Optional[int] = None,
+                      segmented: bool = False,
+                      cache_file: Optional[str] = None,
+                      profiler: Optional[StageProfiler] = None,
+                      prefetch: int = PREFETCH_WORKERS,
+                      relative_to: Optional[Tuple[str, str]] = None,
+                      executor: str = EXECUTOR_PROCESS,
+                      remote: Optional["RemoteSession"] = None) -> Iterator[Optional[dict]]:
+    """
+    依次产出每个文件对的结果，顺序与 file_pairs 一致
+
+    jobs > 1 时使用进程池并行计算，每个工作进程在初始化时创建一次评估会话；
+    executor 为 "thread" 时改用线程池，各线程共享同一个已初始化的分词器；
+    顺序计算时由 prefetch 个线程预读后续文件，读取与计算重叠进行；
+    结果按输入顺序流式返回
+
+    Args:
+        file_pairs: [(ASR文件路径, 标注文件路径), ...]，可为惰性迭代器
+        tokenizer: 分词器名称
+        filter_fillers: 是否过滤语气词
+        jobs: 并行工作进程（或线程）数
+        max_cer: CER 上限（阈值判定模式）
+        max_distance: 编辑距离上限（阈值判定模式）
+        segmented: 是否使用锚点分段对齐（长文本）
+        cache_file: 结果缓存（SQLite）路径，None 时不缓存
+        profiler: 性能剖析计时器，None 时不计时
+        prefetch: 顺序计算时的预读线程数，0 表示不预读
+        relative_to: (ASR根目录, 标注根目录)，给出时结果中记录相对路径而非文件名
+        executor: 并行执行方式，"process"（进程池）或 "thread"（线程池）
+        remote: 已连接的常驻评估服务会话，给出时顺序模式交给服务计算（结束时关闭）
+
+    Yields:
+        Optional[dict]: 计算结果，失败为 None
+    """
+    if prefetch > 0 and jobs <= 1:
+        return _iter_prefetched_results(file_pairs, prefetch, tokenizer, filter_fillers,
+                                        max_cer, max_distance, segmented, cache_file, profiler,
+                                        relative_to, remote)
+    task_fn = partial(_evaluate_file_task, relative_to=relative_to)
+    return _iter_task_results(file_pairs, task_fn, tokenizer, filter_fillers,
+                              jobs, max_cer, max_distance, segmented, cache_file, profiler,
+                              executor, remote,
+                              batch_fn=partial(_evaluate_file_tasks, relative_to=relative_to))
+
+
+def iter_manifest_results(text_pairs: List[Tuple[str, str, str]],
+                          tokenizer: str, filter_fillers: bool,
+                          jobs: int = 1,
+                          max_cer: Optional[float] = None,
+                          max_distance: Optional[int] = None,
+                          segmented: bool = False,
+                          cache_file: Optional[str] = None,
+                          profiler: Optional[StageProfiler] = None,
+                          executor: str = EXECUTOR_PROCESS,
+                          remote: Optional["RemoteSession"] = None) -> Iterator[Optional[dict]]:
+    """
+    依次产出清单中每对语句的结果，顺序与 text_pairs 一致（不访问文件系统）
+
+    Args:
+        text_pairs: [(语句ID, 参考文本, 假设文本), ...]
+        tokenizer: 分词器名称
+        filter_fillers: 是否过滤语气词
+        jobs: 并行工作进程（或线程）数
+        max_cer: CER 上限（阈值判定模式）
+        max_distance: 编辑距离上限（阈值判定模式）
+        segmented: 是否使用锚点分段对齐（长文本）
+        cache_file: 结果缓存（SQLite）路径，None 时不缓存
+        profiler: 性能剖析计时器，None 时不计时
+        executor: 并行执行方式，"process"（进程池）或 "thread"（线程池）
+        remote: 已连接的常驻评估服务会话，给出时顺序模式交给服务计算（结束时关闭）
+
+    Yields:
+        Optional[dict]: 计算结果，失败为 None
+    """
+    return _iter_task_results(text_pairs, _evaluate_text_task, tokenizer, filter_fillers,
+                              jobs, max_cer, max_distance, segmented, cache_file, profiler,
+                              executor, remote, batch_fn=_evaluate_text_tasks)
+
+
+def format_triage_cer(result: dict) -> str:
+    """格式化阈值判定模式下的 CER 显示"""
+    if result['over_threshold']:
+        return "超出阈值"
+    return f"{result['cer']:.4f}"
+
+
+def _warn_unmatched(count: int, samples: List[str], side: str, other_side: str):
+    print(f"警告: {count} 个{side}文件在{other_side}目录中没有同名文件，将被跳过: "
+          f"{', '.join(samples)}{'...' if count > len(samples) else ''}",
+          file=sys.stderr)
+
+
+def report_unmatched_files(pairing: DirectoryPairing):
+    """
+    报告未配对的文件（在配对遍历结束后调用）
+
+    Args:
+        pairing: 已遍历完毕的目录配对
+    """
+    if pairing.asr_only:
+        _warn_unmatched(pairing.asr_only, pairing.asr_only_samples, "ASR", "标注")
+    if pairing.ref_only:
+        _warn_unmatched(pairing.ref_only, pairing.ref_only_samples, "标注", "ASR")
+    if pairing.duplicates:
+        print(f"警告: {pairing.duplicates} 个文件与同目录下同名文件仅扩展名不同，"
+              f"已按扩展名优先级跳过", file=sys.stderr)
+    if not pairing.matched:
+        print("错误: ASR目录与标注目录之间没有同名文件可配对", file=sys.stderr)
+
+
+def _check_directories(*directories: str) -> bool:
+    """检查目录是否存在，不存在时报告错误"""
+    for directory in directories:
+        if not os.path.isdir(directory):
+            print(f"错误: 目录不存在: {directory}", file=sys.stderr)
+            return False
+    return True
+
+
+def iter_directory_pairs(asr_dir: str, ref_dir: str,
+                         extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+                         recursive: bool = False) -> Optional[Iterator[Tuple[str, str]]]:
+    """
+    边遍历目录边产出文件对，遍历结束后报告未配对的文件
+
+    开始计算前先取出第一对，确认存在可配对的文件
     
     Args:
         asr_dir: ASR文件目录
         ref_dir: 标注文件目录
-        tokenizer: 分词器名称
-        filter_fillers: 是否过滤语气词
-        output_file: 输出文件路径
-        output_format: 输出格式 (text/csv/json)
-        verbose: 是否显示详细信息
+        extensions: 参与配对的扩展名（按优先级）
+        recursive: 是否递归进入子目录（以相对路径配对）
         
     Returns:
-        List[dict]: 所有结果列表
+        Optional[Iterator[Tuple[str, str]]]: 惰性的 (ASR文件路径, 标注文件路径)，
+            目录不存在或没有可配对文件时返回 None
     """
-    asr_path = Path(asr_dir)
-    ref_path = Path(ref_dir)
-    
-    # 获取所有txt文件，建立 文件名(stem) → 完整路径 的映射
-    asr_map = {f.stem: f for f in sorted(asr_path.glob('*.txt'))}
-    ref_map = {f.stem: f for f in sorted(ref_path.glob('*.txt'))}
-    
-    # 按文件名取交集进行配对，保持排序
-    common_names = sorted(set(asr_map.keys()) & set(ref_map.keys()))
-    asr_only = sorted(set(asr_map.keys()) - set(ref_map.keys()))
-    ref_only = sorted(set(ref_map.keys()) - set(asr_map.keys()))
+    if not _check_directories(asr_dir, ref_dir):
+        return None
+    pairing = DirectoryPairing(asr_dir, ref_dir, extensions, recursive)
+    pairs = iter(pairing)
+    first = next(pairs, None)
+    if first is None:
+        report_unmatched_files(pairing)
+        return None
     
-    # 报告未配对的文件
-    if asr_only:
-        print(f"警告: {len(asr_only)} 个ASR文件在标注目录中没有同名文件，将被跳过: "
-              f"{', '.join(asr_only[:5])}{'...' if len(asr_only) > 5 else ''}",
+    def _pairs_then_report() -> Iterator[Tuple[str, str]]:
+        yield first
+        yield from pairs
+        report_unmatched_files(pairing)
+
+    return _pairs_then_report()
+
+
+def pair_directory_files(asr_dir: str, ref_dir: str,
+                         extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+                         recursive: bool = False) -> List[Tuple[str, str]]:
+    """
+    按文件名配对两个目录中的文本文件，并报告未配对的文件
+
+    递归模式下以"相对路径去掉扩展名"配对，如 asr/spk1/a.txt 与 ref/spk1/a.txt
+
+    Args:
+        asr_dir: ASR文件目录
+        ref_dir: 标注文件目录
+        extensions: 参与配对的扩展名（按优先级），默认只有 .txt
+        recursive: 是否递归进入子目录
+
+    Returns:
+        List[Tuple[str, str]]: 按配对键排序的 [(ASR文件路径, 标注文件路径), ...]
+    """
+    if not _check_directories(asr_dir, ref_dir):
+        return []
+    pairing = DirectoryPairing(asr_dir, ref_dir, extensions, recursive)
+    file_pairs = list(pairing)
+    report_unmatched_files(pairing)
+    return file_pairs
+
+
+def pair_manifest_entries(ref_manifest: str, hyp_manifest: str) -> List[Tuple[str, str, str]]:
+    """
+    读取参考清单与假设清单，按语句ID配对，并报告未配对的语句
+
+    Args:
+        ref_manifest: 参考清单路径（Kaldi text 或 JSONL）
+        hyp_manifest: 假设清单路径（Kaldi text 或 JSONL）
+
+    Returns:
+        List[Tuple[str, str, str]]: 按参考清单顺序的 [(语句ID, 参考文本, 假设文本), ...]，
+            读取失败时为空列表
+    """
+    try:
+        ref_entries = load_manifest(ref_manifest)
+        hyp_entries = load_manifest(hyp_manifest)
+    except (OSError, ValueError) as e:
+        print(f"错误: 读取清单失败: {str(e)}", file=sys.stderr)
+        return []
+
+    text_pairs, ref_only, hyp_only = join_manifests(ref_entries, hyp_entries)
+
+    if hyp_only:
+        print(f"警告: {len(hyp_only)} 条识别结果在参考清单中没有对应语句，将被跳过: "
+              f"{', '.join(hyp_only[:5])}{'...' if len(hyp_only) > 5 else ''}",
               file=sys.stderr)
     if ref_only:
-        print(f"警告: {len(ref_only)} 个标注文件在ASR目录中没有同名文件，将被跳过: "
+        print(f"警告: {len(ref_only)} 条参考语句在识别清单中没有对应结果，将被跳过: "
               f"{', '.join(ref_only[:5])}{'...' if len(ref_only) > 5 else ''}",
               file=sys.stderr)
-    
-    if not common_names:
-        print("错误: ASR目录与标注目录之间没有同名文件可配对", file=sys.stderr)
-        return []
-    
+
+    if not text_pairs:
+        print("错误: 参考清单与识别清单之间没有相同的语句ID可配对", file=sys.stderr)
+
+    return text_pairs
+
+
+def _print_batch_header(total: Optional[int], tokenizer: str, filter_fillers: bool, jobs: int,
+                        manifest: bool = False, executor: str = EXECUTOR_PROCESS):
+    """打印批处理开始信息（total 为 None 表示边遍历目录边处理，总数未知）"""
+    if manifest:
+        print(f"\n开始批处理，共{total}个语句对（按语句ID配对）...")
+    elif total is None:
+        print("\n开始批处理（按文件名配对，边遍历目录边处理）...")
+    else:
+        print(f"\n开始批处理，共{total}个文件对（按文件名配对）...")
+    print(f"分词器: {tokenizer}")
+    print(f"语气词过滤: {'启用' if filter_fillers else '禁用'}")
+    if jobs > 1:
+        print(f"并行{EXECUTOR_LABELS[executor]}数: {jobs}")
+    print("-" * 60)
+
+
+def _print_batch_summary(accumulator: CorpusAccumulator, over_files: List[str],
+                         triage: bool, succeeded: int, failed_count: int, total: int,
+                         manifest: bool = False):
+    """打印批处理汇总信息（阈值判定模式只列出超限文件）"""
+    unit = "语句对" if manifest else "文件对"
+    print("\n" + "=" * 60)
+    print("阈值判定完成！" if triage else "批处理完成！")
+    print("=" * 60)
+
+    print(f"成功处理: {succeeded}/{total}个{unit}")
+    if failed_count > 0:
+        print(f"失败: {failed_count}个{unit}")
+    if triage:
+        print(f"超出阈值: {len(over_files)}个{unit}")
+        for name in over_files:
+            print(f"  {name}")
+        return
+    print(f"平均CER: {accumulator.macro_cer:.4f}")
+    print(f"平均准确率: {accumulator.avg_accuracy:.4f}")
+    print(f"总体准确率: {accumulator.overall_accuracy:.4f}")
+    print(f"总错误: 替换={accumulator.substitutions}, "
+          f"删除={accumulator.deletions}, 插入={accumulator.insertions}")
+
+
+def _progress(index: int, total: Optional[int]) -> str:
+    return f"{index}/{total}" if total is not None else str(index)
+
+
+def collect_batch_results(pair_results: Iterable[Optional[dict]], total: Optional[int],
+                          tokenizer: str, filter_fillers: bool,
+                          output_file: Optional[str] = None,
+                          output_format: str = "text",
+                          verbose: bool = False,
+                          jobs: int = 1,
+                          manifest: bool = False,
+                          executor: str = EXECUTOR_PROCESS) -> List[dict]:
+    """
+    收集批处理结果、打印汇总并按格式保存
+
+    Args:
+        pair_results: 逐对结果（失败为 None）
+        total: 总对数，None 表示事先未知（以实际处理的对数为准）
+        tokenizer: 分词器名称
+        filter_fillers: 是否过滤语气词
+        output_file: 输出文件路径
+        output_format: 输出格式 (text/csv/json/jsonl/tsv)
+        verbose: 是否显示详细信息
+        jobs: 并行工作进程（或线程）数（仅用于显示）
+        manifest: 是否为清单输入（仅影响提示文字）
+        executor: 并行执行方式（仅用于显示）
+
+    Returns:
+        List[dict]: 所有结果列表
+    """
     results = []
+    accumulator = CorpusAccumulator()
     failed_count = 0
-    total = len(common_names)
     
     if output_format != "json":
-        print(f"\n开始批处理，共{total}个文件对（按文件名配对）...")
-        print(f"分词器: {tokenizer}")
-        print(f"语气词过滤: {'启用' if filter_fillers else '禁用'}")
-        print("-" * 60)
-    
-    for i, name in enumerate(common_names, 1):
-        asr_file = asr_map[name]
-        ref_file = ref_map[name]
+        _print_batch_header(total, tokenizer, filter_fillers, jobs, manifest, executor)
+
+    for i, result in enumerate(pair_results, 1):
         if verbose:
-            print(f"\n[{i}/{total}] ", end='')
-        
-        result = process_single_pair(
-            str(asr_file), str(ref_file),
-            tokenizer, filter_fillers, verbose
-        )
+            print(f"\n[{_progress(i, total)}] ", end='')
+            if result:
+                print_pair_result(result)
         
         if result:
             results.append(result)
+            if not is_triage_result(result):
+                accumulator.add_result(result)
         else:
             failed_count += 1
     
     # 统计总体结果（非 JSON 模式打印人类可读摘要）
     if results and output_format != "json":
-        print("\n" + "=" * 60)
-        print("批处理完成！")
-        print("=" * 60)
-        
-        avg_cer = sum(r['cer'] for r in results) / len(results)
-        avg_accuracy = sum(r['accuracy'] for r in results) / len(results)
-        total_subs = sum(r['substitutions'] for r in results)
-        total_dels = sum(r['deletions'] for r in results)
-        total_ins = sum(r['insertions'] for r in results)
-        
-        print(f"成功处理: {len(results)}/{total}个文件对")
-        if failed_count > 0:
-            print(f"失败: {failed_count}个文件对")
-        print(f"平均CER: {avg_cer:.4f}")
-        print(f"平均准确率: {avg_accuracy:.4f}")
-        print(f"总错误: 替换={total_subs}, 删除={total_dels}, 插入={total_ins}")
+        triage = is_triage_result(results[0])
+        over_files = [r['asr_file'] for r in results if triage and r['over_threshold']]
+        _print_batch_summary(accumulator, over_files, triage, len(results), failed_count,
+                             total if total is not None else len(results) + failed_count,
+                             manifest)
     
     # 保存结果到文件（所有格式统一处理，修复 JSON 模式不写文件的 bug）
     if results and output_file:
@@ -168,6 +894,159 @@ def batch_process_directory(asr_dir: str, ref_dir: str,
     return results
 
 
+def stream_batch_results(pair_results: Iterable[Optional[dict]], total: Optional[int],
+                         tokenizer: str, filter_fillers: bool,
+                         output_file: str,
+                         output_format: str = "jsonl",
+                         verbose: bool = False,
+                         jobs: int = 1,
+                         flush_every: int = DEFAULT_FLUSH_EVERY,
+                         manifest: bool = False,
+                         executor: str = EXECUTOR_PROCESS) -> dict:
+    """
+    流式写出批处理结果：每算完一对立即写出，不在内存中保留逐对结果
+
+    JSONL 在末尾追加一条 summary 记录，CSV / TSV 的汇总写到 .summary.json 旁路文件
+
+    Args:
+        pair_results: 逐对结果（失败为 None）
+        total: 总对数，None 表示事先未知（以实际处理的对数为准）
+        tokenizer: 分词器名称
+        filter_fillers: 是否过滤语气词
+        output_file: 输出文件路径
+        output_format: 输出格式 (jsonl/csv/tsv)
+        verbose: 是否显示详细信息
+        jobs: 并行工作进程（或线程）数（仅用于显示）
+        flush_every: 每写出多少条记录刷新一次缓冲
+        manifest: 是否为清单输入（仅影响提示文字）
+        executor: 并行执行方式（仅用于显示）
+
+    Returns:
+        dict: 汇总信息
+    """
+    failed_count = 0
+    over_files = []
+
+    _print_batch_header(total, tokenizer, filter_fillers, jobs, manifest, executor)
+
+    with StreamingResultWriter(output_file, output_format, flush_every) as writer:
+        for i, result in enumerate(pair_results, 1):
+            if verbose:
+                print(f"\n[{_progress(i, total)}] ", end='')
+                if result:
+                    print_pair_result(result)
+
+            if result:
+                writer.write(result)
+                if is_triage_result(result) and result['over_threshold']:
+                    over_files.append(result['asr_file'])
+            else:
+                failed_count += 1
+
+    if writer.count:
+        _print_batch_summary(writer.accumulator, over_files, writer.triage_limits is not None,
+                             writer.count, failed_count,
+                             total if total is not None else writer.count + failed_count, manifest)
+        print(f"\n结果已保存到: {output_file}")
+        if output_format != "jsonl":
+            print(f"汇总已保存到: {summary_sidecar_path(output_file)}")
+    return writer.summary()
+
+
+def batch_process_directory(asr_dir: str, ref_dir: str,
+                           tokenizer: str, filter_fillers: bool,
+                           output_file: Optional[str] = None,
+                           output_format: str = "text",
+                           verbose: bool = False,
+                           max_cer: Optional[float] = None,
+                           max_distance: Optional[int] = None,
+                           segmented: bool = False,
+                           jobs: int = 1,
+                           cache_file: Optional[str] = None,
+                           extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+                           recursive: bool = False,
+                           executor: str = EXECUTOR_PROCESS) -> List[dict]:
+    """
+    批处理目录中的文件
+
+    Args:
+        asr_dir: ASR文件目录
+        ref_dir: 标注文件目录
+        tokenizer: 分词器名称
+        filter_fillers: 是否过滤语气词
+        output_file: 输出文件路径
+        output_format: 输出格式 (text/csv/json/jsonl/tsv)
+        verbose: 是否显示详细信息
+        max_cer: CER 上限（阈值判定模式）
+        max_distance: 编辑距离上限（阈值判定模式）
+        segmented: 是否使用锚点分段对齐（长文本）
+        jobs: 并行工作进程（或线程）数（1 为串行）
+        cache_file: 结果缓存（SQLite）路径，None 时不缓存
+        extensions: 参与配对的扩展名（按优先级）
+        recursive: 是否递归进入子目录（以相对路径配对）
+        executor: 并行执行方式，"process"（进程池）或 "thread"（线程池）
+
+    Returns:
+        List[dict]: 所有结果列表
+    """
+    file_pairs = pair_directory_files(asr_dir, ref_dir, extensions, recursive)
+    if not file_pairs:
+        return []
+
+    pair_results = iter_pair_results(
+        file_pairs, tokenizer, filter_fillers, jobs=jobs,
+        max_cer=max_cer, max_distance=max_distance, segmented=segmented,
+        cache_file=cache_file, relative_to=(asr_dir, ref_dir) if recursive else None,
+        executor=executor
+    )
+    return collect_batch_results(pair_results, len(file_pairs), tokenizer, filter_fillers,
+                                 output_file, output_format, verbose, jobs, executor=executor)
+
+
+def stream_batch_directory(asr_dir: str, ref_dir: str,
+                           tokenizer: str, filter_fillers: bool,
+                           output_file: str,
+                           output_format: str = "jsonl",
+                           verbose: bool = False,
+                           max_cer: Optional[float] = None,
+                           max_distance: Optional[int] = None,
+                           segmented: bool = False,
+                           jobs: int = 1,
+                           flush_every: int = DEFAULT_FLUSH_EVERY,
+                           cache_file: Optional[str] = None,
+                           extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+                           recursive: bool = False,
+                           executor: str = EXECUTOR_PROCESS) -> Optional[dict]:
+    """
+    流式批处理目录中的文件，参数同 batch_process_directory
+
+    边遍历目录边计算和写出，不预先列出全部文件
+
+    Args:
+        flush_every: 每写出多少条记录刷新一次缓冲
+        cache_file: 结果缓存（SQLite）路径，None 时不缓存
+        extensions: 参与配对的扩展名（按优先级）
+        recursive: 是否递归进入子目录（以相对路径配对）
+        executor: 并行执行方式，"process"（进程池）或 "thread"（线程池）
+
+    Returns:
+        Optional[dict]: 汇总信息，没有可配对文件时返回 None
+    """
+    file_pairs = iter_directory_pairs(asr_dir, ref_dir, extensions, recursive)
+    if file_pairs is None:
+        return None
+
+    pair_results = iter_pair_results(
+        file_pairs, tokenizer, filter_fillers, jobs=jobs,
+        max_cer=max_cer, max_distance=max_distance, segmented=segmented,
+        cache_file=cache_file, relative_to=(asr_dir, ref_dir) if recursive else None,
+        executor=executor
+    )
+    return stream_batch_results(pair_results, None, tokenizer, filter_fillers,
+                                output_file, output_format, verbose, jobs, flush_every,
+                                executor=executor)
+
+
 def save_results(results: List[dict], output_file: str, output_format: str = "text"):
     """
     保存结果到文件，支持多种格式
@@ -175,13 +1054,17 @@ def save_results(results: List[dict], output_file: str, output_format: str = "te
     Args:
         results: 结果列表
         output_file: 输出文件路径
-        output_format: 输出格式 (text/csv/json)
+        output_format: 输出格式 (text/csv/json/jsonl/tsv)
     """
     if not results:
         print("没有结果可以保存")
         return
     
-    if output_format == "json" or output_file.endswith('.json'):
+    if output_format in ("jsonl", "tsv"):
+        # 流式格式：逐条写出，汇总作为尾记录或旁路文件
+        with StreamingResultWriter(output_file, output_format) as writer:
+            writer.write_all(results)
+    elif output_format == "json" or output_file.endswith('.json'):
         save_results_to_json(results, output_file)
     elif output_format == "csv" or output_file.endswith('.csv'):
         save_results_to_csv(results, output_file)
@@ -197,18 +1080,28 @@ def save_results_to_json(results: List[dict], output_file: str):
         results: 结果列表
         output_file: 输出文件路径
     """
+    if is_triage_result(results[0]):
+        summary = {
+            "total_pairs": len(results),
+            "over_threshold": sum(1 for r in results if r['over_threshold']),
+            "max_cer": results[0]['max_cer'],
+            "max_distance": results[0]['max_distance'],
+        }
+        output = {
+            "tool": "CER-Analysis-Tool",
+            "version": __version__,
+            "summary": summary,
+            "results": results,
+        }
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        return
+
     # 构建可序列化的输出
     output = {
         "tool": "CER-Analysis-Tool",
         "version": __version__,
-        "summary": {
-            "total_pairs": len(results),
-            "avg_cer": sum(r['cer'] for r in results) / len(results),
-            "avg_accuracy": sum(r['accuracy'] for r in results) / len(results),
-            "total_substitutions": sum(r['substitutions'] for r in results),
-            "total_deletions": sum(r['deletions'] for r in results),
-            "total_insertions": sum(r['insertions'] for r in results),
-        },
+        "summary": CorpusAccumulator.from_results(results).summary(),
         "results": results,
     }
     
@@ -224,13 +1117,7 @@ def save_results_to_csv(results: List[dict], output_file: str):
         results: 结果列表
         output_file: 输出文件路径
     """
-    fieldnames = [
-        'asr_file', 'ref_file', 'tokenizer',
-        'cer', 'wer', 'accuracy',
-        'substitutions', 'deletions', 'insertions',
-        'ref_length', 'hyp_length',
-        'filter_fillers'
-    ]
+    fieldnames = TRIAGE_FIELDNAMES if is_triage_result(results[0]) else RESULT_FIELDNAMES
     
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
@@ -248,6 +1135,18 @@ def save_results_to_txt(results: List[dict], output_file: str):
         results: 结果列表
         output_file: 输出文件路径
     """
+    if is_triage_result(results[0]):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write("ASR文件\t标注文件\t分词器\tCER\t超出阈值\t过滤语气词\n")
+            for result in results:
+                f.write(f"{result['asr_file']}\t"
+                       f"{result['ref_file']}\t"
+                       f"{result['tokenizer']}\t"
+                       f"{format_triage_cer(result)}\t"
+                       f"{'是' if result['over_threshold'] else '否'}\t"
+                       f"{'是' if result['filter_fillers'] else '否'}\n")
+        return
+
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write("ASR文件\t标注文件\t分词器\tCER\t准确率\t替换\t删除\t插入\t过滤语气词\n")
         
@@ -263,6 +1162,34 @@ def save_results_to_txt(results: List[dict], output_file: str):
                    f"{'是' if result['filter_fillers'] else '否'}\n")
 
 
+def enable_jieba_parallel(processes: int) -> bool:
+    """
+    启用 jieba 多进程批量分词（分词器由工厂单例共享，之后创建的会话直接使用）
+
+    Args:
+        processes: 进程数
+
+    Returns:
+        bool: 是否已启用；失败时报告警告并继续单进程分词
+    """
+    try:
+        tokenizer = get_tokenizer('jieba')
+        if not isinstance(tokenizer, JiebaTokenizer):
+            return False
+        tokenizer.enable_parallel(processes)
+        return True
+    except TokenizerError as e:
+        print(f"警告: {str(e)}，改为单进程分词", file=sys.stderr)
+        return False
+
+
+def print_profile_report(profiler: Optional[StageProfiler], started: float):
+    """启用 --profile 时把性能剖析报告输出到 stderr（不干扰 stdout 上的 JSON）"""
+    if profiler is None:
+        return
+    print("\n" + profiler.format_report(time.perf_counter() - started), file=sys.stderr)
+
+
 def list_tokenizers():
     """列出可用的分词器"""
     print("\n可用的分词器:")
@@ -270,8 +1197,9 @@ def list_tokenizers():
     
     available = get_available_tokenizers()
     
+    # 只探测依赖与版本，不加载模型
     for name in available:
-        info = get_tokenizer_info(name)
+        info = get_tokenizer_metadata(name)
         status = "✓" if info.get('available') else "✗"
         version = info.get('version', 'unknown')
         desc = info.get('description', '')
@@ -283,6 +1211,11 @@ def list_tokenizers():
 
 def main():
     """主函数 - CLI入口"""
+    # cer-tool serve：常驻评估服务（按需导入，不支持 Unix 域套接字的平台上其余功能不受影响）
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from cer_tool.server import server_main
+        return server_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser(
         prog='cer-tool',
         description='CER-Analysis-Tool - 中文字准确率分析工具（命令行版本）',
@@ -298,11 +1231,34 @@ def main():
   # 批量处理目录
   cer-tool --asr-dir ./asr_files --ref-dir ./ref_files --output results.csv
   
+  # 阈值判定：只找出 CER 超过 30% 的文件对
+  cer-tool --asr-dir ./asr_files --ref-dir ./ref_files --max-cer 0.3
+
+  # 批量处理，使用 8 个进程并行
+  cer-tool --asr-dir ./asr_files --ref-dir ./ref_files --jobs 8
+
   # 批量处理并输出JSON
   cer-tool --asr-dir ./asr_files --ref-dir ./ref_files --output results.json --format json
   
-  # 列出可用分词器
+  # 大批量流式输出：逐对写出 JSONL，末尾追加汇总记录
+  cer-tool --asr-dir ./asr_files --ref-dir ./ref_files --output results.jsonl --format jsonl
+
+  # 分片目录：递归遍历子目录，按相对路径配对
+  cer-tool --asr-dir ./asr_tree --ref-dir ./ref_tree --recursive --ext .txt,.lab
+
+  # 清单输入：Kaldi text 或 JSONL，按语句ID配对
+  cer-tool --ref-manifest ref.text --hyp-manifest hyp.text --output results.jsonl --format jsonl
+
+  # 使用结果缓存：再次运行时只重新计算有变化的文件对
+  cer-tool --asr-dir ./asr_files --ref-dir ./ref_files --cache cer_cache.sqlite
+
+  # 常驻评估服务：分词器只加载一次，之后的调用通过 --server auto 使用
+  cer-tool serve --preload hanlp &
+  cer-tool --asr asr.txt --ref ref.txt --tokenizer hanlp --server auto
+
+  # 列出可用分词器（--refresh-tokenizers 重新检测之前初始化失败的分词器）
   cer-tool --list-tokenizers
+  cer-tool --list-tokenizers --refresh-tokenizers
         """
     )
     
@@ -315,6 +1271,14 @@ def main():
     parser.add_argument('--ref', type=str, help='标注文件路径')
     parser.add_argument('--asr-dir', type=str, help='ASR文件目录（批处理模式）')
     parser.add_argument('--ref-dir', type=str, help='标注文件目录（批处理模式）')
+    parser.add_argument('--recursive', action='store_true',
+                       help='递归遍历子目录，按相对路径（不含扩展名）配对文件')
+    parser.add_argument('--ext', type=str, default=','.join(DEFAULT_EXTENSIONS),
+                       help=f'参与配对的文件扩展名，逗号分隔，靠前的优先 (默认: {",".join(DEFAULT_EXTENSIONS)})')
+    parser.add_argument('--ref-manifest', type=str,
+                       help='参考文本清单（Kaldi text "utt-id 文本" 或 JSONL），按语句ID配对')
+    parser.add_argument('--hyp-manifest', type=str,
+                       help='识别结果清单（Kaldi text "utt-id 文本" 或 JSONL），按语句ID配对')
     
     # 分词器选项
     parser.add_argument('--tokenizer', type=str, default='jieba',
@@ -322,6 +1286,8 @@ def main():
                        help='选择分词器 (默认: jieba)')
     parser.add_argument('--list-tokenizers', action='store_true',
                        help='列出所有可用的分词器')
+    parser.add_argument('--refresh-tokenizers', action='store_true',
+                       help='清除分词器探测缓存，重新检测之前初始化失败的分词器')
     
     # 处理选项
     parser.add_argument('--filter-fillers', action='store_true',
@@ -331,13 +1297,74 @@ def main():
     parser.add_argument('--output', '-o', type=str,
                        help='输出文件路径（支持 .csv/.txt/.json 格式）')
     parser.add_argument('--format', '-f', type=str, default='text',
-                       choices=['text', 'csv', 'json'],
-                       help='输出格式 (默认: text)')
+                       choices=['text', 'csv', 'json', 'jsonl', 'tsv'],
+                       help='输出格式 (默认: text)；jsonl/tsv 在批处理时逐对流式写出')
+    parser.add_argument('--stream', action='store_true',
+                       help='批处理结果逐对流式写出（jsonl/csv/tsv），内存占用不随文件对数量增长')
+    parser.add_argument('--flush-every', type=int, default=DEFAULT_FLUSH_EVERY,
+                       help=f'流式写出时每多少条记录刷新一次缓冲 (默认: {DEFAULT_FLUSH_EVERY})')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='显示详细处理信息')
     
+    # 阈值判定选项
+    parser.add_argument('--max-cer', type=float, default=None,
+                       help='CER 上限：只判定是否超限，超限时提前结束计算')
+    parser.add_argument('--max-distance', type=int, default=None,
+                       help='编辑距离上限：只判定是否超限，超限时提前结束计算')
+
+    # 并行选项
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='批处理并行工作数（进程或线程，见 --executor），'
+                            '0 表示使用全部 CPU 核心 (默认: 1)')
+
+    parser.add_argument('--executor', choices=EXECUTORS, default=EXECUTOR_PROCESS,
+                       help='并行执行方式：process 每个进程各加载一份分词器；'
+                            'thread 各线程共享同一个分词器，内存占用小 (默认: process)')
+
+    parser.add_argument('--prefetch', type=int, default=PREFETCH_WORKERS,
+                       help=f'串行批处理时预读文件的线程数，0 表示不预读 (默认: {PREFETCH_WORKERS})')
+
+    parser.add_argument('--jieba-processes', type=int, default=0, metavar='N',
+                       help='串行批处理时 jieba 批量分词（如 --filter-fillers）使用的进程数，'
+                            '0 表示不启用多进程模式 (默认: 0)')
+
+    # 缓存选项
+    parser.add_argument('--cache', type=str, default=None, metavar='PATH',
+                       help='结果缓存文件（SQLite）：未变化的文本对直接读取缓存，中断的批处理可续跑')
+
+    # 性能剖析选项
+    parser.add_argument('--profile', action='store_true',
+                       help='输出分阶段性能剖析报告（读取、各预处理步骤、对齐的耗时与吞吐率）到 stderr')
+
+    # 长文本选项
+    parser.add_argument('--segmented', action='store_true',
+                       help='锚点分段对齐：长而相似的文本（讲座、播客）只对齐锚点间的空隙')
+
+    # 常驻服务选项
+    parser.add_argument('--server', choices=['auto', 'off'], default='off',
+                       help='auto: 评估服务（cer-tool serve）在运行时交给服务计算，'
+                            '否则本地计算 (默认: off)')
+    parser.add_argument('--socket', type=str, default=None, metavar='PATH',
+                       help='评估服务的套接字路径 (默认: 与 cer-tool serve 相同)')
+
     args = parser.parse_args()
     
+    profiler = StageProfiler() if args.profile else None
+    started = time.perf_counter()
+
+    if bool(args.ref_manifest) != bool(args.hyp_manifest):
+        parser.error("--ref-manifest 与 --hyp-manifest 需要同时指定")
+
+    if args.stream and args.format not in STREAM_FORMATS:
+        parser.error(f"--stream 仅支持以下格式: {', '.join(STREAM_FORMATS)}")
+
+    # 清除探测缓存（如离线下载模型失败后已联网）
+    if args.refresh_tokenizers:
+        clear_probe_cache()
+        if not (args.list_tokenizers or args.asr or args.asr_dir or args.ref_manifest):
+            print("分词器探测缓存已清除")
+            return 0
+
     # 列出分词器
     if args.list_tokenizers:
         list_tokenizers()
@@ -349,11 +1376,24 @@ def main():
             print("\n单文件对比模式")
             print("=" * 60)
         
+        # 评估服务在运行时交给服务计算（分词器已在服务进程中加载）
+        session: Optional[AnySession] = None
+        if args.server == 'auto':
+            session = _connect_server(args, profiler)
+        if session is None and (args.cache or profiler is not None):
+            session = EvaluationSession(args.tokenizer, args.filter_fillers,
+                                        segmented=args.segmented, max_cer=args.max_cer,
+                                        max_distance=args.max_distance, cache_file=args.cache,
+                                        profiler=profiler)
         result = process_single_pair(
             args.asr, args.ref,
             args.tokenizer, args.filter_fillers,
-            verbose=args.verbose
+            verbose=args.verbose,
+            max_cer=args.max_cer, max_distance=args.max_distance,
+            segmented=args.segmented, session=session
         )
+        if session is not None:
+            session.close()
         
         if result is None:
             return 1
@@ -368,6 +1408,12 @@ def main():
         if args.format == "json" and not args.output:
             # JSON 无文件：打印到 stdout
             print(json.dumps(result, ensure_ascii=False, indent=2))
+        elif args.format == "jsonl" and not args.output:
+            print(json.dumps(result, ensure_ascii=False))
+        elif args.format != "json" and is_triage_result(result):
+            print(f"\n处理: {result['asr_file']} <-> {result['ref_file']}")
+            print(f"  分词器:  {result.get('tokenizer', 'jieba')}")
+            print(f"  CER:     {format_triage_cer(result)}")
         elif args.format != "json":
             # 默认 text 模式：始终打印结果到终端
             print(f"\n处理: {result['asr_file']} <-> {result['ref_file']}")
@@ -380,14 +1426,63 @@ def main():
             print(f"  参考长度: {result['ref_length']}, "
                   f"假设长度: {result['hyp_length']}")
         
+        print_profile_report(profiler, started)
         return 0
     
-    # 批处理模式
-    elif args.asr_dir and args.ref_dir:
-        results = batch_process_directory(
-            args.asr_dir, args.ref_dir,
-            args.tokenizer, args.filter_fillers,
-            args.output, args.format, args.verbose
+    # 批处理模式（目录按文件名配对，或清单按语句ID配对）
+    elif (args.asr_dir and args.ref_dir) or (args.ref_manifest and args.hyp_manifest):
+        streaming = args.stream or args.format in ("jsonl", "tsv")
+        if streaming and not args.output:
+            parser.error("流式写出需要通过 --output 指定输出文件")
+
+        manifest = bool(args.ref_manifest and args.hyp_manifest)
+        if manifest:
+            tasks = pair_manifest_entries(args.ref_manifest, args.hyp_manifest)
+            if not tasks:
+                return 1
+        else:
+            # 边遍历目录边处理，总数事先未知
+            tasks = iter_directory_pairs(args.asr_dir, args.ref_dir,
+                                         args.ext.split(','), args.recursive)
+            if tasks is None:
+                return 1
+
+        # 评估服务在运行时交给服务计算（分词器已在服务进程中加载，不再启动本地进程池）
+        remote = _connect_server(args, profiler) if args.server == 'auto' else None
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        if remote is not None:
+            jobs = 1
+        elif jobs <= 1 and args.jieba_processes > 0 and args.tokenizer == 'jieba':
+            enable_jieba_parallel(args.jieba_processes)
+        session_options = dict(
+            jobs=jobs, max_cer=args.max_cer, max_distance=args.max_distance,
+            segmented=args.segmented, cache_file=args.cache, profiler=profiler,
+            executor=args.executor, remote=remote
+        )
+        if manifest:
+            total = len(tasks)
+            pair_results = iter_manifest_results(tasks, args.tokenizer, args.filter_fillers,
+                                                 **session_options)
+        else:
+            total = None
+            relative_to = (args.asr_dir, args.ref_dir) if args.recursive else None
+            pair_results = iter_pair_results(tasks, args.tokenizer, args.filter_fillers,
+                                             prefetch=args.prefetch, relative_to=relative_to,
+                                             **session_options)
+
+        if streaming:
+            summary = stream_batch_results(
+                pair_results, total, args.tokenizer, args.filter_fillers,
+                args.output, args.format, args.verbose, jobs,
+                flush_every=args.flush_every, manifest=manifest, executor=args.executor
+            )
+            print_profile_report(profiler, started)
+            return 0 if summary['total_pairs'] else 1
+
+        results = collect_batch_results(
+            pair_results, total, args.tokenizer, args.filter_fillers,
+            args.output, args.format, args.verbose, jobs, manifest=manifest,
+            executor=args.executor
         )
         
         # JSON 无文件输出时打印到 stdout
@@ -399,6 +1494,7 @@ def main():
             }
             print(json.dumps(output, ensure_ascii=False, indent=2))
         
+        print_profile_report(profiler, started)
         if not results:
             return 1
         return 0
@@ -5,7 +5,91 @@
 从 CLI 和 GUI 中提取的重复逻辑
 """
 
-from typing import List
+import codecs
+import locale
+import os
+from typing import Dict, List, Optional, Tuple
+
+# 默认尝试的编码（按优先级）
+DEFAULT_ENCODINGS = ('utf-8', 'gbk', 'gb2312', 'gb18030')
+
+# 字节序标记 → 编码（UTF-32 的 BOM 以 UTF-16 的 BOM 开头，需先检查）
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+# 目录 → 该目录上一次成功解码所用的编码
+# （同一来源的文件通常编码一致；dict 的单次读写是原子操作，预读线程可并发访问）
+_directory_encodings: Dict[str, str] = {}
+
+
+def clear_encoding_cache() -> None:
+    """清空按目录记忆的编码"""
+    _directory_encodings.clear()
+
+
+def _strip_bom(data: bytes) -> Tuple[bytes, Optional[str]]:
+    """去除字节序标记，返回 (剩余字节, BOM 对应的编码或 None)"""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data[len(bom):], encoding
+    return data, None
+
+
+def _is_candidate(encoding: str, encodings: List[str]) -> bool:
+    """encoding 是否在显式候选编码列表中（按规范化的编码名比较）"""
+    name = codecs.lookup(encoding).name
+    return any(codecs.lookup(candidate).name == name for candidate in encodings)
+
+
+def decode_with_encodings(data: bytes,
+                          encodings: Optional[List[str]] = None,
+                          preferred: Optional[str] = None) -> Tuple[str, str]:
+    """
+    在内存中按候选编码依次解码字节内容
+
+    有 BOM 时直接使用 BOM 指定的编码；否则 UTF-8 始终最先尝试
+    （UTF-8 校验严格，遇到非法字节立即失败，而 GBK 能把大多数 UTF-8 字节序列解成乱码），
+    其后是 preferred，再其后是其余候选编码与系统默认编码
+
+    Args:
+        data (bytes): 文件的原始字节
+        encodings (List[str]): 候选编码列表，默认 UTF-8 → GBK → GB2312 → GB18030
+        preferred (Optional[str]): 优先尝试的编码（如同目录上一个文件的编码）
+
+    Returns:
+        Tuple[str, str]: (解码后的文本, 使用的编码)
+
+    Raises:
+        UnicodeDecodeError: 所有候选编码都解码失败（异常为最后一次的解码错误）
+    """
+    data, bom_encoding = _strip_bom(data)
+    if bom_encoding is not None:
+        return data.decode(bom_encoding), bom_encoding
+
+    candidates = list(encodings or DEFAULT_ENCODINGS)
+    if preferred:
+        head = 1 if candidates and codecs.lookup(candidates[0]).name == 'utf-8' else 0
+        candidates.insert(head, preferred)
+    candidates.append(locale.getpreferredencoding(False))
+
+    tried = set()
+    last_error: Optional[UnicodeDecodeError] = None
+    for encoding in candidates:
+        name = codecs.lookup(encoding).name
+        if name in tried:
+            continue
+        tried.add(name)
+        try:
+            return data.decode(encoding), encoding
+        except UnicodeDecodeError as e:
+            last_error = e
+    assert last_error is not None
+    raise last_error
 
 
 def read_file_with_encodings(file_path: str, 
@@ -13,36 +97,39 @@ def read_file_with_encodings(file_path: str,
     """
     使用多种编码方式读取文件内容
     支持常见的中文编码格式，自动检测最适合的编码
+
+    文件只读取一次：先检查 BOM，再在内存中依次尝试候选编码；
+    成功的编码按所在目录记忆，同目录的后续文件优先尝试该编码
     
     Args:
         file_path (str): 文件路径
         encodings (List[str]): 尝试的编码列表，默认 UTF-8 → GBK → GB2312 → GB18030
         
     Returns:
-        str: 文件内容（已去除首尾空白）
+        str: 文件内容（已去除首尾空白，换行统一为 \\n）
         
     Raises:
         Exception: 如果所有编码方式都失败则抛出异常
     """
     if encodings is None:
-        encodings = ['utf-8', 'gbk', 'gb2312', 'gb18030']
-    
-    errors = []
-    
-    for encoding in encodings:
-        try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read().strip()
-        except UnicodeDecodeError as e:
-            errors.append(f"{encoding}: {e}")
-            continue
-    
-    # 最后尝试系统默认编码
+        encodings = list(DEFAULT_ENCODINGS)
+
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    directory = os.path.dirname(os.path.abspath(file_path))
     try:
-        with open(file_path, 'r') as f:
-            return f.read().strip()
-    except Exception as e:
+        text, encoding = decode_with_encodings(data, encodings,
+                                               preferred=_directory_encodings.get(directory))
+    except UnicodeDecodeError as e:
         raise Exception(
             f"无法读取文件 {file_path}，尝试的编码: {', '.join(encodings)}。"
             f"最后错误: {str(e)}"
         )
+    # BOM 只说明本文件的编码；系统默认编码（如 cp1252、latin-1）几乎能解码任何字节，
+    # 记住它会让同目录的 GBK 文件在 GBK 之前被它解成乱码——两者都不作为同目录其他文件的依据
+    if _strip_bom(data)[1] is None and _is_candidate(encoding, encodings):
+        _directory_encodings[directory] = encoding
+
+    # 与文本模式读取一致：统一换行符
+    return text.replace('\r\n', '\n').replace('\r', '\n').strip()
@@ -21,27 +21,23 @@ import os
 import csv
 from pathlib import Path
 from functools import partial
+from itertools import islice
 import threading
 import queue
 
-# 导入重构后的ASRMetrics类和分词器模块
-from cer_tool.metrics import ASRMetrics
-from cer_tool.tokenizers import get_available_tokenizers, get_tokenizer_info, get_cached_tokenizer_info
+# 导入评估会话和分词器模块
+from cer_tool.session import EvaluationSession
+# calculate_overall_accuracy 已移至 aggregation 模块，此处保留导入以兼容 cer_tool.gui 旧导入路径
+from cer_tool.aggregation import CorpusAccumulator, calculate_overall_accuracy  # noqa: F401
+from cer_tool.tokenizers import (
+    TokenizerFactory, clear_probe_cache, get_available_tokenizers, get_cached_tokenizer_info,
+    get_tokenizer_metadata,
+)
 from cer_tool.file_utils import read_file_with_encodings
+from cer_tool.prefetch import prefetch_file_pairs
 
-
-def calculate_overall_accuracy(total_errors: int, total_ref_chars: int) -> float:
-    """
-    计算总体准确率，处理零参考字数边界。
-
-    规则与明细一致：
-    - total_ref_chars > 0: 1 - (total_errors / total_ref_chars)
-    - total_ref_chars == 0 且 total_errors == 0: 1.0
-    - total_ref_chars == 0 且 total_errors > 0: 0.0
-    """
-    if total_ref_chars > 0:
-        return 1.0 - (total_errors / total_ref_chars)
-    return 1.0 if total_errors == 0 else 0.0
+# 后台计算每批对齐的文件对数量（较小的批次保证取消操作及时响应）
+ALIGN_BATCH_SIZE = 16
 
 
 def build_file_pairs_by_stem(asr_files, ref_files):
@@ -111,9 +107,10 @@ class CERAnalysisTool:
         self.ref_files = []  # 标注文件列表
         self.file_pairs = []  # 文件配对信息
         self.results = []  # 计算结果列表
+        self.accumulator = CorpusAccumulator()  # 汇总统计，随结果逐条累加
         
-        # 性能优化：缓存ASRMetrics实例，避免重复创建
-        self.asr_metrics_cache = {}
+        # 性能优化：按分词器缓存评估会话，避免重复加载分词器
+        self.session_cache = {}
 
         # 创建主框架分为上下两部分
         self.top_frame = ttk.Frame(root)
@@ -477,17 +474,20 @@ class CERAnalysisTool:
         """
         更新分词器状态显示
         检查当前选中分词器的可用性和版本信息，更新状态标签
+        （只读取元数据，不在界面线程中初始化分词器，也不等待后台线程的加载）
         """
         tokenizer_name = self.selected_tokenizer.get()
         try:
-            info = get_tokenizer_info(tokenizer_name)
+            info = get_tokenizer_metadata(tokenizer_name)
             hint_text = ""
 
             if info.get('available', False):
                 version = info.get('version', 'unknown')
                 status_text = f"✓ {tokenizer_name} (v{version})"
-                if tokenizer_name in self.asr_metrics_cache:
+                if tokenizer_name in self.session_cache:
                     status_text += " [已缓存]"
+                elif TokenizerFactory.is_loading(tokenizer_name):
+                    status_text += " [加载中]"
                 self.tokenizer_status_label.config(
                     text=status_text,
                     foreground="green"
@@ -523,16 +523,18 @@ class CERAnalysisTool:
     def clear_tokenizer_cache(self):
         """
         清理分词器缓存
-        释放内存，清除所有已缓存的分词器实例
+        释放内存，清除所有已缓存的分词器实例与探测缓存（之前初始化失败的分词器重新检测）
 
         Returns:
             tuple: (是否成功, 错误信息)
         """
-        self.asr_metrics_cache.clear()
+        for session in self.session_cache.values():
+            session.close()
+        self.session_cache.clear()
 
         try:
-            from cer_tool.tokenizers.factory import TokenizerFactory
             TokenizerFactory.clear_cache()
+            clear_probe_cache()
             success = True
             error_msg = ""
         except Exception as e:
@@ -562,23 +564,23 @@ class CERAnalysisTool:
             # 🔧 修复: 优先使用工厂类的缓存信息获取方法
             info = get_cached_tokenizer_info(tokenizer_name)
             
-            # 如果工厂类缓存中没有，再检查ASRMetrics缓存
-            if info is None and tokenizer_name in self.asr_metrics_cache:
+            # 如果工厂类缓存中没有，再检查评估会话缓存
+            if info is None and tokenizer_name in self.session_cache:
                 try:
-                    cached_metrics = self.asr_metrics_cache[tokenizer_name]
-                    info = cached_metrics.get_tokenizer_info()
+                    cached_session = self.session_cache[tokenizer_name]
+                    info = cached_session.metrics.get_tokenizer_info()
                     info['initialized'] = True
                     info['available'] = True
                     info['cached'] = True
-                    print(f"从ASRMetrics缓存获取{tokenizer_name}分词器信息")
+                    print(f"从评估会话缓存获取{tokenizer_name}分词器信息")
                 except Exception as e:
-                    print(f"从ASRMetrics缓存获取信息失败: {str(e)}")
+                    print(f"从评估会话缓存获取信息失败: {str(e)}")
                     info = None
             
-            # 如果都没有缓存，则从工厂类获取（可能会触发初始化）
+            # 如果都没有缓存，则读取元数据（不触发初始化，也不等待正在进行的加载）
             if info is None:
-                info = get_tokenizer_info(tokenizer_name)
-                print(f"从工厂类重新获取{tokenizer_name}分词器信息")
+                info = get_tokenizer_metadata(tokenizer_name)
+                print(f"从工厂类获取{tokenizer_name}分词器元数据")
             else:
                 print(f"使用缓存的{tokenizer_name}分词器信息")
             
@@ -612,7 +614,7 @@ class CERAnalysisTool:
             init_status = "成功" if info.get('initialized', False) else "失败"
             if info.get('cached', False):
                 init_status += " [已缓存]"
-            elif tokenizer_name in self.asr_metrics_cache:
+            elif tokenizer_name in self.session_cache:
                 init_status += " [ASR已缓存]"
             info_text += f"初始化状态: {init_status}\n"
             
@@ -847,6 +849,7 @@ class CERAnalysisTool:
             self.result_tree.delete(item)
         self.result_item_map.clear()
         self.results = []
+        self.accumulator = CorpusAccumulator()
         self.current_result = None
         self.update_detail_views(None)
         self.row_summary_var.set("请选择一条结果查看详情")
@@ -957,55 +960,66 @@ class CERAnalysisTool:
         """
         try:
             # 初始化分词器
-            if tokenizer_name not in self.asr_metrics_cache:
+            if tokenizer_name not in self.session_cache:
                 self.result_queue.put(('status', f"正在加载{tokenizer_name}分词器..."))
-                self.asr_metrics_cache[tokenizer_name] = ASRMetrics(tokenizer_name=tokenizer_name)
+                self.session_cache[tokenizer_name] = EvaluationSession(tokenizer_name=tokenizer_name)
             
-            asr_metrics = self.asr_metrics_cache[tokenizer_name]
+            session = self.session_cache[tokenizer_name]
             
-            # 逐对处理文件
-            for index, (asr_file, ref_file) in enumerate(file_pairs, start=1):
-                # 检查是否被取消
+            # 后台线程池预读后续文件，读取与计算重叠进行；
+            # 读取成功的文件对按批对齐（依赖分词器的预处理步骤整批调用分词器）
+            prefetched = prefetch_file_pairs(file_pairs, read=self.read_file_with_multiple_encodings)
+            index = 0
+            while True:
+                # 检查是否被取消（关闭预读生成器会取消尚未开始的读取）
                 if self.cancel_event.is_set():
+                    prefetched.close()
                     self.result_queue.put(('cancelled', None))
                     return
                 
-                try:
-                    # 读取文件
-                    asr_text = self.read_file_with_multiple_encodings(asr_file)
-                    ref_text = self.read_file_with_multiple_encodings(ref_file)
-                    
-                    # 计算指标
-                    metrics = asr_metrics.calculate_detailed_metrics(ref_text, asr_text, filter_fillers)
-                    diff_ref, diff_hyp = asr_metrics.highlight_errors(ref_text, asr_text, filter_fillers)
-                    diff_sequence = asr_metrics.show_differences(ref_text, asr_text, filter_fillers)
-                    
-                    # 构建结果
-                    result = {
-                        "asr_file": os.path.basename(asr_file),
-                        "ref_file": os.path.basename(ref_file),
-                        "asr_chars": metrics['hyp_length'],
-                        "ref_chars": metrics['ref_length'],
-                        "accuracy": metrics['accuracy'],
-                        "details": metrics,
-                        "filter_fillers": filter_fillers,
-                        "tokenizer": metrics.get('tokenizer', tokenizer_name),
-                        "diff_reference": diff_ref,
-                        "diff_hypothesis": diff_hyp,
-                        "diff_sequence": diff_sequence
-                    }
-                    
-                    # 发送进度和结果
-                    self.result_queue.put(('progress', index, total_pairs, result, None))
-                    
-                except Exception as e:
-                    # 发送错误信息（但不中断处理）
-                    error_info = {
-                        'asr_file': os.path.basename(asr_file),
-                        'ref_file': os.path.basename(ref_file),
-                        'error': str(e)
-                    }
-                    self.result_queue.put(('progress', index, total_pairs, None, error_info))
+                chunk = list(islice(prefetched, ALIGN_BATCH_SIZE))
+                if not chunk:
+                    break
+                alignments = self._align_chunk(session, chunk, filter_fillers)
+                for (asr_file, ref_file, texts, read_error), alignment in zip(chunk, alignments):
+                    index += 1
+                    try:
+                        if read_error is not None:
+                            raise read_error
+                        if isinstance(alignment, Exception):
+                            raise alignment
+
+                        # 单次预处理+对齐，指标、高亮与差异序列共享同一份对齐结果
+                        metrics = alignment.to_metrics()
+                        diff_ref, diff_hyp = alignment.highlighted
+                        diff_sequence = alignment.diff_sequence
+
+                        # 构建结果
+                        result = {
+                            "asr_file": os.path.basename(asr_file),
+                            "ref_file": os.path.basename(ref_file),
+                            "asr_chars": metrics['hyp_length'],
+                            "ref_chars": metrics['ref_length'],
+                            "accuracy": metrics['accuracy'],
+                            "details": metrics,
+                            "filter_fillers": filter_fillers,
+                            "tokenizer": metrics.get('tokenizer', tokenizer_name),
+                            "diff_reference": diff_ref,
+                            "diff_hypothesis": diff_hyp,
+                            "diff_sequence": diff_sequence
+                        }
+
+                        # 发送进度和结果
+                        self.result_queue.put(('progress', index, total_pairs, result, None))
+
+                    except Exception as e:
+                        # 发送错误信息（但不中断处理）
+                        error_info = {
+                            'asr_file': os.path.basename(asr_file),
+                            'ref_file': os.path.basename(ref_file),
+                            'error': str(e)
+                        }
+                        self.result_queue.put(('progress', index, total_pairs, None, error_info))
             
             # 所有文件处理完成
             self.result_queue.put(('complete', None))
@@ -1014,6 +1028,36 @@ class CERAnalysisTool:
             # 严重错误（如分词器初始化失败）
             self.result_queue.put(('error', str(e)))
     
+    def _align_chunk(self, session, chunk, filter_fillers):
+        """
+        对一批预读结果中读取成功的文件对整批对齐
+
+        整批对齐出错时逐对重新对齐，出错的文件对位置上为异常对象
+
+        Args:
+            session: 评估会话
+            chunk: 预读结果列表 [PrefetchedPair, ...]
+            filter_fillers: 是否过滤语气词
+
+        Returns:
+            list: 与 chunk 一一对应的对齐结果；读取失败为 None，对齐失败为异常对象
+        """
+        indices = [i for i, item in enumerate(chunk) if item.error is None]
+        pairs = [(chunk[i].texts[1], chunk[i].texts[0]) for i in indices]
+        alignments = [None] * len(chunk)
+        try:
+            aligned = session.align_batch(pairs, filter_fillers) if pairs else []
+        except Exception:
+            aligned = []
+            for ref_text, asr_text in pairs:
+                try:
+                    aligned.append(session.align(ref_text, asr_text, filter_fillers))
+                except Exception as e:
+                    aligned.append(e)
+        for i, alignment in zip(indices, aligned):
+            alignments[i] = alignment
+        return alignments
+
     def _check_results(self):
         """
         定时检查结果队列并更新UI
@@ -1041,6 +1085,7 @@ class CERAnalysisTool:
                         elif result:
                             # 添加结果到表格
                             self.results.append(result)
+                            self.accumulator.add_result(result['details'])
                             item_id = self.result_tree.insert(
                                 "",
                                 "end",
@@ -1110,24 +1155,13 @@ class CERAnalysisTool:
         
         # 计算统计信息
         if self.results:
-            total_accuracy = sum(r['accuracy'] for r in self.results)
-            avg_accuracy = total_accuracy / len(self.results)
-            
-            total_subs = sum(r['details'].get('substitutions', 0) for r in self.results)
-            total_dels = sum(r['details'].get('deletions', 0) for r in self.results)
-            total_ins = sum(r['details'].get('insertions', 0) for r in self.results)
-            total_ref_chars = sum(r['ref_chars'] for r in self.results)
-            total_hyp_chars = sum(r['asr_chars'] for r in self.results)
-            
-            total_errors = total_subs + total_dels + total_ins
-            overall_accuracy = calculate_overall_accuracy(total_errors, total_ref_chars)
-            
+            acc = self.accumulator
             summary_lines = [
-                f"处理文件对: {len(self.results)}",
-                f"平均准确率: {avg_accuracy:.4f}",
-                f"总体准确率: {overall_accuracy:.4f}",
-                f"标注字数: {total_ref_chars}    ASR字数: {total_hyp_chars}",
-                f"替换: {total_subs}    删除: {total_dels}    插入: {total_ins}"
+                f"处理文件对: {acc.pairs}",
+                f"平均准确率: {acc.avg_accuracy:.4f}",
+                f"总体准确率: {acc.overall_accuracy:.4f}",
+                f"标注字数: {acc.ref_length}    ASR字数: {acc.hyp_length}",
+                f"替换: {acc.substitutions}    删除: {acc.deletions}    插入: {acc.insertions}"
             ]
             self.summary_var.set("\n".join(summary_lines))
             
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+清单文件模块
+读取 Kaldi 风格 text 文件（每行 "utt-id 文本"）或 JSONL 清单（每行 {"utt_id": ..., "text": ...}），
+按语句 ID 建立哈希索引并与另一份清单配对。
+整个文件通过内存映射一次读入，评估过程不再有逐句的文件系统调用
+"""
+
+import json
+import mmap
+import os
+from typing import Dict, Iterator, List, Tuple
+
+# JSONL 清单中语句 ID 的候选字段名（按优先级）
+JSONL_ID_KEYS = ('utt_id', 'id', 'key')
+
+# JSONL 清单中文本的字段名
+JSONL_TEXT_KEY = 'text'
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+
+def _iter_lines(manifest_file: str) -> Iterator[bytes]:
+    """通过内存映射逐行产出文件内容（不含换行符）"""
+    if os.path.getsize(manifest_file) == 0:
+        return
+    with open(manifest_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b''):
+                yield line.rstrip(b'\r\n')
+
+
+def _is_jsonl(manifest_file: str) -> bool:
+    """按扩展名判断，其他扩展名按首个非空行是否以 { 开头判断"""
+    extension = os.path.splitext(manifest_file)[1].lower()
+    if extension in ('.jsonl', '.json'):
+        return True
+    for line in _iter_lines(manifest_file):
+        line = line.lstrip(_UTF8_BOM).strip()
+        if line:
+            return line.startswith(b'{')
+    return False
+
+
+def _parse_jsonl_line(line: str, line_number: int, manifest_file: str) -> Tuple[str, str]:
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{manifest_file} 第 {line_number} 行不是合法的 JSON: {e}")
+    if not isinstance(record, dict):
+        raise ValueError(f"{manifest_file} 第 {line_number} 行不是 JSON 对象")
+    for key in JSONL_ID_KEYS:
+        if key in record:
+            return str(record[key]), str(record.get(JSONL_TEXT_KEY) or '')
+    raise ValueError(f"{manifest_file} 第 {line_number} 行缺少语句 ID 字段"
+                     f"（{'/'.join(JSONL_ID_KEYS)}）")
+
+
+def load_manifest(manifest_file: str, encoding: str = 'utf-8') -> Dict[str, str]:
+    """
+    读取清单文件，建立 语句ID → 文本 的索引
+
+    支持两种格式：
+    - Kaldi text：每行 "utt-id 文本"，ID 与文本以第一个空白分隔，文本可为空
+    - JSONL：每行一个 JSON 对象，ID 字段为 utt_id/id/key，文本字段为 text
+
+    Args:
+        manifest_file (str): 清单文件路径
+        encoding (str): 文件编码，默认 UTF-8（自动跳过 BOM）
+
+    Returns:
+        Dict[str, str]: 语句ID → 文本（保持文件中的顺序，文本已去除首尾空白）
+
+    Raises:
+        ValueError: 行格式错误、解码失败或语句 ID 重复
+    """
+    jsonl = _is_jsonl(manifest_file)
+    entries: Dict[str, str] = {}
+
+    for line_number, raw_line in enumerate(_iter_lines(manifest_file), 1):
+        if line_number == 1 and raw_line.startswith(_UTF8_BOM):
+            raw_line = raw_line[len(_UTF8_BOM):]
+        try:
+            line = raw_line.decode(encoding).strip()
+        except UnicodeDecodeError as e:
+            raise ValueError(f"{manifest_file} 第 {line_number} 行无法以 {encoding} 解码: {e}")
+        if not line:
+            continue
+
+        if jsonl:
+            utt_id, text = _parse_jsonl_line(line, line_number, manifest_file)
+        else:
+            parts = line.split(maxsplit=1)
+            utt_id, text = parts[0], parts[1] if len(parts) > 1 else ''
+
+        if utt_id in entries:
+            raise ValueError(f"{manifest_file} 第 {line_number} 行语句 ID 重复: {utt_id}")
+        entries[utt_id] = text.strip()
+
+    return entries
+
+
+def join_manifests(ref_entries: Dict[str, str],
+                   hyp_entries: Dict[str, str]) -> Tuple[List[Tuple[str, str, str]], List[str], List[str]]:
+    """
+    按语句 ID 配对参考清单与假设清单
+
+    Args:
+        ref_entries (Dict[str, str]): 参考清单索引
+        hyp_entries (Dict[str, str]): 假设清单索引
+
+    Returns:
+        Tuple: (按参考清单顺序的 [(语句ID, 参考文本, 假设文本), ...],
+                只在参考清单中的 ID 列表, 只在假设清单中的 ID 列表)
+    """
+    pairs = []
+    ref_only = []
+    for utt_id, ref_text in ref_entries.items():
+        hyp_text = hyp_entries.get(utt_id)
+        if hyp_text is None:
+            ref_only.append(utt_id)
+        else:
+            pairs.append((utt_id, ref_text, hyp_text))
+    hyp_only = [utt_id for utt_id in hyp_entries if utt_id not in ref_entries]
+    return pairs, ref_only, hyp_only
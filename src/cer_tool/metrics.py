@@ -5,12 +5,16 @@ CER Analysis Tool - 字准确率计算引擎
 V2 变更：
 - 预处理流水线集成（替代 jiwer 预处理调用）
 - 边界条件统一处理
+- 单次对齐：指标、高亮、差异序列共享同一份对齐结果
 """
 
-import difflib
+import math
 import re
+import time
 import unicodedata
-from typing import List, Tuple, Dict, Any, Optional
+from concurrent.futures import Executor
+from itertools import islice
+from typing import List, Tuple, Dict, Any, Optional, Callable, Iterable, Sequence
 
 # 导入分词器模块
 from cer_tool.tokenizers import get_tokenizer, get_available_tokenizers, TokenizerError
@@ -22,6 +26,19 @@ from cer_tool.preprocessing import (
     LowercaseStep, FilterFillerWordsStep, ChineseTokenizeStep
 )
 
+# 导入对齐模块
+from cer_tool.alignment import (
+    AlignmentResult, LINEAR_SPACE_THRESHOLD, bitparallel_distance, bounded_distance,
+    fallback_editops, count_editops, compute_opcodes, edit_ops_batch, load_levenshtein
+)
+from cer_tool.anchored_alignment import anchored_opcodes
+from cer_tool.batch import BatchMetrics
+from cer_tool.profiling import STAGE_ALIGN, StageProfiler
+
+
+# calculate_batch 每次预处理并计算的文本对数量
+BATCH_CHUNK_SIZE = 1024
+
 
 class ASRMetrics:
     """
@@ -29,15 +46,28 @@ class ASRMetrics:
     支持多种分词器：jieba、THULAC、HanLP
     """
     
-    def __init__(self, tokenizer_name: str = "jieba"):
+    def __init__(self, tokenizer_name: str = "jieba",
+                 linear_space_threshold: int = LINEAR_SPACE_THRESHOLD):
         """
         初始化ASRMetrics实例
         
         Args:
             tokenizer_name (str): 分词器名称，默认为"jieba"
+            linear_space_threshold (int): 无python-Levenshtein时，DP单元数（m·n）
+                超过该值即改用线性内存的分治回溯，避免超长文本内存溢出
         """
         self.tokenizer_name = tokenizer_name
         self.tokenizer = None
+        self.linear_space_threshold = linear_space_threshold
+        # 编译后的预处理流水线缓存：(分词器, 是否过滤语气词, 预设名) → 可调用对象
+        self._compiled_pipelines: Dict[Tuple[str, bool, str], Callable[[str], str]] = {}
+        # 批量版本的编译流水线（calculate_batch 使用），键同上
+        self._compiled_batch_pipelines: Dict[Tuple[str, bool, str],
+                                             Callable[[List[str]], List[str]]] = {}
+        # 编辑距离后端只解析一次：Levenshtein 模块，或 None 表示使用内置算法
+        self.levenshtein = load_levenshtein()
+        # 性能剖析计时器，None 表示未启用（热路径只做一次 None 判断）
+        self.profiler: Optional[StageProfiler] = None
         self._initialize_tokenizer()
     
     def _initialize_tokenizer(self):
@@ -165,33 +195,44 @@ class ASRMetrics:
         
         return text
     
-    def get_character_positions(self, text: str) -> List[Tuple[str, int]]:
+    def get_word_tokens(self, text: str) -> List[Tuple[str, int, int]]:
         """
-        利用当前分词器的tokenize功能进行精确字符定位
+        利用当前分词器的tokenize功能进行精确分词
         
         Args:
             text (str): 输入文本
             
         Returns:
-            list: 包含(字符, 位置)元组的列表
+            list: 包含(词语, 开始位置, 结束位置)元组的列表
         """
         try:
             if not text.strip():
                 return []
             
-            positions = []
-            tokens = self.tokenizer.tokenize(text)
-            
-            for word, start, end in tokens:
-                for i, char in enumerate(word):
-                    positions.append((char, start + i))
-            
-            return positions
+            tokens: List[Tuple[str, int, int]] = self.tokenizer.tokenize(text)
+            return tokens
             
         except Exception as e:
             print(f"警告: 字符位置获取失败: {str(e)}")
-            # 回退到简单的字符位置
-            return [(char, i) for i, char in enumerate(text)]
+            # 回退到逐字切分
+            return [(char, i, i + 1) for i, char in enumerate(text)]
+
+    def get_character_positions(self, text: str) -> List[Tuple[str, int]]:
+        """
+        利用当前分词器的tokenize功能进行精确字符定位
+
+        Args:
+            text (str): 输入文本
+
+        Returns:
+            list: 包含(字符, 位置)元组的列表
+        """
+        positions = []
+        for word, start, end in self.get_word_tokens(text):
+            for i, char in enumerate(word):
+                positions.append((char, start + i))
+
+        return positions
     
     def _build_pipeline(self, filter_fillers: bool = False) -> PreprocessingPipeline:
         """
@@ -215,6 +256,80 @@ class ASRMetrics:
         
         return pipeline
     
+    def _get_compiled_pipeline(self, filter_fillers: bool = False) -> Callable[[str], str]:
+        """
+        获取编译后的预处理流水线，同一配置只构建并编译一次
+
+        Args:
+            filter_fillers (bool): 是否包含语气词过滤步骤
+
+        Returns:
+            Callable[[str], str]: 编译后的流水线
+        """
+        preset = 'asr_evaluation' if filter_fillers else 'cer_optimized'
+        key = (self.tokenizer_name, filter_fillers, preset)
+
+        compiled = self._compiled_pipelines.get(key)
+        if compiled is None:
+            compiled = self._build_pipeline(filter_fillers).compile(self.profiler)
+            self._compiled_pipelines[key] = compiled
+
+        return compiled
+
+    def _get_compiled_batch_pipeline(self, filter_fillers: bool = False) -> Callable[[List[str]], List[str]]:
+        """
+        获取编译后的批量预处理流水线，同一配置只构建并编译一次
+
+        Args:
+            filter_fillers (bool): 是否包含语气词过滤步骤
+
+        Returns:
+            Callable[[List[str]], List[str]]: 编译后的批量流水线
+        """
+        preset = 'asr_evaluation' if filter_fillers else 'cer_optimized'
+        key = (self.tokenizer_name, filter_fillers, preset)
+
+        compiled = self._compiled_batch_pipelines.get(key)
+        if compiled is None:
+            compiled = self._build_pipeline(filter_fillers).compile_batch(self.profiler)
+            self._compiled_batch_pipelines[key] = compiled
+
+        return compiled
+
+    def enable_profiling(self, profiler: Optional[StageProfiler] = None) -> StageProfiler:
+        """
+        启用分阶段性能剖析：预处理各步骤与对齐分别计时
+
+        Args:
+            profiler (Optional[StageProfiler]): 使用的计时器，None 时新建
+
+        Returns:
+            StageProfiler: 正在使用的计时器
+        """
+        self.profiler = profiler if profiler is not None else StageProfiler()
+        # 已编译的流水线不含计时点，需要重新编译
+        self._compiled_pipelines.clear()
+        self._compiled_batch_pipelines.clear()
+        return self.profiler
+
+    def disable_profiling(self):
+        """关闭性能剖析"""
+        self.profiler = None
+        self._compiled_pipelines.clear()
+        self._compiled_batch_pipelines.clear()
+
+    def get_pipeline_fingerprint(self, filter_fillers: bool = False) -> str:
+        """
+        获取预处理流水线指纹（用于结果缓存的键）
+
+        Args:
+            filter_fillers (bool): 是否包含语气词过滤步骤
+
+        Returns:
+            str: 流水线指纹
+        """
+        return self._build_pipeline(filter_fillers).fingerprint()
+
     def preprocess_text(self, text: str, filter_fillers: bool = False) -> str:
         """
         预处理文本：使用 PreprocessingPipeline 替代 jiwer
@@ -232,9 +347,8 @@ class ASRMetrics:
         if not text or not text.strip():
             return ""
         
-        # 构建并执行预处理流水线
-        pipeline = self._build_pipeline(filter_fillers)
-        processed_text = pipeline.process(text)
+        # 执行缓存的编译流水线（首次调用时构建）
+        processed_text = self._get_compiled_pipeline(filter_fillers)(text)
         
         # 优化：如果处理后为空，直接返回
         if not processed_text:
@@ -242,37 +356,95 @@ class ASRMetrics:
         
         return processed_text
     
-    def calculate_cer(self, reference: str, hypothesis: str, filter_fillers: bool = False) -> float:
+    def preprocess_batch(self, texts: List[str], filter_fillers: bool = False) -> List[str]:
+        """
+        批量预处理文本，结果与逐条调用 preprocess_text 一致
+
+        整批文本依次经过各步骤，语气词过滤等依赖分词器的步骤调用分词器的批量接口
+
+        Args:
+            texts (List[str]): 输入文本列表
+            filter_fillers (bool): 是否过滤语气词
+
+        Returns:
+            List[str]: 预处理后的文本列表
+        """
+        results = ["" for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if indices:
+            processed = self._get_compiled_batch_pipeline(filter_fillers)([texts[i] for i in indices])
+            for i, text in zip(indices, processed):
+                results[i] = text or ""
+        return results
+
+    def calculate_cer(self, reference: str, hypothesis: str, filter_fillers: bool = False,
+                      max_cer: Optional[float] = None,
+                      max_distance: Optional[int] = None) -> Optional[float]:
         """
         计算字符错误率 (Character Error Rate)
         
+        指定 max_cer 或 max_distance 时进入阈值判定模式：只计算到能判定是否超限为止，
+        超过阈值时返回 None（超限标记），未超过时返回精确的 CER
+
         Args:
             reference (str): 参考文本（标准文本）
             hypothesis (str): 假设文本（ASR生成文本）
             filter_fillers (bool): 是否过滤语气词
+            max_cer (Optional[float]): CER 上限
+            max_distance (Optional[int]): 编辑距离上限
             
         Returns:
-            float: 字符错误率
+            Optional[float]: 字符错误率；超过阈值时为 None
         """
         # 预处理文本
         ref_processed = self.preprocess_text(reference, filter_fillers)
         hyp_processed = self.preprocess_text(hypothesis, filter_fillers)
-        
-        # 获取字符位置信息
-        ref_positions = self.get_character_positions(ref_processed)
-        hyp_positions = self.get_character_positions(hyp_processed)
-        
-        # 提取字符列表（仅用于调试/扩展，CER 直接基于 processed 字符串）
-        ref_chars = [pos[0] for pos in ref_positions] if ref_positions else list(ref_processed)
-        hyp_chars = [pos[0] for pos in hyp_positions] if hyp_positions else list(hyp_processed)
-        
+        return self._calculate_processed_cer(ref_processed, hyp_processed, max_cer, max_distance)
+
+    def calculate_cer_batch(self, pairs: Sequence[Tuple[str, str]], filter_fillers: bool = False,
+                            max_cer: Optional[float] = None,
+                            max_distance: Optional[int] = None) -> List[Optional[float]]:
+        """
+        批量计算字符错误率，整批文本一次预处理（分词器按批调用），结果与逐对调用 calculate_cer 一致
+
+        Args:
+            pairs (Sequence[Tuple[str, str]]): (参考文本, 假设文本) 列表
+            filter_fillers (bool): 是否过滤语气词
+            max_cer (Optional[float]): CER 上限
+            max_distance (Optional[int]): 编辑距离上限
+
+        Returns:
+            List[Optional[float]]: 与输入一一对应的字符错误率；超过阈值时为 None
+        """
+        processed = self.preprocess_batch([text for pair in pairs for text in pair], filter_fillers)
+        return [self._calculate_processed_cer(ref, hyp, max_cer, max_distance)
+                for ref, hyp in zip(processed[0::2], processed[1::2])]
+
+    def _calculate_processed_cer(self, ref_processed: str, hyp_processed: str,
+                                 max_cer: Optional[float],
+                                 max_distance: Optional[int]) -> Optional[float]:
+        """对已预处理的文本计算 CER（calculate_cer 与 calculate_cer_batch 共用）"""
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter()
+        
+        if max_cer is not None or max_distance is not None:
+            cer = self._calculate_bounded_cer(ref_processed, hyp_processed, max_cer, max_distance)
+            if profiler is not None:
+                profiler.record(STAGE_ALIGN, time.perf_counter() - start,
+                                len(ref_processed) + len(hyp_processed))
+            return cer
+
+        # 字符级计算：直接基于 processed 字符串，不调用分词器
         # 计算编辑距离
-        try:
-            import Levenshtein
-            distance = Levenshtein.distance(ref_processed, hyp_processed)
-        except ImportError:
-            # 如果没有Levenshtein库，使用基本的编辑距离算法
+        if self.levenshtein is not None:
+            distance = self.levenshtein.distance(ref_processed, hyp_processed)
+        else:
+            # 如果没有Levenshtein库，使用位并行编辑距离算法
             distance = self._calculate_edit_distance(ref_processed, hyp_processed)
+        if profiler is not None:
+            profiler.record(STAGE_ALIGN, time.perf_counter() - start,
+                            len(ref_processed) + len(hyp_processed))
         
         # 计算CER
         if len(ref_processed) > 0:
@@ -282,10 +454,58 @@ class ASRMetrics:
         
         return cer
     
+    def _calculate_bounded_cer(self, ref_processed: str, hyp_processed: str,
+                               max_cer: Optional[float],
+                               max_distance: Optional[int]) -> Optional[float]:
+        """
+        阈值判定模式下计算 CER，超过阈值时返回 None
+
+        Args:
+            ref_processed (str): 预处理后的参考文本
+            hyp_processed (str): 预处理后的假设文本
+            max_cer (Optional[float]): CER 上限
+            max_distance (Optional[int]): 编辑距离上限
+
+        Returns:
+            Optional[float]: 字符错误率；超过阈值时为 None
+        """
+        ref_length = len(ref_processed)
+        if ref_length == 0:
+            # 空参考沿用 calculate_cer 的边界语义
+            cer = 1.0 if hyp_processed else 0.0
+            if max_cer is not None and cer > max_cer:
+                return None
+            if max_distance is not None and len(hyp_processed) > max_distance:
+                return None
+            return cer
+
+        # 换算为编辑距离上限：distance <= k 等价于 cer <= max_cer
+        limit = ref_length + len(hyp_processed)
+        if max_cer is not None:
+            limit = min(limit, math.floor(max_cer * ref_length + 1e-9))
+        if max_distance is not None:
+            limit = min(limit, max_distance)
+
+        distance: Optional[int]
+        if self.levenshtein is not None:
+            try:
+                distance = self.levenshtein.distance(ref_processed, hyp_processed, score_cutoff=limit)
+            except TypeError:
+                # 旧版 python-Levenshtein 不支持 score_cutoff
+                distance = self.levenshtein.distance(ref_processed, hyp_processed)
+            if distance > limit:
+                return None
+        else:
+            distance = bounded_distance(ref_processed, hyp_processed, limit)
+            if distance is None:
+                return None
+
+        return distance / ref_length
+
     def _calculate_edit_distance(self, s1: str, s2: str) -> int:
         """
         计算两个字符串的编辑距离（Levenshtein距离）
-        使用动态规划算法，当python-Levenshtein库不可用时的备用实现
+        使用位并行（Myers/Hyyrö）算法，当python-Levenshtein库不可用时的备用实现
         
         Args:
             s1 (str): 第一个字符串
@@ -294,42 +514,13 @@ class ASRMetrics:
         Returns:
             int: 编辑距离（最少需要多少次编辑操作使两个字符串相同）
         """
-        # 边界条件处理
-        if len(s1) == 0:
-            return len(s2)  # 插入s2的所有字符
-        if len(s2) == 0:
-            return len(s1)  # 删除s1的所有字符
-        
-        # 创建编辑距离矩阵，使用动态规划
-        matrix = [[0] * (len(s2) + 1) for _ in range(len(s1) + 1)]
-        
-        # 初始化第一行和第一列（基础情况）
-        for i in range(len(s1) + 1):
-            matrix[i][0] = i  # 从空字符串到s1[:i]需要i次插入
-        for j in range(len(s2) + 1):
-            matrix[0][j] = j  # 从空字符串到s2[:j]需要j次插入
-        
-        # 填充矩阵，计算最小编辑距离
-        for i in range(1, len(s1) + 1):
-            for j in range(1, len(s2) + 1):
-                if s1[i-1] == s2[j-1]:
-                    cost = 0  # 字符相同，无需编辑
-                else:
-                    cost = 1  # 字符不同，需要替换
-                
-                # 选择三种操作中代价最小的
-                matrix[i][j] = min(
-                    matrix[i-1][j] + 1,      # 删除操作
-                    matrix[i][j-1] + 1,      # 插入操作
-                    matrix[i-1][j-1] + cost  # 替换操作（或匹配）
-                )
-        
-        return matrix[len(s1)][len(s2)]
+        return bitparallel_distance(s1, s2)
     
     def _calculate_edit_ops_with_backtrack(self, s1: str, s2: str) -> Tuple[int, int, int]:
         """
-        使用动态规划+路径回溯精确计算编辑操作（替换、删除、插入）
-        当python-Levenshtein库不可用时的精确回退实现
+        使用位并行DP+路径回溯精确计算编辑操作（替换、删除、插入）
+        当python-Levenshtein库不可用时的精确回退实现；
+        m·n 超过 linear_space_threshold 时自动改用线性内存分治回溯
         
         Args:
             s1 (str): 参考字符串
@@ -338,68 +529,7 @@ class ASRMetrics:
         Returns:
             Tuple[int, int, int]: (替换数, 删除数, 插入数)
         """
-        m, n = len(s1), len(s2)
-        
-        # 创建DP矩阵
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
-        
-        # 初始化第一行和第一列
-        for i in range(m + 1):
-            dp[i][0] = i  # 从s1[:i]到空字符串需要i次删除
-        for j in range(n + 1):
-            dp[0][j] = j  # 从空字符串到s2[:j]需要j次插入
-        
-        # 填充DP矩阵
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if s1[i-1] == s2[j-1]:
-                    # 字符相同，无需编辑
-                    dp[i][j] = dp[i-1][j-1]
-                else:
-                    # 字符不同，选择代价最小的操作
-                    dp[i][j] = min(
-                        dp[i-1][j-1] + 1,  # 替换
-                        dp[i-1][j] + 1,     # 删除
-                        dp[i][j-1] + 1      # 插入
-                    )
-        
-        # 路径回溯统计各类操作
-        i, j = m, n
-        substitutions = 0
-        deletions = 0
-        insertions = 0
-        
-        while i > 0 or j > 0:
-            if i == 0:
-                # 只能插入
-                insertions += j
-                break
-            if j == 0:
-                # 只能删除
-                deletions += i
-                break
-                
-            if s1[i-1] == s2[j-1]:
-                # 字符匹配，向左上移动
-                i -= 1
-                j -= 1
-            else:
-                # 找到当前位置的最优来源
-                if dp[i][j] == dp[i-1][j-1] + 1:
-                    # 替换操作
-                    substitutions += 1
-                    i -= 1
-                    j -= 1
-                elif dp[i][j] == dp[i-1][j] + 1:
-                    # 删除操作
-                    deletions += 1
-                    i -= 1
-                else:
-                    # 插入操作
-                    insertions += 1
-                    j -= 1
-        
-        return substitutions, deletions, insertions
+        return count_editops(fallback_editops(s1, s2, self.linear_space_threshold))
     
     def calculate_wer(self, reference: str, hypothesis: str, filter_fillers: bool = False) -> float:
         """
@@ -446,28 +576,29 @@ class ASRMetrics:
         Returns:
             Tuple[int, int, int]: (替换数, 删除数, 插入数)
         """
-        try:
-            import Levenshtein
-            
-            # 将列表转为字符串，然后计算编辑距离
-            ref_str = "".join(reference)
-            hyp_str = "".join(hypothesis)
-            
-            # 计算编辑操作
-            ops = Levenshtein.editops(ref_str, hyp_str)
-            
-            # 统计各类操作数量
-            s = len([op for op in ops if op[0] == 'replace'])  # 替换
-            d = len([op for op in ops if op[0] == 'delete'])   # 删除
-            i = len([op for op in ops if op[0] == 'insert'])   # 插入
-            
-            return s, d, i
-            
-        except ImportError:
-            # 如果没有Levenshtein库，使用精确的DP路径回溯算法
-            ref_str = "".join(reference)
-            hyp_str = "".join(hypothesis)
-            return self._calculate_edit_ops_with_backtrack(ref_str, hyp_str)
+        # 将列表转为字符串，然后计算编辑操作
+        ref_str = "".join(reference)
+        hyp_str = "".join(hypothesis)
+
+        if self.levenshtein is not None:
+            return count_editops(self.levenshtein.editops(ref_str, hyp_str))
+
+        # 如果没有Levenshtein库，走回退链（NumPy 批量引擎 / 位并行DP路径回溯）
+        return self._calculate_edit_ops_batch([(ref_str, hyp_str)])[0]
+
+    def _calculate_edit_ops_batch(self, pairs: List[Tuple[str, str]]) -> List[Tuple[int, int, int]]:
+        """
+        批量计算多对字符串的编辑操作数量
+        未安装python-Levenshtein但已安装NumPy时，长度相近的多对字符串
+        会在一次向量化DP中完成计算，结果与逐对计算完全相同
+
+        Args:
+            pairs (List[Tuple[str, str]]): (参考字符串, 假设字符串) 列表
+
+        Returns:
+            List[Tuple[int, int, int]]: 与输入顺序一致的 (替换数, 删除数, 插入数) 列表
+        """
+        return edit_ops_batch(pairs, self.linear_space_threshold, self.levenshtein)
     
     def calculate_accuracy(self, reference: str, hypothesis: str, filter_fillers: bool = False) -> float:
         """
@@ -482,88 +613,127 @@ class ASRMetrics:
             float: 准确率
         """
         cer = self.calculate_cer(reference, hypothesis, filter_fillers)
+        # 未设置阈值时 calculate_cer 总是返回数值
+        assert cer is not None
         return 1.0 - cer
     
-    def calculate_detailed_metrics(self, reference: str, hypothesis: str, filter_fillers: bool = False) -> Dict[str, Any]:
+    def align(self, reference: str, hypothesis: str, filter_fillers: bool = False,
+              segmented: bool = False, executor: Optional[Executor] = None) -> AlignmentResult:
         """
-        计算详细的错误指标，包括插入、删除、替换错误
+        预处理并对齐参考文本与假设文本（各只执行一次）
+
+        返回的对齐结果可按需派生详细指标（to_metrics）、高亮文本（highlighted）
+        和差异序列（diff_sequence），三者基于同一组对齐片段，结果互相一致。
+        对齐是纯字符级的，不调用分词器；只有访问词级输出
+        （ref_tokens / hyp_tokens / ref_positions / hyp_positions）时才惰性分词
         
+        segmented=True 时使用锚点分段对齐，适合长而相似的文本（讲座、播客等）
+
         Args:
             reference (str): 参考文本（标准文本）
             hypothesis (str): 假设文本（ASR生成文本）
             filter_fillers (bool): 是否过滤语气词
+            segmented (bool): 是否使用锚点分段对齐
+            executor (Optional[Executor]): 分段对齐时并行计算空隙的执行器
             
         Returns:
-            dict: 包含各种错误指标的字典
+            AlignmentResult: 对齐结果
         """
-        # 预处理文本
         ref_processed = self.preprocess_text(reference, filter_fillers)
         hyp_processed = self.preprocess_text(hypothesis, filter_fillers)
+        return self._align_processed(ref_processed, hyp_processed, segmented, executor)
+
+    def align_batch(self, pairs: Sequence[Tuple[str, str]], filter_fillers: bool = False,
+                    segmented: bool = False) -> List[AlignmentResult]:
+        """
+        批量对齐多对文本，整批文本一次预处理（分词器按批调用），结果与逐对调用 align 一致
+
+        Args:
+            pairs (Sequence[Tuple[str, str]]): (参考文本, 假设文本) 列表
+            filter_fillers (bool): 是否过滤语气词
+            segmented (bool): 是否使用锚点分段对齐
+
+        Returns:
+            List[AlignmentResult]: 与输入一一对应的对齐结果
+        """
+        processed = self.preprocess_batch([text for pair in pairs for text in pair], filter_fillers)
+        return [self._align_processed(ref, hyp, segmented)
+                for ref, hyp in zip(processed[0::2], processed[1::2])]
+
+    def _align_processed(self, ref_processed: str, hyp_processed: str, segmented: bool = False,
+                         executor: Optional[Executor] = None) -> AlignmentResult:
+        """对齐已预处理的文本（align 与 align_batch 共用）"""
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter()
+        
+        if segmented:
+            opcodes = anchored_opcodes(ref_processed, hyp_processed,
+                                       linear_space_threshold=self.linear_space_threshold,
+                                       executor=executor, backend=self.levenshtein)
+        else:
+            opcodes = compute_opcodes(ref_processed, hyp_processed, self.linear_space_threshold,
+                                      self.levenshtein)
+        if profiler is not None:
+            profiler.record(STAGE_ALIGN, time.perf_counter() - start,
+                            len(ref_processed) + len(hyp_processed))
+        
+        return AlignmentResult(ref_processed, hyp_processed, opcodes, self.tokenizer_name,
+                               tokenize=self.get_word_tokens)
+
+    def calculate_detailed_metrics(self, reference: str, hypothesis: str, filter_fillers: bool = False,
+                                   segmented: bool = False) -> Dict[str, Any]:
+        """
+        计算详细的错误指标，包括插入、删除、替换错误
         
-        # 获取字符位置信息
-        ref_positions = self.get_character_positions(ref_processed)
-        hyp_positions = self.get_character_positions(hyp_processed)
-        
-        # 提取字符列表
-        ref_chars = [pos[0] for pos in ref_positions] if ref_positions else list(ref_processed)
-        hyp_chars = [pos[0] for pos in hyp_positions] if hyp_positions else list(hyp_processed)
-        
-        # 边界条件处理：统一与 calculate_cer() 一致的空文本语义
-        # 空参考 + 空假设 → CER=0.0  空参考 + 非空假设 → CER=1.0
-        ref_length = len(ref_chars)
-        hyp_length = len(hyp_chars)
-        
-        if ref_length == 0 and hyp_length == 0:
-            # 两个都为空，视为完全匹配
-            return {
-                'cer': 0.0, 'wer': 0.0, 'mer': 0.0, 'wil': 0.0, 'wip': 1.0,
-                'hits': 0, 'substitutions': 0, 'deletions': 0, 'insertions': 0,
-                'ref_length': 0, 'hyp_length': 0,
-                'accuracy': 1.0, 'tokenizer': self.tokenizer_name
-            }
-        
-        if ref_length == 0:
-            # 空参考 + 非空假设，CER=1.0（与 calculate_cer 一致）
-            return {
-                'cer': 1.0, 'wer': 1.0, 'mer': 1.0, 'wil': 1.0, 'wip': 0.0,
-                'hits': 0, 'substitutions': 0, 'deletions': 0, 'insertions': hyp_length,
-                'ref_length': 0, 'hyp_length': hyp_length,
-                'accuracy': 0.0, 'tokenizer': self.tokenizer_name
-            }
-        
-        if hyp_length == 0:
-            # 非空参考 + 空假设，CER=1.0
-            return {
-                'cer': 1.0, 'wer': 1.0, 'mer': 1.0, 'wil': 1.0, 'wip': 0.0,
-                'hits': 0, 'substitutions': 0, 'deletions': ref_length, 'insertions': 0,
-                'ref_length': ref_length, 'hyp_length': 0,
-                'accuracy': 0.0, 'tokenizer': self.tokenizer_name
-            }
-        
-        # 正常情况：两个都非空，计算编辑操作
-        s, d, i = self._calculate_edit_ops(ref_chars, hyp_chars)
-        
-        # 计算总错误数和字符错误率
-        total_errors = s + d + i
-        cer = total_errors / ref_length
-        
-        # 返回详细指标
-        return {
-            'cer': cer,
-            'wer': cer,  # 对于中文，CER和WER相同
-            'mer': cer,  # 匹配错误率
-            'wil': cer,  # 词信息丢失率
-            'wip': 1.0 - cer,  # 词信息保留率
-            'hits': ref_length - (s + d),  # 命中数
-            'substitutions': s,  # 替换错误数
-            'deletions': d,      # 删除错误数
-            'insertions': i,     # 插入错误数
-            'ref_length': ref_length,  # 参考文本长度
-            'hyp_length': hyp_length,  # 假设文本长度
-            'accuracy': 1.0 - cer,  # 准确率
-            'tokenizer': self.tokenizer_name  # 使用的分词器
-        }
+        Args:
+            reference (str): 参考文本（标准文本）
+            hypothesis (str): 假设文本（ASR生成文本）
+            filter_fillers (bool): 是否过滤语气词
+            segmented (bool): 是否使用锚点分段对齐（长文本）
+
+        Returns:
+            dict: 包含各种错误指标的字典
+        """
+        # 边界条件（空参考/空假设）由 AlignmentResult 统一处理，与 calculate_cer() 语义一致
+        return self.align(reference, hypothesis, filter_fillers, segmented=segmented).to_metrics()
     
+    def calculate_batch(self, pairs: Iterable[Tuple[str, str]], filter_fillers: bool = False,
+                        chunk_size: int = BATCH_CHUNK_SIZE) -> BatchMetrics:
+        """
+        批量计算多对文本的错误统计，结果按列存储
+
+        输入按块惰性消费，每块的参考与假设文本整批预处理（分词器按批调用），再一次性计算编辑操作
+        （未安装python-Levenshtein但安装了NumPy时走批量向量化引擎）；
+        逐对结果与 calculate_detailed_metrics 的 S/D/I、长度和 CER 一致
+
+        Args:
+            pairs (Iterable[Tuple[str, str]]): (参考文本, 假设文本) 序列
+            filter_fillers (bool): 是否过滤语气词
+            chunk_size (int): 每块的文本对数量
+
+        Returns:
+            BatchMetrics: 列式批量结果，含微/宏平均汇总
+        """
+        batch = BatchMetrics(self.tokenizer_name)
+        iterator = iter(pairs)
+        while True:
+            raw = list(islice(iterator, chunk_size))
+            if not raw:
+                break
+            processed = self.preprocess_batch([text for pair in raw for text in pair], filter_fillers)
+            chunk = list(zip(processed[0::2], processed[1::2]))
+            profiler = self.profiler
+            if profiler is not None:
+                start = time.perf_counter()
+            edit_ops = self._calculate_edit_ops_batch(chunk)
+            if profiler is not None:
+                profiler.record(STAGE_ALIGN, time.perf_counter() - start,
+                                sum(len(ref) + len(hyp) for ref, hyp in chunk))
+            for (ref, hyp), (s, d, i) in zip(chunk, edit_ops):
+                batch.append(s, d, i, len(ref), len(hyp))
+        return batch
+
     def show_differences(self, reference: str, hypothesis: str, filter_fillers: bool = False) -> str:
         """
         显示两个文本之间的差异
@@ -576,15 +746,7 @@ class ASRMetrics:
         Returns:
             str: 格式化的差异信息
         """
-        # 预处理文本
-        ref_processed = self.preprocess_text(reference, filter_fillers)
-        hyp_processed = self.preprocess_text(hypothesis, filter_fillers)
-        
-        # 使用difflib计算差异
-        d = difflib.Differ()
-        diff = list(d.compare(list(ref_processed), list(hyp_processed)))
-        
-        return ''.join(diff)
+        return self.align(reference, hypothesis, filter_fillers).diff_sequence
     
     def highlight_errors(self, reference: str, hypothesis: str, filter_fillers: bool = False) -> Tuple[str, str]:
         """
@@ -598,30 +760,7 @@ class ASRMetrics:
         Returns:
             tuple: (参考文本高亮版, 假设文本高亮版)
         """
-        # 预处理文本
-        ref_processed = self.preprocess_text(reference, filter_fillers)
-        hyp_processed = self.preprocess_text(hypothesis, filter_fillers)
-        
-        # 使用difflib的SequenceMatcher找出匹配和不匹配的部分
-        matcher = difflib.SequenceMatcher(None, ref_processed, hyp_processed)
-        
-        # 构建高亮标记的字符串
-        ref_highlighted = []
-        hyp_highlighted = []
-        
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-            if tag == 'equal':
-                ref_highlighted.append(ref_processed[i1:i2])
-                hyp_highlighted.append(hyp_processed[j1:j2])
-            elif tag == 'replace':
-                ref_highlighted.append(f"[{ref_processed[i1:i2]}]")
-                hyp_highlighted.append(f"[{hyp_processed[j1:j2]}]")
-            elif tag == 'delete':
-                ref_highlighted.append(f"[{ref_processed[i1:i2]}]")
-            elif tag == 'insert':
-                hyp_highlighted.append(f"[{hyp_processed[j1:j2]}]")
-        
-        return ''.join(ref_highlighted), ''.join(hyp_highlighted)
+        return self.align(reference, hypothesis, filter_fillers).highlighted
     
     def get_tokenizer_info(self) -> Dict[str, Any]:
         """
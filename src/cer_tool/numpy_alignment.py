@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumPy 批量编辑操作引擎（可选依赖）
+将多对字符串编码为码点数组后一次性计算 DP 与路径回溯，
+适用于未安装 python-Levenshtein 但已安装 NumPy 的环境
+
+DP 按行推进：先以向量运算取替换/删除代价的较小值，
+再用累计最小值（minimum.accumulate）一次性解决行内的插入依赖；
+路径回溯在整批字符串对上同步进行，优先级与 backtrack_editops 一致
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# 单个批次 DP 矩阵的最大单元数（int32，约 64MB）
+MAX_BATCH_CELLS = 16_000_000
+
+
+def _encode(texts: Sequence[str], width: int, fill: int) -> np.ndarray:
+    """将字符串编码为定宽码点矩阵，不足部分以 fill 填充"""
+    arr = np.full((len(texts), width), fill, dtype=np.int64)
+    for row, text in enumerate(texts):
+        if text:
+            arr[row, :len(text)] = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    return arr
+
+
+def _solve_group(refs: Sequence[str], hyps: Sequence[str]) -> List[Tuple[int, int, int]]:
+    """对一组字符串对计算 (替换数, 删除数, 插入数)"""
+    batch = len(refs)
+    ref_lens = np.array([len(r) for r in refs], dtype=np.int64)
+    hyp_lens = np.array([len(h) for h in hyps], dtype=np.int64)
+    max_m, max_n = int(ref_lens.max()), int(hyp_lens.max())
+
+    # 两侧填充值不同，填充位置永不匹配（且回溯不会访问填充区域）
+    ref_arr = _encode(refs, max_m, -1)
+    hyp_arr = _encode(hyps, max_n, -2)
+
+    dp = np.empty((batch, max_m + 1, max_n + 1), dtype=np.int32)
+    cols = np.arange(max_n + 1, dtype=np.int32)
+    dp[:, 0, :] = cols
+
+    best = np.empty((batch, max_n + 1), dtype=np.int32)
+    for i in range(1, max_m + 1):
+        prev = dp[:, i - 1, :]
+        cost = (hyp_arr != ref_arr[:, i - 1:i]).astype(np.int32)
+        # 替换（或匹配）与删除中的较小者
+        best[:, 0] = i
+        np.minimum(prev[:, :-1] + cost, prev[:, 1:] + 1, out=best[:, 1:])
+        # 行内插入：D[i][j] = min_{k<=j}(best[k] + j - k)
+        dp[:, i, :] = np.minimum.accumulate(best - cols, axis=1) + cols
+
+    # 整批同步回溯：优先级 匹配 → 替换 → 删除 → 插入
+    rows = np.arange(batch)
+    i, j = ref_lens.copy(), hyp_lens.copy()
+    subs = np.zeros(batch, dtype=np.int64)
+    dels = np.zeros(batch, dtype=np.int64)
+    ins = np.zeros(batch, dtype=np.int64)
+
+    while True:
+        both = (i > 0) & (j > 0)
+        if not both.any():
+            break
+        im1 = np.maximum(i - 1, 0)
+        jm1 = np.maximum(j - 1, 0)
+        match = both & (ref_arr[rows, im1] == hyp_arr[rows, jm1])
+        rest = both & ~match
+        current = dp[rows, i, j]
+        sub = rest & (current == dp[rows, im1, jm1] + 1)
+        dele = rest & ~sub & (current == dp[rows, im1, j] + 1)
+        insert = rest & ~sub & ~dele
+
+        subs += sub
+        dels += dele
+        ins += insert
+        diagonal = match | sub
+        i -= diagonal | dele
+        j -= diagonal | insert
+
+    # 剩余部分只能插入或删除
+    ins += j
+    dels += i
+
+    return list(zip(subs.tolist(), dels.tolist(), ins.tolist()))
+
+
+def numpy_edit_ops_batch(pairs: Sequence[Tuple[str, str]],
+                         max_cells: int = MAX_BATCH_CELLS) -> List[Tuple[int, int, int]]:
+    """
+    批量计算多对字符串的编辑操作数量
+
+    先按长度排序分组，使同组内长度相近、填充最少；每组 DP 矩阵不超过 max_cells。
+    单对超过 max_cells 时仍单独成组计算，调用方应自行将超长文本交给线性内存实现
+
+    Args:
+        pairs: (参考字符串, 假设字符串) 列表
+        max_cells (int): 单组 DP 矩阵的最大单元数
+
+    Returns:
+        List[Tuple[int, int, int]]: 与输入顺序一致的 (替换数, 删除数, 插入数) 列表
+    """
+    results: List[Tuple[int, int, int]] = [(0, 0, 0)] * len(pairs)
+    order = sorted(range(len(pairs)), key=lambda k: (len(pairs[k][0]), len(pairs[k][1])))
+
+    group: List[int] = []
+    max_m = max_n = 0
+    for k in order:
+        m, n = len(pairs[k][0]), len(pairs[k][1])
+        new_m, new_n = max(max_m, m), max(max_n, n)
+        if group and (len(group) + 1) * (new_m + 1) * (new_n + 1) > max_cells:
+            _flush(pairs, group, results)
+            group, new_m, new_n = [], m, n
+        group.append(k)
+        max_m, max_n = new_m, new_n
+    if group:
+        _flush(pairs, group, results)
+
+    return results
+
+
+def _flush(pairs, group, results):
+    """计算一组并按原始下标写回结果"""
+    counts = _solve_group([pairs[k][0] for k in group], [pairs[k][1] for k in group])
+    for k, value in zip(group, counts):
+        results[k] = value
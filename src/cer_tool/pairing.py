@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录配对模块
+用 os.scandir 遍历（可递归的）ASR 目录与标注目录，以"相对路径去掉扩展名"为键配对文件。
+两侧按相同的确定顺序遍历，用归并方式边遍历边产出配对结果：
+内存占用只与目录深度和单个目录的条目数有关，未配对文件只保留计数与少量样例
+"""
+
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# 默认参与配对的文件扩展名
+DEFAULT_EXTENSIONS = ('.txt',)
+
+# 未配对文件报告中保留的样例数
+UNMATCHED_SAMPLE_SIZE = 5
+
+# 配对键：相对路径的各级目录名 + 去掉扩展名的文件名
+PairKey = Tuple[str, ...]
+
+
+def normalize_extensions(extensions: Sequence[str]) -> Tuple[str, ...]:
+    """
+    规范化扩展名：补全前导点并转为小写，去除重复（保持优先级顺序）
+
+    Args:
+        extensions (Sequence[str]): 扩展名列表，如 ['txt', '.lab']
+
+    Returns:
+        Tuple[str, ...]: 规范化后的扩展名
+    """
+    normalized = []
+    for extension in extensions:
+        extension = extension.strip().lower()
+        if not extension:
+            continue
+        if not extension.startswith('.'):
+            extension = '.' + extension
+        if extension not in normalized:
+            normalized.append(extension)
+    return tuple(normalized)
+
+
+def _match_extension(name: str, extensions: Tuple[str, ...]) -> Optional[int]:
+    """返回文件名匹配的扩展名序号（即优先级），不匹配返回 None"""
+    lowered = name.lower()
+    for index, extension in enumerate(extensions):
+        if lowered.endswith(extension) and len(name) > len(extension):
+            return index
+    return None
+
+
+def _scan_sorted(directory: str, extensions: Tuple[str, ...], recursive: bool,
+                 prefix: PairKey) -> Iterator[Tuple[PairKey, str]]:
+    entries = []
+    with os.scandir(directory) as scanner:
+        for entry in scanner:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                # 不跟随目录符号链接，避免循环
+                if recursive:
+                    entries.append((entry.name, 1, 0, entry.path))
+                continue
+            priority = _match_extension(entry.name, extensions)
+            if priority is not None and entry.is_file():
+                stem = entry.name[:len(entry.name) - len(extensions[priority])]
+                entries.append((stem, 0, priority, entry.path))
+
+    # 同一目录内按 (名称, 文件先于目录, 扩展名优先级) 排序，
+    # 整棵树的键因此按元组字典序单调递增，两侧遍历顺序一致
+    entries.sort()
+    for name, is_dir, _, path in entries:
+        key = prefix + (name,)
+        if is_dir:
+            yield from _scan_sorted(path, extensions, recursive, key)
+        else:
+            yield key, path
+
+
+def iter_text_files(root: str, extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+                    recursive: bool = False) -> Iterator[Tuple[PairKey, str]]:
+    """
+    按确定顺序遍历目录中的文本文件
+
+    Args:
+        root (str): 根目录
+        extensions (Sequence[str]): 参与配对的扩展名（按优先级）
+        recursive (bool): 是否递归进入子目录（跳过隐藏文件与目录符号链接）
+
+    Yields:
+        Tuple[PairKey, str]: (配对键, 文件路径)，配对键按元组字典序递增；
+            同一目录下同名不同扩展名的文件键相同，按扩展名优先级相邻产出
+    """
+    return _scan_sorted(root, normalize_extensions(extensions), recursive, ())
+
+
+def format_pair_key(key: PairKey) -> str:
+    """配对键显示为以 / 分隔的相对路径（不含扩展名）"""
+    return '/'.join(key)
+
+
+class DirectoryPairing:
+    """
+    两个目录之间的惰性文件配对（可迭代）
+
+    迭代产出 (ASR文件路径, 标注文件路径)；迭代结束后可读取未配对统计。
+    同一侧出现相同配对键的多个文件（如 a.txt 与 a.lab）时只取扩展名优先级最高的一个
+
+    用法：
+        pairing = DirectoryPairing(asr_dir, ref_dir, recursive=True)
+        for asr_file, ref_file in pairing:
+            ...
+        print(pairing.matched, pairing.asr_only, pairing.ref_only)
+    """
+
+    def __init__(self, asr_dir: str, ref_dir: str,
+                 extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+                 recursive: bool = False):
+        """
+        Args:
+            asr_dir (str): ASR 文件目录
+            ref_dir (str): 标注文件目录
+            extensions (Sequence[str]): 参与配对的扩展名（按优先级）
+            recursive (bool): 是否递归进入子目录，键为相对路径
+        """
+        self.asr_dir = asr_dir
+        self.ref_dir = ref_dir
+        self.extensions = normalize_extensions(extensions)
+        self.recursive = recursive
+        self._reset()
+
+    def _reset(self) -> None:
+        self.matched = 0
+        self.asr_only = 0
+        self.ref_only = 0
+        self.duplicates = 0
+        self.asr_only_samples: List[str] = []
+        self.ref_only_samples: List[str] = []
+
+    def _unique(self, files: Iterator[Tuple[PairKey, str]]) -> Iterator[Tuple[PairKey, str]]:
+        """跳过与前一个文件配对键相同的文件（优先级较低的扩展名）"""
+        previous = None
+        for key, path in files:
+            if key == previous:
+                self.duplicates += 1
+                continue
+            previous = key
+            yield key, path
+
+    def _note_unmatched(self, side: str, key: PairKey) -> None:
+        samples = self.asr_only_samples if side == 'asr' else self.ref_only_samples
+        if side == 'asr':
+            self.asr_only += 1
+        else:
+            self.ref_only += 1
+        if len(samples) < UNMATCHED_SAMPLE_SIZE:
+            samples.append(format_pair_key(key))
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        self._reset()
+        asr_files = self._unique(iter_text_files(self.asr_dir, self.extensions, self.recursive))
+        ref_files = self._unique(iter_text_files(self.ref_dir, self.extensions, self.recursive))
+        asr_item = next(asr_files, None)
+        ref_item = next(ref_files, None)
+
+        # 两侧键均有序，归并即可完成配对
+        while asr_item is not None and ref_item is not None:
+            if asr_item[0] == ref_item[0]:
+                self.matched += 1
+                yield asr_item[1], ref_item[1]
+                asr_item = next(asr_files, None)
+                ref_item = next(ref_files, None)
+            elif asr_item[0] < ref_item[0]:
+                self._note_unmatched('asr', asr_item[0])
+                asr_item = next(asr_files, None)
+            else:
+                self._note_unmatched('ref', ref_item[0])
+                ref_item = next(ref_files, None)
+
+        while asr_item is not None:
+            self._note_unmatched('asr', asr_item[0])
+            asr_item = next(asr_files, None)
+        while ref_item is not None:
+            self._note_unmatched('ref', ref_item[0])
+            ref_item = next(ref_files, None)
+
+    def __repr__(self) -> str:
+        return (f"DirectoryPairing(asr_dir={self.asr_dir}, ref_dir={self.ref_dir}, "
+                f"matched={self.matched}, asr_only={self.asr_only}, ref_only={self.ref_only})")
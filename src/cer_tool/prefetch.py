@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件预读模块
+批处理时由小型线程池提前读取并解码后续文件对，计算与文件 I/O 重叠进行；
+预读窗口有上限，窗口满时读取线程停止提交新任务（背压），内存占用有界。
+结果按输入顺序产出
+"""
+
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from cer_tool.file_utils import read_file_with_encodings
+from cer_tool.profiling import STAGE_READ, StageProfiler
+
+# 默认预读线程数（读取以等待 I/O 为主，少量线程即可掩盖网络文件系统延迟）
+PREFETCH_WORKERS = 4
+
+# 每个预读线程对应的最大预读文件对数
+PREFETCH_DEPTH_PER_WORKER = 8
+
+
+class PrefetchedPair(NamedTuple):
+    """预读结果：读取失败时 texts 为 None、error 为异常"""
+    asr_file: str
+    ref_file: str
+    texts: Optional[Tuple[str, str]]
+    error: Optional[Exception]
+
+
+def _read_pair(read: Callable[[str], str], asr_file: str, ref_file: str) -> Tuple[str, str]:
+    return read(asr_file), read(ref_file)
+
+
+def prefetch_file_pairs(file_pairs: Iterable[Tuple[str, str]],
+                        workers: int = PREFETCH_WORKERS,
+                        depth: Optional[int] = None,
+                        read: Callable[[str], str] = read_file_with_encodings,
+                        profiler: Optional[StageProfiler] = None) -> Iterator[PrefetchedPair]:
+    """
+    预读文件对，按输入顺序产出 (ASR路径, 标注路径, (ASR文本, 标注文本), 错误)
+
+    最多有 depth 个文件对处于读取中或已读取未消费状态；
+    生成器被提前关闭（如用户取消）时，尚未开始的读取任务会被取消
+
+    Args:
+        file_pairs (Iterable[Tuple[str, str]]): [(ASR文件路径, 标注文件路径), ...]
+        workers (int): 预读线程数，<= 0 时在当前线程顺序读取
+        depth (Optional[int]): 预读窗口大小，None 时为 workers × PREFETCH_DEPTH_PER_WORKER
+        read (Callable[[str], str]): 读取并解码单个文件的函数
+        profiler (Optional[StageProfiler]): 性能剖析计时器，记录等待读取结果的时间
+
+    Yields:
+        PrefetchedPair: 预读结果
+    """
+    if workers <= 0:
+        for asr_file, ref_file in file_pairs:
+            start = time.perf_counter()
+            try:
+                texts = _read_pair(read, asr_file, ref_file)
+            except Exception as e:
+                yield PrefetchedPair(asr_file, ref_file, None, e)
+                continue
+            if profiler is not None:
+                profiler.record(STAGE_READ, time.perf_counter() - start, len(texts[0]) + len(texts[1]))
+            yield PrefetchedPair(asr_file, ref_file, texts, None)
+        return
+
+    if depth is None:
+        depth = workers * PREFETCH_DEPTH_PER_WORKER
+    depth = max(1, depth)
+
+    pending = iter(file_pairs)
+    window: "deque[Tuple[str, str, Future]]" = deque()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cer-prefetch")
+
+    def _fill():
+        # 窗口未满时继续提交读取任务（背压：窗口满则等待消费）
+        while len(window) < depth:
+            try:
+                asr_file, ref_file = next(pending)
+            except StopIteration:
+                return
+            window.append((asr_file, ref_file, executor.submit(_read_pair, read, asr_file, ref_file)))
+
+    try:
+        _fill()
+        while window:
+            asr_file, ref_file, future = window.popleft()
+            start = time.perf_counter()
+            try:
+                texts = future.result()
+            except Exception as e:
+                item = PrefetchedPair(asr_file, ref_file, None, e)
+            else:
+                if profiler is not None:
+                    # 启用预读时记录的是计算线程实际等待读取的时间
+                    profiler.record(STAGE_READ, time.perf_counter() - start,
+                                    len(texts[0]) + len(texts[1]))
+                item = PrefetchedPair(asr_file, ref_file, texts, None)
+            _fill()
+            yield item
+    finally:
+        for _, _, future in window:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -6,8 +6,19 @@
 """
 
 import re
+import time
 import unicodedata
-from typing import List, Callable, Tuple, Any, Optional
+from functools import partial
+from typing import TYPE_CHECKING, List, Callable, Tuple, Any, Optional
+
+if TYPE_CHECKING:
+    from cer_tool.profiling import StageProfiler
+
+
+# 预编译的正则表达式（各步骤与编译后的流水线共用）
+_PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+_NUMBER_PATTERN = re.compile(r'[0-9０-９]+')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
 
 
 class PreprocessingStep:
@@ -42,6 +53,48 @@ class PreprocessingStep:
         """设置步骤是否启用"""
         self.enabled = enabled
     
+    def as_callable(self) -> Callable[[str], str]:
+        """
+        返回该步骤的纯变换函数（不含启用状态检查），供编译流水线使用
+
+        Returns:
+            Callable[[str], str]: 文本变换函数
+        """
+        return self.process
+
+    def process_batch(self, texts: List[str]) -> List[str]:
+        """
+        批量处理文本，结果与逐条调用 process 一致
+
+        默认逐条处理；依赖分词器的步骤覆盖此方法，整批交给分词器的批量接口
+
+        Args:
+            texts: 输入文本列表
+
+        Returns:
+            处理后的文本列表
+        """
+        return [self.process(text) for text in texts]
+
+    def as_batch_callable(self) -> Callable[[List[str]], List[str]]:
+        """
+        返回该步骤的批量变换函数（不含启用状态检查），供编译批量流水线使用
+
+        Returns:
+            Callable[[List[str]], List[str]]: 批量文本变换函数
+        """
+        func = self.as_callable()
+        return lambda texts: [func(text) for text in texts]
+
+    def fingerprint(self) -> str:
+        """
+        返回描述该步骤行为的稳定字符串，用于结果缓存的键
+
+        Returns:
+            str: 步骤指纹
+        """
+        return f"{type(self).__name__}:{self.name}"
+
     def __repr__(self):
         status = "启用" if self.enabled else "禁用"
         return f"{self.name} [{status}]"
@@ -56,7 +109,10 @@ class RemovePunctuationStep(PreprocessingStep):
     def process(self, text: str) -> str:
         if not self.enabled:
             return text
-        return re.sub(r'[^\w\s]', '', text)
+        return _PUNCTUATION_PATTERN.sub('', text)
+
+    def as_callable(self) -> Callable[[str], str]:
+        return partial(_PUNCTUATION_PATTERN.sub, '')
 
 
 class NormalizeWidthStep(PreprocessingStep):
@@ -70,6 +126,9 @@ class NormalizeWidthStep(PreprocessingStep):
             return text
         return unicodedata.normalize('NFKC', text)
 
+    def as_callable(self) -> Callable[[str], str]:
+        return partial(unicodedata.normalize, 'NFKC')
+
 
 class NormalizeNumbersStep(PreprocessingStep):
     """数字归一步骤"""
@@ -80,7 +139,10 @@ class NormalizeNumbersStep(PreprocessingStep):
     def process(self, text: str) -> str:
         if not self.enabled:
             return text
-        return re.sub(r'[0-9０-９]+', '0', text)
+        return _NUMBER_PATTERN.sub('0', text)
+
+    def as_callable(self) -> Callable[[str], str]:
+        return partial(_NUMBER_PATTERN.sub, '0')
 
 
 class NormalizeWhitespaceStep(PreprocessingStep):
@@ -92,7 +154,10 @@ class NormalizeWhitespaceStep(PreprocessingStep):
     def process(self, text: str) -> str:
         if not self.enabled:
             return text
-        return re.sub(r'\s+', '', text)
+        return _WHITESPACE_PATTERN.sub('', text)
+
+    def as_callable(self) -> Callable[[str], str]:
+        return partial(_WHITESPACE_PATTERN.sub, '')
 
 
 class LowercaseStep(PreprocessingStep):
@@ -106,6 +171,9 @@ class LowercaseStep(PreprocessingStep):
             return text
         return text.lower()
 
+    def as_callable(self) -> Callable[[str], str]:
+        return str.lower
+
 
 class FilterFillerWordsStep(PreprocessingStep):
     """过滤语气词步骤"""
@@ -126,14 +194,7 @@ class FilterFillerWordsStep(PreprocessingStep):
         try:
             if self.tokenizer:
                 # 使用分词器进行词性标注
-                words_pos = self.tokenizer.posseg(text)
-                filtered_words = []
-                for word, flag in words_pos:
-                    # 过滤语气词
-                    if word in self.filler_words or flag == 'y':
-                        continue
-                    filtered_words.append(word)
-                return "".join(filtered_words)
+                return self._join_kept_words(self.tokenizer.posseg(text))
             else:
                 # 简单的词表过滤
                 result = text
@@ -144,6 +205,36 @@ class FilterFillerWordsStep(PreprocessingStep):
             print(f"警告: 语气词过滤失败: {str(e)}")
             return text
 
+    def _join_kept_words(self, words_pos: List[Tuple[str, str]]) -> str:
+        """去掉语气词（词表命中或词性为 y）后重新拼接"""
+        return "".join(word for word, flag in words_pos
+                       if word not in self.filler_words and flag != 'y')
+
+    def process_batch(self, texts: List[str]) -> List[str]:
+        if not self.enabled:
+            return list(texts)
+        if not self.tokenizer:
+            return [self.process(text) for text in texts]
+
+        results = ["" for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text.strip()]
+        try:
+            # 整批文本一次交给分词器做词性标注
+            tagged = self.tokenizer.posseg_batch([texts[i] for i in indices])
+        except Exception as e:
+            print(f"警告: 批量语气词过滤失败，改为逐条处理: {str(e)}")
+            return [self.process(text) for text in texts]
+        for i, words_pos in zip(indices, tagged):
+            results[i] = self._join_kept_words(words_pos)
+        return results
+
+    def as_batch_callable(self) -> Callable[[List[str]], List[str]]:
+        return self.process_batch
+
+    def fingerprint(self) -> str:
+        # 语气词表变化会改变过滤结果
+        return f"{super().fingerprint()}:{','.join(self.filler_words)}"
+
 
 class ChineseTokenizeStep(PreprocessingStep):
     """中文分词步骤"""
@@ -166,6 +257,24 @@ class ChineseTokenizeStep(PreprocessingStep):
             print(f"警告: 分词失败: {str(e)}")
             return text
 
+    def process_batch(self, texts: List[str]) -> List[str]:
+        if not self.enabled or not self.tokenizer:
+            return list(texts)
+
+        results = [text.strip() if text else text for text in texts]
+        indices = [i for i, text in enumerate(texts) if text and len(text.strip()) > 2]
+        try:
+            words_batch = self.tokenizer.cut_batch([texts[i] for i in indices])
+        except Exception as e:
+            print(f"警告: 批量分词失败，改为逐条处理: {str(e)}")
+            return [self.process(text) for text in texts]
+        for i, words in zip(indices, words_batch):
+            results[i] = "".join(words)
+        return results
+
+    def as_batch_callable(self) -> Callable[[List[str]], List[str]]:
+        return self.process_batch
+
 
 class CustomFunctionStep(PreprocessingStep):
     """自定义函数步骤"""
@@ -179,6 +288,9 @@ class CustomFunctionStep(PreprocessingStep):
             return text
         return self.func(text)
 
+    def fingerprint(self) -> str:
+        return f"{super().fingerprint()}:{getattr(self.func, '__qualname__', repr(self.func))}"
+
 
 class PreprocessingPipeline:
     """
@@ -274,6 +386,111 @@ class PreprocessingPipeline:
                 result = step.process(result)
         return result
     
+    def compile(self, profiler: Optional['StageProfiler'] = None) -> Callable[[str], str]:
+        """
+        将流水线编译为固定的可调用对象
+
+        编译时即剔除禁用步骤，并将各步骤替换为其纯变换函数（如预编译正则的 sub），
+        执行时不再逐步检查启用状态、也不经过 step.process 的方法分派。
+        编译结果是当前步骤配置的快照，之后对流水线的增删改不会影响它。
+
+        Args:
+            profiler: 可选的 StageProfiler，给出时逐步骤计时（阶段名为 "预处理/步骤名"）
+
+        Returns:
+            Callable[[str], str]: 等价于 process 的文本处理函数
+        """
+        if profiler is not None:
+            return self._compile_profiled(profiler)
+
+        funcs = tuple(step.as_callable() for step in self.steps if step.enabled)
+
+        def compiled(text: str) -> str:
+            for func in funcs:
+                text = func(text)
+            return text
+
+        return compiled
+
+    def process_batch(self, texts: List[str]) -> List[str]:
+        """
+        批量执行完整的预处理流水线，每个步骤处理整批文本后再进入下一步骤
+
+        Args:
+            texts: 输入文本列表
+
+        Returns:
+            处理后的文本列表，与逐条调用 process 一致
+        """
+        results = list(texts)
+        for step in self.steps:
+            if step.enabled:
+                results = step.process_batch(results)
+        return results
+
+    def compile_batch(self, profiler: Optional['StageProfiler'] = None
+                      ) -> Callable[[List[str]], List[str]]:
+        """
+        将流水线编译为批量版本的可调用对象（语义同 compile）
+
+        依赖分词器的步骤把整批文本一次交给分词器的批量接口（如 HanLP 批量推理）
+
+        Args:
+            profiler: 可选的 StageProfiler，给出时逐步骤计时（每批记录一次）
+
+        Returns:
+            Callable[[List[str]], List[str]]: 等价于 process_batch 的批量处理函数
+        """
+        stages = tuple((step.name, step.as_batch_callable()) for step in self.steps if step.enabled)
+
+        if profiler is None:
+            def compiled(texts: List[str]) -> List[str]:
+                texts = list(texts)
+                for _, func in stages:
+                    texts = func(texts)
+                return texts
+            return compiled
+
+        from cer_tool.profiling import preprocess_stage
+        profiled = tuple((preprocess_stage(name), func) for name, func in stages)
+
+        def compiled_profiled(texts: List[str]) -> List[str]:
+            texts = list(texts)
+            for stage, func in profiled:
+                start = time.perf_counter()
+                chars = sum(len(text) for text in texts)
+                texts = func(texts)
+                profiler.record(stage, time.perf_counter() - start, chars)
+            return texts
+
+        return compiled_profiled
+
+    def fingerprint(self) -> str:
+        """
+        返回启用步骤的指纹序列，步骤或顺序变化时指纹随之变化
+
+        Returns:
+            str: 流水线指纹
+        """
+        return "|".join(step.fingerprint() for step in self.steps if step.enabled)
+
+    def _compile_profiled(self, profiler: 'StageProfiler') -> Callable[[str], str]:
+        """编译带逐步骤计时的流水线（仅在启用性能剖析时使用）"""
+        from cer_tool.profiling import preprocess_stage
+
+        stages = tuple((preprocess_stage(step.name), step.as_callable())
+                       for step in self.steps if step.enabled)
+
+        def compiled(text: str) -> str:
+            for stage, func in stages:
+                start = time.perf_counter()
+                chars = len(text)
+                text = func(text)
+                profiler.record(stage, time.perf_counter() - start, chars)
+            return text
+
+        return compiled
+
     def get_steps(self) -> List[PreprocessingStep]:
         """获取所有步骤"""
         return self.steps.copy()
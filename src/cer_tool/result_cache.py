@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结果缓存模块
+以 (评估配置指纹, 参考文本, 假设文本) 的 SHA-256 为键，把单对评估结果持久化到 SQLite。
+重复运行时未变化的文本对直接从磁盘读取；每条结果写入后立即提交，
+中断的批处理再次运行时从已完成的位置继续
+"""
+
+import hashlib
+import json
+import sqlite3
+from typing import Any, Dict, Optional
+
+# SQLite 等待其他进程释放写锁的秒数（--jobs 并行时多个进程共用同一个缓存文件）
+CACHE_TIMEOUT = 30.0
+
+
+def make_cache_key(fingerprint: str, reference: str, hypothesis: str) -> str:
+    """
+    计算缓存键
+
+    Args:
+        fingerprint (str): 评估配置指纹（分词器、流水线、工具版本等）
+        reference (str): 参考文本
+        hypothesis (str): 假设文本
+
+    Returns:
+        str: 十六进制 SHA-256 摘要
+    """
+    digest = hashlib.sha256()
+    for part in (fingerprint, reference, hypothesis):
+        data = part.encode('utf-8')
+        # 长度前缀避免不同拆分拼接出相同的字节序列
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    基于 SQLite 的评估结果缓存（支持 with 语句）
+
+    用法：
+        with ResultCache("cer_cache.sqlite") as cache:
+            result = cache.get(key)
+            if result is None:
+                cache.put(key, compute())
+    """
+
+    def __init__(self, cache_file: str):
+        """
+        打开（必要时创建）缓存数据库
+
+        Args:
+            cache_file (str): SQLite 数据库文件路径
+        """
+        self.cache_file = cache_file
+        self.hits = 0
+        self.misses = 0
+        # 每个连接只由一个线程使用，但线程池模式下由主线程统一关闭
+        self._conn = sqlite3.connect(cache_file, timeout=CACHE_TIMEOUT, check_same_thread=False)
+        # WAL 模式允许并行进程读写；NORMAL 同步级别下每次提交不强制刷盘
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存结果
+
+        Args:
+            key (str): 缓存键
+
+        Returns:
+            Optional[dict]: 缓存的结果字典，未命中返回 None
+        """
+        row = self._conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        result: Dict[str, Any] = json.loads(row[0])
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        写入结果并立即提交
+
+        Args:
+            key (str): 缓存键
+            result (dict): 结果字典（需可 JSON 序列化）
+        """
+        self._conn.execute("INSERT OR REPLACE INTO results (key, result) VALUES (?, ?)",
+                           (key, json.dumps(result, ensure_ascii=False)))
+        self._conn.commit()
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._conn.execute("DELETE FROM results")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        count: int = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return count
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self._conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __repr__(self) -> str:
+        return f"ResultCache(file={self.cache_file}, hits={self.hits}, misses={self.misses})"
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式结果写出模块
+批处理时每算完一对就追加一条记录（JSONL / CSV / TSV），定期刷新缓冲；
+汇总在关闭时写入：JSONL 追加一条 summary 记录，CSV / TSV 写到 .summary.json 旁路文件；
+批处理因异常中断时汇总标记 "complete": false，不会被误认为完整运行的结果。
+内存占用与文件对数量无关，进程崩溃时最多丢失一个缓冲区的记录
+"""
+
+import csv
+import json
+from typing import Any, Dict, List, Optional
+
+from cer_tool import __version__
+from cer_tool.aggregation import CorpusAccumulator
+
+# 支持流式写出的格式
+STREAM_FORMATS = ('jsonl', 'csv', 'tsv')
+
+# 默认每写出多少条记录刷新一次缓冲
+DEFAULT_FLUSH_EVERY = 100
+
+# CSV / TSV 列定义
+RESULT_FIELDNAMES = [
+    'asr_file', 'ref_file', 'tokenizer',
+    'cer', 'wer', 'accuracy',
+    'substitutions', 'deletions', 'insertions',
+    'ref_length', 'hyp_length',
+    'filter_fillers'
+]
+TRIAGE_FIELDNAMES = [
+    'asr_file', 'ref_file', 'tokenizer',
+    'cer', 'over_threshold', 'max_cer', 'max_distance',
+    'filter_fillers'
+]
+
+
+def is_triage_result(result: Dict[str, Any]) -> bool:
+    """判断结果是否来自阈值判定模式"""
+    return 'over_threshold' in result
+
+
+def summary_sidecar_path(output_file: str) -> str:
+    """CSV / TSV 汇总旁路文件路径"""
+    return f"{output_file}.summary.json"
+
+
+class StreamingResultWriter:
+    """
+    流式结果写出器（支持 with 语句）
+
+    用法：
+        with StreamingResultWriter("results.jsonl") as writer:
+            for result in results:
+                writer.write(result)
+    """
+
+    def __init__(self, output_file: str, output_format: str = "jsonl",
+                 flush_every: int = DEFAULT_FLUSH_EVERY):
+        """
+        打开输出文件
+
+        Args:
+            output_file (str): 输出文件路径
+            output_format (str): 输出格式 (jsonl/csv/tsv)
+            flush_every (int): 每写出多少条记录刷新一次缓冲
+
+        Raises:
+            ValueError: 格式不支持流式写出
+        """
+        if output_format not in STREAM_FORMATS:
+            raise ValueError(f"不支持流式写出的格式: {output_format}，"
+                             f"可选: {', '.join(STREAM_FORMATS)}")
+        self.output_file = output_file
+        self.output_format = output_format
+        self.flush_every = max(1, flush_every)
+        self.accumulator = CorpusAccumulator()
+        self.count = 0
+        self.over_threshold = 0
+        self.triage_limits: Optional[Dict[str, Any]] = None
+        self.closed = False
+        self._csv_writer: Optional[csv.DictWriter] = None
+        newline = '' if output_format != 'jsonl' else None
+        self._file = open(output_file, 'w', encoding='utf-8', newline=newline)
+
+    def write(self, result: Dict[str, Any]) -> None:
+        """
+        追加一条结果记录，并累加到汇总
+
+        Args:
+            result (dict): 单个文件对的结果字典
+        """
+        if self.output_format == 'jsonl':
+            self._file.write(json.dumps(result, ensure_ascii=False))
+            self._file.write('\n')
+        else:
+            if self._csv_writer is None:
+                # 列定义由第一条记录决定（阈值判定模式列不同）
+                fieldnames = TRIAGE_FIELDNAMES if is_triage_result(result) else RESULT_FIELDNAMES
+                delimiter = '\t' if self.output_format == 'tsv' else ','
+                self._csv_writer = csv.DictWriter(self._file, fieldnames=fieldnames,
+                                                  delimiter=delimiter, extrasaction='ignore')
+                self._csv_writer.writeheader()
+            self._csv_writer.writerow(result)
+
+        if is_triage_result(result):
+            self.over_threshold += result['over_threshold']
+            self.triage_limits = {'max_cer': result['max_cer'],
+                                  'max_distance': result['max_distance']}
+        else:
+            self.accumulator.add_result(result)
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def write_all(self, results: List[Dict[str, Any]]) -> None:
+        """
+        依次写出多条结果记录
+
+        Args:
+            results (List[dict]): 结果列表
+        """
+        for result in results:
+            self.write(result)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        已写出记录的汇总
+
+        Returns:
+            dict: 与 JSON 输出 summary 字段相同格式的汇总
+        """
+        if self.triage_limits is not None:
+            return {
+                "total_pairs": self.count,
+                "over_threshold": self.over_threshold,
+                **self.triage_limits,
+            }
+        return self.accumulator.summary()
+
+    def close(self, complete: bool = True) -> None:
+        """
+        写入汇总并关闭文件
+
+        Args:
+            complete (bool): 批处理是否正常结束，False 时汇总标记为不完整
+        """
+        if self.closed:
+            return
+        self.closed = True
+        trailer = {
+            "tool": "CER-Analysis-Tool",
+            "version": __version__,
+            "complete": complete,
+            "summary": self.summary(),
+        }
+        if self.output_format == 'jsonl':
+            self._file.write(json.dumps(trailer, ensure_ascii=False))
+            self._file.write('\n')
+            self._file.close()
+            return
+        self._file.close()
+        with open(summary_sidecar_path(self.output_file), 'w', encoding='utf-8') as f:
+            json.dump(trailer, f, ensure_ascii=False, indent=2)
+
+    def __enter__(self) -> "StreamingResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 写出过程中抛出异常（含 Ctrl+C）时已写出的只是部分结果
+        self.close(complete=exc_type is None)
+        return False
@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻评估服务模块
+cer-tool serve 启动一个常驻进程，通过 Unix 域套接字提供评估服务：
+分词器与评估会话只加载一次，之后的 CLI 调用（--server auto）把文本对交给服务计算，
+不再为每次调用重新导入模型库、加载模型（HanLP 每次需要 10～30 秒）。
+
+协议：每条消息为 4 字节大端无符号长度 + UTF-8 JSON 对象；
+一个连接上可以依次发送多条请求，服务按顺序逐条应答。
+    {"op": "ping"}                          → {"ok": true, "version": ..., "pid": ..., "sessions": n}
+    {"op": "session", "config": {...}}      → {"ok": true, "tokenizer": ..., "backend": ..., "version": ...}
+    {"op": "evaluate", "config": {...}, "pairs": [[参考, 假设], ...]}
+                                            → {"ok": true, "results": [...]}
+    {"op": "shutdown"}                      → {"ok": true}
+失败时应答 {"ok": false, "error": "..."}
+
+Unix 域套接字不可用的平台（如旧版 Windows）上导入本模块不会失败：
+connect_session 返回 None、server_available 返回 False，调用方回退到本地计算
+"""
+
+import argparse
+import getpass
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, cast
+
+from cer_tool import __version__
+from cer_tool.profiling import STAGE_EVALUATE, StageProfiler
+from cer_tool.session import SESSION_BATCH_SIZE, EvaluationSession
+
+# 套接字路径环境变量（未设置时使用 $XDG_RUNTIME_DIR 或临时目录下的 cer-tool-<用户名>.sock）
+SOCKET_ENV = 'CER_TOOL_SOCKET'
+
+# 消息头：4 字节大端无符号长度
+_HEADER = struct.Struct('>I')
+
+# 单条消息的最大字节数（防止异常长度字段导致一次分配过多内存）
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+
+# 客户端连接超时（秒）：服务未运行时应尽快回退到本地计算
+CONNECT_TIMEOUT = 1.0
+
+# 影响评估结果的会话配置项（服务按配置复用会话）
+_CONFIG_KEYS = ('tokenizer', 'filter_fillers', 'segmented', 'max_cer', 'max_distance', 'cache_file')
+
+
+class ServerError(RuntimeError):
+    """服务不可用或返回错误"""
+
+
+def unix_sockets_supported() -> bool:
+    """当前平台是否支持 Unix 域套接字"""
+    return hasattr(socket, 'AF_UNIX') and hasattr(socketserver, 'UnixStreamServer')
+
+
+def default_socket_path() -> str:
+    """默认套接字路径"""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(base, f"cer-tool-{getpass.getuser()}.sock")
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ConnectionError("连接在消息中途关闭")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """
+    发送一条消息
+
+    Args:
+        sock (socket.socket): 已连接的套接字
+        message (Dict[str, Any]): 可 JSON 序列化的对象
+    """
+    data = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    if len(data) > MAX_MESSAGE_BYTES:
+        raise ValueError(f"消息过大: {len(data)} 字节")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+    接收一条消息
+
+    Args:
+        sock (socket.socket): 已连接的套接字
+
+    Returns:
+        Optional[Dict[str, Any]]: 消息对象，对端在消息边界关闭连接时返回 None
+
+    Raises:
+        ConnectionError: 连接在消息中途关闭
+        ValueError: 长度字段超限或内容不是 JSON 对象
+    """
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_MESSAGE_BYTES:
+        raise ValueError(f"消息过大: {size} 字节")
+    data = _recv_exact(sock, size) if size else b''
+    if data is None:
+        raise ConnectionError("连接在消息中途关闭")
+    message = json.loads(data.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError("消息必须是 JSON 对象")
+    return message
+
+
+def _session_config(tokenizer: str, filter_fillers: bool, segmented: bool,
+                    max_cer: Optional[float], max_distance: Optional[int],
+                    cache_file: Optional[str]) -> Dict[str, Any]:
+    # 缓存文件按绝对路径传给服务（服务进程的工作目录可能不同）
+    return {
+        'tokenizer': tokenizer,
+        'filter_fillers': filter_fillers,
+        'segmented': segmented,
+        'max_cer': max_cer,
+        'max_distance': max_distance,
+        'cache_file': os.path.abspath(cache_file) if cache_file else None,
+    }
+
+
+class EvaluationServer:
+    """
+    服务端状态：按配置缓存评估会话
+
+    不同配置的请求可以并发计算；同一会话的请求由会话锁串行化
+    （会话持有的 SQLite 缓存连接与流水线状态不在线程间并发使用）
+    """
+
+    def __init__(self):
+        self.sessions: Dict[Tuple, Tuple[EvaluationSession, threading.Lock]] = {}
+        # 正在创建的会话：配置键 → Future，同一配置的并发请求等待同一次创建
+        self._pending: Dict[Tuple, 'Future[Tuple[EvaluationSession, threading.Lock]]'] = {}
+        self._sessions_lock = threading.Lock()
+        self._closed = False
+        self.started = time.time()
+
+    def get_session(self, config: Dict[str, Any]) -> Tuple[EvaluationSession, threading.Lock]:
+        """
+        取得（必要时创建）与配置对应的会话
+
+        全局锁内只登记正在创建的配置，会话（加载分词器模型）在锁外创建：
+        创建新配置的会话时，其他配置的请求与 ping 不被阻塞
+
+        Args:
+            config (Dict[str, Any]): 会话配置（_CONFIG_KEYS）
+
+        Returns:
+            Tuple[EvaluationSession, threading.Lock]: (会话, 会话锁)
+        """
+        key = tuple(config.get(name) for name in _CONFIG_KEYS)
+        with self._sessions_lock:
+            if self._closed:
+                raise RuntimeError("服务已关闭")
+            entry = self.sessions.get(key)
+            if entry is not None:
+                return entry
+            future = self._pending.get(key)
+            creating = future is None
+            if future is None:
+                future = self._pending[key] = Future()
+        if not creating:
+            return future.result()
+
+        try:
+            # 分词器由工厂单例共享，不同配置并发创建时只初始化一次
+            session = EvaluationSession(
+                key[0] or 'jieba', bool(key[1]), segmented=bool(key[2]),
+                max_cer=key[3], max_distance=key[4], cache_file=key[5]
+            )
+        except BaseException as e:
+            # 创建失败不留下登记，后续请求重新尝试
+            with self._sessions_lock:
+                del self._pending[key]
+            future.set_exception(e)
+            raise
+        entry = (session, threading.Lock())
+        with self._sessions_lock:
+            del self._pending[key]
+            closed = self._closed
+            if not closed:
+                self.sessions[key] = entry
+        if closed:
+            session.close()
+            error = RuntimeError("服务已关闭")
+            future.set_exception(error)
+            raise error
+        future.set_result(entry)
+        return entry
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        处理一条请求
+
+        Args:
+            request (Dict[str, Any]): 请求对象
+
+        Returns:
+            Dict[str, Any]: 应答对象
+        """
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'version': __version__, 'pid': os.getpid(),
+                    'sessions': len(self.sessions), 'uptime': time.time() - self.started}
+        if op == 'session':
+            session, _ = self.get_session(request.get('config', {}))
+            return {'ok': True, 'tokenizer': session.tokenizer_name,
+                    'backend': session.backend_name, 'version': __version__}
+        if op == 'evaluate':
+            session, lock = self.get_session(request.get('config', {}))
+            pairs = [(reference, hypothesis) for reference, hypothesis in request.get('pairs', [])]
+            with lock:
+                results = session.evaluate_batch(pairs)
+            return {'ok': True, 'results': results}
+        return {'ok': False, 'error': f"未知操作: {op}"}
+
+    def close(self):
+        """关闭全部会话"""
+        with self._sessions_lock:
+            self._closed = True
+            for session, _ in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """逐条读取请求并应答，直到客户端关闭连接"""
+
+    def handle(self):
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (OSError, ValueError) as e:
+                print(f"警告: 丢弃无效请求: {str(e)}", file=sys.stderr)
+                return
+            if request is None:
+                return
+            if request.get('op') == 'shutdown':
+                # 客户端已断开时照常停止；shutdown() 需在 serve_forever 之外的线程调用
+                self._reply({'ok': True})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            try:
+                response = cast(StatefulServer, self.server).state.handle(request)
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            if not self._reply(response):
+                return
+
+    def _reply(self, response: Dict[str, Any]) -> bool:
+        """发送应答；客户端已断开（BrokenPipeError 等）时返回 False，结束该连接"""
+        try:
+            send_message(self.request, response)
+            return True
+        except OSError:
+            return False
+
+
+class StatefulServer(socketserver.BaseServer):
+    """
+    create_server 返回的服务类型：socketserver 服务附带 EvaluationServer 状态
+
+    具体的 Unix 域套接字服务类在 create_server 中创建，
+    不支持 Unix 域套接字的平台上导入本模块时不会引用 socketserver.UnixStreamServer
+    """
+
+    state: EvaluationServer
+
+
+def _ping(socket_path: str, timeout: float = CONNECT_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """向服务发送 ping，服务未运行（或平台不支持 Unix 域套接字）时返回 None"""
+    if not unix_sockets_supported():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            send_message(sock, {'op': 'ping'})
+            return recv_message(sock)
+    except (OSError, ValueError):
+        return None
+
+
+def server_available(socket_path: Optional[str] = None) -> bool:
+    """
+    检查服务是否在运行且版本与本工具一致
+
+    Args:
+        socket_path (Optional[str]): 套接字路径，None 时使用默认路径
+
+    Returns:
+        bool: 服务可用
+    """
+    response = _ping(socket_path or default_socket_path())
+    return bool(response and response.get('ok') and response.get('version') == __version__)
+
+
+def create_server(socket_path: str) -> StatefulServer:
+    """
+    绑定套接字并创建服务（不开始服务循环）
+
+    Args:
+        socket_path (str): 套接字路径
+
+    Returns:
+        StatefulServer: 服务对象，state 属性为 EvaluationServer
+
+    Raises:
+        ServerError: 已有服务在运行，或平台不支持 Unix 域套接字
+    """
+    if not unix_sockets_supported():
+        raise ServerError("当前平台不支持 Unix 域套接字")
+
+    class UnixEvaluationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer,
+                               StatefulServer):
+        daemon_threads = True
+
+        def __init__(self, server_address: str, state: EvaluationServer):
+            self.state = state
+            super().__init__(server_address, _RequestHandler)
+
+    if os.path.exists(socket_path):
+        if _ping(socket_path) is not None:
+            raise ServerError(f"服务已在运行: {socket_path}")
+        # 上次异常退出遗留的套接字文件
+        os.unlink(socket_path)
+    state = EvaluationServer()
+    # 套接字文件在 bind 时即只有当前用户可访问，其他用户没有可连接的时间窗口
+    old_umask = os.umask(0o077)
+    try:
+        return UnixEvaluationServer(socket_path, state)
+    finally:
+        os.umask(old_umask)
+
+
+def serve(socket_path: Optional[str] = None, preload: Iterable[str] = ()) -> None:
+    """
+    运行服务直到收到 shutdown 请求或 Ctrl+C
+
+    Args:
+        socket_path (Optional[str]): 套接字路径，None 时使用默认路径
+        preload (Iterable[str]): 启动时预先加载的分词器名称
+    """
+    socket_path = socket_path or default_socket_path()
+    server = create_server(socket_path)
+    try:
+        for name in preload:
+            started = time.perf_counter()
+            server.state.handle({'op': 'session', 'config': {'tokenizer': name}})
+            print(f"已加载分词器 {name}（{time.perf_counter() - started:.1f}s）", file=sys.stderr)
+        print(f"CER-Analysis-Tool {__version__} 评估服务已启动: {socket_path}", file=sys.stderr)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.state.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+class RemoteSession:
+    """
+    通过常驻服务计算的评估会话，提供 CLI 使用的 EvaluationSession 接口
+    （evaluate / evaluate_many / close 与会话配置属性）
+    """
+
+    def __init__(self, socket_path: str, tokenizer_name: str = "jieba",
+                 filter_fillers: bool = False, segmented: bool = False,
+                 max_cer: Optional[float] = None, max_distance: Optional[int] = None,
+                 cache_file: Optional[str] = None,
+                 profiler: Optional[StageProfiler] = None):
+        """
+        连接服务并在服务端准备会话
+
+        Args:
+            socket_path (str): 套接字路径
+            其余参数同 EvaluationSession；cache_file 由服务进程打开
+
+        Raises:
+            ServerError: 连接失败或服务端创建会话失败
+        """
+        self.socket_path = socket_path
+        self.filter_fillers = filter_fillers
+        self.segmented = segmented
+        self.max_cer = max_cer
+        self.max_distance = max_distance
+        self.profiler = profiler
+        self.closed = False
+        self._config = _session_config(tokenizer_name, filter_fillers, segmented,
+                                       max_cer, max_distance, cache_file)
+        self._configs: Dict[bool, Dict[str, Any]] = {filter_fillers: self._config}
+        if not unix_sockets_supported():
+            raise ServerError("当前平台不支持 Unix 域套接字")
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(CONNECT_TIMEOUT)
+            self._sock.connect(socket_path)
+            # 连接建立后不再限时（服务端首次加载分词器可能需要较长时间）
+            self._sock.settimeout(None)
+        except OSError as e:
+            self._sock.close()
+            raise ServerError(f"无法连接评估服务 {socket_path}: {str(e)}")
+        try:
+            response = self._request({'op': 'session', 'config': self._config})
+        except ServerError:
+            self.close()
+            raise
+        self.tokenizer_name = response['tokenizer']
+        self.backend_name = response['backend']
+        self.server_version = response.get('version')
+
+    @property
+    def triage(self) -> bool:
+        """是否为阈值判定模式"""
+        return self.max_cer is not None or self.max_distance is not None
+
+    def _request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if self.closed:
+            raise RuntimeError("评估会话已关闭")
+        try:
+            send_message(self._sock, request)
+            response = recv_message(self._sock)
+        except (OSError, ValueError) as e:
+            raise ServerError(f"评估服务通信失败: {str(e)}")
+        if response is None:
+            raise ServerError("评估服务已断开连接")
+        if not response.get('ok'):
+            raise ServerError(response.get('error', '评估服务返回错误'))
+        return response
+
+    def _config_for(self, filter_fillers: Optional[bool]) -> Dict[str, Any]:
+        if filter_fillers is None:
+            return self._config
+        config = self._configs.get(filter_fillers)
+        if config is None:
+            config = self._configs[filter_fillers] = dict(self._config,
+                                                          filter_fillers=filter_fillers)
+        return config
+
+    def evaluate_batch(self, pairs: Sequence[Tuple[str, str]],
+                       filter_fillers: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        一次往返评估多对文本
+
+        Args:
+            pairs (Sequence[Tuple[str, str]]): (参考文本, 假设文本) 列表
+            filter_fillers (Optional[bool]): 是否过滤语气词，None 时使用会话默认值
+
+        Returns:
+            List[dict]: 与输入一一对应的指标字典
+        """
+        if self.profiler is not None:
+            start = time.perf_counter()
+        response = self._request({'op': 'evaluate', 'config': self._config_for(filter_fillers),
+                                  'pairs': [list(pair) for pair in pairs]})
+        if self.profiler is not None:
+            self.profiler.record(STAGE_EVALUATE, time.perf_counter() - start,
+                                 sum(len(ref) + len(hyp) for ref, hyp in pairs))
+        results: List[Dict[str, Any]] = response['results']
+        return results
+
+    def evaluate(self, pair: Tuple[str, str],
+                 filter_fillers: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        评估一对文本（结果格式同 EvaluationSession.evaluate）
+
+        Args:
+            pair (Tuple[str, str]): (参考文本, 假设文本)
+            filter_fillers (Optional[bool]): 是否过滤语气词，None 时使用会话默认值
+
+        Returns:
+            dict: 指标字典
+        """
+        return self.evaluate_batch([pair], filter_fillers)[0]
+
+    def evaluate_many(self, pairs: Iterable[Tuple[str, str]],
+                      filter_fillers: Optional[bool] = None,
+                      batch_size: int = SESSION_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """依次评估多对文本，按输入顺序惰性产出结果（每批一次往返）"""
+        iterator = iter(pairs)
+        while True:
+            batch = list(islice(iterator, max(1, batch_size)))
+            if not batch:
+                return
+            yield from self.evaluate_batch(batch, filter_fillers)
+
+    def close(self):
+        """断开与服务的连接（服务端会话保留，供后续调用复用）"""
+        if not self.closed:
+            self._sock.close()
+        self.closed = True
+
+    def __enter__(self) -> "RemoteSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __repr__(self) -> str:
+        return (f"RemoteSession(socket={self.socket_path}, tokenizer={self.tokenizer_name}, "
+                f"filter_fillers={self.filter_fillers})")
+
+
+def connect_session(socket_path: Optional[str] = None, **session_options) -> Optional[RemoteSession]:
+    """
+    服务在运行且版本一致时返回远程会话，否则返回 None（调用方回退到本地计算）
+
+    直接建立会话，不预先 ping：服务未运行时连接立即失败，可用时省去一次往返
+
+    Args:
+        socket_path (Optional[str]): 套接字路径，None 时使用默认路径
+        **session_options: 传给 RemoteSession 的会话配置
+
+    Returns:
+        Optional[RemoteSession]: 远程会话
+    """
+    if not unix_sockets_supported():
+        return None
+    socket_path = socket_path or default_socket_path()
+    try:
+        session = RemoteSession(socket_path, **session_options)
+    except ServerError as e:
+        if os.path.exists(socket_path):
+            print(f"警告: {str(e)}，改为本地计算", file=sys.stderr)
+        return None
+    if session.server_version != __version__:
+        print(f"警告: 评估服务版本 {session.server_version} 与本工具 {__version__} 不一致，"
+              f"改为本地计算", file=sys.stderr)
+        session.close()
+        return None
+    return session
+
+
+def stop_server(socket_path: Optional[str] = None) -> bool:
+    """
+    请求服务退出
+
+    Args:
+        socket_path (Optional[str]): 套接字路径，None 时使用默认路径
+
+    Returns:
+        bool: 服务已确认退出请求
+    """
+    if not unix_sockets_supported():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(socket_path or default_socket_path())
+            send_message(sock, {'op': 'shutdown'})
+            response = recv_message(sock)
+        return bool(response and response.get('ok'))
+    except (OSError, ValueError):
+        return False
+
+
+def server_main(argv: Optional[List[str]] = None) -> int:
+    """
+    cer-tool serve 子命令入口
+
+    Args:
+        argv (Optional[List[str]]): serve 之后的命令行参数
+
+    Returns:
+        int: 退出码
+    """
+    parser = argparse.ArgumentParser(
+        prog='cer-tool serve',
+        description='常驻评估服务：分词器只加载一次，CLI 通过 --server auto 使用',
+        epilog='''
+示例:
+  # 启动服务并预先加载 HanLP（CI 流水线开始时执行一次）
+  cer-tool serve --preload hanlp &
+
+  # 之后的调用自动使用服务，服务未运行时本地计算
+  cer-tool --asr asr.txt --ref ref.txt --tokenizer hanlp --server auto
+
+  # 查看状态 / 停止服务
+  cer-tool serve --status
+  cer-tool serve --stop
+        ''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--socket', type=str, default=None,
+                        help=f'Unix 域套接字路径 (默认: ${SOCKET_ENV} 或 {default_socket_path()})')
+    parser.add_argument('--preload', type=str, default='',
+                        help='启动时预先加载的分词器，逗号分隔（如 jieba,hanlp）')
+    parser.add_argument('--status', action='store_true', help='查看服务是否在运行')
+    parser.add_argument('--stop', action='store_true', help='停止正在运行的服务')
+    args = parser.parse_args(argv)
+    socket_path = args.socket or default_socket_path()
+
+    if args.status:
+        response = _ping(socket_path)
+        if not response:
+            print(f"评估服务未运行: {socket_path}")
+            return 1
+        print(f"评估服务运行中: {socket_path}")
+        print(f"  版本: {response.get('version')}  进程: {response.get('pid')}  "
+              f"会话数: {response.get('sessions')}  运行时间: {response.get('uptime', 0):.0f}s")
+        return 0
+
+    if args.stop:
+        if stop_server(socket_path):
+            print(f"评估服务已停止: {socket_path}")
+            return 0
+        print(f"评估服务未运行: {socket_path}", file=sys.stderr)
+        return 1
+
+    preload = [name.strip() for name in args.preload.split(',') if name.strip()]
+    try:
+        serve(socket_path, preload)
+    except ServerError as e:
+        print(f"错误: {str(e)}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评估会话模块
+EvaluationSession 持有分词器、编译后的预处理流水线和编辑距离后端，
+创建时一次性解析，之后的每次评估都复用这些热状态；
+CLI、GUI 与库调用方都通过会话完成计算
+"""
+
+import json
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from cer_tool import __version__
+from cer_tool.alignment import LINEAR_SPACE_THRESHOLD, AlignmentResult
+from cer_tool.metrics import ASRMetrics
+from cer_tool.profiling import STAGE_EVALUATE, StageProfiler
+from cer_tool.result_cache import ResultCache, make_cache_key
+
+# evaluate_many 每批预处理的文本对数量（依赖分词器的步骤按批调用分词器）
+SESSION_BATCH_SIZE = 64
+
+
+class EvaluationSession:
+    """
+    可复用的评估会话（支持 with 语句）
+
+    用法：
+        with EvaluationSession(tokenizer_name="jieba") as session:
+            result = session.evaluate((reference, hypothesis))
+            for result in session.evaluate_many(pairs):
+                ...
+            results = session.evaluate_batch([(reference, hypothesis), ...])
+    """
+
+    def __init__(self, tokenizer_name: str = "jieba", filter_fillers: bool = False,
+                 segmented: bool = False,
+                 max_cer: Optional[float] = None,
+                 max_distance: Optional[int] = None,
+                 linear_space_threshold: int = LINEAR_SPACE_THRESHOLD,
+                 cache_file: Optional[str] = None,
+                 profiler: Optional[StageProfiler] = None):
+        """
+        创建会话并解析分词器、预处理流水线与编辑距离后端
+
+        Args:
+            tokenizer_name (str): 分词器名称
+            filter_fillers (bool): 默认是否过滤语气词
+            segmented (bool): 是否使用锚点分段对齐（长文本）
+            max_cer (Optional[float]): CER 上限，指定时 evaluate 进入阈值判定模式
+            max_distance (Optional[int]): 编辑距离上限，指定时 evaluate 进入阈值判定模式
+            linear_space_threshold (int): 回退实现启用线性内存模式的 m·n 阈值
+            cache_file (Optional[str]): 结果缓存（SQLite）路径，None 时不缓存
+            profiler (Optional[StageProfiler]): 性能剖析计时器，None 时不计时
+        """
+        self.metrics = ASRMetrics(tokenizer_name=tokenizer_name,
+                                  linear_space_threshold=linear_space_threshold)
+        self.filter_fillers = filter_fillers
+        self.segmented = segmented
+        self.max_cer = max_cer
+        self.max_distance = max_distance
+        self.closed = False
+        self.cache = ResultCache(cache_file) if cache_file else None
+        self._fingerprints: Dict[bool, str] = {}
+        if profiler is not None:
+            self.metrics.enable_profiling(profiler)
+        # 预先编译默认配置的预处理流水线
+        self.metrics._get_compiled_pipeline(filter_fillers)
+
+    @property
+    def tokenizer_name(self) -> str:
+        """实际使用的分词器名称（初始化失败回退时为 jieba）"""
+        return self.metrics.tokenizer_name
+
+    @property
+    def backend_name(self) -> str:
+        """编辑距离后端名称"""
+        return "python-Levenshtein" if self.metrics.levenshtein is not None else "builtin"
+
+    @property
+    def profiler(self) -> Optional[StageProfiler]:
+        """性能剖析计时器（未启用时为 None）"""
+        return self.metrics.profiler
+
+    @property
+    def triage(self) -> bool:
+        """是否为阈值判定模式"""
+        return self.max_cer is not None or self.max_distance is not None
+
+    def fingerprint(self, filter_fillers: Optional[bool] = None) -> str:
+        """
+        评估配置指纹：任何可能改变结果的设置变化时指纹随之变化
+
+        Args:
+            filter_fillers (Optional[bool]): 是否过滤语气词，None 时使用会话默认值
+
+        Returns:
+            str: 配置指纹（JSON 字符串）
+        """
+        filter_fillers = self._resolve_fillers(filter_fillers)
+        fingerprint = self._fingerprints.get(filter_fillers)
+        if fingerprint is None:
+            fingerprint = json.dumps({
+                'tool_version': __version__,
+                'tokenizer': self.tokenizer_name,
+                'tokenizer_version': self.metrics.get_tokenizer_info().get('version'),
+                'pipeline': self.metrics.get_pipeline_fingerprint(filter_fillers),
+                'filter_fillers': filter_fillers,
+                'backend': self.backend_name,
+                'segmented': self.segmented,
+                'max_cer': self.max_cer,
+                'max_distance': self.max_distance,
+            }, ensure_ascii=False, sort_keys=True)
+            self._fingerprints[filter_fillers] = fingerprint
+        return fingerprint
+
+    def _resolve_fillers(self, filter_fillers: Optional[bool]) -> bool:
+        if self.closed:
+            raise RuntimeError("评估会话已关闭")
+        return self.filter_fillers if filter_fillers is None else filter_fillers
+
+    def align(self, reference: str, hypothesis: str,
+              filter_fillers: Optional[bool] = None) -> AlignmentResult:
+        """
+        对齐一对文本
+
+        Args:
+            reference (str): 参考文本
+            hypothesis (str): 假设文本
+            filter_fillers (Optional[bool]): 是否过滤语气词，None 时使用会话默认值
+
+        Returns:
+            AlignmentResult: 对齐结果
+        """
+        return self.metrics.align(reference, hypothesis, self._resolve_fillers(filter_fillers),
+                                  segmented=self.segmented)
+
+    def align_batch(self, pairs: Sequence[Tuple[str, str]],
+                    filter_fillers: Optional[bool] = None) -> List[AlignmentResult]:
+        """
+        批量对齐多对文本（整批预处理，分词器按批调用）
+
+        Args:
+            pairs (Sequence[Tuple[str, str]]): (参考文本, 假设文本) 列表
+            filter_fillers (Optional[bool]): 是否过滤语气词，None 时使用会话默认值
+
+        Returns:
+            List[AlignmentResult]: 与输入一一对应的对齐结果
+        """
+        return self.metrics.align_batch(pairs, self._resolve_fillers(filter_fillers),
+                                        segmented=self.segmented)
+
+    def evaluate(self, pair: Tuple[str, str],
+                 filter_fillers: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        评估一对文本
+
+        Args:
+            pair (Tuple[str, str]): (参考文本, 假设文本)
+            filter_fillers (Optional[bool]): 是否过滤语气词，None 时使用会话默认值
+
+        Returns:
+            dict: 与 calculate_detailed_metrics 相同格式的指标字典；
+                阈值判定模式下为 cer / over_threshold / max_cer / max_distance / tokenizer
+        """
+        reference, hypothesis = pair
+        filter_fillers = self._resolve_fillers(filter_fillers)
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter()
+
+        if self.cache is None:
+            result = self._evaluate(reference, hypothesis, filter_fillers)
+        else:
+            key = make_cache_key(self.fingerprint(filter_fillers), reference, hypothesis)
+            cached = self.cache.get(key)
+            if cached is None:
+                result = self._evaluate(reference, hypothesis, filter_fillers)
+                self.cache.put(key, result)
+            else:
+                result = cached
+
+        if profiler is not None:
+            profiler.record(STAGE_EVALUATE, time.perf_counter() - start,
+                            len(reference) + len(hypothesis))
+        return result
+
+    def _evaluate(self, reference: str, hypothesis: str, filter_fillers: bool) -> Dict[str, Any]:
+        if self.triage:
+            # 阈值判定模式：超限时 cer 为 None
+            cer = self.metrics.calculate_cer(reference, hypothesis, filter_fillers,
+                                             max_cer=self.max_cer, max_distance=self.max_distance)
+            return {
+                'cer': cer,
+                'over_threshold': cer is None,
+                'max_cer': self.max_cer,
+                'max_distance': self.max_distance,
+                'tokenizer': self.tokenizer_name,
+            }
+        return self.align(reference, hypothesis, filter_fillers).to_metrics()
+
+    def evaluate_batch(self, pairs: Sequence[Tuple[str, str]],
+                       filter_fillers: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        评估多对文本：缓存未命中的文本对整批预处理（分词器按批调用）后逐对对齐
+
+        Args:
+            pairs (Sequence[Tuple[str, str]]): (参考文本, 假设文本) 列表
+            filter_fillers (Optional[bool]): 是否过滤语气词，None 时使用会话默认值
+
+        Returns:
+            List[dict]: 与输入一一对应的指标字典（格式同 evaluate）
+        """
+        filter_fillers = self._resolve_fillers(filter_fillers)
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter()
+
+        if self.cache is None:
+            results = self._evaluate_batch(pairs, filter_fillers)
+        else:
+            fingerprint = self.fingerprint(filter_fillers)
+            keys = [make_cache_key(fingerprint, reference, hypothesis)
+                    for reference, hypothesis in pairs]
+            cached = [self.cache.get(key) for key in keys]
+            missing = [i for i, result in enumerate(cached) if result is None]
+            computed = self._evaluate_batch([pairs[i] for i in missing], filter_fillers)
+            for i, result in zip(missing, computed):
+                self.cache.put(keys[i], result)
+                cached[i] = result
+            results = [result for result in cached if result is not None]
+
+        if profiler is not None:
+            profiler.record(STAGE_EVALUATE, time.perf_counter() - start,
+                            sum(len(reference) + len(hypothesis) for reference, hypothesis in pairs))
+        return results
+
+    def _evaluate_batch(self, pairs: Sequence[Tuple[str, str]],
+                        filter_fillers: bool) -> List[Dict[str, Any]]:
+        if not pairs:
+            return []
+        if self.triage:
+            cers = self.metrics.calculate_cer_batch(pairs, filter_fillers, max_cer=self.max_cer,
+                                                    max_distance=self.max_distance)
+            return [{
+                'cer': cer,
+                'over_threshold': cer is None,
+                'max_cer': self.max_cer,
+                'max_distance': self.max_distance,
+                'tokenizer': self.tokenizer_name,
+            } for cer in cers]
+        return [alignment.to_metrics() for alignment in
+                self.metrics.align_batch(pairs, filter_fillers, segmented=self.segmented)]
+
+    def evaluate_many(self, pairs: Iterable[Tuple[str, str]],
+                      filter_fillers: Optional[bool] = None,
+                      batch_size: int = SESSION_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        评估多对文本，按输入顺序惰性产出结果
+
+        输入每次取 batch_size 对交给 evaluate_batch，最多提前读取一批
+
+        Args:
+            pairs (Iterable[Tuple[str, str]]): (参考文本, 假设文本) 序列
+            filter_fillers (Optional[bool]): 是否过滤语气词，None 时使用会话默认值
+            batch_size (int): 每批的文本对数量
+
+        Yields:
+            dict: 每对文本的指标字典
+        """
+        iterator = iter(pairs)
+        while True:
+            batch = list(islice(iterator, max(1, batch_size)))
+            if not batch:
+                return
+            yield from self.evaluate_batch(batch, filter_fillers)
+
+    def close(self):
+        """关闭会话（同时关闭结果缓存）"""
+        if self.cache is not None and not self.closed:
+            self.cache.close()
+        self.closed = True
+
+    def __enter__(self) -> "EvaluationSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __repr__(self) -> str:
+        return (f"EvaluationSession(tokenizer={self.tokenizer_name}, "
+                f"backend={self.backend_name}, filter_fillers={self.filter_fillers})")
@@ -13,6 +13,9 @@ from .base import (
     TokenizerProcessError
 )
 
+# 分词结果缓存
+from .cache import TokenizerOutputCache
+
 # 导入具体分词器实现
 from .jieba_tokenizer import JiebaTokenizer
 from .thulac_tokenizer import ThulacTokenizer
@@ -26,15 +29,20 @@ from .factory import (
     get_available_tokenizers, 
     get_tokenizer, 
     get_tokenizer_info,
+    get_tokenizer_metadata,
     get_cached_tokenizer_info
 )
 
+# 可用性探测缓存
+from .probe import probe_tokenizer, clear_probe_cache
+
 # 导出模块
 __all__ = [
     'BaseTokenizer',
     'TokenizerError', 
     'TokenizerInitError',
     'TokenizerProcessError',
+    'TokenizerOutputCache',
     'JiebaTokenizer',
     'ThulacTokenizer', 
     'HanlpTokenizer',
@@ -42,5 +50,8 @@ __all__ = [
     'get_available_tokenizers',
     'get_tokenizer',
     'get_tokenizer_info',
-    'get_cached_tokenizer_info'
+    'get_tokenizer_metadata',
+    'get_cached_tokenizer_info',
+    'probe_tokenizer',
+    'clear_probe_cache'
 ]
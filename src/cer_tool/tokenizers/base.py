@@ -4,7 +4,15 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional, Sequence
+
+from .cache import DEFAULT_CACHE_CHARS, DEFAULT_CACHE_ENTRIES, TokenizerOutputCache
+
+# 可被缓存的分词方法
+CACHED_METHODS = ('cut', 'posseg', 'tokenize')
+
+# 批量分词方法 → 对应的单条分词方法
+BATCH_METHODS = {'cut_batch': 'cut', 'posseg_batch': 'posseg', 'tokenize_batch': 'tokenize'}
 
 
 class TokenizerError(Exception):
@@ -28,10 +36,69 @@ class BaseTokenizer(ABC):
     定义所有分词器必须实现的接口
     """
     
+    # 依赖包的导入名与发行包名（用于不初始化的可用性探测），None 表示无外部依赖
+    package: Optional[str] = None
+    distribution: Optional[str] = None
+
     def __init__(self):
         self.name = self.__class__.__name__.replace('Tokenizer', '').lower()
         self.is_initialized = False
         self.version = "unknown"
+        self.output_cache: Optional[TokenizerOutputCache] = None
+
+    def enable_cache(self, max_entries: int = DEFAULT_CACHE_ENTRIES,
+                     max_chars: int = DEFAULT_CACHE_CHARS) -> TokenizerOutputCache:
+        """
+        启用分词结果缓存（cut / posseg / tokenize 按输入文本记忆输出）
+
+        分词结果只取决于输入文本与词典；修改词典后需调用 clear_cache()。
+        已按相同上限启用时直接返回现有缓存，不丢弃已缓存的结果
+
+        Args:
+            max_entries (int): 最多缓存的条目数
+            max_chars (int): 最多缓存的输入字符总数
+
+        Returns:
+            TokenizerOutputCache: 缓存对象
+        """
+        cache = self.output_cache
+        if cache is not None and (cache.max_entries, cache.max_chars) == (max_entries, max_chars):
+            return cache
+        self.disable_cache()
+        cache = TokenizerOutputCache(max_entries, max_chars)
+        for method in CACHED_METHODS:
+            # 以实例属性覆盖类方法，子类实现无需改动
+            uncached = getattr(type(self), method).__get__(self)
+            setattr(self, method, cache.wrap(method, uncached))
+        for batch_method, method in BATCH_METHODS.items():
+            # 默认的批量实现逐条调用（已缓存的）单条方法；子类的原生批量实现只对未命中的文本调用
+            if getattr(type(self), batch_method) is not getattr(BaseTokenizer, batch_method):
+                uncached = getattr(type(self), batch_method).__get__(self)
+                setattr(self, batch_method, cache.wrap_batch(method, uncached))
+        self.output_cache = cache
+        return cache
+
+    def disable_cache(self) -> None:
+        """停用分词结果缓存"""
+        for method in CACHED_METHODS + tuple(BATCH_METHODS):
+            self.__dict__.pop(method, None)
+        self.output_cache = None
+
+    def clear_cache(self) -> None:
+        """清空分词结果缓存（如加载了自定义词典）"""
+        if self.output_cache is not None:
+            self.output_cache.clear()
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        分词结果缓存统计
+
+        Returns:
+            Optional[Dict[str, Any]]: 命中/未命中/淘汰次数等，未启用缓存时返回 None
+        """
+        if self.output_cache is None:
+            return None
+        return self.output_cache.stats()
     
     @abstractmethod
     def initialize(self) -> bool:
@@ -94,6 +161,53 @@ class BaseTokenizer(ABC):
         """
         pass
     
+    def cut_batch(self, texts: Sequence[str]) -> List[List[str]]:
+        """
+        批量分词，结果与逐条调用 cut 一致
+
+        默认逐条调用 cut；支持批量推理的分词器应覆盖此方法
+
+        Args:
+            texts (Sequence[str]): 待分词的文本列表
+
+        Returns:
+            List[List[str]]: 与输入一一对应的分词结果
+
+        Raises:
+            TokenizerProcessError: 分词处理失败时抛出
+        """
+        return [self.cut(text) for text in texts]
+
+    def posseg_batch(self, texts: Sequence[str]) -> List[List[Tuple[str, str]]]:
+        """
+        批量词性标注，结果与逐条调用 posseg 一致
+
+        Args:
+            texts (Sequence[str]): 待标注的文本列表
+
+        Returns:
+            List[List[Tuple[str, str]]]: 与输入一一对应的 (词语, 词性) 列表
+
+        Raises:
+            TokenizerProcessError: 词性标注失败时抛出
+        """
+        return [self.posseg(text) for text in texts]
+
+    def tokenize_batch(self, texts: Sequence[str]) -> List[List[Tuple[str, int, int]]]:
+        """
+        批量精确分词，结果与逐条调用 tokenize 一致
+
+        Args:
+            texts (Sequence[str]): 待分词的文本列表
+
+        Returns:
+            List[List[Tuple[str, int, int]]]: 与输入一一对应的 (词语, 开始位置, 结束位置) 列表
+
+        Raises:
+            TokenizerProcessError: 分词处理失败时抛出
+        """
+        return [self.tokenize(text) for text in texts]
+
     def validate_text(self, text: str) -> str:
         """
         验证和预处理输入文本
@@ -129,12 +243,15 @@ class BaseTokenizer(ABC):
         Returns:
             Dict[str, Any]: 包含分词器信息的字典
         """
-        return {
+        info = {
             'name': self.name,
             'initialized': self.is_initialized,
             'version': self.version,
             'class_name': self.__class__.__name__
         }
+        if self.output_cache is not None:
+            info['cache'] = self.output_cache.stats()
+        return info
     
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(name='{self.name}', initialized={self.is_initialized})"
@@ -0,0 +1,198 @@
+"""
+分词结果缓存
+按 (方法名, 输入文本) 记忆 cut / posseg / tokenize 的输出，
+条目数与输入字符总数双重上限，超出时按最近最少使用（LRU）淘汰。
+测试集中反复出现的提示语、唤醒词等文本只需分词一次
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# 默认最多缓存的条目数
+DEFAULT_CACHE_ENTRIES = 10000
+
+# 默认最多缓存的输入字符总数
+DEFAULT_CACHE_CHARS = 1000000
+
+
+class TokenizerOutputCache:
+    """
+    线程安全的有界 LRU 缓存
+
+    GUI 工作线程与主线程共用工厂中的分词器单例，所有读写都在锁内完成；
+    分词计算本身在锁外进行，不会让不同文本的分词互相等待
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES,
+                 max_chars: int = DEFAULT_CACHE_CHARS):
+        """
+        Args:
+            max_entries (int): 最多缓存的条目数
+            max_chars (int): 最多缓存的输入字符总数
+        """
+        if max_entries <= 0 or max_chars <= 0:
+            raise ValueError("缓存上限必须为正数")
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, method: str, text: str) -> Optional[List]:
+        """
+        读取缓存（命中时移到最近使用端）
+
+        Args:
+            method (str): 方法名
+            text (str): 输入文本
+
+        Returns:
+            Optional[List]: 缓存结果的副本，未命中返回 None
+        """
+        key = (method, text)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return list(value)
+
+    def put(self, method: str, text: str, value: List[Hashable]) -> None:
+        """
+        写入缓存，必要时淘汰最久未使用的条目
+
+        Args:
+            method (str): 方法名
+            text (str): 输入文本
+            value (List): 分词结果（元素为字符串或元组，按不可变元组保存）
+        """
+        if len(text) > self.max_chars:
+            return
+        key = (method, text)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = tuple(value)
+            self._chars += len(text)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                (_, old_text), _ = self._entries.popitem(last=False)
+                self._chars -= len(old_text)
+                self.evictions += 1
+
+    def wrap(self, method: str, func: Callable[[str], List]) -> "CachedMethod":
+        """
+        为分词方法包装一层缓存
+
+        Args:
+            method (str): 方法名（作为缓存键的一部分）
+            func (Callable[[str], List]): 未缓存的分词方法
+
+        Returns:
+            CachedMethod: 带缓存的分词方法
+        """
+        return CachedMethod(self, method, func)
+
+    def wrap_batch(self, method: str,
+                   batch_func: Callable[[List[str]], List[List]]) -> "CachedBatchMethod":
+        """
+        为批量分词方法包装一层缓存：命中的文本直接取缓存，
+        未命中的文本去重后一次性交给原生批量实现
+
+        Args:
+            method (str): 对应的单条方法名（与单条调用共用缓存条目）
+            batch_func (Callable[[List[str]], List[List]]): 未缓存的批量分词方法
+
+        Returns:
+            CachedBatchMethod: 带缓存的批量分词方法
+        """
+        return CachedBatchMethod(self, method, batch_func)
+
+    def clear(self) -> None:
+        """清空缓存与统计"""
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        缓存统计
+
+        Returns:
+            Dict[str, Any]: {entries, chars, max_entries, max_chars, hits, misses, evictions, hit_rate}
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'chars': self._chars,
+                'max_entries': self.max_entries,
+                'max_chars': self.max_chars,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (f"TokenizerOutputCache(entries={len(self)}, hits={self.hits}, "
+                f"misses={self.misses})")
+
+
+class CachedMethod:
+    """带缓存的单条分词方法，未缓存的原方法保存在 uncached 属性中"""
+
+    def __init__(self, cache: TokenizerOutputCache, method: str, func: Callable[[str], List]):
+        self.cache = cache
+        self.method = method
+        self.uncached = func
+        self.__doc__ = func.__doc__
+
+    def __call__(self, text: str) -> List:
+        if not isinstance(text, str):
+            return self.uncached(text)
+        value = self.cache.get(self.method, text)
+        if value is None:
+            value = self.uncached(text)
+            self.cache.put(self.method, text, value)
+        return value
+
+
+class CachedBatchMethod:
+    """带缓存的批量分词方法，未缓存的原生批量实现保存在 uncached 属性中"""
+
+    def __init__(self, cache: TokenizerOutputCache, method: str,
+                 batch_func: Callable[[List[str]], List[List]]):
+        self.cache = cache
+        self.method = method
+        self.uncached = batch_func
+        self.__doc__ = batch_func.__doc__
+
+    def __call__(self, texts: List[str]) -> List[List]:
+        results: List = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            value = self.cache.get(self.method, text) if isinstance(text, str) else None
+            if value is None:
+                missing.setdefault(text, []).append(index)
+            else:
+                results[index] = value
+        if missing:
+            pending = list(missing)
+            for text, value in zip(pending, self.uncached(pending)):
+                if isinstance(text, str):
+                    self.cache.put(self.method, text, value)
+                for index in missing[text]:
+                    results[index] = list(value)
+        return results
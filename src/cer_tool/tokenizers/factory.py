@@ -1,13 +1,19 @@
 """
 分词器工厂
 提供分词器的创建、管理和获取功能
+
+工厂是线程安全的：每个分词器名称有一把初始化锁，
+多个线程同时请求同一分词器时只有一个线程执行初始化，其余线程等待并取得同一实例；
+只读取信息的调用不获取初始化锁，不会因为正在加载的模型而阻塞
 """
 
-from typing import Dict, List, Optional, Any
+import threading
+from typing import Dict, List, Optional, Any, Type
 from .base import BaseTokenizer, TokenizerInitError
 from .jieba_tokenizer import JiebaTokenizer
 from .thulac_tokenizer import ThulacTokenizer
 from .hanlp_tokenizer import HanlpTokenizer
+from .probe import installed_version, probe_tokenizer, record_initialization
 
 
 class TokenizerFactory:
@@ -18,7 +24,10 @@ class TokenizerFactory:
     
     _instance = None
     _tokenizers: Dict[str, BaseTokenizer] = {}
-    _available_tokenizers: Dict[str, type] = {
+    # 每个分词器名称一把初始化锁（由 _locks_guard 保护锁表本身）
+    _init_locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+    _available_tokenizers: Dict[str, Type[BaseTokenizer]] = {
         'jieba': JiebaTokenizer,
         'thulac': ThulacTokenizer,
         'hanlp': HanlpTokenizer
@@ -40,42 +49,89 @@ class TokenizerFactory:
     def get_available_tokenizers(cls) -> List[str]:
         """
         获取可用的分词器列表
-        检查每个分词器的依赖是否满足
+        只检查依赖包是否已安装（find_spec + 包元数据），不导入分词器库、不加载模型；
+        当前版本曾初始化失败的分词器不计入
         
         Returns:
             List[str]: 可用的分词器名称列表
         """
         available = []
-        
-        for name, tokenizer_class in cls._available_tokenizers.items():
-            try:
-                # 尝试创建分词器实例
-                tokenizer = tokenizer_class()
-                tokenizer.initialize()
+        for name in cls._available_tokenizers:
+            if name in cls._tokenizers or cls.probe_tokenizer(name)['available']:
                 available.append(name)
-            except TokenizerInitError:
-                # 如果初始化失败，该分词器不可用
-                continue
-            except Exception:
-                # 其他异常也视为不可用
-                continue
+        return available
+
+    @classmethod
+    def probe_tokenizer(cls, name: str) -> Dict[str, Any]:
+        """
+        探测分词器可用性（不初始化）
         
-        # 确保jieba总是在列表中（如果可用的话）
-        if 'jieba' not in available:
-            # 再次尝试jieba
-            try:
-                jieba_tokenizer = JiebaTokenizer()
-                jieba_tokenizer.initialize()
-                available.insert(0, 'jieba')
-            except:
-                pass
+        Args:
+            name (str): 分词器名称
+
+        Returns:
+            Dict[str, Any]: {name, available, installed, version, verified[, error]}
+        """
+        tokenizer_class = cls._available_tokenizers[name]
+        return probe_tokenizer(name, tokenizer_class.package, tokenizer_class.distribution)
+
+    @classmethod
+    def get_tokenizer_metadata(cls, name: str) -> Dict[str, Any]:
+        """
+        获取分词器信息（不初始化；已初始化的实例直接返回其信息）
         
-        return available
+        Args:
+            name (str): 分词器名称
+
+        Returns:
+            Dict[str, Any]: 分词器信息字典（含 available / version / initialized）
+        """
+        if name not in cls._available_tokenizers:
+            return {
+                'name': name,
+                'available': False,
+                'error': f'不支持的分词器: {name}'
+            }
+
+        cached_info = cls.get_cached_tokenizer_info(name)
+        if cached_info is not None:
+            return cached_info
+
+        # 未初始化的实例只提供描述、特性等静态信息
+        info = cls._available_tokenizers[name]().get_info()
+        probe = cls.probe_tokenizer(name)
+        info.update(probe)
+        info['version'] = probe['version'] or 'unknown'
+        return info
     
+    @classmethod
+    def _get_init_lock(cls, name: str) -> threading.Lock:
+        with cls._locks_guard:
+            lock = cls._init_locks.get(name)
+            if lock is None:
+                lock = cls._init_locks[name] = threading.Lock()
+            return lock
+
+    @classmethod
+    def is_loading(cls, name: str) -> bool:
+        """
+        指定分词器是否正在初始化（不阻塞）
+
+        Args:
+            name (str): 分词器名称
+
+        Returns:
+            bool: 是否有线程正在初始化该分词器
+        """
+        lock = cls._init_locks.get(name)
+        return lock is not None and lock.locked() and name not in cls._tokenizers
+
     @classmethod
     def get_tokenizer(cls, name: str) -> BaseTokenizer:
         """
-        获取分词器实例（单例模式）
+        获取分词器实例（单例模式，线程安全）
+        并发请求同一分词器时只初始化一次，其余线程等待初始化完成后取得同一实例；
+        初始化失败时每个等待的线程各自重试并得到异常
         
         Args:
             name (str): 分词器名称
@@ -90,24 +146,38 @@ class TokenizerFactory:
         if name not in cls._available_tokenizers:
             raise ValueError(f"不支持的分词器: {name}，可用的分词器: {list(cls._available_tokenizers.keys())}")
         
-        # 如果已经创建过该分词器实例，直接返回
-        if name in cls._tokenizers:
-            return cls._tokenizers[name]
-        
-        # 创建新的分词器实例
-        tokenizer_class = cls._available_tokenizers[name]
-        tokenizer = tokenizer_class()
-        
-        # 初始化分词器
-        try:
-            success = tokenizer.initialize()
-            if not success:
-                raise TokenizerInitError(f"{name}分词器初始化失败")
-        except Exception as e:
-            raise TokenizerInitError(f"{name}分词器初始化失败: {str(e)}")
-        
-        # 缓存分词器实例
-        cls._tokenizers[name] = tokenizer
+        # 如果已经创建过该分词器实例，直接返回（无锁快速路径）
+        tokenizer = cls._tokenizers.get(name)
+        if tokenizer is not None:
+            return tokenizer
+
+        with cls._get_init_lock(name):
+            # 等待锁期间其他线程可能已完成初始化
+            tokenizer = cls._tokenizers.get(name)
+            if tokenizer is not None:
+                return tokenizer
+
+            # 创建新的分词器实例
+            tokenizer_class = cls._available_tokenizers[name]
+            tokenizer = tokenizer_class()
+
+            # 初始化分词器（结果按已安装版本记入探测缓存）
+            version = (installed_version(tokenizer_class.package, tokenizer_class.distribution)
+                       if tokenizer_class.package else None)
+            try:
+                success = tokenizer.initialize()
+                if not success:
+                    raise TokenizerInitError(f"{name}分词器初始化失败")
+            except Exception as e:
+                record_initialization(name, version, str(e))
+                raise TokenizerInitError(f"{name}分词器初始化失败: {str(e)}")
+            record_initialization(name, version)
+
+            # 单例被所有评估共用，启用分词结果缓存（重复文本只分词一次）
+            tokenizer.enable_cache()
+
+            # 初始化完成后才发布实例，其他线程不会取得未初始化的分词器
+            cls._tokenizers[name] = tokenizer
         
         return tokenizer
     
@@ -130,9 +200,9 @@ class TokenizerFactory:
             }
         
         # 🔧 修复: 优先从缓存获取信息，避免重复初始化
-        if name in cls._tokenizers:
+        cached_tokenizer = cls._tokenizers.get(name)
+        if cached_tokenizer is not None:
             try:
-                cached_tokenizer = cls._tokenizers[name]
                 info = cached_tokenizer.get_info()
                 info['available'] = True
                 # 确保缓存的实例显示正确的初始化状态
@@ -141,6 +211,12 @@ class TokenizerFactory:
             except Exception as e:
                 print(f"从缓存获取{name}分词器信息失败: {str(e)}")
         
+        # 其他线程正在加载时不等待，返回不初始化的元数据
+        if cls.is_loading(name):
+            info = cls.get_tokenizer_metadata(name)
+            info['loading'] = True
+            return info
+
         # 如果缓存中没有，再尝试创建新实例
         try:
             tokenizer = cls.get_tokenizer(name)
@@ -168,9 +244,9 @@ class TokenizerFactory:
         if name not in cls._available_tokenizers:
             return None
         
-        if name in cls._tokenizers:
+        cached_tokenizer = cls._tokenizers.get(name)
+        if cached_tokenizer is not None:
             try:
-                cached_tokenizer = cls._tokenizers[name]
                 info = cached_tokenizer.get_info()
                 info['available'] = True
                 info['initialized'] = cached_tokenizer.is_initialized
@@ -185,7 +261,7 @@ class TokenizerFactory:
     @classmethod
     def check_tokenizer_availability(cls, name: str) -> bool:
         """
-        检查指定分词器是否可用
+        检查指定分词器是否可用（探测依赖，不初始化）
         
         Args:
             name (str): 分词器名称
@@ -196,12 +272,9 @@ class TokenizerFactory:
         if name not in cls._available_tokenizers:
             return False
         
-        try:
-            tokenizer_class = cls._available_tokenizers[name]
-            tokenizer = tokenizer_class()
-            return tokenizer.initialize()
-        except:
-            return False
+        if name in cls._tokenizers:
+            return True
+        return bool(cls.probe_tokenizer(name)['available'])
     
     @classmethod
     def create_tokenizer(cls, name: str) -> BaseTokenizer:
@@ -237,7 +310,7 @@ class TokenizerFactory:
     @classmethod
     def clear_cache(cls):
         """
-        清除缓存的分词器实例
+        清除缓存的分词器实例（正在进行的初始化完成后仍会发布其实例）
         """
         cls._tokenizers.clear()
     
@@ -295,6 +368,20 @@ def get_tokenizer_info(name: str) -> Dict[str, Any]:
     return factory.get_tokenizer_info(name)
 
 
+def get_tokenizer_metadata(name: str) -> Dict[str, Any]:
+    """
+    获取分词器信息的便捷函数（不初始化分词器）
+
+    Args:
+        name (str): 分词器名称
+
+    Returns:
+        Dict[str, Any]: 分词器信息字典
+    """
+    factory = TokenizerFactory()
+    return factory.get_tokenizer_metadata(name)
+
+
 def get_cached_tokenizer_info(name: str) -> Dict[str, Any]:
     """
     获取已缓存分词器信息的便捷函数
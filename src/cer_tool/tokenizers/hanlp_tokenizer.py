@@ -3,8 +3,9 @@ HanLP分词器实现
 基于HanLP库的分词器，提供BERT等深度学习模型支持
 """
 
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 from .base import BaseTokenizer, TokenizerInitError, TokenizerProcessError
+from .offsets import locate_tokens
 
 
 class HanlpTokenizer(BaseTokenizer):
@@ -13,6 +14,10 @@ class HanlpTokenizer(BaseTokenizer):
     基于HanLP 2.x版本，支持BERT等深度学习模型的中文分词
     """
     
+    # 依赖包（用于不初始化的可用性探测）
+    package = 'hanlp'
+    distribution = 'hanlp'
+
     def __init__(self):
         super().__init__()
         self.name = "hanlp"
@@ -202,49 +207,95 @@ class HanlpTokenizer(BaseTokenizer):
                 pass  # 如果不支持偏移量，继续使用手动计算
             
             # 手动计算位置信息
-            words = self.cut(cleaned_text)
-            result = []
-            current_pos = 0
-            text_chars = list(cleaned_text)
-            
-            for word in words:
-                word_chars = list(word)
-                word_len = len(word_chars)
-                
-                # 在剩余文本中查找当前词语
-                start_pos = current_pos
-                found = False
-                
-                # 向前搜索匹配位置
-                while start_pos <= len(text_chars) - word_len:
-                    # 检查是否匹配
-                    match = True
-                    for i, char in enumerate(word_chars):
-                        if start_pos + i >= len(text_chars) or text_chars[start_pos + i] != char:
-                            match = False
-                            break
-                    
-                    if match:
-                        end_pos = start_pos + word_len
-                        result.append((word, start_pos, end_pos))
-                        current_pos = end_pos
-                        found = True
-                        break
-                    
-                    start_pos += 1
-                
-                # 如果没有找到匹配，使用近似位置
-                if not found:
-                    end_pos = current_pos + word_len
-                    if end_pos > len(text_chars):
-                        end_pos = len(text_chars)
-                    result.append((word, current_pos, end_pos))
-                    current_pos = end_pos
-            
-            return result
+            return locate_tokens(cleaned_text, self.cut(cleaned_text))
             
         except Exception as e:
             raise TokenizerProcessError(f"HanLP精确分词失败: {str(e)}")
+
+    def _check_initialized(self):
+        if not self.is_initialized:
+            raise TokenizerProcessError("HanLP分词器未初始化")
+
+    def cut_batch(self, texts: Sequence[str]) -> List[List[str]]:
+        """
+        批量分词：非空文本整体交给分词模型做一次批量推理
+
+        Args:
+            texts (Sequence[str]): 待分词的文本列表
+
+        Returns:
+            List[List[str]]: 与输入一一对应的分词结果
+
+        Raises:
+            TokenizerProcessError: 分词处理失败时抛出
+        """
+        try:
+            self._check_initialized()
+            cleaned = [self.validate_text(text) for text in texts]
+            results: List[List[str]] = [[] for _ in cleaned]
+            indices = [i for i, text in enumerate(cleaned) if text]
+            if indices:
+                # HanLP 模型接收列表输入时按批推理，返回等长的结果列表
+                outputs = self.tok_model([cleaned[i] for i in indices])
+                for i, words in zip(indices, outputs):
+                    results[i] = list(words)
+            return results
+            
+        except Exception as e:
+            raise TokenizerProcessError(f"HanLP批量分词失败: {str(e)}")
+
+    def posseg_batch(self, texts: Sequence[str]) -> List[List[Tuple[str, str]]]:
+        """
+        批量词性标注：先批量分词，再把全部词序列一次交给词性标注模型
+
+        Args:
+            texts (Sequence[str]): 待标注的文本列表
+
+        Returns:
+            List[List[Tuple[str, str]]]: 与输入一一对应的 (词语, 词性) 列表
+
+        Raises:
+            TokenizerProcessError: 词性标注失败时抛出
+        """
+        try:
+            words_batch = self.cut_batch(texts)
+            indices = [i for i, words in enumerate(words_batch) if words]
+            tags_batch = None
+            if self.pos_model and indices:
+                try:
+                    tags_batch = self.pos_model([words_batch[i] for i in indices])
+                except Exception:
+                    # 与 posseg 一致：词性标注失败时使用默认词性
+                    tags_batch = None
+
+            results = [[(word, 'unk') for word in words] for words in words_batch]
+            if tags_batch is not None:
+                for i, tags in zip(indices, tags_batch):
+                    results[i] = list(zip(words_batch[i], tags))
+            return results
+
+        except Exception as e:
+            raise TokenizerProcessError(f"HanLP批量词性标注失败: {str(e)}")
+
+    def tokenize_batch(self, texts: Sequence[str]) -> List[List[Tuple[str, int, int]]]:
+        """
+        批量精确分词：批量分词后在各自原文中定位
+
+        Args:
+            texts (Sequence[str]): 待分词的文本列表
+
+        Returns:
+            List[List[Tuple[str, int, int]]]: 与输入一一对应的 (词语, 开始位置, 结束位置) 列表
+
+        Raises:
+            TokenizerProcessError: 分词处理失败时抛出
+        """
+        try:
+            cleaned = [self.validate_text(text) for text in texts]
+            return [locate_tokens(text, words)
+                    for text, words in zip(cleaned, self.cut_batch(cleaned))]
+        except Exception as e:
+            raise TokenizerProcessError(f"HanLP批量精确分词失败: {str(e)}")
     
     def get_info(self) -> dict:
         """
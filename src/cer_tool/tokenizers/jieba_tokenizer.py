@@ -3,11 +3,44 @@ Jieba分词器实现
 基于jieba库的分词器，完全兼容现有功能
 """
 
-from typing import List, Tuple
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
 import jieba
 import jieba.posseg
 from .base import BaseTokenizer, TokenizerInitError, TokenizerProcessError
 
+# 多进程模式下，批量文本至少达到该条数才分发给进程池（条数过少时进程间通信开销大于收益）
+PARALLEL_MIN_BATCH = 32
+
+# 多进程模式下每个工作进程分到的任务块数（兼顾负载均衡与进程间通信开销）
+PARALLEL_CHUNKS_PER_PROCESS = 4
+
+
+def _init_parallel_worker(dictionary: Optional[str]) -> None:
+    """
+    工作进程初始化：加载词典
+
+    spawn / forkserver 启动的进程不继承主进程已加载的词典，在此各加载一次
+    """
+    if dictionary:
+        jieba.set_dictionary(dictionary)
+    jieba.initialize()
+
+
+def _cut_chunk(texts: List[str]) -> List[List[str]]:
+    return [jieba.lcut(text) for text in texts]
+
+
+def _posseg_chunk(texts: List[str]) -> List[List[Tuple[str, str]]]:
+    return [[(word, flag) for word, flag in jieba.posseg.cut(text)] for text in texts]
+
+
+def _tokenize_chunk(texts: List[str]) -> List[List[Tuple[str, int, int]]]:
+    return [[(word, start, end) for word, start, end in jieba.tokenize(text)] for text in texts]
+
 
 class JiebaTokenizer(BaseTokenizer):
     """
@@ -15,9 +48,15 @@ class JiebaTokenizer(BaseTokenizer):
     基于jieba库，提供中文分词、词性标注和精确位置分词功能
     """
     
+    # 依赖包（用于不初始化的可用性探测）
+    package = 'jieba'
+    distribution = 'jieba'
+
     def __init__(self):
         super().__init__()
         self.name = "jieba"
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.parallel_processes = 0
     
     def initialize(self) -> bool:
         """
@@ -144,6 +183,134 @@ class JiebaTokenizer(BaseTokenizer):
         except Exception as e:
             raise TokenizerProcessError(f"Jieba精确分词失败: {str(e)}")
     
+    def enable_parallel(self, processes: Optional[int] = None,
+                        start_method: Optional[str] = None) -> int:
+        """
+        启用多进程批量分词（jieba 的多进程模式）
+
+        只作用于 cut_batch / posseg_batch / tokenize_batch，单条调用仍在当前进程执行；
+        与 jieba.enable_parallel 不同，不替换 jieba 模块的全局函数，也不依赖 fork：
+        工作进程在初始化时自行加载词典，spawn / forkserver 启动方式下同样可用。
+        通过 load_userdict 加载的自定义词典不会传给工作进程。
+        进程池由 close() 关闭，解释器退出时也会自动关闭
+
+        Args:
+            processes (Optional[int]): 进程数，None 时为 CPU 核数
+            start_method (Optional[str]): 进程启动方式（fork / spawn / forkserver），None 时为平台默认
+
+        Returns:
+            int: 实际使用的进程数
+        """
+        self.disable_parallel()
+        processes = max(1, processes or os.cpu_count() or 1)
+        context = multiprocessing.get_context(start_method)
+        pool = ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                                   initializer=_init_parallel_worker,
+                                   initargs=(jieba.dt.dictionary,))
+        try:
+            # 立即启动全部工作进程并加载词典，首个批次不承担启动开销
+            list(pool.map(_cut_chunk, [[] for _ in range(processes)]))
+        except Exception as e:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise TokenizerInitError(f"Jieba多进程模式启动失败: {str(e)}")
+        self._pool = pool
+        self.parallel_processes = processes
+        atexit.register(self.disable_parallel)
+        return processes
+
+    def disable_parallel(self) -> None:
+        """关闭多进程批量分词，等待工作进程退出"""
+        pool = self._pool
+        self._pool = None
+        self.parallel_processes = 0
+        if pool is not None:
+            atexit.unregister(self.disable_parallel)
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def close(self) -> None:
+        """释放分词器持有的资源（关闭多进程模式的进程池）"""
+        self.disable_parallel()
+
+    def _map_batch(self, method: str, chunk_fn: Callable[[List[str]], List[list]],
+                   texts: Sequence[str]) -> List[list]:
+        """按多进程模式或逐条方式批量处理"""
+        pool = self._pool
+        if pool is None or len(texts) < PARALLEL_MIN_BATCH:
+            # 调用类上的原始方法：启用缓存时批量方法外层已查过缓存
+            single = getattr(JiebaTokenizer, method)
+            return [single(self, text) for text in texts]
+
+        cleaned = [self.validate_text(text) for text in texts]
+        results: List[list] = [[] for _ in cleaned]
+        indices = [i for i, text in enumerate(cleaned) if text]
+        size = max(1, -(-len(indices) // (self.parallel_processes * PARALLEL_CHUNKS_PER_PROCESS)))
+        chunks = [[cleaned[i] for i in indices[start:start + size]]
+                  for start in range(0, len(indices), size)]
+        outputs = (output for chunk_outputs in pool.map(chunk_fn, chunks) for output in chunk_outputs)
+        for i, output in zip(indices, outputs):
+            results[i] = output
+        return results
+
+    def cut_batch(self, texts: Sequence[str]) -> List[List[str]]:
+        """
+        批量分词（启用多进程模式时由进程池并行处理）
+
+        Args:
+            texts (Sequence[str]): 待分词的文本列表
+
+        Returns:
+            List[List[str]]: 与输入一一对应的分词结果
+
+        Raises:
+            TokenizerProcessError: 分词处理失败时抛出
+        """
+        try:
+            return self._map_batch('cut', _cut_chunk, texts)
+        except TokenizerProcessError:
+            raise
+        except Exception as e:
+            raise TokenizerProcessError(f"Jieba批量分词失败: {str(e)}")
+
+    def posseg_batch(self, texts: Sequence[str]) -> List[List[Tuple[str, str]]]:
+        """
+        批量词性标注（启用多进程模式时由进程池并行处理）
+
+        Args:
+            texts (Sequence[str]): 待标注的文本列表
+
+        Returns:
+            List[List[Tuple[str, str]]]: 与输入一一对应的 (词语, 词性) 列表
+
+        Raises:
+            TokenizerProcessError: 词性标注失败时抛出
+        """
+        try:
+            return self._map_batch('posseg', _posseg_chunk, texts)
+        except TokenizerProcessError:
+            raise
+        except Exception as e:
+            raise TokenizerProcessError(f"Jieba批量词性标注失败: {str(e)}")
+
+    def tokenize_batch(self, texts: Sequence[str]) -> List[List[Tuple[str, int, int]]]:
+        """
+        批量精确分词（启用多进程模式时由进程池并行处理）
+
+        Args:
+            texts (Sequence[str]): 待分词的文本列表
+
+        Returns:
+            List[List[Tuple[str, int, int]]]: 与输入一一对应的 (词语, 开始位置, 结束位置) 列表
+
+        Raises:
+            TokenizerProcessError: 分词处理失败时抛出
+        """
+        try:
+            return self._map_batch('tokenize', _tokenize_chunk, texts)
+        except TokenizerProcessError:
+            raise
+        except Exception as e:
+            raise TokenizerProcessError(f"Jieba批量精确分词失败: {str(e)}")
+
     def get_info(self) -> dict:
         """
         获取Jieba分词器信息
@@ -157,6 +324,7 @@ class JiebaTokenizer(BaseTokenizer):
             'features': ['分词', '词性标注', '精确位置分词'],
             'dependencies': ['jieba'],
             'performance': '高速',
-            'accuracy': '中等'
+            'accuracy': '中等',
+            'parallel_processes': self.parallel_processes
         })
         return info 
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+分词结果位置还原
+THULAC、HanLP 等分词器只返回词语序列，不返回词语在原文中的位置；
+本模块从移动游标处用 str.find 依次定位每个词语，整段文本只扫描一遍。
+分词器改写过的词语（如全角转半角、繁简转换）在原文中找不到时，
+假定它紧接在游标之后（跳过空白）并占用同样多的字符，后续词语再次精确命中时位置自动重新同步
+"""
+
+from typing import Iterable, List, Tuple
+
+# 词语前允许跳过的最多字符数（分词器丢弃的空白、符号等）；
+# 限定查找窗口使找不到的词语不会扫描剩余全文，总耗时与文本长度成线性
+MAX_SKIPPED_CHARS = 32
+
+
+def locate_tokens(text: str, words: Iterable[str]) -> List[Tuple[str, int, int]]:
+    """
+    在原文中依次定位分词结果
+
+    Args:
+        text (str): 分词时使用的原文
+        words (Iterable[str]): 按顺序排列的分词结果
+
+    Returns:
+        List[Tuple[str, int, int]]: (词语, 开始位置, 结束位置)的元组列表，位置单调不减
+    """
+    result = []
+    text_len = len(text)
+    cursor = 0
+
+    for word in words:
+        word_len = len(word)
+        start = text.find(word, cursor, cursor + MAX_SKIPPED_CHARS + word_len) if word_len else -1
+        if start >= 0:
+            end = start + word_len
+        else:
+            # 规范化漂移或空词语：跳过空白后按原长度占位
+            start = cursor
+            while start < text_len and text[start].isspace():
+                start += 1
+            end = min(start + word_len, text_len)
+
+        result.append((word, start, end))
+        cursor = end
+
+    return result
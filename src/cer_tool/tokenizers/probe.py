@@ -0,0 +1,191 @@
+"""
+分词器可用性探测
+只通过 importlib.util.find_spec 与包元数据判断分词器依赖是否已安装，
+不导入分词器库、不加载模型（HanLP 仅导入就需要加载 torch）。
+完整初始化的结果按 分词器名称 + 已安装版本 记录在磁盘缓存中：
+某版本初始化失败过的分词器在探测时直接报告不可用，升级或重装（版本变化）后记录自动失效；
+失败记录只在 FAILURE_TTL 秒内有效（离线下载模型等临时失败过后会重新尝试），
+也可通过 clear_probe_cache()（CLI --refresh-tokenizers、GUI「清理缓存」）立即清除
+"""
+
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from importlib import metadata
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 等平台没有 fcntl，只能在进程内串行写入
+    fcntl = None  # type: ignore[assignment]
+
+# 缓存目录环境变量（未设置时使用 $XDG_CACHE_HOME/cer_tool 或 ~/.cache/cer_tool）
+CACHE_DIR_ENV = 'CER_TOOL_CACHE_DIR'
+
+# 探测缓存文件名
+PROBE_CACHE_FILE = 'tokenizer_probe.json'
+
+# 初始化失败记录的有效期（秒），过期后探测重新报告可用，下次使用时再完整初始化一次
+FAILURE_TTL = 3600
+
+# 同一进程内多个线程写探测缓存时串行读-改-写，避免互相覆盖对方的记录
+_write_lock = threading.Lock()
+
+# 跨进程写锁文件名（--jobs 工作进程等并发写入者通过 flock 串行读-改-写）
+PROBE_LOCK_FILE = PROBE_CACHE_FILE + '.lock'
+
+
+def probe_cache_path() -> str:
+    """探测缓存文件路径"""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(base, 'cer_tool')
+    return os.path.join(cache_dir, PROBE_CACHE_FILE)
+
+
+def installed_version(package: str, distribution: Optional[str] = None) -> Optional[str]:
+    """
+    查询依赖包的已安装版本（不导入包本身）
+
+    Args:
+        package (str): 导入名，如 'hanlp'
+        distribution (Optional[str]): 发行包名，None 时与导入名相同
+
+    Returns:
+        Optional[str]: 版本号；未安装返回 None，已安装但缺少元数据返回 'unknown'
+    """
+    try:
+        if importlib.util.find_spec(package) is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+    try:
+        return metadata.version(distribution or package)
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def _load_records() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(probe_cache_path(), 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        return records if isinstance(records, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _expired(record: Dict[str, Any]) -> bool:
+    """失败记录是否已超过有效期（缺少时间戳的旧记录视为已过期）"""
+    recorded = record.get('time')
+    return not isinstance(recorded, (int, float)) or time.time() - recorded > FAILURE_TTL
+
+
+def _unchanged(records: Dict[str, Dict[str, Any]], name: str, version: Optional[str],
+               error: Optional[str]) -> bool:
+    """记录中已有相同版本与结果（失败记录还需未过期），无需重写缓存文件"""
+    record = records.get(name)
+    if record is None or record.get('version') != version or record.get('error') != error:
+        return False
+    return error is None or not _expired(record)
+
+
+@contextmanager
+def _locked(directory: str) -> Iterator[None]:
+    """进程内线程锁 + 跨进程文件锁（fcntl.flock），保护探测缓存的读-改-写"""
+    with _write_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(directory, PROBE_LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def record_initialization(name: str, version: Optional[str], error: Optional[str] = None) -> None:
+    """
+    记录一次完整初始化的结果（写入失败时静默忽略，缓存只是加速手段）
+
+    记录的版本与结果不变时不写文件：每次运行、每个工作进程初始化成功时不会重复重写缓存
+
+    Args:
+        name (str): 分词器名称
+        version (Optional[str]): 初始化时的已安装版本
+        error (Optional[str]): 失败原因，成功时为 None
+    """
+    if _unchanged(_load_records(), name, version, error):
+        return
+    path = probe_cache_path()
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with _locked(directory):
+            # 在锁内重新读取，合并其他线程或进程刚写入的记录
+            records = _load_records()
+            if _unchanged(records, name, version, error):
+                return
+            records[name] = {'version': version, 'error': error, 'time': time.time()}
+            # 先写唯一命名的临时文件再替换，读取者不会读到写了一半的文件
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=PROBE_CACHE_FILE, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(records, f, ensure_ascii=False, indent=2)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+    except OSError:
+        pass
+
+
+def clear_probe_cache() -> None:
+    """删除探测缓存（如修复了模型文件后希望重新探测）"""
+    try:
+        os.remove(probe_cache_path())
+    except OSError:
+        pass
+
+
+def probe_tokenizer(name: str, package: Optional[str],
+                    distribution: Optional[str] = None) -> Dict[str, Any]:
+    """
+    探测分词器是否可用（不初始化）
+
+    Args:
+        name (str): 分词器名称
+        package (Optional[str]): 依赖包的导入名，None 表示无外部依赖
+        distribution (Optional[str]): 依赖包的发行包名
+
+    Returns:
+        Dict[str, Any]: {name, available, installed, version, verified[, error]}；
+            verified 表示当前版本曾经完整初始化成功；
+            当前版本在 FAILURE_TTL 秒内初始化失败过时 available 为 False
+    """
+    if package is None:
+        return {'name': name, 'available': True, 'installed': True, 'version': 'unknown',
+                'verified': False}
+
+    version = installed_version(package, distribution)
+    if version is None:
+        return {'name': name, 'available': False, 'installed': False, 'version': None,
+                'verified': False, 'error': f"{distribution or package} 未安装"}
+
+    record = _load_records().get(name)
+    if record is not None and record.get('error') and _expired(record):
+        record = None
+    if record is None or record.get('version') != version:
+        return {'name': name, 'available': True, 'installed': True, 'version': version,
+                'verified': False}
+    if record.get('error'):
+        return {'name': name, 'available': False, 'installed': True, 'version': version,
+                'verified': False, 'error': record['error']}
+    return {'name': name, 'available': True, 'installed': True, 'version': version,
+            'verified': True}
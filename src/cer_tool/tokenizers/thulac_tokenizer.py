@@ -3,8 +3,9 @@ THULAC分词器实现
 基于THULAC库的分词器，提供高精度中文分词
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from .base import BaseTokenizer, TokenizerInitError, TokenizerProcessError
+from .offsets import locate_tokens
 
 
 class ThulacTokenizer(BaseTokenizer):
@@ -13,10 +14,16 @@ class ThulacTokenizer(BaseTokenizer):
     基于THULAC库，提供高精度中文分词和词性标注功能
     """
     
+    # 依赖包（用于不初始化的可用性探测）
+    package = 'thulac'
+    distribution = 'thulac'
+
     def __init__(self):
         super().__init__()
         self.name = "thulac"
         self.thu = None
+        # 最近一次分析的 (文本, [(词语, 词性), ...])，cut / posseg / tokenize 对同一文本共用
+        self._last_analysis: Optional[Tuple[str, List[Tuple[str, str]]]] = None
     
     def initialize(self) -> bool:
         """
@@ -78,6 +85,26 @@ class ThulacTokenizer(BaseTokenizer):
         except Exception as e:
             raise TokenizerInitError(f"THULAC分词器初始化失败: {str(e)}")
     
+    def _analyze(self, cleaned_text: str) -> List[Tuple[str, str]]:
+        """
+        调用一次THULAC完成分词与词性标注，结果供 cut / posseg / tokenize 共用
+
+        Args:
+            cleaned_text (str): 已清理的非空文本
+
+        Returns:
+            List[Tuple[str, str]]: (词语, 词性)的元组列表
+        """
+        last = self._last_analysis
+        if last is not None and last[0] == cleaned_text:
+            return last[1]
+
+        # text=False 直接返回 [[词语, 词性], ...]，无需解析 "词语_词性" 字符串
+        # （词语本身含下划线时字符串形式无法正确拆分）
+        analysis = [(word, pos or 'unk') for word, pos in self.thu.cut(cleaned_text, text=False)]
+        self._last_analysis = (cleaned_text, analysis)
+        return analysis
+
     def cut(self, text: str) -> List[str]:
         """
         基础分词功能
@@ -99,21 +126,7 @@ class ThulacTokenizer(BaseTokenizer):
             if not cleaned_text:
                 return []
             
-            # 使用THULAC进行分词，只返回词语
-            result_text = self.thu.cut(cleaned_text, text=True)
-            # 分割成词语列表
-            words = result_text.split()
-            
-            # 提取词语部分（去掉词性标注）
-            result = []
-            for word in words:
-                if '_' in word:
-                    word_part = word.split('_')[0]
-                    result.append(word_part)
-                else:
-                    result.append(word)
-            
-            return result
+            return [word for word, _ in self._analyze(cleaned_text)]
             
         except Exception as e:
             raise TokenizerProcessError(f"THULAC分词失败: {str(e)}")
@@ -139,22 +152,7 @@ class ThulacTokenizer(BaseTokenizer):
             if not cleaned_text:
                 return []
             
-            # 使用THULAC进行词性标注
-            result_text = self.thu.cut(cleaned_text, text=True)
-            # 分割成词语列表
-            words = result_text.split()
-            
-            # 解析词语和词性
-            result = []
-            for word_pos in words:
-                if '_' in word_pos:
-                    word, pos = word_pos.split('_', 1)
-                    result.append((word, pos))
-                else:
-                    # 如果没有词性标注，使用默认值
-                    result.append((word_pos, 'unk'))
-            
-            return result
+            return list(self._analyze(cleaned_text))
             
         except Exception as e:
             raise TokenizerProcessError(f"THULAC词性标注失败: {str(e)}")
@@ -162,7 +160,7 @@ class ThulacTokenizer(BaseTokenizer):
     def tokenize(self, text: str) -> List[Tuple[str, int, int]]:
         """
         精确分词，返回词语及其在原文中的位置
-        由于THULAC不直接提供位置信息，需要手动计算
+        由于THULAC不直接提供位置信息，在原文中依次定位分词结果
         
         Args:
             text (str): 待分词的文本
@@ -181,49 +179,8 @@ class ThulacTokenizer(BaseTokenizer):
             if not cleaned_text:
                 return []
             
-            # 获取分词结果
-            words = self.cut(cleaned_text)
-            
-            # 手动计算位置信息
-            result = []
-            current_pos = 0
-            text_chars = list(cleaned_text)
-            
-            for word in words:
-                word_chars = list(word)
-                word_len = len(word_chars)
-                
-                # 在剩余文本中查找当前词语
-                start_pos = current_pos
-                found = False
-                
-                # 向前搜索匹配位置
-                while start_pos <= len(text_chars) - word_len:
-                    # 检查是否匹配
-                    match = True
-                    for i, char in enumerate(word_chars):
-                        if start_pos + i >= len(text_chars) or text_chars[start_pos + i] != char:
-                            match = False
-                            break
-                    
-                    if match:
-                        end_pos = start_pos + word_len
-                        result.append((word, start_pos, end_pos))
-                        current_pos = end_pos
-                        found = True
-                        break
-                    
-                    start_pos += 1
-                
-                # 如果没有找到匹配（可能由于分词结果与原文不一致），使用近似位置
-                if not found:
-                    end_pos = current_pos + word_len
-                    if end_pos > len(text_chars):
-                        end_pos = len(text_chars)
-                    result.append((word, current_pos, end_pos))
-                    current_pos = end_pos
-            
-            return result
+            words = [word for word, _ in self._analyze(cleaned_text)]
+            return locate_tokens(cleaned_text, words)
             
         except Exception as e:
             raise TokenizerProcessError(f"THULAC精确分词失败: {str(e)}")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试公共配置
+
+分词器探测缓存（tokenizer_probe.json）默认写在 ~/.cache/cer_tool，
+测试期间统一改写到临时目录，避免读写真实用户缓存、测试之间互相影响。
+子进程（CLI 测试）继承环境变量，同样写入临时目录。
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from cer_tool.tokenizers.probe import CACHE_DIR_ENV
+
+_saved_cache_dir = None
+_collection_cache_dir = None
+
+
+def pytest_configure(config):
+    """收集阶段（模块导入时的 skipif 探测等）也不写真实缓存"""
+    global _saved_cache_dir, _collection_cache_dir
+    _saved_cache_dir = os.environ.get(CACHE_DIR_ENV)
+    _collection_cache_dir = tempfile.mkdtemp(prefix="cer_tool_probe_")
+    os.environ[CACHE_DIR_ENV] = _collection_cache_dir
+
+
+def pytest_unconfigure(config):
+    """恢复环境变量并删除收集阶段的临时缓存目录"""
+    if _saved_cache_dir is None:
+        os.environ.pop(CACHE_DIR_ENV, None)
+    else:
+        os.environ[CACHE_DIR_ENV] = _saved_cache_dir
+    if _collection_cache_dir is not None:
+        shutil.rmtree(_collection_cache_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def _probe_cache_dir(tmp_path, monkeypatch):
+    """每个测试使用独立的探测缓存目录"""
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+语料级汇总测试模块
+
+覆盖场景：
+- 逐对累加得到的微/宏平均 CER、平均/总体准确率
+- 分片累加后 merge 与整体累加结果一致
+- 零参考字数边界（calculate_overall_accuracy 语义）
+- 由结果字典与列式批量结果构建累加器
+"""
+
+import pytest
+
+from cer_tool.aggregation import CorpusAccumulator, calculate_overall_accuracy
+from cer_tool.metrics import ASRMetrics
+
+ROWS = [
+    # (替换, 删除, 插入, 参考长度, 假设长度)
+    (1, 0, 0, 10, 10),
+    (0, 2, 1, 8, 7),
+    (0, 0, 0, 5, 5),
+    (0, 0, 2, 0, 2),
+]
+
+
+def _accumulate(rows):
+    accumulator = CorpusAccumulator()
+    for row in rows:
+        accumulator.update(*row)
+    return accumulator
+
+
+class TestCorpusAccumulator:
+    """CorpusAccumulator 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_aggregates(self):
+        """微平均按总字数加权，宏平均为逐对平均"""
+        acc = _accumulate(ROWS)
+        assert acc.pairs == 4
+        assert acc.total_errors == 6
+        assert acc.micro_cer == pytest.approx(6 / 23)
+        assert acc.macro_cer == pytest.approx((0.1 + 3 / 8 + 0.0 + 1.0) / 4)
+        assert acc.avg_accuracy == pytest.approx(1 - acc.macro_cer)
+        assert acc.overall_accuracy == calculate_overall_accuracy(6, 23)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_merge_matches_single_pass(self):
+        """分片累加后合并与整体累加一致"""
+        whole = _accumulate(ROWS)
+        merged = _accumulate(ROWS[:1]).merge(_accumulate(ROWS[1:3])).merge(_accumulate(ROWS[3:]))
+        assert merged.summary() == pytest.approx(whole.summary())
+        assert CorpusAccumulator().merge(whole).summary() == whole.summary()
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_zero_reference_characters(self):
+        """参考总字数为 0 时沿用 calculate_overall_accuracy 的边界规则"""
+        assert CorpusAccumulator().overall_accuracy == 1.0
+        assert CorpusAccumulator().avg_accuracy == 0.0
+        assert _accumulate([(0, 0, 2, 0, 2)]).overall_accuracy == 0.0
+        assert _accumulate([(0, 0, 0, 0, 0)]).overall_accuracy == 1.0
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_from_results_and_batch(self):
+        """由详细指标字典与列式批量结果构建的累加器一致"""
+        metrics = ASRMetrics(tokenizer_name='jieba')
+        pairs = [("今天天气很好", "今天天汽很好"), ("我来到北京", "我到北京了"), ("", "多余")]
+        from_results = CorpusAccumulator.from_results(
+            metrics.calculate_detailed_metrics(ref, hyp) for ref, hyp in pairs
+        )
+        from_batch = metrics.calculate_batch(pairs).to_accumulator()
+        assert from_results.summary() == from_batch.summary()
+        assert from_results.pairs == 3
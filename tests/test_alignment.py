@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字符级对齐模块测试
+
+覆盖场景：
+- editops → opcodes 转换（片段合并、覆盖全长）
+- AlignmentResult 派生的错误统计与回溯算法一致
+- 指标字典、高亮文本、差异序列三种视图彼此一致
+- ASRMetrics.align 与 calculate_detailed_metrics / highlight_errors / show_differences 一致
+- 空文本边界
+- 字符级快速路径不调用分词器，词级输出惰性计算
+- 位并行（Myers/Hyyrö）后端与朴素DP回溯结果完全一致
+- 线性内存分治回溯与全量回溯结果完全一致，超过阈值时自动启用
+- 批量编辑操作（含 NumPy 引擎）与逐对回溯结果完全一致，保持输入顺序
+- 带上限的编辑距离：未超限时精确，超限时返回 None 并提前退出
+"""
+
+import importlib.util
+import random
+import sys
+
+import pytest
+
+import cer_tool.alignment as alignment_module
+from cer_tool.alignment import (
+    AlignmentResult,
+    backtrack_editops,
+    bitparallel_distance,
+    bitparallel_editops,
+    bounded_distance,
+    compute_opcodes,
+    count_editops,
+    edit_ops_batch,
+    editops_to_opcodes,
+    fallback_editops,
+    linear_space_editops,
+)
+from cer_tool.metrics import ASRMetrics
+
+# ────────────────── 共享 fixture ──────────────────
+
+@pytest.fixture(scope="module")
+def metrics():
+    """共享的 jieba ASRMetrics 实例"""
+    return ASRMetrics(tokenizer_name='jieba')
+
+
+PAIRS = [
+    ("abcdef", "axcxef"),
+    ("abcdef", "abef"),
+    ("abef", "abcdef"),
+    ("kitten", "sitting"),
+    ("今天天气很好", "今天天汽不好啊"),
+    ("我来到北京清华大学", "我到北京清大学了"),
+    ("abc", ""),
+    ("", "abc"),
+    ("", ""),
+]
+
+
+# ════════════════════════════════════════════════════
+# 第一组：opcodes 构建
+# ════════════════════════════════════════════════════
+
+class TestOpcodes:
+    """editops 与 opcodes 转换测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_merges_consecutive_ops(self):
+        """连续同类操作合并为一个片段"""
+        opcodes = editops_to_opcodes(backtrack_editops("abcdef", "abef"), 6, 4)
+        assert opcodes == [
+            ('equal', 0, 2, 0, 2),
+            ('delete', 2, 4, 2, 2),
+            ('equal', 4, 6, 2, 4),
+        ]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("ref, hyp", PAIRS)
+    def test_opcodes_cover_both_strings(self, ref, hyp):
+        """opcodes 首尾相接并覆盖两个字符串全长"""
+        opcodes = compute_opcodes(ref, hyp)
+        i = j = 0
+        for tag, i1, i2, j1, j2 in opcodes:
+            assert (i1, j1) == (i, j)
+            i, j = i2, j2
+        assert (i, j) == (len(ref), len(hyp))
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("ref, hyp", PAIRS)
+    def test_counts_match_backtrack(self, ref, hyp):
+        """opcodes 派生的 S/D/I 与编辑操作计数一致"""
+        result = AlignmentResult(ref, hyp, compute_opcodes(ref, hyp))
+        s, d, i = result.counts
+        assert s + d + i == sum(count_editops(backtrack_editops(ref, hyp)))
+        assert d - i == len(ref) - len(hyp)
+
+
+# ════════════════════════════════════════════════════
+# 第二组：三种视图一致性
+# ════════════════════════════════════════════════════
+
+class TestAlignmentViews:
+    """指标、高亮、差异序列一致性测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_highlight_marks_errors(self):
+        """高亮文本中错误片段以方括号标出"""
+        result = AlignmentResult("今天天气很好", "今天天气不好",
+                                 compute_opcodes("今天天气很好", "今天天气不好"))
+        assert result.highlighted == ("今天天气[很]好", "今天天气[不]好")
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_diff_sequence_agrees_with_counts(self):
+        """差异序列中 '-'/'+' 标记数与 S/D/I 一致"""
+        ref, hyp = "我来到北京清华大学", "我到北京清大学了"
+        result = AlignmentResult(ref, hyp, compute_opcodes(ref, hyp))
+        s, d, i = result.counts
+        seq = result.diff_sequence
+        assert seq.count('- ') == s + d
+        assert seq.count('+ ') == s + i
+        assert seq.count('  ') == result.hits
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_to_metrics_returns_fresh_dict(self):
+        """to_metrics 每次返回新字典，调用方修改不影响结果对象"""
+        result = AlignmentResult("ab", "ab", compute_opcodes("ab", "ab"))
+        first = result.to_metrics()
+        first['asr_file'] = 'x.txt'
+        assert 'asr_file' not in result.to_metrics()
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    @pytest.mark.parametrize("ref, hyp, expected_cer", [
+        ("", "", 0.0),
+        ("", "abc", 1.0),
+        ("abc", "", 1.0),
+    ])
+    def test_empty_boundaries(self, ref, hyp, expected_cer):
+        """空文本边界与 calculate_cer 语义一致"""
+        result = AlignmentResult(ref, hyp, compute_opcodes(ref, hyp))
+        assert result.cer == expected_cer
+        assert result.to_metrics()['accuracy'] == 1.0 - expected_cer
+
+
+# ════════════════════════════════════════════════════
+# 第三组：ASRMetrics.align 集成
+# ════════════════════════════════════════════════════
+
+class TestMetricsAlign:
+    """ASRMetrics.align 与既有接口一致性测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_align_matches_legacy_apis(self, metrics):
+        """align 派生结果与三个既有接口一致"""
+        ref, hyp = "今天天气很好，我们去公园吧！", "今天天汽很好我们去公圆"
+        alignment = metrics.align(ref, hyp)
+        assert alignment.to_metrics() == metrics.calculate_detailed_metrics(ref, hyp)
+        assert alignment.highlighted == metrics.highlight_errors(ref, hyp)
+        assert alignment.diff_sequence == metrics.show_differences(ref, hyp)
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_align_cer_matches_calculate_cer(self, metrics):
+        """align 的 CER 与 calculate_cer 一致"""
+        ref, hyp = "我来到北京清华大学", "我到北京清大学了"
+        assert metrics.align(ref, hyp).cer == pytest.approx(metrics.calculate_cer(ref, hyp))
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_align_preprocesses_once(self, metrics, monkeypatch):
+        """align 对每侧文本只预处理一次"""
+        calls = []
+        original = metrics.preprocess_text
+
+        def _counting(text, filter_fillers=False):
+            calls.append(text)
+            return original(text, filter_fillers)
+
+        monkeypatch.setattr(metrics, 'preprocess_text', _counting)
+        alignment = metrics.align("你好世界", "你好时间")
+        alignment.to_metrics()
+        alignment.highlighted
+        alignment.diff_sequence
+        assert len(calls) == 2
+
+
+# ════════════════════════════════════════════════════
+# 第四组：字符级快速路径（不调用分词器）
+# ════════════════════════════════════════════════════
+
+class TestTokenizerFreePath:
+    """字符级计算不调用 tokenizer.tokenize，词级输出惰性计算"""
+
+    @pytest.fixture
+    def counting_tokenize(self, metrics, monkeypatch):
+        calls = []
+        original = metrics.tokenizer.tokenize
+
+        def _counting(text):
+            calls.append(text)
+            return original(text)
+
+        monkeypatch.setattr(metrics.tokenizer, 'tokenize', _counting)
+        return calls
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_cer_and_metrics_skip_tokenizer(self, metrics, counting_tokenize):
+        """calculate_cer / calculate_detailed_metrics 不调用 tokenize"""
+        metrics.calculate_cer("今天天气很好", "今天天汽很好")
+        metrics.calculate_detailed_metrics("今天天气很好", "今天天汽很好")
+        metrics.align("今天天气很好", "今天天汽很好").to_metrics()
+        assert counting_tokenize == []
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_word_tokens_computed_lazily_once(self, metrics, counting_tokenize):
+        """访问词级输出时才分词，且每侧只分词一次"""
+        alignment = metrics.align("我来到北京清华大学", "我来到北京")
+        assert counting_tokenize == []
+        tokens = alignment.ref_tokens
+        alignment.ref_tokens
+        assert counting_tokenize == ["我来到北京清华大学"]
+        assert "".join(word for word, _, _ in tokens) == alignment.reference
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_positions_match_get_character_positions(self, metrics):
+        """惰性字符位置与 get_character_positions 一致"""
+        alignment = metrics.align("我来到北京清华大学", "我来到北京")
+        assert alignment.ref_positions == metrics.get_character_positions(alignment.reference)
+        assert alignment.hyp_positions == metrics.get_character_positions(alignment.hypothesis)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_positions_without_tokenizer(self):
+        """未提供分词函数时按单字切分"""
+        result = AlignmentResult("你好", "你", compute_opcodes("你好", "你"))
+        assert result.ref_positions == [("你", 0), ("好", 1)]
+
+
+# ════════════════════════════════════════════════════
+# 第五组：位并行后端
+# ════════════════════════════════════════════════════
+
+def _random_pairs(count, alphabet, max_len, seed):
+    """生成可复现的随机字符串对"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield (
+            ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len))),
+            ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len))),
+        )
+
+
+class TestBitParallelBackend:
+    """位并行编辑距离与回溯测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("ref, hyp", PAIRS)
+    def test_editops_match_naive_dp(self, ref, hyp):
+        """固定样例：编辑操作与朴素DP回溯完全一致"""
+        assert bitparallel_editops(ref, hyp) == backtrack_editops(ref, hyp)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_random_pairs_match_naive_dp(self):
+        """随机样例：编辑操作与距离均与朴素DP一致"""
+        for ref, hyp in _random_pairs(500, "abc今天", 20, seed=2024):
+            expected = backtrack_editops(ref, hyp)
+            assert bitparallel_editops(ref, hyp) == expected, (ref, hyp)
+            assert bitparallel_distance(ref, hyp) == len(expected), (ref, hyp)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_multiword_bit_vectors(self):
+        """参考长度超过 64 位时结果依然正确"""
+        for ref, hyp in _random_pairs(20, "abcd", 200, seed=7):
+            assert bitparallel_editops(ref, hyp) == backtrack_editops(ref, hyp)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_long_text_counts(self):
+        """万字级文本可快速得到 S/D/I"""
+        ref = "今天天气很好" * 1667
+        hyp = ref[:5000] + "错" * 10 + ref[5100:]
+        s, d, i = count_editops(bitparallel_editops(ref, hyp))
+        assert (s, d, i) == (10, 90, 0)
+        assert bitparallel_distance(ref, hyp) == 100
+
+
+# ════════════════════════════════════════════════════
+# 第六组：线性内存分治回溯
+# ════════════════════════════════════════════════════
+
+class TestLinearSpaceBackend:
+    """线性内存分治回溯测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("block", [1, 2, 5])
+    def test_random_pairs_match_full_backtrack(self, block):
+        """小块宽强制多层分治，结果与全量回溯完全一致"""
+        for ref, hyp in _random_pairs(300, "abcd", 30, seed=block):
+            assert linear_space_editops(ref, hyp, block=block) == bitparallel_editops(ref, hyp), \
+                (ref, hyp)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_long_text_opcodes_identical(self):
+        """长文本下 opcodes 与全量回溯一致"""
+        rng = random.Random(11)
+        ref = ''.join(rng.choice("今天天气很好我们去公园") for _ in range(3000))
+        hyp = ref[:1000] + "多余" + ref[1000:2000] + ref[2100:]
+        assert linear_space_editops(ref, hyp, block=64) == bitparallel_editops(ref, hyp)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_threshold_selects_linear_mode(self, monkeypatch):
+        """m·n 超过阈值时自动选择线性内存模式"""
+        calls = []
+        original = alignment_module.linear_space_editops
+
+        def _tracking(s1, s2, *args, **kwargs):
+            calls.append((s1, s2))
+            return original(s1, s2, *args, **kwargs)
+
+        monkeypatch.setattr(alignment_module, 'linear_space_editops', _tracking)
+        fallback_editops("abcdef", "abcxef", linear_space_threshold=100)
+        assert calls == []
+        fallback_editops("abcdef", "abcxef", linear_space_threshold=10)
+        assert calls == [("abcdef", "abcxef")]
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_metrics_threshold_is_configurable(self):
+        """ASRMetrics 的阈值可配置，且不影响计算结果"""
+        ref, hyp = "我来到北京清华大学", "我到北京清大学了"
+        default = ASRMetrics(tokenizer_name='jieba')
+        linear = ASRMetrics(tokenizer_name='jieba', linear_space_threshold=0)
+        assert linear.linear_space_threshold == 0
+        assert linear.calculate_detailed_metrics(ref, hyp) == default.calculate_detailed_metrics(ref, hyp)
+        assert linear._calculate_edit_ops_with_backtrack(ref, hyp) == \
+            default._calculate_edit_ops_with_backtrack(ref, hyp)
+
+
+# ════════════════════════════════════════════════════
+# 第七组：批量编辑操作（NumPy 引擎）
+# ════════════════════════════════════════════════════
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+
+class TestBatchEditOps:
+    """批量编辑操作测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_batch_matches_per_pair(self, monkeypatch):
+        """回退链下批量结果与逐对回溯一致，且保持输入顺序"""
+        # 屏蔽 python-Levenshtein，其 S/D/I 拆分可能与回溯优先级不同
+        monkeypatch.setitem(sys.modules, 'Levenshtein', None)
+        pairs = PAIRS + list(_random_pairs(40, "abcd今天", 30, seed=6))
+        expected = [count_editops(backtrack_editops(ref, hyp)) for ref, hyp in pairs]
+        assert edit_ops_batch(pairs) == expected
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_metrics_batch_matches_single(self, metrics):
+        """ASRMetrics 批量接口与单对接口一致"""
+        pairs = list(_random_pairs(20, "我来到北京清华大学", 25, seed=8))
+        expected = [metrics._calculate_edit_ops(list(ref), list(hyp)) for ref, hyp in pairs]
+        assert metrics._calculate_edit_ops_batch(pairs) == expected
+
+    @pytest.mark.optional
+    @pytest.mark.unit
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy 未安装")
+    @pytest.mark.parametrize("max_cells", [16, 500, 16_000_000])
+    def test_numpy_engine_matches_naive_dp(self, max_cells):
+        """NumPy 引擎在不同分组大小下与朴素DP回溯一致"""
+        from cer_tool.numpy_alignment import numpy_edit_ops_batch
+
+        pairs = PAIRS + list(_random_pairs(200, "abc今天气", 40, seed=12))
+        expected = [count_editops(backtrack_editops(ref, hyp)) for ref, hyp in pairs]
+        assert numpy_edit_ops_batch(pairs, max_cells=max_cells) == expected
+
+    @pytest.mark.optional
+    @pytest.mark.unit
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy 未安装")
+    def test_numpy_engine_non_bmp_characters(self):
+        """BMP 以外的字符按码点正确比较"""
+        from cer_tool.numpy_alignment import numpy_edit_ops_batch
+
+        pairs = [("𠀀𠀁𠀂", "𠀀𠀂"), ("a😀b", "a😁b")] * 4
+        expected = [count_editops(backtrack_editops(ref, hyp)) for ref, hyp in pairs]
+        assert numpy_edit_ops_batch(pairs) == expected
+
+
+# ════════════════════════════════════════════════════
+# 第八组：带上限的编辑距离
+# ════════════════════════════════════════════════════
+
+class TestBoundedDistance:
+    """阈值判定用编辑距离测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_random_pairs_match_full_distance(self):
+        """任意上限下：未超限返回精确距离，超限返回 None"""
+        for ref, hyp in _random_pairs(500, "abc今天", 20, seed=77):
+            distance = bitparallel_distance(ref, hyp)
+            for limit in range(-1, 12):
+                expected = distance if 0 <= limit and distance <= limit else None
+                assert bounded_distance(ref, hyp, limit) == expected, (ref, hyp, limit)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_early_exit_on_diagonal(self, monkeypatch):
+        """长度与字符计数相同但乱序的文本，在扫描完之前即退出"""
+        seen = []
+        original = alignment_module._pattern_masks
+
+        class _CountingDict(dict):
+            def get(self, key, default=None):
+                seen.append(key)
+                return super().get(key, default)
+
+        monkeypatch.setattr(alignment_module, '_pattern_masks',
+                            lambda s1: _CountingDict(original(s1)))
+        ref = "abcd" * 250
+        hyp = "dcba" * 250
+        assert bounded_distance(ref, hyp, 10) is None
+        assert len(seen) < len(hyp)
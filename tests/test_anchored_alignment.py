@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+锚点分段对齐测试模块
+
+覆盖场景：
+- 锚点查找：唯一 n-gram、顺序一致、互不重叠、扩展到最长匹配
+- 分段对齐的 opcodes 覆盖全长，匹配片段内容一致
+- 相似文本下错误总数与整体对齐一致（回退实现下 S/D/I 拆分也一致）
+- 无锚点时退回整体对齐
+- 执行器并行计算与串行结果一致
+- ASRMetrics.align(segmented=True) 集成
+"""
+
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cer_tool.alignment import AlignmentResult, compute_opcodes
+from cer_tool.anchored_alignment import anchored_opcodes, find_anchors
+from cer_tool.metrics import ASRMetrics
+
+ALPHABET = "今天天气很好我们去公园散步吃饭学习工作北京上海"
+
+
+def _mutate(text, rate, rng):
+    """按给定比例随机替换、删除、插入字符"""
+    out = []
+    for char in text:
+        roll = rng.random()
+        if roll < rate / 3:
+            out.append(rng.choice(ALPHABET))
+        elif roll < 2 * rate / 3:
+            continue
+        elif roll < rate:
+            out.append(char)
+            out.append(rng.choice(ALPHABET))
+        else:
+            out.append(char)
+    return ''.join(out)
+
+
+def _similar_pairs(count, max_len, seed):
+    """生成可复现的相似文本对"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        ref = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_len)))
+        yield ref, _mutate(ref, rng.choice([0.02, 0.05, 0.1]), rng)
+
+
+def _assert_covers(opcodes, ref, hyp):
+    """opcodes 首尾相接覆盖全长，匹配片段内容一致"""
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j)
+        if tag == 'equal':
+            assert ref[i1:i2] == hyp[j1:j2]
+        i, j = i2, j2
+    assert (i, j) == (len(ref), len(hyp))
+
+
+# ════════════════════════════════════════════════════
+# 第一组：锚点查找
+# ════════════════════════════════════════════════════
+
+class TestFindAnchors:
+    """锚点查找测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_identical_text_single_anchor(self):
+        """相同文本合并为一个覆盖全长的锚点"""
+        text = "我来到北京清华大学读书"
+        assert find_anchors(text, text, ngram=3) == [(0, 0, len(text))]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_anchors_are_ordered_and_exact(self):
+        """锚点按位置升序、互不重叠，且两侧内容一致"""
+        for ref, hyp in _similar_pairs(50, 200, seed=1):
+            end1 = end2 = 0
+            for i, j, length in find_anchors(ref, hyp, ngram=4):
+                assert i >= end1 and j >= end2 and length > 0
+                assert ref[i:i + length] == hyp[j:j + length]
+                end1, end2 = i + length, j + length
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_repeated_ngrams_are_not_anchors(self):
+        """重复出现的 n-gram 不作为锚点，短文本无锚点"""
+        assert find_anchors("哈哈哈哈哈哈", "哈哈哈哈", ngram=2) == []
+        assert find_anchors("短", "短", ngram=6) == []
+
+
+# ════════════════════════════════════════════════════
+# 第二组：分段对齐
+# ════════════════════════════════════════════════════
+
+class TestAnchoredOpcodes:
+    """分段对齐测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_distance_matches_full_alignment(self):
+        """相似文本下错误总数与整体对齐一致"""
+        for ref, hyp in _similar_pairs(200, 300, seed=2):
+            opcodes = anchored_opcodes(ref, hyp, ngram=4)
+            _assert_covers(opcodes, ref, hyp)
+            full = compute_opcodes(ref, hyp)
+            assert sum(AlignmentResult(ref, hyp, opcodes).counts) == \
+                sum(AlignmentResult(ref, hyp, full).counts), (ref, hyp)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_counts_match_full_fallback(self, monkeypatch):
+        """回退实现下替换/删除/插入的拆分也与整体对齐一致"""
+        # python-Levenshtein 在等价路径间的取舍依赖上下文，屏蔽后比较拆分
+        monkeypatch.setitem(sys.modules, 'Levenshtein', None)
+        for ref, hyp in _similar_pairs(200, 300, seed=4):
+            opcodes = anchored_opcodes(ref, hyp, ngram=4)
+            full = compute_opcodes(ref, hyp)
+            assert AlignmentResult(ref, hyp, opcodes).counts == \
+                AlignmentResult(ref, hyp, full).counts, (ref, hyp)
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_no_anchor_falls_back_to_full(self):
+        """无锚点时与整体对齐完全相同"""
+        ref, hyp = "今天天气很好", "明日有雨"
+        assert anchored_opcodes(ref, hyp) == compute_opcodes(ref, hyp)
+        assert anchored_opcodes("", "") == compute_opcodes("", "")
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_executor_matches_serial(self):
+        """并行计算空隙与串行结果一致"""
+        ref, hyp = next(_similar_pairs(1, 3000, seed=3))
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert anchored_opcodes(ref, hyp, executor=executor) == anchored_opcodes(ref, hyp)
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_metrics_segmented(self):
+        """ASRMetrics 分段模式与整体对齐指标一致"""
+        metrics = ASRMetrics(tokenizer_name='jieba')
+        ref = "今天天气很好，我们去公园散步，然后去吃饭。" * 20
+        hyp = "今天天汽很好，我们去公园散步，然后吃饭了。" * 20
+        segmented = metrics.calculate_detailed_metrics(ref, hyp, segmented=True)
+        full = metrics.calculate_detailed_metrics(ref, hyp)
+        assert segmented['cer'] == full['cer']
+        assert segmented['ref_length'] == full['ref_length']
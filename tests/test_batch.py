@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列式批量计算测试模块
+
+覆盖场景：
+- calculate_batch 逐行结果与 calculate_detailed_metrics 一致
+- 列使用 array('i') / array('d') 存储
+- 微平均 / 宏平均 CER 与总体准确率（汇总键名与 CorpusAccumulator 一致）
+- 空参考、空批量边界
+- 生成器输入与分块计算
+- 批量预处理与逐条预处理一致
+- 批量对齐 / 批量 CER 与逐对调用一致
+"""
+
+import pytest
+
+from cer_tool.batch import BatchMetrics
+from cer_tool.metrics import ASRMetrics
+
+# ────────────────── 共享 fixture ──────────────────
+
+@pytest.fixture(scope="module")
+def metrics():
+    """共享的 jieba ASRMetrics 实例"""
+    return ASRMetrics(tokenizer_name='jieba')
+
+
+PAIRS = [
+    ("今天天气很好", "今天天汽很好"),
+    ("我来到北京清华大学", "我到北京清大学了"),
+    ("你好，世界！", "你好世界"),
+    ("嗯，今天我们开会", "今天我们开会啊"),
+    ("", "多余"),
+    ("", ""),
+    ("参考", ""),
+]
+
+
+# ════════════════════════════════════════════════════
+# 第一组：逐行结果
+# ════════════════════════════════════════════════════
+
+class TestBatchRows:
+    """逐行结果一致性测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    @pytest.mark.parametrize("filter_fillers", [False, True])
+    def test_rows_match_detailed_metrics(self, metrics, filter_fillers):
+        """每行 S/D/I、长度、CER 与 calculate_detailed_metrics 一致"""
+        batch = metrics.calculate_batch(PAIRS, filter_fillers=filter_fillers)
+        assert len(batch) == len(PAIRS)
+        for (ref, hyp), row in zip(PAIRS, batch):
+            detail = metrics.calculate_detailed_metrics(ref, hyp, filter_fillers)
+            assert row == (detail['substitutions'], detail['deletions'], detail['insertions'],
+                           detail['ref_length'], detail['hyp_length'], detail['cer'])
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_columns_are_arrays(self, metrics):
+        """整数列为 array('i')，CER 列为 array('d')"""
+        batch = metrics.calculate_batch(PAIRS)
+        for column in (batch.substitutions, batch.deletions, batch.insertions,
+                       batch.ref_length, batch.hyp_length):
+            assert column.typecode == 'i'
+        assert batch.cer.typecode == 'd'
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_generator_input_and_chunking(self, metrics):
+        """生成器输入按块消费，结果与一次性计算相同"""
+        whole = metrics.calculate_batch(PAIRS)
+        chunked = metrics.calculate_batch((pair for pair in PAIRS), chunk_size=2)
+        assert list(chunked) == list(whole)
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    @pytest.mark.parametrize("filter_fillers", [False, True])
+    def test_preprocess_batch_matches_single(self, metrics, filter_fillers):
+        """preprocess_batch 与逐条 preprocess_text 结果一致"""
+        texts = [text for pair in PAIRS for text in pair] + ["   "]
+        assert metrics.preprocess_batch(texts, filter_fillers) == [
+            metrics.preprocess_text(text, filter_fillers) for text in texts]
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    @pytest.mark.parametrize("filter_fillers", [False, True])
+    def test_align_and_cer_batch_match_single(self, metrics, filter_fillers):
+        """align_batch / calculate_cer_batch 与逐对调用结果一致"""
+        aligned = metrics.align_batch(PAIRS, filter_fillers)
+        assert [alignment.to_metrics() for alignment in aligned] == [
+            metrics.calculate_detailed_metrics(ref, hyp, filter_fillers) for ref, hyp in PAIRS]
+        for limits in ({}, {'max_cer': 0.2}, {'max_distance': 1}):
+            assert metrics.calculate_cer_batch(PAIRS, filter_fillers, **limits) == [
+                metrics.calculate_cer(ref, hyp, filter_fillers, **limits) for ref, hyp in PAIRS]
+
+
+# ════════════════════════════════════════════════════
+# 第二组：汇总指标
+# ════════════════════════════════════════════════════
+
+class TestBatchAggregates:
+    """微/宏平均汇总测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_micro_and_macro(self):
+        """微平均按总字数加权，宏平均为逐对平均"""
+        batch = BatchMetrics()
+        batch.append(1, 0, 0, 10, 10)
+        batch.append(0, 1, 1, 2, 2)
+        assert batch.micro_cer == pytest.approx(3 / 12)
+        assert batch.macro_cer == pytest.approx((0.1 + 1.0) / 2)
+        assert batch.overall_accuracy == pytest.approx(1 - 3 / 12)
+        summary = batch.summary()
+        assert summary['total_pairs'] == 2
+        assert summary['total_deletions'] == 1
+        assert summary['total_ref_length'] == 12
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_summary_matches_accumulator(self):
+        """批量汇总与 CorpusAccumulator.summary 使用同一组键名与数值"""
+        batch = BatchMetrics(tokenizer_name='jieba')
+        batch.append(1, 0, 0, 10, 10)
+        batch.append(0, 0, 2, 0, 2)
+        summary = batch.summary()
+        assert summary.pop('tokenizer') == 'jieba'
+        assert summary == batch.to_accumulator().summary()
+        assert summary['avg_cer'] == pytest.approx((0.1 + 1.0) / 2)
+        assert 'macro_cer' not in summary
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_empty_batch_and_empty_reference(self, metrics):
+        """空批量与参考总字数为 0 的边界"""
+        empty = metrics.calculate_batch([])
+        assert len(empty) == 0
+        assert empty.micro_cer == 0.0
+        assert empty.macro_cer == 0.0
+        assert empty.overall_accuracy == 1.0
+
+        only_insertions = metrics.calculate_batch([("", "多余")])
+        assert only_insertions.micro_cer == 1.0
+        assert only_insertions.overall_accuracy == 0.0
@@ -6,6 +6,7 @@ CLI 命令行接口测试模块
 覆盖场景：
 - --version 输出
 - --list-tokenizers 功能
+- --refresh-tokenizers 清除探测缓存
 - 单文件模式正常处理
 - 单文件模式失败退出码
 - 批处理模式
@@ -14,12 +15,26 @@ CLI 命令行接口测试模块
 - --filter-fillers 选项
 - 无参数时打印帮助
 - 错误输出到 stderr
+- --max-cer 阈值判定模式
+- --segmented 锚点分段对齐
+- --jobs 并行批处理（结果顺序确定）
+- --format jsonl/tsv 与 --stream 流式写出
+- --ref-manifest / --hyp-manifest 清单输入
+- --cache 结果缓存
+- --profile 性能剖析报告
+- --prefetch 文件预读
+- --recursive / --ext 递归目录配对
+- --executor thread 线程池并行批处理（开始信息显示执行方式）
+- --jobs 并行模式按有界窗口读取惰性输入
+- 顺序模式按批评估文件对与清单语句对（--jieba-processes 多进程分词）
 """
 
 import json
 import os
 import subprocess
 import sys
+import time
+
 import pytest
 
 
@@ -111,6 +126,21 @@ class TestVersionAndHelp:
         assert result.returncode == 0
         assert 'jieba' in result.stdout.lower()
 
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_refresh_tokenizers(self, tmp_path):
+        """--refresh-tokenizers 删除探测缓存，记录过失败的分词器重新列为可用"""
+        from importlib import metadata
+        cache_file = tmp_path / "tokenizer_probe.json"
+        cache_file.write_text(json.dumps({'jieba': {
+            'version': metadata.version('jieba'), 'error': "离线无法下载", 'time': time.time()}}),
+            encoding='utf-8')
+        env = dict(os.environ, CER_TOOL_CACHE_DIR=str(tmp_path))
+        result = run_cli('--list-tokenizers', '--refresh-tokenizers', env=env)
+        assert result.returncode == 0
+        assert not cache_file.exists()
+        assert 'jieba' in result.stdout
+
 
 # ════════════════════════════════════════════════════
 # 第二组：单文件模式
@@ -216,6 +246,22 @@ class TestBatchMode:
         assert 'results' in data
         assert len(data['results']) == 3
 
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_batch_parallel_jobs_match_sequential(self, batch_dirs, tmp_path):
+        """--jobs 并行结果与串行一致，且按文件名顺序输出"""
+        asr_dir, ref_dir = batch_dirs
+        outputs = {}
+        for jobs in ('1', '2'):
+            output_file = str(tmp_path / f"jobs_{jobs}.json")
+            result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir, '--jobs', jobs,
+                             '--output', output_file, '--format', 'json')
+            assert result.returncode == 0
+            with open(output_file, 'r', encoding='utf-8') as f:
+                outputs[jobs] = json.load(f)['results']
+        assert outputs['2'] == outputs['1']
+        assert [r['asr_file'] for r in outputs['2']] == ['001.txt', '002.txt', '003.txt']
+
     @pytest.mark.basic
     @pytest.mark.cli
     def test_batch_pairs_by_filename_intersection(self, tmp_path):
@@ -288,6 +334,15 @@ class TestOptionCombinations:
         result = run_cli('--asr', asr_file, '--ref', ref_file, '--filter-fillers')
         assert result.returncode == 0
 
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_segmented_option(self, sample_files):
+        """--segmented 选项正常工作"""
+        asr_file, ref_file = sample_files
+        result = run_cli('--asr', asr_file, '--ref', ref_file, '--segmented')
+        assert result.returncode == 0
+        assert 'CER' in result.stdout
+
     @pytest.mark.basic
     @pytest.mark.cli
     def test_verbose_option(self, sample_files):
@@ -304,3 +359,380 @@ class TestOptionCombinations:
         assert result.returncode == 1
         # 错误信息应在 stderr 中
         assert '错误' in result.stderr or 'error' in result.stderr.lower() or len(result.stderr) > 0
+
+
+# ════════════════════════════════════════════════════
+# 第五组：阈值判定模式
+# ════════════════════════════════════════════════════
+
+class TestThresholdMode:
+    """--max-cer / --max-distance 阈值判定测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_batch_reports_over_threshold(self, batch_dirs):
+        """批处理列出超过 CER 上限的文件对"""
+        asr_dir, ref_dir = batch_dirs
+        result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir, '--max-cer', '0.1')
+        assert result.returncode == 0
+        assert '超出阈值: 2个文件对' in result.stdout
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_batch_json_marks_over_threshold(self, batch_dirs, tmp_path):
+        """JSON 输出中超限的文件对 cer 为 null 并带超限标记"""
+        asr_dir, ref_dir = batch_dirs
+        output_file = str(tmp_path / "triage.json")
+        result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir,
+                         '--max-distance', '0', '--output', output_file, '--format', 'json')
+        assert result.returncode == 0
+        with open(output_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert data['summary']['over_threshold'] == 2
+        by_name = {r['asr_file']: r for r in data['results']}
+        assert by_name['001.txt']['over_threshold'] is True
+        assert by_name['001.txt']['cer'] is None
+        assert by_name['003.txt']['over_threshold'] is False
+        assert by_name['003.txt']['cer'] == 0.0
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_single_pair_csv(self, sample_files, tmp_path):
+        """单文件阈值判定写入 CSV"""
+        asr_file, ref_file = sample_files
+        output_file = str(tmp_path / "triage.csv")
+        result = run_cli('--asr', asr_file, '--ref', ref_file,
+                         '--max-cer', '0.5', '--output', output_file, '--format', 'csv')
+        assert result.returncode == 0
+        with open(output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        assert 'over_threshold' in content
+        assert 'False' in content
+
+
+# ════════════════════════════════════════════════════
+# 第六组：流式输出
+# ════════════════════════════════════════════════════
+
+class TestStreamingOutput:
+    """--format jsonl/tsv 与 --stream 流式写出测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_batch_jsonl_with_summary_trailer(self, batch_dirs, tmp_path):
+        """批处理 JSONL 每行一条记录，末尾为汇总记录"""
+        asr_dir, ref_dir = batch_dirs
+        output_file = str(tmp_path / "results.jsonl")
+        result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir,
+                         '--output', output_file, '--format', 'jsonl')
+        assert result.returncode == 0
+        with open(output_file, 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        assert [r['asr_file'] for r in lines[:-1]] == ['001.txt', '002.txt', '003.txt']
+        assert lines[-1]['summary']['total_pairs'] == 3
+        assert lines[-1]['summary']['total_substitutions'] == 2
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_batch_stream_csv_with_sidecar(self, batch_dirs, tmp_path):
+        """--stream CSV 汇总写入 .summary.json 旁路文件"""
+        asr_dir, ref_dir = batch_dirs
+        output_file = str(tmp_path / "results.csv")
+        result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir, '--stream',
+                         '--output', output_file, '--format', 'csv')
+        assert result.returncode == 0
+        with open(output_file, 'r', encoding='utf-8') as f:
+            assert len(f.read().strip().splitlines()) == 4
+        with open(output_file + '.summary.json', 'r', encoding='utf-8') as f:
+            assert json.load(f)['summary']['total_pairs'] == 3
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_stream_requires_output(self, batch_dirs):
+        """流式写出未指定输出文件时报错"""
+        asr_dir, ref_dir = batch_dirs
+        result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir, '--format', 'jsonl')
+        assert result.returncode != 0
+        assert '--output' in result.stderr
+
+
+# ════════════════════════════════════════════════════
+# 第七组：清单输入
+# ════════════════════════════════════════════════════
+
+class TestManifestInput:
+    """--ref-manifest / --hyp-manifest 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_manifest_batch_json(self, tmp_path):
+        """Kaldi text 参考清单与 JSONL 识别清单按语句ID配对"""
+        ref_manifest = tmp_path / "ref.text"
+        hyp_manifest = tmp_path / "hyp.jsonl"
+        create_text_file(str(ref_manifest), "u1 今天天气非常好\nu2 明天会下雨\nu3 你好世界\n")
+        create_text_file(str(hyp_manifest),
+                         '{"utt_id": "u2", "text": "明天会下雪"}\n'
+                         '{"utt_id": "u1", "text": "今天天汽非常好"}\n')
+        result = run_cli('--ref-manifest', str(ref_manifest), '--hyp-manifest', str(hyp_manifest),
+                         '--format', 'json')
+        assert result.returncode == 0
+        data = json.loads(result.stdout)
+        assert [r['utt_id'] for r in data['results']] == ['u1', 'u2']
+        assert all(r['substitutions'] == 1 for r in data['results'])
+        assert 'u3' in result.stderr
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_manifest_requires_both(self, tmp_path):
+        """只指定一个清单时报错"""
+        ref_manifest = tmp_path / "ref.text"
+        create_text_file(str(ref_manifest), "u1 你好\n")
+        result = run_cli('--ref-manifest', str(ref_manifest))
+        assert result.returncode != 0
+        assert '--hyp-manifest' in result.stderr
+
+
+# ════════════════════════════════════════════════════
+# 第八组：结果缓存
+# ════════════════════════════════════════════════════
+
+class TestResultCacheOption:
+    """--cache 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_rerun_with_cache_matches(self, batch_dirs, tmp_path):
+        """使用缓存的第二次运行结果与第一次一致"""
+        asr_dir, ref_dir = batch_dirs
+        cache_file = str(tmp_path / "cache.sqlite")
+        outputs = []
+        for run in range(2):
+            output_file = str(tmp_path / f"run{run}.json")
+            result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir, '--cache', cache_file,
+                             '--output', output_file, '--format', 'json')
+            assert result.returncode == 0
+            with open(output_file, 'r', encoding='utf-8') as f:
+                outputs.append(json.load(f))
+        assert os.path.exists(cache_file)
+        assert outputs[0] == outputs[1]
+
+
+# ════════════════════════════════════════════════════
+# 第九组：性能剖析
+# ════════════════════════════════════════════════════
+
+class TestProfileOption:
+    """--profile 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_profile_report_on_stderr(self, batch_dirs):
+        """剖析报告输出到 stderr，stdout 的 JSON 不受影响"""
+        asr_dir, ref_dir = batch_dirs
+        result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir, '--profile', '--format', 'json')
+        assert result.returncode == 0
+        assert len(json.loads(result.stdout)['results']) == 3
+        assert '性能剖析报告' in result.stderr
+        assert '读取文件' in result.stderr
+        assert '对齐' in result.stderr
+
+
+# ════════════════════════════════════════════════════
+# 第十组：文件预读
+# ════════════════════════════════════════════════════
+
+class TestPrefetchOption:
+    """--prefetch 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_prefetch_matches_without_prefetch(self, batch_dirs):
+        """预读与不预读的批处理结果一致"""
+        asr_dir, ref_dir = batch_dirs
+        outputs = []
+        for prefetch in ('0', '4'):
+            result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir,
+                             '--prefetch', prefetch, '--format', 'json')
+            assert result.returncode == 0
+            outputs.append(json.loads(result.stdout)['results'])
+        assert outputs[0] == outputs[1]
+
+
+# ════════════════════════════════════════════════════
+# 第十一组：递归目录配对
+# ════════════════════════════════════════════════════
+
+class TestRecursivePairing:
+    """--recursive / --ext 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_recursive_pairs_by_relative_path(self, tmp_path):
+        """递归模式按相对路径配对子目录中的文件，并报告未配对文件"""
+        asr_dir = tmp_path / "asr"
+        ref_dir = tmp_path / "ref"
+        for shard in ("s1", "s2"):
+            (asr_dir / shard).mkdir(parents=True)
+            (ref_dir / shard).mkdir(parents=True)
+            create_text_file(str(asr_dir / shard / "u.txt"), "明天会下雪")
+            create_text_file(str(ref_dir / shard / "u.lab"), "明天会下雨")
+        create_text_file(str(asr_dir / "s2" / "extra.txt"), "多余")
+
+        result = run_cli('--asr-dir', str(asr_dir), '--ref-dir', str(ref_dir),
+                         '--recursive', '--ext', '.txt,.lab', '--format', 'json')
+        assert result.returncode == 0
+        results = json.loads(result.stdout)['results']
+        assert [r['asr_file'] for r in results] == ['s1/u.txt', 's2/u.txt']
+        assert results[0]['ref_file'] == 's1/u.lab'
+        assert "s2/extra" in result.stderr
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_missing_directory_reports_error(self, tmp_path):
+        """目录不存在时报错并返回失败码"""
+        result = run_cli('--asr-dir', str(tmp_path / "none"), '--ref-dir', str(tmp_path))
+        assert result.returncode == 1
+        assert "目录不存在" in result.stderr
+
+
+# ════════════════════════════════════════════════════
+# 第十二组：线程池并行
+# ════════════════════════════════════════════════════
+
+class TestThreadExecutor:
+    """--executor thread 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_thread_executor_matches_sequential(self, batch_dirs):
+        """线程池并行结果与串行一致，顺序不变"""
+        asr_dir, ref_dir = batch_dirs
+        outputs = []
+        for extra in ((), ('--jobs', '3', '--executor', 'thread')):
+            result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir,
+                             '--format', 'json', *extra)
+            assert result.returncode == 0
+            outputs.append(json.loads(result.stdout)['results'])
+        assert outputs[0] == outputs[1]
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_thread_executor_with_cache_and_profile(self, batch_dirs, tmp_path):
+        """线程池模式下各线程使用自己的缓存连接，剖析统计汇总到主线程"""
+        asr_dir, ref_dir = batch_dirs
+        cache_file = str(tmp_path / "cache.sqlite")
+        for _ in range(2):
+            result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir,
+                             '--jobs', '2', '--executor', 'thread',
+                             '--cache', cache_file, '--profile')
+            assert result.returncode == 0
+            assert "单对评估" in result.stderr
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_header_shows_executor_kind(self, batch_dirs):
+        """批处理开始信息按执行方式显示并行线程数或进程数"""
+        asr_dir, ref_dir = batch_dirs
+        for executor, label in (('thread', "并行线程数: 2"), ('process', "并行进程数: 2")):
+            result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir,
+                             '--jobs', '2', '--executor', executor)
+            assert result.returncode == 0
+            assert label in result.stdout
+
+
+# ════════════════════════════════════════════════════
+# 第十三组：并行任务窗口
+# ════════════════════════════════════════════════════
+
+class TestParallelWindow:
+    """--jobs 并行模式按有界窗口读取惰性输入"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_lazy_input_read_within_window(self, tmp_path):
+        """取回第一个结果时只读取了窗口内的任务，结果顺序与输入一致"""
+        from cer_tool.cli import PARALLEL_WINDOW_PER_WORKER, iter_pair_results
+
+        asr_file = tmp_path / "asr.txt"
+        ref_file = tmp_path / "ref.txt"
+        create_text_file(str(asr_file), "今天天汽非常好")
+        create_text_file(str(ref_file), "今天天气非常好")
+        consumed = []
+
+        def lazy_pairs():
+            for i in range(200):
+                consumed.append(i)
+                yield str(asr_file), str(ref_file)
+
+        jobs = 2
+        results = iter_pair_results(lazy_pairs(), 'jieba', False, jobs=jobs, executor='thread')
+        first = next(results)
+        assert first is not None and first['substitutions'] == 1
+        assert len(consumed) <= jobs * PARALLEL_WINDOW_PER_WORKER + 2
+        assert len([first] + list(results)) == 200
+
+
+# ════════════════════════════════════════════════════
+# 第十四组：顺序模式批量评估
+# ════════════════════════════════════════════════════
+
+class TestSequentialBatches:
+    """顺序模式按批调用 EvaluationSession.evaluate_batch"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("prefetch", [0, 2])
+    def test_directory_pairs_evaluated_in_batches(self, batch_dirs, monkeypatch, prefetch):
+        """目录批处理按批评估，读取失败的文件对在原位置返回 None"""
+        from cer_tool.cli import iter_pair_results
+        from cer_tool.session import EvaluationSession
+
+        asr_dir, ref_dir = batch_dirs
+        pairs = [(os.path.join(asr_dir, f"{i:03d}.txt"), os.path.join(ref_dir, f"{i:03d}.txt"))
+                 for i in (1, 2, 3)]
+        pairs.insert(1, (os.path.join(asr_dir, "missing.txt"), pairs[0][1]))
+        batch_sizes = []
+        original = EvaluationSession.evaluate_batch
+
+        def _spy(self, batch, filter_fillers=None):
+            batch_sizes.append(len(batch))
+            return original(self, batch, filter_fillers)
+
+        monkeypatch.setattr(EvaluationSession, 'evaluate_batch', _spy)
+        results = list(iter_pair_results(pairs, 'jieba', False, prefetch=prefetch))
+        assert [r is None for r in results] == [False, True, False, False]
+        assert [r['asr_file'] for r in results if r] == ["001.txt", "002.txt", "003.txt"]
+        assert batch_sizes == [3]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_manifest_pairs_evaluated_in_batches(self, monkeypatch):
+        """清单输入整批评估，结果带语句ID"""
+        from cer_tool.cli import iter_manifest_results
+        from cer_tool.session import EvaluationSession
+
+        calls = []
+        original = EvaluationSession.evaluate_batch
+
+        def _spy(self, batch, filter_fillers=None):
+            calls.append(len(batch))
+            return original(self, batch, filter_fillers)
+
+        monkeypatch.setattr(EvaluationSession, 'evaluate_batch', _spy)
+        text_pairs = [("u1", "今天天气很好", "今天天汽很好"), ("u2", "你好", "你好")]
+        results = list(iter_manifest_results(text_pairs, 'jieba', False))
+        assert [r['utt_id'] for r in results] == ["u1", "u2"]
+        assert calls == [2]
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_jieba_processes_match_single_process(self, batch_dirs):
+        """--jieba-processes 多进程分词的结果与单进程一致"""
+        asr_dir, ref_dir = batch_dirs
+        outputs = []
+        for extra in ((), ('--jieba-processes', '2')):
+            result = run_cli('--asr-dir', asr_dir, '--ref-dir', ref_dir, '--filter-fillers',
+                             '--format', 'json', *extra)
+            assert result.returncode == 0
+            outputs.append(json.loads(result.stdout)['results'])
+        assert outputs[0] == outputs[1]
@@ -14,6 +14,7 @@
 - 差异展示 (show_differences, highlight_errors)
 - 内置编辑距离（无 Levenshtein 库时的备选算法）
 - get_tokenizer_info
+- 阈值判定模式（max_cer / max_distance）
 """
 
 import pytest
@@ -333,3 +334,80 @@ class TestTokenizerInfo:
         info = metrics.get_tokenizer_info()
         assert isinstance(info, dict)
         assert 'name' in info or 'tokenizer_name' in info or len(info) > 0
+
+
+# ════════════════════════════════════════════════════
+# 第九组：预处理流水线缓存
+# ════════════════════════════════════════════════════
+
+class TestPipelineCache:
+    """编译流水线缓存测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_pipeline_built_once_per_config(self, monkeypatch):
+        """同一配置多次预处理只构建一次流水线"""
+        local_metrics = ASRMetrics(tokenizer_name='jieba')
+        calls = []
+        original = local_metrics._build_pipeline
+
+        def _counting(filter_fillers=False):
+            calls.append(filter_fillers)
+            return original(filter_fillers)
+
+        monkeypatch.setattr(local_metrics, '_build_pipeline', _counting)
+        for _ in range(3):
+            local_metrics.preprocess_text("你好，世界！")
+            local_metrics.preprocess_text("嗯，好的", filter_fillers=True)
+        assert calls == [False, True]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_cached_pipeline_matches_fresh_build(self, metrics):
+        """缓存的编译流水线与新建流水线结果一致"""
+        text = "嗯，今天ＡＢＣ天气很好啊！"
+        for filter_fillers in (False, True):
+            expected = metrics._build_pipeline(filter_fillers).process(text)
+            assert metrics.preprocess_text(text, filter_fillers) == expected
+
+
+# ════════════════════════════════════════════════════
+# 第十组：阈值判定模式
+# ════════════════════════════════════════════════════
+
+class TestThresholdedCER:
+    """max_cer / max_distance 阈值判定测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("ref,hyp", [
+        ("今天天气很好", "今天天汽很好"),
+        ("我来到北京清华大学", "我到北京清大学了"),
+        ("你好世界", "再见"),
+        ("", "多余"),
+        ("", ""),
+    ])
+    def test_within_threshold_returns_exact_cer(self, metrics, ref, hyp):
+        """未超限时返回与 calculate_cer 相同的精确值"""
+        exact = metrics.calculate_cer(ref, hyp)
+        assert metrics.calculate_cer(ref, hyp, max_cer=exact) == exact
+        assert metrics.calculate_cer(ref, hyp, max_cer=exact + 0.5) == exact
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_over_threshold_returns_none(self, metrics):
+        """超过 CER 上限时返回 None"""
+        ref, hyp = "我来到北京清华大学", "我到北京清大学了"
+        exact = metrics.calculate_cer(ref, hyp)
+        assert metrics.calculate_cer(ref, hyp, max_cer=exact - 0.01) is None
+        assert metrics.calculate_cer("", "多余", max_cer=0.5) is None
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_max_distance(self, metrics):
+        """编辑距离上限与 CER 上限同时生效，取更严格者"""
+        ref, hyp = "今天天气很好", "今天天汽不好"
+        assert metrics.calculate_cer(ref, hyp, max_distance=2) == pytest.approx(2 / 6)
+        assert metrics.calculate_cer(ref, hyp, max_distance=1) is None
+        assert metrics.calculate_cer(ref, hyp, max_cer=1.0, max_distance=1) is None
+        assert metrics.calculate_cer(ref, hyp, max_cer=0.2, max_distance=5) is None
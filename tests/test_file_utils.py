@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件工具测试模块
+
+覆盖场景：
+- UTF-8 / GBK / GB18030 文件自动识别编码
+- BOM 识别（UTF-8、UTF-16）并去除
+- 文件只读取一次
+- 按目录记忆编码，同目录后续文件优先尝试
+- 记忆的 GBK 编码不会把 UTF-8 文件解成乱码
+- 系统默认编码兜底成功时不记忆（不让 latin-1 抢在 GBK 之前）
+- 所有编码失败时抛出异常
+"""
+
+import builtins
+import locale
+
+import pytest
+
+from cer_tool import file_utils
+from cer_tool.file_utils import (
+    clear_encoding_cache,
+    decode_with_encodings,
+    read_file_with_encodings,
+)
+
+# ────────────────── 共享 fixture ──────────────────
+
+@pytest.fixture(autouse=True)
+def _clean_encoding_cache():
+    clear_encoding_cache()
+    yield
+    clear_encoding_cache()
+
+
+def _write(path, data: bytes):
+    path.write_bytes(data)
+    return str(path)
+
+
+# ════════════════════════════════════════════════════
+# 第一组：编码识别
+# ════════════════════════════════════════════════════
+
+class TestEncodingDetection:
+    """编码识别测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("encoding", ['utf-8', 'gbk', 'gb18030'])
+    def test_common_encodings(self, tmp_path, encoding):
+        """常见中文编码均能正确读取"""
+        path = _write(tmp_path / "a.txt", "  今天天气很好\r\n".encode(encoding))
+        assert read_file_with_encodings(path) == "今天天气很好"
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("bom_encoding", ['utf-8-sig', 'utf-16'])
+    def test_bom_detected_and_stripped(self, tmp_path, bom_encoding):
+        """带 BOM 的文件按 BOM 解码，且内容不含 BOM"""
+        path = _write(tmp_path / "a.txt", "语音识别".encode(bom_encoding))
+        assert read_file_with_encodings(path) == "语音识别"
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_newlines_normalized(self, tmp_path):
+        """换行符与文本模式读取一致"""
+        path = _write(tmp_path / "a.txt", "第一行\r\n第二行\r第三行".encode('utf-8'))
+        assert read_file_with_encodings(path) == "第一行\n第二行\n第三行"
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_undecodable_raises(self, tmp_path):
+        """所有编码都失败时抛出异常"""
+        path = _write(tmp_path / "a.txt", b"\xff\xfe\xfd")
+        with pytest.raises(Exception, match="无法读取文件"):
+            read_file_with_encodings(path, encodings=['ascii'])
+
+
+# ════════════════════════════════════════════════════
+# 第二组：单次读取与按目录记忆编码
+# ════════════════════════════════════════════════════
+
+class TestSingleReadAndMemory:
+    """单次读取与编码记忆测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_file_opened_once(self, tmp_path, monkeypatch):
+        """GBK 文件只打开一次"""
+        path = _write(tmp_path / "a.txt", "中文内容".encode('gbk'))
+        opened = []
+        real_open = builtins.open
+
+        def _counting_open(file, *args, **kwargs):
+            opened.append(file)
+            return real_open(file, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, 'open', _counting_open)
+        assert read_file_with_encodings(path) == "中文内容"
+        assert opened == [path]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_directory_encoding_remembered(self, tmp_path):
+        """同目录后续文件优先尝试上次成功的编码"""
+        read_file_with_encodings(_write(tmp_path / "a.txt", "中文".encode('gb18030')),
+                                 encodings=['utf-8', 'gb18030', 'gbk'])
+        assert file_utils._directory_encodings[str(tmp_path)] == 'gb18030'
+        text, encoding = decode_with_encodings("中文".encode('gbk'), ['utf-8', 'gbk', 'gb18030'],
+                                               preferred='gb18030')
+        assert (text, encoding) == ("中文", 'gb18030')
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_remembered_gbk_does_not_garble_utf8(self, tmp_path):
+        """目录记忆为 GBK 时，UTF-8 文件仍按 UTF-8 解码"""
+        read_file_with_encodings(_write(tmp_path / "a.txt", "中文".encode('gbk')))
+        assert file_utils._directory_encodings[str(tmp_path)] == 'gbk'
+        path = _write(tmp_path / "b.txt", "识别结果".encode('utf-8'))
+        assert read_file_with_encodings(path) == "识别结果"
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_bom_encoding_not_remembered(self, tmp_path):
+        """BOM 指定的编码不作为同目录其他文件的依据"""
+        read_file_with_encodings(_write(tmp_path / "a.txt", "中文".encode('utf-16')))
+        assert str(tmp_path) not in file_utils._directory_encodings
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_locale_fallback_not_remembered(self, tmp_path, monkeypatch):
+        """只靠系统默认编码解码成功时不记忆，同目录的 GBK 文件仍按 GBK 解码"""
+        monkeypatch.setattr(locale, 'getpreferredencoding', lambda do_setlocale=True: 'latin-1')
+        read_file_with_encodings(_write(tmp_path / "a.txt", b"caf\xe9 \xff"),
+                                 encodings=['utf-8', 'gbk'])
+        assert str(tmp_path) not in file_utils._directory_encodings
+        path = _write(tmp_path / "b.txt", "中文内容".encode('gbk'))
+        assert read_file_with_encodings(path) == "中文内容"
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+清单文件测试模块
+
+覆盖场景：
+- Kaldi text 清单（含空文本、多空白、BOM）
+- JSONL 清单（utt_id / id 字段，扩展名与内容识别）
+- 重复语句ID与格式错误报错（含非对象的 JSONL 行）
+- 按语句ID配对及未配对列表
+- 空文件
+"""
+
+import pytest
+
+from cer_tool.manifest import join_manifests, load_manifest
+
+
+def write_bytes(path, content: bytes) -> str:
+    """写入原始字节并返回路径"""
+    path.write_bytes(content)
+    return str(path)
+
+
+# ════════════════════════════════════════════════════
+# 第一组：读取清单
+# ════════════════════════════════════════════════════
+
+class TestLoadManifest:
+    """load_manifest 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_kaldi_text(self, tmp_path):
+        """Kaldi text：以第一个空白分隔 ID 与文本，允许空文本"""
+        path = write_bytes(tmp_path / "text",
+                           "\ufeffu1 今天 天气很好\nu2\t明天会下雨\r\n\nu3\n".encode('utf-8'))
+        assert load_manifest(path) == {'u1': '今天 天气很好', 'u2': '明天会下雨', 'u3': ''}
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_jsonl_by_extension_and_content(self, tmp_path):
+        """JSONL 按扩展名或首行内容识别，支持 utt_id / id 字段"""
+        content = '{"utt_id": "u1", "text": "你好"}\n{"id": 2, "text": "世界"}\n'.encode('utf-8')
+        expected = {'u1': '你好', '2': '世界'}
+        assert load_manifest(write_bytes(tmp_path / "hyp.jsonl", content)) == expected
+        assert load_manifest(write_bytes(tmp_path / "hyp.list", content)) == expected
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_empty_file(self, tmp_path):
+        """空文件返回空索引"""
+        assert load_manifest(write_bytes(tmp_path / "empty.text", b"")) == {}
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    @pytest.mark.parametrize("name,content", [
+        ("dup.text", "u1 一\nu1 二\n".encode('utf-8')),
+        ("bad.jsonl", b'{"utt_id": "u1", "text": \n'),
+        ("noid.jsonl", '{"text": "你好"}\n'.encode('utf-8')),
+        ("gbk.text", "u1 你好\n".encode('gbk')),
+    ])
+    def test_invalid_manifest(self, tmp_path, name, content):
+        """重复ID、非法 JSON、缺少ID字段、解码失败均抛出 ValueError"""
+        with pytest.raises(ValueError):
+            load_manifest(write_bytes(tmp_path / name, content))
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    @pytest.mark.parametrize("line", [b'5', b'null', b'"utt_id x"', b'["u1", "x"]'])
+    def test_jsonl_line_not_object(self, tmp_path, line):
+        """JSONL 行是合法 JSON 但不是对象时抛出带行号的 ValueError"""
+        path = write_bytes(tmp_path / "hyp.jsonl", b'{"utt_id": "u1", "text": ""}\n' + line + b'\n')
+        with pytest.raises(ValueError, match="第 2 行不是 JSON 对象"):
+            load_manifest(path)
+
+
+# ════════════════════════════════════════════════════
+# 第二组：按语句ID配对
+# ════════════════════════════════════════════════════
+
+class TestJoinManifests:
+    """join_manifests 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_join_in_reference_order(self):
+        """配对结果按参考清单顺序，并返回两侧未配对的ID"""
+        ref = {'u1': '一', 'u2': '二', 'u3': '三'}
+        hyp = {'u3': '叁', 'u9': '九', 'u1': '壹'}
+        pairs, ref_only, hyp_only = join_manifests(ref, hyp)
+        assert pairs == [('u1', '一', '壹'), ('u3', '三', '叁')]
+        assert ref_only == ['u2']
+        assert hyp_only == ['u9']
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录配对测试模块
+
+覆盖场景：
+- 单层目录按文件名配对（与原 glob 配对结果一致）
+- 递归遍历子目录，按相对路径配对
+- 多扩展名与扩展名优先级
+- 未配对文件只保留计数与样例
+- 配对结果惰性产出
+- 隐藏文件被跳过
+"""
+
+import pytest
+
+from cer_tool.pairing import (
+    UNMATCHED_SAMPLE_SIZE,
+    DirectoryPairing,
+    iter_text_files,
+    normalize_extensions,
+)
+
+
+def _touch(root, relative, text="文本"):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+# ────────────────── 共享 fixture ──────────────────
+
+@pytest.fixture
+def nested_dirs(tmp_path):
+    """两棵分片目录树：spk1/spk2 下各有文件，部分文件只在一侧"""
+    asr_dir, ref_dir = tmp_path / "asr", tmp_path / "ref"
+    for relative in ("a.txt", "spk1/u1.txt", "spk1/u2.txt", "spk2/u1.txt", "spk2/deep/u3.txt"):
+        _touch(asr_dir, relative)
+    for relative in ("a.txt", "spk1/u1.txt", "spk2/u1.txt", "spk2/deep/u3.txt", "spk3/u9.txt"):
+        _touch(ref_dir, relative)
+    return asr_dir, ref_dir
+
+
+# ════════════════════════════════════════════════════
+# 第一组：遍历与配对
+# ════════════════════════════════════════════════════
+
+class TestDirectoryPairing:
+    """目录配对测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_flat_pairing_by_stem(self, nested_dirs):
+        """非递归模式只配对顶层文件"""
+        asr_dir, ref_dir = nested_dirs
+        pairing = DirectoryPairing(str(asr_dir), str(ref_dir))
+        assert list(pairing) == [(str(asr_dir / "a.txt"), str(ref_dir / "a.txt"))]
+        assert (pairing.matched, pairing.asr_only, pairing.ref_only) == (1, 0, 0)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_recursive_pairing_by_relative_path(self, nested_dirs):
+        """递归模式按相对路径配对，同名不同目录的文件不会混淆"""
+        asr_dir, ref_dir = nested_dirs
+        pairing = DirectoryPairing(str(asr_dir), str(ref_dir), recursive=True)
+        pairs = list(pairing)
+        assert pairs == [
+            (str(asr_dir / rel), str(ref_dir / rel))
+            for rel in ("a.txt", "spk1/u1.txt", "spk2/deep/u3.txt", "spk2/u1.txt")
+        ]
+        assert pairing.asr_only_samples == ["spk1/u2"]
+        assert pairing.ref_only_samples == ["spk3/u9"]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_keys_sorted_consistently(self, tmp_path):
+        """遍历顺序按相对路径的元组字典序递增（归并配对的前提）"""
+        for relative in ("b.txt", "a/z.txt", "a b/c.txt", "a.x.txt", "a.txt"):
+            _touch(tmp_path, relative)
+        keys = [key for key, _ in iter_text_files(str(tmp_path), recursive=True)]
+        assert keys == sorted(keys)
+        assert len(keys) == 5
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_extension_priority(self, tmp_path):
+        """多扩展名：同名文件按扩展名优先级只取一个"""
+        asr_dir, ref_dir = tmp_path / "asr", tmp_path / "ref"
+        _touch(asr_dir, "u1.lab")
+        _touch(asr_dir, "u1.TXT")
+        _touch(ref_dir, "u1.lab")
+        _touch(ref_dir, "note.md")
+        pairing = DirectoryPairing(str(asr_dir), str(ref_dir), extensions=['txt', '.lab'])
+        assert list(pairing) == [(str(asr_dir / "u1.TXT"), str(ref_dir / "u1.lab"))]
+        assert pairing.duplicates == 1
+        assert normalize_extensions(['TXT', '.lab', 'txt']) == ('.txt', '.lab')
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_hidden_files_skipped(self, tmp_path):
+        """隐藏文件与隐藏目录不参与配对"""
+        _touch(tmp_path, ".hidden.txt")
+        _touch(tmp_path, ".git/x.txt")
+        _touch(tmp_path, "ok.txt")
+        keys = [key for key, _ in iter_text_files(str(tmp_path), recursive=True)]
+        assert keys == [("ok",)]
+
+
+# ════════════════════════════════════════════════════
+# 第二组：惰性与未配对统计
+# ════════════════════════════════════════════════════
+
+class TestLazyPairing:
+    """惰性配对测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_pairs_yielded_lazily(self, nested_dirs):
+        """取第一对时不需要遍历完整棵树"""
+        asr_dir, ref_dir = nested_dirs
+        pairing = DirectoryPairing(str(asr_dir), str(ref_dir), recursive=True)
+        pairs = iter(pairing)
+        assert next(pairs) == (str(asr_dir / "a.txt"), str(ref_dir / "a.txt"))
+        assert pairing.ref_only == 0  # spk3 尚未遍历
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_unmatched_keeps_only_samples(self, tmp_path):
+        """大量未配对文件只保留计数与少量样例"""
+        asr_dir, ref_dir = tmp_path / "asr", tmp_path / "ref"
+        ref_dir.mkdir()
+        for i in range(20):
+            _touch(asr_dir, f"u{i:03d}.txt")
+        pairing = DirectoryPairing(str(asr_dir), str(ref_dir))
+        assert list(pairing) == []
+        assert pairing.asr_only == 20
+        assert len(pairing.asr_only_samples) == UNMATCHED_SAMPLE_SIZE
+        assert pairing.asr_only_samples[0] == "u000"
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件预读测试模块
+
+覆盖场景：
+- 结果顺序与输入一致（含无线程顺序读取模式）
+- 读取失败以错误项返回，不中断后续文件
+- 预读窗口限制已读取未消费的文件对数量（背压）
+- 提前关闭生成器时取消尚未开始的读取
+- 记录读取阶段耗时
+"""
+
+import threading
+import time
+
+import pytest
+
+from cer_tool.prefetch import prefetch_file_pairs
+from cer_tool.profiling import STAGE_READ, StageProfiler
+
+
+def _fake_read(path):
+    """以路径本身作为文件内容，路径含 bad 时读取失败"""
+    if 'bad' in path:
+        raise UnicodeDecodeError('utf-8', b'', 0, 1, 'bad')
+    return f"内容{path}"
+
+
+PAIRS = [(f"asr{i}", f"ref{i}") for i in range(20)]
+
+
+# ════════════════════════════════════════════════════
+# 第一组：顺序与错误
+# ════════════════════════════════════════════════════
+
+class TestPrefetchOrder:
+    """预读顺序与错误处理测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("workers", [0, 1, 4])
+    def test_order_preserved(self, workers):
+        """结果顺序与输入一致"""
+        items = list(prefetch_file_pairs(PAIRS, workers=workers, depth=3, read=_fake_read))
+        assert [(item.asr_file, item.ref_file) for item in items] == PAIRS
+        assert items[5].texts == ("内容asr5", "内容ref5")
+        assert all(item.error is None for item in items)
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_read_error_reported_per_pair(self, workers):
+        """单个文件读取失败只影响对应的文件对"""
+        pairs = [("a1", "r1"), ("bad", "r2"), ("a3", "r3")]
+        items = list(prefetch_file_pairs(pairs, workers=workers, read=_fake_read))
+        assert items[1].texts is None
+        assert isinstance(items[1].error, UnicodeDecodeError)
+        assert items[2].texts == ("内容a3", "内容r3")
+
+
+# ════════════════════════════════════════════════════
+# 第二组：背压与取消
+# ════════════════════════════════════════════════════
+
+class TestPrefetchBackpressure:
+    """预读窗口与取消测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_window_bounds_reads_ahead(self):
+        """已开始读取但未被消费的文件对不超过窗口大小"""
+        lock = threading.Lock()
+        started = []
+
+        def _read(path):
+            with lock:
+                started.append(path)
+            return path
+
+        depth = 3
+        consumed = 0
+        for _ in prefetch_file_pairs(PAIRS, workers=2, depth=depth, read=_read):
+            consumed += 1
+            time.sleep(0.005)  # 给预读线程充分时间提前读取
+            with lock:
+                ahead = len(started) // 2 - consumed
+            assert ahead <= depth
+        assert consumed == len(PAIRS)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_close_stops_reading(self):
+        """提前关闭生成器后不再提交新的读取任务"""
+        lock = threading.Lock()
+        started = []
+
+        def _read(path):
+            with lock:
+                started.append(path)
+            return path
+
+        prefetched = prefetch_file_pairs(PAIRS, workers=1, depth=2, read=_read)
+        next(prefetched)
+        prefetched.close()
+        time.sleep(0.05)
+        assert len(started) // 2 <= 3
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_profiler_records_read_stage(self):
+        """启用剖析时记录读取阶段"""
+        profiler = StageProfiler()
+        list(prefetch_file_pairs(PAIRS, workers=2, read=_fake_read, profiler=profiler))
+        assert profiler.summary()[STAGE_READ]['count'] == len(PAIRS)
@@ -11,6 +11,7 @@
 - 链式调用
 - create_pipeline 便捷函数
 - 边界条件（空字符串、仅空白、超长文本）
+- 批量处理（process_batch / compile_batch，分词器按批调用）
 """
 
 import pytest
@@ -315,3 +316,111 @@ class TestPreprocessingBoundary:
         step = RemovePunctuationStep()
         repr_str = repr(step)
         assert "启用" in repr_str
+
+
+# ════════════════════════════════════════════════════
+# 第五组：编译流水线
+# ════════════════════════════════════════════════════
+
+class TestCompiledPipeline:
+    """PreprocessingPipeline.compile 测试"""
+
+    SAMPLES = ["你好，世界！Hello１２３", "  ＡＢＣ  def\t测试。", "", "嗯，好的啊"]
+
+    @pytest.mark.basic
+    @pytest.mark.pipeline
+    @pytest.mark.parametrize("preset", ['basic', 'conservative', 'aggressive',
+                                        'cer_optimized', 'asr_evaluation'])
+    def test_compiled_equals_process(self, preset):
+        """编译结果与逐步执行 process 的输出一致"""
+        pipeline = create_pipeline(preset)
+        pipeline.add_step(LowercaseStep())
+        compiled = pipeline.compile()
+        for text in self.SAMPLES:
+            assert compiled(text) == pipeline.process(text)
+
+    @pytest.mark.basic
+    @pytest.mark.pipeline
+    def test_compiled_skips_disabled_steps(self):
+        """禁用的步骤在编译时被剔除"""
+        pipeline = PipelinePresets.aggressive()
+        pipeline.enable_step("数字归一", False)
+        compiled = pipeline.compile()
+        assert compiled("温度25度") == "温度25度"
+
+    @pytest.mark.basic
+    @pytest.mark.pipeline
+    def test_compiled_is_snapshot(self):
+        """编译后修改流水线不影响已编译的可调用对象"""
+        pipeline = PipelinePresets.basic()
+        compiled = pipeline.compile()
+        pipeline.add_step(LowercaseStep())
+        assert compiled("ABC") == "ABC"
+        assert pipeline.compile()("ABC") == "abc"
+
+    @pytest.mark.basic
+    @pytest.mark.pipeline
+    def test_custom_step_compiles(self):
+        """自定义函数步骤通过默认 as_callable 参与编译"""
+        pipeline = PreprocessingPipeline()
+        pipeline.add_step(CustomFunctionStep("反转", lambda t: t[::-1]))
+        assert pipeline.compile()("abc") == "cba"
+
+
+# ════════════════════════════════════════════════════
+# 第六组：批量处理
+# ════════════════════════════════════════════════════
+
+class _BatchCountingTokenizer:
+    """记录批量调用次数的测试分词器（按字切分，"嗯" 标为语气词）"""
+
+    def __init__(self):
+        self.batch_calls = []
+
+    def posseg(self, text):
+        return [(ch, 'y' if ch == '嗯' else 'x') for ch in text]
+
+    def posseg_batch(self, texts):
+        self.batch_calls.append(list(texts))
+        return [self.posseg(text) for text in texts]
+
+    def cut(self, text):
+        return list(text)
+
+    def cut_batch(self, texts):
+        self.batch_calls.append(list(texts))
+        return [self.cut(text) for text in texts]
+
+
+class TestBatchPipeline:
+    """process_batch / compile_batch 测试"""
+
+    SAMPLES = ["你好，世界！Hello１２３", "  ＡＢＣ  def\t测试。", "", "嗯，好的啊", "   "]
+
+    @pytest.mark.basic
+    @pytest.mark.pipeline
+    @pytest.mark.parametrize("preset", ['basic', 'aggressive', 'cer_optimized', 'asr_evaluation'])
+    def test_batch_equals_process(self, preset):
+        """批量结果与逐条 process 一致"""
+        pipeline = create_pipeline(preset, _BatchCountingTokenizer())
+        expected = [pipeline.process(text) for text in self.SAMPLES]
+        assert pipeline.process_batch(self.SAMPLES) == expected
+        assert pipeline.compile_batch()(self.SAMPLES) == expected
+
+    @pytest.mark.basic
+    @pytest.mark.pipeline
+    def test_filler_step_uses_one_batch_call(self):
+        """语气词过滤对整批非空文本只调用一次 posseg_batch"""
+        tokenizer = _BatchCountingTokenizer()
+        step = FilterFillerWordsStep(tokenizer)
+        assert step.process_batch(["嗯好的", "", "对嗯"]) == ["好的", "", "对"]
+        assert tokenizer.batch_calls == [["嗯好的", "对嗯"]]
+
+    @pytest.mark.basic
+    @pytest.mark.pipeline
+    def test_tokenize_step_batch(self):
+        """中文分词步骤批量处理，短文本不送入分词器"""
+        tokenizer = _BatchCountingTokenizer()
+        step = ChineseTokenizeStep(tokenizer)
+        assert step.process_batch(["今天天气", " 好 ", ""]) == ["今天天气", "好", ""]
+        assert tokenizer.batch_calls == [["今天天气"]]
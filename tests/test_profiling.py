@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分阶段性能剖析测试模块
+
+覆盖场景：
+- 计次、总耗时、分位数与字符吞吐率
+- 计时器合并与取出（drain）
+- 启用剖析后结果不变，且记录预处理各步骤与对齐阶段
+- 关闭剖析后不再计时
+- 文本报告格式
+"""
+
+import pytest
+
+from cer_tool.metrics import ASRMetrics
+from cer_tool.profiling import (
+    STAGE_ALIGN,
+    STAGE_EVALUATE,
+    StageProfiler,
+    preprocess_stage,
+)
+from cer_tool.session import EvaluationSession
+
+PAIRS = [
+    ("嗯，今天天气很好", "今天天汽很好啊"),
+    ("我来到北京清华大学", "我到北京清大学了"),
+]
+
+
+# ════════════════════════════════════════════════════
+# 第一组：计时统计
+# ════════════════════════════════════════════════════
+
+class TestStageProfiler:
+    """StageProfiler 统计测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_totals_and_percentiles(self):
+        """总耗时、均值、分位数与吞吐率"""
+        profiler = StageProfiler()
+        for ms in range(1, 101):
+            profiler.record("阶段", ms / 1000, chars=10)
+        stats = profiler.summary()["阶段"]
+        assert stats['count'] == 100
+        assert stats['total_seconds'] == pytest.approx(5.05)
+        assert stats['mean_ms'] == pytest.approx(50.5)
+        assert stats['p50_ms'] == pytest.approx(50, rel=0.05)
+        assert stats['p99_ms'] == pytest.approx(99, rel=0.05)
+        assert stats['max_ms'] == pytest.approx(100)
+        assert stats['chars_per_sec'] == pytest.approx(1000 / 5.05)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_merge_and_drain(self):
+        """合并累加两份统计；drain 取出并清空"""
+        first, second = StageProfiler(), StageProfiler()
+        first.record("a", 0.01, 5)
+        second.record("a", 0.03, 5)
+        second.record("b", 0.02)
+        first.merge(second)
+        assert first.summary()["a"]['count'] == 2
+        assert first.summary()["a"]['chars'] == 10
+        assert list(first.summary()) == ["a", "b"]
+
+        drained = first.drain()
+        assert first.summary() == {}
+        assert drained.summary()["b"]['count'] == 1
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_zero_duration(self):
+        """零耗时不报错，吞吐率为 0"""
+        profiler = StageProfiler()
+        profiler.record("a", 0.0, 3)
+        stats = profiler.summary()["a"]
+        assert stats['p50_ms'] == 0.0
+        assert stats['chars_per_sec'] == 0.0
+
+
+# ════════════════════════════════════════════════════
+# 第二组：计算引擎计时点
+# ════════════════════════════════════════════════════
+
+class TestProfiledMetrics:
+    """ASRMetrics / EvaluationSession 剖析测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_results_unchanged_and_stages_recorded(self):
+        """启用剖析结果不变，并记录预处理各步骤、对齐与单对评估"""
+        plain = EvaluationSession(tokenizer_name='jieba', filter_fillers=True)
+        profiler = StageProfiler()
+        profiled = EvaluationSession(tokenizer_name='jieba', filter_fillers=True, profiler=profiler)
+        for pair in PAIRS:
+            assert profiled.evaluate(pair) == plain.evaluate(pair)
+
+        stages = profiler.summary()
+        assert stages[STAGE_ALIGN]['count'] == len(PAIRS)
+        assert stages[STAGE_EVALUATE]['count'] == len(PAIRS)
+        assert stages[preprocess_stage("过滤语气词")]['count'] == 2 * len(PAIRS)
+        assert profiled.profiler is profiler
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_disable_profiling(self):
+        """关闭剖析后不再记录"""
+        metrics = ASRMetrics(tokenizer_name='jieba')
+        profiler = metrics.enable_profiling()
+        metrics.calculate_cer(*PAIRS[0])
+        metrics.calculate_batch(PAIRS)
+        assert profiler.summary()[STAGE_ALIGN]['count'] == 2
+
+        metrics.disable_profiling()
+        metrics.calculate_cer(*PAIRS[0])
+        assert profiler.summary()[STAGE_ALIGN]['count'] == 2
+        assert metrics.profiler is None
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_format_report(self):
+        """文本报告包含阶段名称与占比"""
+        profiler = StageProfiler()
+        profiler.record(STAGE_ALIGN, 0.5, 100)
+        report = profiler.format_report(wall_seconds=1.0)
+        assert STAGE_ALIGN in report
+        assert "50.0%" in report
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结果缓存测试模块
+
+覆盖场景：
+- 缓存键区分配置指纹、参考文本与假设文本
+- SQLite 读写、持久化与清空
+- 会话命中缓存时跳过计算
+- 配置变化（语气词过滤、阈值）不共用缓存
+- 流水线指纹随步骤与语气词表变化
+"""
+
+import pytest
+
+from cer_tool.preprocessing import (
+    FilterFillerWordsStep,
+    PreprocessingPipeline,
+    RemovePunctuationStep,
+)
+from cer_tool.result_cache import ResultCache, make_cache_key
+from cer_tool.session import EvaluationSession
+
+# ════════════════════════════════════════════════════
+# 第一组：缓存存储
+# ════════════════════════════════════════════════════
+
+class TestResultCacheStore:
+    """ResultCache 与缓存键测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_cache_key_distinguishes_parts(self):
+        """拼接相同但拆分不同的输入得到不同的键"""
+        assert make_cache_key("f", "ab", "c") != make_cache_key("f", "a", "bc")
+        assert make_cache_key("f1", "a", "b") != make_cache_key("f2", "a", "b")
+        assert make_cache_key("f", "a", "b") == make_cache_key("f", "a", "b")
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_put_get_persist_and_clear(self, tmp_path):
+        """写入的结果在重新打开后仍可读取，清空后未命中"""
+        cache_file = str(tmp_path / "cache.sqlite")
+        with ResultCache(cache_file) as cache:
+            assert cache.get("k") is None
+            cache.put("k", {'cer': 0.5, 'tokenizer': '结巴'})
+        with ResultCache(cache_file) as cache:
+            assert cache.get("k") == {'cer': 0.5, 'tokenizer': '结巴'}
+            assert len(cache) == 1
+            assert (cache.hits, cache.misses) == (1, 0)
+            cache.clear()
+            assert cache.get("k") is None
+
+
+# ════════════════════════════════════════════════════
+# 第二组：会话缓存
+# ════════════════════════════════════════════════════
+
+class TestSessionCache:
+    """EvaluationSession 使用缓存测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_hit_skips_computation(self, tmp_path, monkeypatch):
+        """第二个会话直接从缓存读取结果，不再对齐"""
+        cache_file = str(tmp_path / "cache.sqlite")
+        pair = ("今天天气很好", "今天天汽很好")
+        with EvaluationSession(tokenizer_name='jieba', cache_file=cache_file) as first:
+            expected = first.evaluate(pair)
+
+        with EvaluationSession(tokenizer_name='jieba', cache_file=cache_file) as second:
+            def _fail(*args, **kwargs):
+                raise AssertionError("命中缓存时不应重新对齐")
+            monkeypatch.setattr(second.metrics, 'align', _fail)
+            assert second.evaluate(pair) == expected
+            assert second.cache.hits == 1
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_settings_change_fingerprint(self, tmp_path):
+        """语气词过滤与阈值设置不同的会话使用不同的指纹"""
+        cache_file = str(tmp_path / "cache.sqlite")
+        pair = ("嗯今天天气很好", "今天天汽很好啊")
+        with EvaluationSession(tokenizer_name='jieba', cache_file=cache_file) as plain:
+            assert plain.fingerprint(False) != plain.fingerprint(True)
+            unfiltered = plain.evaluate(pair, filter_fillers=False)
+            filtered = plain.evaluate(pair, filter_fillers=True)
+            assert unfiltered != filtered
+            assert plain.cache.misses == 2
+        with EvaluationSession(tokenizer_name='jieba', cache_file=cache_file,
+                               max_cer=0.1) as triage:
+            assert triage.evaluate(pair)['over_threshold'] is True
+
+
+# ════════════════════════════════════════════════════
+# 第三组：流水线指纹
+# ════════════════════════════════════════════════════
+
+class TestPipelineFingerprint:
+    """PreprocessingPipeline.fingerprint 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_fingerprint_tracks_steps(self):
+        """禁用步骤或修改语气词表时指纹变化"""
+        def _build():
+            return (PreprocessingPipeline()
+                    .add_step(RemovePunctuationStep())
+                    .add_step(FilterFillerWordsStep()))
+
+        pipeline = _build()
+        original = pipeline.fingerprint()
+        assert original == _build().fingerprint()
+
+        filler_step = pipeline.get_steps()[1]
+        filler_step.filler_words.append("哈")
+        assert pipeline.fingerprint() != original
+
+        pipeline.enable_step(filler_step.name, False)
+        assert filler_step.name not in pipeline.fingerprint()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式结果写出测试模块
+
+覆盖场景：
+- JSONL 逐行记录与汇总尾记录
+- CSV / TSV 表头、分隔符与旁路汇总文件
+- 阈值判定结果的列与汇总
+- 按 flush_every 定期刷新
+- 不支持的格式报错
+- 异常中断时汇总标记为不完整
+"""
+
+import csv
+import json
+
+import pytest
+
+from cer_tool.aggregation import CorpusAccumulator
+from cer_tool.result_writer import StreamingResultWriter, summary_sidecar_path
+
+RESULTS = [
+    {'asr_file': 'a.txt', 'ref_file': 'a.txt', 'tokenizer': 'jieba', 'cer': 0.25,
+     'wer': 0.25, 'accuracy': 0.75, 'substitutions': 1, 'deletions': 0, 'insertions': 0,
+     'ref_length': 4, 'hyp_length': 4, 'filter_fillers': False},
+    {'asr_file': 'b.txt', 'ref_file': 'b.txt', 'tokenizer': 'jieba', 'cer': 0.0,
+     'wer': 0.0, 'accuracy': 1.0, 'substitutions': 0, 'deletions': 0, 'insertions': 0,
+     'ref_length': 6, 'hyp_length': 6, 'filter_fillers': False},
+]
+
+TRIAGE_RESULTS = [
+    {'asr_file': 'a.txt', 'ref_file': 'a.txt', 'tokenizer': 'jieba', 'cer': None,
+     'over_threshold': True, 'max_cer': 0.1, 'max_distance': None, 'filter_fillers': False},
+    {'asr_file': 'b.txt', 'ref_file': 'b.txt', 'tokenizer': 'jieba', 'cer': 0.0,
+     'over_threshold': False, 'max_cer': 0.1, 'max_distance': None, 'filter_fillers': False},
+]
+
+
+# ════════════════════════════════════════════════════
+# 第一组：输出格式
+# ════════════════════════════════════════════════════
+
+class TestStreamingFormats:
+    """JSONL / CSV / TSV 写出测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_jsonl_records_and_trailer(self, tmp_path):
+        """JSONL 每行一条记录，关闭时追加汇总记录"""
+        output_file = str(tmp_path / "out.jsonl")
+        with StreamingResultWriter(output_file, 'jsonl') as writer:
+            writer.write_all(RESULTS)
+        with open(output_file, 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        assert lines[:2] == RESULTS
+        assert lines[2]['summary'] == CorpusAccumulator.from_results(RESULTS).summary()
+        assert lines[2]['complete'] is True
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    @pytest.mark.parametrize("output_format,delimiter", [("csv", ","), ("tsv", "\t")])
+    def test_delimited_with_sidecar(self, tmp_path, output_format, delimiter):
+        """CSV / TSV 使用对应分隔符，汇总写入旁路文件"""
+        output_file = str(tmp_path / f"out.{output_format}")
+        with StreamingResultWriter(output_file, output_format) as writer:
+            writer.write_all(RESULTS)
+        with open(output_file, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f, delimiter=delimiter))
+        assert [row['asr_file'] for row in rows] == ['a.txt', 'b.txt']
+        assert rows[0]['substitutions'] == '1'
+        with open(summary_sidecar_path(output_file), 'r', encoding='utf-8') as f:
+            assert json.load(f)['summary']['total_ref_length'] == 10
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_triage_columns_and_summary(self, tmp_path):
+        """阈值判定结果使用判定列，汇总统计超限数"""
+        output_file = str(tmp_path / "triage.csv")
+        with StreamingResultWriter(output_file, 'csv') as writer:
+            writer.write_all(TRIAGE_RESULTS)
+        with open(output_file, 'r', encoding='utf-8', newline='') as f:
+            header = next(csv.reader(f))
+        assert 'over_threshold' in header
+        assert 'substitutions' not in header
+        assert writer.summary() == {'total_pairs': 2, 'over_threshold': 1,
+                                    'max_cer': 0.1, 'max_distance': None}
+
+
+# ════════════════════════════════════════════════════
+# 第二组：缓冲与边界
+# ════════════════════════════════════════════════════
+
+class TestStreamingBuffering:
+    """刷新与边界测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_flush_every(self, tmp_path):
+        """每写满 flush_every 条记录即可从磁盘读到"""
+        output_file = str(tmp_path / "out.jsonl")
+        writer = StreamingResultWriter(output_file, 'jsonl', flush_every=2)
+        writer.write(RESULTS[0])
+        writer.write(RESULTS[1])
+        with open(output_file, 'r', encoding='utf-8') as f:
+            assert len(f.read().splitlines()) == 2
+        writer.close()
+        writer.close()
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_unsupported_format(self, tmp_path):
+        """不支持流式写出的格式抛出 ValueError"""
+        with pytest.raises(ValueError):
+            StreamingResultWriter(str(tmp_path / "out.json"), 'json')
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    @pytest.mark.parametrize("output_format", ["jsonl", "csv"])
+    def test_interrupted_run_marked_incomplete(self, tmp_path, output_format):
+        """with 块内抛出异常 → 汇总标记 complete 为 false"""
+        output_file = str(tmp_path / f"out.{output_format}")
+        with pytest.raises(KeyboardInterrupt):
+            with StreamingResultWriter(output_file, output_format) as writer:
+                writer.write(RESULTS[0])
+                raise KeyboardInterrupt
+        if output_format == 'jsonl':
+            with open(output_file, 'r', encoding='utf-8') as f:
+                trailer = json.loads(f.read().splitlines()[-1])
+        else:
+            with open(summary_sidecar_path(output_file), 'r', encoding='utf-8') as f:
+                trailer = json.load(f)
+        assert trailer['complete'] is False
+        assert trailer['summary']['total_pairs'] == 1
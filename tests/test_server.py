@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻评估服务测试模块
+
+覆盖场景：
+- 长度前缀 JSON 消息的收发（连接关闭、超长长度字段）
+- ping / session / evaluate 请求，未知操作返回错误
+- 远程会话结果与本地会话一致，同一配置的会话在服务端复用
+- 会话在全局锁外创建（不阻塞 ping 与其他配置），同一配置只创建一次，创建失败不留登记
+- 服务未运行或版本不一致时 connect_session 返回 None（回退本地计算）
+- 套接字文件创建时即仅限当前用户访问
+- 不支持 Unix 域套接字的平台上导入 CLI 不失败，服务不可用
+- 已有服务在运行时拒绝重复启动，shutdown 请求停止服务
+- 客户端在应答前断开时处理线程静默结束
+- CLI --server auto 使用服务（只连接一次、不预先 ping），服务未运行或连接出错时本地计算
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+
+import pytest
+
+from cer_tool.server import (
+    MAX_MESSAGE_BYTES,
+    RemoteSession,
+    ServerError,
+    connect_session,
+    create_server,
+    recv_message,
+    send_message,
+    server_available,
+    stop_server,
+)
+from cer_tool.session import EvaluationSession
+
+PAIRS = [("今天天气很好", "今天天气真好"), ("我们去公园", "我们去公园"), ("你好", "")]
+
+
+# ────────────────── 共享 fixture ──────────────────
+
+@pytest.fixture
+def socket_path():
+    """短路径的临时套接字（Unix 域套接字路径长度有限）"""
+    directory = tempfile.mkdtemp(prefix="cer")
+    yield os.path.join(directory, "s.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def running_server(socket_path):
+    """在后台线程中运行评估服务，测试结束时停止"""
+    server = create_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.state.close()
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def batch_dirs(tmp_path):
+    """创建包含两个文件对的批处理目录"""
+    asr_dir, ref_dir = tmp_path / "asr", tmp_path / "ref"
+    asr_dir.mkdir()
+    ref_dir.mkdir()
+    for i, (ref, hyp) in enumerate(PAIRS[:2]):
+        (asr_dir / f"{i}.txt").write_text(hyp, encoding='utf-8')
+        (ref_dir / f"{i}.txt").write_text(ref, encoding='utf-8')
+    return str(asr_dir), str(ref_dir)
+
+
+# ════════════════════════════════════════════════════
+# 第一组：消息帧
+# ════════════════════════════════════════════════════
+
+class TestFraming:
+    """长度前缀 JSON 消息测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_round_trip(self):
+        """多条消息依次收发，对端关闭后返回 None"""
+        left, right = socket.socketpair()
+        with left, right:
+            send_message(left, {"op": "ping", "text": "中文"})
+            send_message(left, {"n": 2})
+            left.close()
+            assert recv_message(right) == {"op": "ping", "text": "中文"}
+            assert recv_message(right) == {"n": 2}
+            assert recv_message(right) is None
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_oversized_length_rejected(self):
+        """长度字段超过上限 → ValueError，不按该长度分配内存"""
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall((MAX_MESSAGE_BYTES + 1).to_bytes(4, 'big'))
+            with pytest.raises(ValueError):
+                recv_message(right)
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_truncated_message(self):
+        """消息中途断开 → ConnectionError"""
+        left, right = socket.socketpair()
+        with right:
+            left.sendall((10).to_bytes(4, 'big') + b'{"a"')
+            left.close()
+            with pytest.raises(ConnectionError):
+                recv_message(right)
+
+
+# ════════════════════════════════════════════════════
+# 第二组：服务与远程会话
+# ════════════════════════════════════════════════════
+
+class TestServer:
+    """评估服务与远程会话测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_remote_matches_local(self, running_server, socket_path):
+        """远程会话的评估结果与本地会话一致"""
+        with EvaluationSession("jieba") as local:
+            expected = [local.evaluate(pair) for pair in PAIRS]
+        with RemoteSession(socket_path, "jieba") as remote:
+            assert remote.tokenizer_name == "jieba"
+            assert [remote.evaluate(pair) for pair in PAIRS] == expected
+            assert remote.evaluate_batch(PAIRS) == expected
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_sessions_reused_per_config(self, running_server, socket_path):
+        """同一配置的请求复用服务端会话，不同配置各建一个"""
+        for _ in range(2):
+            with RemoteSession(socket_path, "jieba") as remote:
+                remote.evaluate(PAIRS[0])
+                remote.evaluate(PAIRS[0], filter_fillers=True)
+        assert len(running_server.state.sessions) == 2
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_triage_mode(self, running_server, socket_path):
+        """阈值判定配置传给服务端"""
+        with RemoteSession(socket_path, "jieba", max_cer=0.01) as remote:
+            assert remote.triage
+            assert remote.evaluate(PAIRS[0])['over_threshold'] is True
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_session_created_outside_global_lock(self, monkeypatch):
+        """创建会话时 ping 与其他配置不被阻塞，同一配置的并发请求只创建一次"""
+        import cer_tool.server as server_module
+        release = threading.Event()
+        created = []
+
+        class _SlowSession:
+            def __init__(self, tokenizer_name, filter_fillers, **kwargs):
+                created.append(filter_fillers)
+                if filter_fillers:
+                    release.wait(timeout=5)
+
+        monkeypatch.setattr(server_module, 'EvaluationSession', _SlowSession)
+        state = server_module.EvaluationServer()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            state.get_session({'filter_fillers': True}))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        try:
+            assert state.handle({'op': 'ping'})['sessions'] == 0
+            state.get_session({'filter_fillers': False})
+            assert len(state.sessions) == 1
+        finally:
+            release.set()
+            for thread in threads:
+                thread.join(timeout=5)
+        assert created.count(True) == 1
+        assert len({id(entry) for entry in results}) == 1
+        assert len(state.sessions) == 2
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_failed_session_not_reserved(self, monkeypatch):
+        """会话创建失败 → 不留下登记，下一次请求重新创建"""
+        import cer_tool.server as server_module
+        attempts = []
+
+        def _failing(*args, **kwargs):
+            attempts.append(1)
+            raise RuntimeError("模型加载失败")
+
+        monkeypatch.setattr(server_module, 'EvaluationSession', _failing)
+        state = server_module.EvaluationServer()
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                state.get_session({})
+        assert attempts == [1, 1]
+        assert state.sessions == {}
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_unknown_op_returns_error(self, running_server, socket_path):
+        """未知操作 → ok 为 false，连接仍可继续使用"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            send_message(sock, {"op": "nope"})
+            response = recv_message(sock)
+            assert response['ok'] is False
+            send_message(sock, {"op": "ping"})
+            assert recv_message(sock)['ok'] is True
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_no_server_falls_back(self, socket_path):
+        """服务未运行 → server_available 为 False，connect_session 返回 None"""
+        assert not server_available(socket_path)
+        assert connect_session(socket_path, tokenizer_name="jieba") is None
+        with pytest.raises(ServerError):
+            RemoteSession(socket_path, "jieba")
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_version_mismatch_falls_back(self, running_server, socket_path, monkeypatch):
+        """服务版本与本工具不一致 → connect_session 返回 None"""
+        handle = running_server.state.handle
+        monkeypatch.setattr(running_server.state, 'handle',
+                            lambda request: dict(handle(request), version='0.0.0'))
+        assert connect_session(socket_path, tokenizer_name="jieba") is None
+        monkeypatch.undo()
+        session = connect_session(socket_path, tokenizer_name="jieba")
+        assert session is not None
+        session.close()
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_socket_owner_only(self, running_server, socket_path):
+        """套接字文件对同组与其他用户没有任何权限"""
+        assert os.stat(socket_path).st_mode & 0o077 == 0
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_without_unix_sockets(self, socket_path):
+        """平台不支持 Unix 域套接字 → 导入 CLI 正常，服务不可用，create_server 报错"""
+        code = (
+            "import socket, socketserver\n"
+            "del socket.AF_UNIX, socketserver.UnixStreamServer\n"
+            "import cer_tool.cli\n"
+            "from cer_tool import server\n"
+            "assert not server.server_available(%r)\n"
+            "assert server.connect_session(%r) is None\n"
+            "assert not server.stop_server(%r)\n"
+            "try:\n"
+            "    server.create_server(%r)\n"
+            "except server.ServerError:\n"
+            "    print('ok')\n"
+        ) % ((socket_path,) * 4)
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == 'ok'
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_refuses_second_server(self, running_server, socket_path):
+        """套接字上已有服务在运行 → 拒绝重复启动"""
+        with pytest.raises(ServerError):
+            create_server(socket_path)
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_stop_server(self, socket_path):
+        """shutdown 请求停止服务循环"""
+        server = create_server(socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        assert server_available(socket_path)
+        assert stop_server(socket_path)
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        server.server_close()
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    @pytest.mark.parametrize("op", ["ping", "shutdown"])
+    def test_client_gone_before_reply(self, op):
+        """客户端发出请求后立即断开 → 应答失败时处理线程静默结束（shutdown 照常执行）"""
+        from cer_tool.server import EvaluationServer, _RequestHandler
+        stopped = threading.Event()
+
+        class _FakeServer:
+            state = EvaluationServer()
+
+            def shutdown(self):
+                stopped.set()
+
+        left, right = socket.socketpair()
+        with right:
+            send_message(left, {"op": op})
+            left.close()
+            _RequestHandler(right, None, _FakeServer())
+        assert stopped.wait(timeout=5 if op == "shutdown" else 0.2) == (op == "shutdown")
+
+
+# ════════════════════════════════════════════════════
+# 第三组：CLI --server auto
+# ════════════════════════════════════════════════════
+
+class TestCliServerOption:
+    """CLI 使用评估服务测试"""
+
+    @staticmethod
+    def _run(socket_path, *args):
+        cmd = [sys.executable, '-m', 'cer_tool.cli', *args,
+               '--server', 'auto', '--socket', socket_path, '--format', 'json']
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_batch_through_server(self, running_server, socket_path, batch_dirs):
+        """服务在运行时批处理交给服务计算，结果与本地一致"""
+        asr_dir, ref_dir = batch_dirs
+        result = self._run(socket_path, '--asr-dir', asr_dir, '--ref-dir', ref_dir)
+        assert result.returncode == 0
+        assert len(running_server.state.sessions) == 1
+
+        local = subprocess.run([sys.executable, '-m', 'cer_tool.cli', '--asr-dir', asr_dir,
+                                '--ref-dir', ref_dir, '--format', 'json'],
+                               capture_output=True, text=True, timeout=60)
+        assert json.loads(result.stdout)['results'] == json.loads(local.stdout)['results']
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_falls_back_without_server(self, socket_path, batch_dirs):
+        """服务未运行时本地计算"""
+        asr_dir, ref_dir = batch_dirs
+        result = self._run(socket_path, '--asr-dir', asr_dir, '--ref-dir', ref_dir)
+        assert result.returncode == 0
+        assert len(json.loads(result.stdout)['results']) == 2
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    @pytest.mark.parametrize("mode", ["single", "batch"])
+    def test_connects_once_without_ping(self, running_server, socket_path, batch_dirs,
+                                        monkeypatch, mode):
+        """--server auto 只建立一次会话连接，不预先 ping"""
+        ops = []
+        handle = running_server.state.handle
+
+        def _recording(request):
+            ops.append(request.get('op'))
+            return handle(request)
+
+        monkeypatch.setattr(running_server.state, 'handle', _recording)
+        asr_dir, ref_dir = batch_dirs
+        if mode == "single":
+            args = ('--asr', os.path.join(asr_dir, "0.txt"), '--ref', os.path.join(ref_dir, "0.txt"))
+        else:
+            args = ('--asr-dir', asr_dir, '--ref-dir', ref_dir)
+        result = self._run(socket_path, *args)
+        assert result.returncode == 0, result.stderr
+        assert ops[0] == 'session'
+        assert ops.count('session') == 1 and 'ping' not in ops
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_falls_back_when_connect_raises(self, running_server, socket_path, batch_dirs,
+                                            monkeypatch, capsys):
+        """连接服务时出现意外错误 → 警告后本地计算"""
+        import cer_tool.cli as cli
+        import cer_tool.server as server_module
+
+        def _broken(*args, **kwargs):
+            raise ConnectionResetError("连接被重置")
+
+        monkeypatch.setattr(server_module, 'connect_session', _broken)
+        asr_dir, ref_dir = batch_dirs
+        monkeypatch.setattr(sys, 'argv', ['cer-tool', '--asr-dir', asr_dir, '--ref-dir', ref_dir,
+                                          '--server', 'auto', '--socket', socket_path,
+                                          '--format', 'json', '--prefetch', '0'])
+        assert cli.main() == 0
+        captured = capsys.readouterr()
+        assert "改为本地计算" in captured.err
+        assert len(json.loads(captured.out)['results']) == 2
+
+    @pytest.mark.basic
+    @pytest.mark.cli
+    def test_serve_status(self, running_server, socket_path):
+        """cer-tool serve --status 报告服务状态"""
+        result = subprocess.run([sys.executable, '-m', 'cer_tool.cli', 'serve', '--status',
+                                 '--socket', socket_path],
+                                capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0
+        assert "运行中" in result.stdout
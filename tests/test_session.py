@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评估会话测试模块
+
+覆盖场景：
+- evaluate 与 calculate_detailed_metrics 结果一致
+- evaluate_many 按输入顺序惰性产出（按批读取输入）
+- evaluate_batch 与逐对评估一致，整批调用分词器批量接口，只计算缓存未命中的文本对
+- 会话默认与单次覆盖的语气词过滤
+- 阈值判定模式
+- 编辑距离后端只解析一次
+- with 语句关闭会话
+"""
+
+import pytest
+
+import cer_tool.metrics as metrics_module
+from cer_tool.metrics import ASRMetrics
+from cer_tool.session import EvaluationSession
+
+PAIRS = [
+    ("今天天气很好", "今天天汽很好"),
+    ("嗯，我来到北京清华大学", "我到北京清大学了啊"),
+    ("", "多余"),
+]
+
+
+# ────────────────── 共享 fixture ──────────────────
+
+@pytest.fixture(scope="module")
+def session():
+    """共享的 jieba 评估会话"""
+    with EvaluationSession(tokenizer_name='jieba') as shared:
+        yield shared
+
+
+# ════════════════════════════════════════════════════
+# 第一组：会话评估
+# ════════════════════════════════════════════════════
+
+class TestEvaluationSession:
+    """EvaluationSession 测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    @pytest.mark.parametrize("filter_fillers", [False, True])
+    def test_evaluate_matches_detailed_metrics(self, session, filter_fillers):
+        """evaluate 与 calculate_detailed_metrics 结果一致"""
+        metrics = ASRMetrics(tokenizer_name='jieba')
+        for ref, hyp in PAIRS:
+            expected = metrics.calculate_detailed_metrics(ref, hyp, filter_fillers)
+            assert session.evaluate((ref, hyp), filter_fillers=filter_fillers) == expected
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_evaluate_many_is_lazy_and_ordered(self, session):
+        """evaluate_many 按输入顺序产出，最多提前读取一批"""
+        consumed = []
+
+        def _pairs():
+            for pair in PAIRS:
+                consumed.append(pair)
+                yield pair
+
+        results = session.evaluate_many(_pairs(), batch_size=2)
+        first = next(results)
+        assert consumed == PAIRS[:2]
+        assert [first] + list(results) == [session.evaluate(pair) for pair in PAIRS]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_session_default_filter_fillers(self):
+        """会话默认的语气词过滤设置生效"""
+        ref, hyp = PAIRS[1]
+        with EvaluationSession(tokenizer_name='jieba', filter_fillers=True) as filtering:
+            assert filtering.evaluate((ref, hyp)) == filtering.evaluate((ref, hyp), filter_fillers=True)
+            assert filtering.evaluate((ref, hyp))['ref_length'] < \
+                filtering.evaluate((ref, hyp), filter_fillers=False)['ref_length']
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_triage_mode(self):
+        """指定 max_cer 时返回超限标记"""
+        with EvaluationSession(tokenizer_name='jieba', max_cer=0.1) as triage:
+            assert triage.evaluate(PAIRS[1])['over_threshold'] is True
+            assert triage.evaluate(("你好", "你好"))['cer'] == 0.0
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_backend_resolved_once(self, monkeypatch):
+        """编辑距离后端在创建会话时解析一次，评估时不再检测"""
+        calls = []
+        original = metrics_module.load_levenshtein
+
+        def _counting():
+            calls.append(1)
+            return original()
+
+        monkeypatch.setattr(metrics_module, 'load_levenshtein', _counting)
+        with EvaluationSession(tokenizer_name='jieba') as local:
+            for pair in PAIRS:
+                local.evaluate(pair)
+                local.metrics.calculate_cer(*pair)
+        assert calls == [1]
+        assert local.backend_name in ("python-Levenshtein", "builtin")
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_closed_session_rejects_evaluate(self):
+        """with 语句结束后会话关闭"""
+        with EvaluationSession(tokenizer_name='jieba') as local:
+            local.evaluate(PAIRS[0])
+        assert local.closed
+        with pytest.raises(RuntimeError):
+            local.evaluate(PAIRS[0])
+
+
+# ════════════════════════════════════════════════════
+# 第二组：批量评估
+# ════════════════════════════════════════════════════
+
+class TestBatchEvaluation:
+    """evaluate_batch / evaluate_many 整批调用分词器的测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    @pytest.mark.parametrize("options", [{}, {'max_cer': 0.1}, {'segmented': True}])
+    def test_evaluate_batch_matches_evaluate(self, options):
+        """批量评估与逐对评估结果一致（含阈值判定与分段对齐模式）"""
+        with EvaluationSession(tokenizer_name='jieba', filter_fillers=True, **options) as local:
+            assert local.evaluate_batch(PAIRS) == [local.evaluate(pair) for pair in PAIRS]
+            assert local.evaluate_batch([]) == []
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_evaluate_many_uses_tokenizer_batches(self, monkeypatch):
+        """语气词过滤时每批文本一次调用分词器的批量接口"""
+        with EvaluationSession(tokenizer_name='jieba', filter_fillers=True) as local:
+            tokenizer = local.metrics.tokenizer
+            batches = []
+            original = tokenizer.posseg_batch
+
+            def _spy(texts):
+                batches.append(len(texts))
+                return original(texts)
+
+            monkeypatch.setattr(tokenizer, 'posseg_batch', _spy)
+            pairs = PAIRS[:2] * 3
+            results = list(local.evaluate_many(pairs, batch_size=4))
+        assert len(results) == 6
+        assert batches == [8, 4]
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_evaluate_batch_with_cache(self, tmp_path):
+        """批量评估只计算缓存未命中的文本对，结果与未缓存时一致"""
+        cache_file = str(tmp_path / "cache.sqlite")
+        with EvaluationSession(tokenizer_name='jieba') as plain:
+            expected = plain.evaluate_batch(PAIRS)
+        with EvaluationSession(tokenizer_name='jieba', cache_file=cache_file) as cached:
+            cached.evaluate(PAIRS[0])
+            assert cached.evaluate_batch(PAIRS) == expected
+            assert cached.cache is not None and cached.cache.hits == 1
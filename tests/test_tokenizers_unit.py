@@ -12,6 +12,11 @@
 - 工厂类单例与缓存
 - 异常处理（无效分词器名称、None 输入）
 - THULAC / HanLP 可选分词器（按环境跳过）
+- 分词结果 LRU 缓存（命中统计、淘汰、线程安全、重复启用不丢失）
+- 批量分词接口（默认实现、HanLP 批量推理、jieba 多进程模式）
+- 不初始化的可用性探测（包元数据、按版本记录的初始化结果、失败记录过期、线程与进程并发写入、结果不变不重写）
+- 工厂并发初始化（同一分词器只初始化一次、读取信息不阻塞）
+- 分词结果位置还原与 THULAC 单次分析
 """
 
 import pytest
@@ -286,3 +291,537 @@ class TestOptionalTokenizers:
         words = tok.cut("今天天气很好")
         assert isinstance(words, list)
         assert len(words) > 0
+
+
+# ════════════════════════════════════════════════════
+# 第七组：分词结果缓存
+# ════════════════════════════════════════════════════
+
+class _CountingTokenizer(BaseTokenizer):
+    """按字切分并记录实际分词次数的测试分词器"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def initialize(self) -> bool:
+        self.is_initialized = True
+        return True
+
+    def cut(self, text):
+        self.calls += 1
+        return list(text)
+
+    def posseg(self, text):
+        self.calls += 1
+        return [(ch, 'x') for ch in text]
+
+    def tokenize(self, text):
+        self.calls += 1
+        return [(ch, i, i + 1) for i, ch in enumerate(text)]
+
+
+class TestOutputCache:
+    """分词结果缓存测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_repeated_text_computed_once(self):
+        """相同文本只分词一次，不同方法分别缓存"""
+        tok = _CountingTokenizer()
+        tok.enable_cache()
+        assert tok.posseg("打开空调") == tok.posseg("打开空调")
+        tok.cut("打开空调")
+        assert tok.calls == 2
+        stats = tok.cache_stats()
+        assert (stats['hits'], stats['misses']) == (1, 2)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_returned_list_is_a_copy(self):
+        """修改返回的列表不影响缓存内容"""
+        tok = _CountingTokenizer()
+        tok.enable_cache()
+        tok.cut("你好").append("污染")
+        assert tok.cut("你好") == ["你", "好"]
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_lru_eviction_by_entries_and_chars(self):
+        """超过条目数或字符数上限时淘汰最久未使用的条目"""
+        tok = _CountingTokenizer()
+        cache = tok.enable_cache(max_entries=2, max_chars=100)
+        tok.cut("甲")
+        tok.cut("乙")
+        tok.cut("甲")   # 甲 成为最近使用
+        tok.cut("丙")   # 淘汰 乙
+        calls = tok.calls
+        tok.cut("甲")
+        assert tok.calls == calls
+        tok.cut("乙")
+        assert tok.calls == calls + 1
+        assert cache.stats()['evictions'] == 2
+
+        cache = tok.enable_cache(max_entries=100, max_chars=5)
+        tok.cut("一二三")
+        tok.cut("四五六")
+        assert cache.stats()['chars'] <= 5
+        assert len(cache) == 1
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_concurrent_access(self):
+        """多线程并发读写时统计一致、条目数不超过上限"""
+        import threading
+        tok = _CountingTokenizer()
+        cache = tok.enable_cache(max_entries=16)
+        texts = [f"文本{i % 40}" for i in range(400)]
+
+        def _worker():
+            for text in texts:
+                assert tok.cut(text) == list(text)
+
+        threads = [threading.Thread(target=_worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        assert stats['hits'] + stats['misses'] == 4 * len(texts)
+        assert stats['entries'] <= 16
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_enable_twice_keeps_entries(self):
+        """按相同上限重复启用时沿用现有缓存，已缓存的结果不丢失"""
+        tok = _CountingTokenizer()
+        cache = tok.enable_cache()
+        tok.cut("你好")
+        assert tok.enable_cache() is cache
+        tok.cut("你好")
+        assert tok.calls == 1
+        assert tok.cut.uncached("你好") == ["你", "好"]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_disable_restores_uncached_methods(self):
+        """停用缓存后恢复为直接分词"""
+        tok = _CountingTokenizer()
+        tok.enable_cache()
+        tok.disable_cache()
+        tok.cut("你好")
+        tok.cut("你好")
+        assert tok.calls == 2
+        assert tok.cache_stats() is None
+        assert 'cache' not in tok.get_info()
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_factory_singleton_cached(self, jieba_tok):
+        """工厂创建的分词器默认启用缓存，结果与直接分词一致"""
+        assert jieba_tok.output_cache is not None
+        assert jieba_tok.cut("今天天气很好") == JiebaTokenizer.cut(jieba_tok, "今天天气很好")
+        assert 'cache' in jieba_tok.get_info()
+
+
+# ════════════════════════════════════════════════════
+# 第八组：批量分词接口
+# ════════════════════════════════════════════════════
+
+class _NativeBatchTokenizer(_CountingTokenizer):
+    """带原生批量实现、记录每批输入的测试分词器"""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def cut_batch(self, texts):
+        self.batches.append(list(texts))
+        return [list(text) for text in texts]
+
+
+class TestBatchTokenization:
+    """cut_batch / posseg_batch / tokenize_batch 测试"""
+
+    TEXTS = ["今天天气很好", "", "我来到北京清华大学", "  你好  ", "今天天气很好"]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_default_batch_loops_single_methods(self):
+        """基类默认批量实现与逐条调用一致"""
+        tok = _CountingTokenizer()
+        assert tok.cut_batch(["你好", "世界"]) == [["你", "好"], ["世", "界"]]
+        assert tok.posseg_batch(["好"]) == [[("好", "x")]]
+        assert tok.tokenize_batch(["好的"]) == [[("好", 0, 1), ("的", 1, 2)]]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_cached_native_batch_only_sees_misses(self):
+        """启用缓存时原生批量实现只处理未命中且去重后的文本"""
+        tok = _NativeBatchTokenizer()
+        tok.enable_cache()
+        tok.cut("你好")
+        assert tok.cut_batch(["你好", "世界", "世界"]) == [["你", "好"], ["世", "界"], ["世", "界"]]
+        assert tok.batches == [["世界"]]
+        assert tok.cut("世界") == ["世", "界"]
+        assert tok.calls == 1
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    def test_jieba_batch_matches_single(self, jieba_tok):
+        """jieba 批量接口与逐条调用一致"""
+        assert jieba_tok.cut_batch(self.TEXTS) == [jieba_tok.cut(t) for t in self.TEXTS]
+        assert jieba_tok.posseg_batch(self.TEXTS) == [jieba_tok.posseg(t) for t in self.TEXTS]
+        assert jieba_tok.tokenize_batch(self.TEXTS) == [jieba_tok.tokenize(t) for t in self.TEXTS]
+
+    @pytest.mark.basic
+    @pytest.mark.integration
+    @pytest.mark.parametrize("start_method", ["spawn", "fork"])
+    def test_jieba_parallel_mode(self, start_method):
+        """jieba 多进程模式的批量结果与逐条调用一致，spawn 启动的工作进程自行加载词典"""
+        import multiprocessing
+        if start_method not in multiprocessing.get_all_start_methods():
+            pytest.skip(f"平台不支持 {start_method} 启动方式")
+        tok = JiebaTokenizer()
+        tok.initialize()
+        texts = [f"{text}{i}" for i in range(20) for text in self.TEXTS[:3]]
+        try:
+            assert tok.enable_parallel(2, start_method=start_method) == 2
+            assert tok.get_info()['parallel_processes'] == 2
+            assert tok.cut_batch(texts) == [tok.cut(t) for t in texts]
+            assert tok.posseg_batch(texts) == [tok.posseg(t) for t in texts]
+            assert tok.tokenize_batch(texts) == [tok.tokenize(t) for t in texts]
+        finally:
+            tok.close()
+        assert tok.parallel_processes == 0
+        assert tok.cut_batch(texts[:2]) == [tok.cut(t) for t in texts[:2]]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_jieba_parallel_shutdown_registered_at_exit(self, monkeypatch):
+        """启用多进程模式时注册退出清理，close 后注销并关闭进程池"""
+        import atexit
+        registered = []
+        monkeypatch.setattr(atexit, 'register', registered.append)
+        monkeypatch.setattr(atexit, 'unregister', registered.remove)
+        tok = JiebaTokenizer()
+        tok.initialize()
+        tok.enable_parallel(1)
+        pool = tok._pool
+        assert registered == [tok.disable_parallel]
+        tok.close()
+        assert registered == [] and tok._pool is None
+        with pytest.raises(RuntimeError):
+            pool.submit(len, [])
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_hanlp_batch_passes_lists_to_models(self):
+        """HanLP 批量接口把整批文本一次交给分词与词性标注模型"""
+        from cer_tool.tokenizers import HanlpTokenizer
+        calls = []
+
+        def tok_model(inputs):
+            calls.append(('tok', inputs))
+            return [list(text) for text in inputs]
+
+        def pos_model(inputs):
+            calls.append(('pos', inputs))
+            return [['n'] * len(words) for words in inputs]
+
+        tok = HanlpTokenizer()
+        tok.tok_model, tok.pos_model, tok.is_initialized = tok_model, pos_model, True
+        assert tok.posseg_batch(["你好", "", "世界"]) == [
+            [("你", "n"), ("好", "n")], [], [("世", "n"), ("界", "n")]]
+        assert calls == [('tok', ["你好", "世界"]), ('pos', [["你", "好"], ["世", "界"]])]
+        assert tok.tokenize_batch([" 好的 "]) == [[("好", 0, 1), ("的", 1, 2)]]
+
+
+# ════════════════════════════════════════════════════
+# 第九组：不初始化的可用性探测
+# ════════════════════════════════════════════════════
+
+class TestAvailabilityProbe:
+    """基于包元数据的可用性探测测试"""
+
+    @pytest.fixture(autouse=True)
+    def _probe_cache_dir(self, tmp_path, monkeypatch):
+        """探测缓存写入临时目录，并禁止探测过程中初始化分词器"""
+        from cer_tool.tokenizers.probe import CACHE_DIR_ENV
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+
+        def _forbidden(self):
+            raise AssertionError("探测过程不应初始化分词器")
+
+        for tokenizer_class in TokenizerFactory._available_tokenizers.values():
+            monkeypatch.setattr(tokenizer_class, 'initialize', _forbidden)
+        monkeypatch.setattr(TokenizerFactory, '_tokenizers', {})
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_available_without_initializing(self):
+        """get_available_tokenizers 只探测依赖，不调用 initialize"""
+        available = get_available_tokenizers()
+        assert 'jieba' in available
+        assert TokenizerFactory.check_tokenizer_availability('jieba')
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_missing_package_unavailable(self):
+        """依赖包未安装 → 不可用，版本为 None"""
+        from cer_tool.tokenizers import probe_tokenizer
+        result = probe_tokenizer('fake', 'cer_tool_no_such_package')
+        assert result['available'] is False
+        assert result['installed'] is False
+        assert result['version'] is None
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_recorded_failure_same_version(self):
+        """同一版本记录过初始化失败 → 探测报告不可用"""
+        from cer_tool.tokenizers.probe import installed_version, record_initialization
+        record_initialization('jieba', installed_version('jieba'), "模型文件损坏")
+        result = TokenizerFactory.probe_tokenizer('jieba')
+        assert result['available'] is False
+        assert result['error'] == "模型文件损坏"
+        assert 'jieba' not in get_available_tokenizers()
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_recorded_failure_expires(self, monkeypatch):
+        """失败记录超过 FAILURE_TTL 后失效（临时失败不会让分词器永久不可用）"""
+        from cer_tool.tokenizers import probe
+        probe.record_initialization('jieba', probe.installed_version('jieba'), "离线无法下载模型")
+        assert TokenizerFactory.probe_tokenizer('jieba')['available'] is False
+        now = probe.time.time()
+        monkeypatch.setattr(probe.time, 'time', lambda: now + probe.FAILURE_TTL + 1)
+        result = TokenizerFactory.probe_tokenizer('jieba')
+        assert result['available'] is True
+        assert result['verified'] is False
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_concurrent_records_not_lost(self, tmp_path):
+        """多个线程同时记录不同分词器 → 每条记录都保留，不留下临时文件"""
+        import threading
+
+        from cer_tool.tokenizers.probe import PROBE_CACHE_FILE, _load_records, record_initialization
+        threads = [threading.Thread(target=record_initialization, args=(f"tok{i}", "1.0"))
+                   for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert set(_load_records()) == {f"tok{i}" for i in range(16)}
+        assert sorted(p.name for p in tmp_path.iterdir() if not p.name.endswith('.lock')) == \
+            [PROBE_CACHE_FILE]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_concurrent_processes_not_lost(self, tmp_path):
+        """多个进程同时记录不同分词器 → 文件锁保证每条记录都保留"""
+        import subprocess
+        import sys
+
+        from cer_tool.tokenizers.probe import _load_records
+        script = ("import sys\n"
+                  "from cer_tool.tokenizers.probe import record_initialization\n"
+                  "for i in range(20):\n"
+                  "    record_initialization(f'{sys.argv[1]}_{i}', '1.0')\n")
+        processes = [subprocess.Popen([sys.executable, '-c', script, f"proc{n}"])
+                     for n in range(4)]
+        assert [process.wait(timeout=60) for process in processes] == [0] * 4
+        assert set(_load_records()) == {f"proc{n}_{i}" for n in range(4) for i in range(20)}
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_unchanged_record_not_rewritten(self, monkeypatch):
+        """版本与结果不变时不重写缓存文件；结果变化时才写入"""
+        from cer_tool.tokenizers import probe
+        probe.record_initialization('jieba', '1.0')
+        writes = []
+        original = probe.os.replace
+
+        def _counting(src, dst):
+            writes.append(dst)
+            original(src, dst)
+
+        monkeypatch.setattr(probe.os, 'replace', _counting)
+        probe.record_initialization('jieba', '1.0')
+        assert writes == []
+        probe.record_initialization('jieba', '1.0', "加载失败")
+        probe.record_initialization('jieba', '1.0', "加载失败")
+        probe.record_initialization('jieba', '1.1')
+        assert len(writes) == 2
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_version_change_invalidates_record(self):
+        """已安装版本变化后，旧的失败记录失效"""
+        from cer_tool.tokenizers import clear_probe_cache
+        from cer_tool.tokenizers.probe import record_initialization
+        record_initialization('jieba', '0.0.0-old', "旧版本初始化失败")
+        assert TokenizerFactory.probe_tokenizer('jieba')['available'] is True
+        clear_probe_cache()
+        assert TokenizerFactory.probe_tokenizer('jieba')['verified'] is False
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_recorded_success_is_verified(self):
+        """当前版本初始化成功过 → verified 为 True"""
+        from cer_tool.tokenizers.probe import installed_version, record_initialization
+        record_initialization('jieba', installed_version('jieba'))
+        result = TokenizerFactory.probe_tokenizer('jieba')
+        assert result['available'] is True
+        assert result['verified'] is True
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_metadata_without_initializing(self):
+        """get_tokenizer_metadata 返回描述与版本，但不初始化"""
+        from cer_tool.tokenizers import get_tokenizer_metadata
+        info = get_tokenizer_metadata('jieba')
+        assert info['available'] is True
+        assert info['initialized'] is False
+        assert info['version'] != 'unknown'
+        assert info['description']
+        assert get_tokenizer_metadata('nonexistent')['available'] is False
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_get_tokenizer_records_failure(self, monkeypatch):
+        """显式选择时完整初始化，失败结果写入探测缓存"""
+        def _broken(self):
+            raise RuntimeError("加载失败")
+
+        monkeypatch.setattr(JiebaTokenizer, 'initialize', _broken)
+        with pytest.raises(TokenizerInitError):
+            get_tokenizer('jieba')
+        assert TokenizerFactory.probe_tokenizer('jieba')['available'] is False
+
+
+# ════════════════════════════════════════════════════
+# 第十组：工厂并发初始化
+# ════════════════════════════════════════════════════
+
+class _SlowTokenizer(_CountingTokenizer):
+    """初始化时等待事件、并统计初始化次数的测试分词器"""
+
+    inits = 0
+    release = None
+
+    def initialize(self) -> bool:
+        type(self).inits += 1
+        type(self).release.wait(timeout=5)
+        self.is_initialized = True
+        return True
+
+
+class TestConcurrentFactory:
+    """工厂线程安全测试"""
+
+    @pytest.fixture(autouse=True)
+    def _slow_tokenizer(self, tmp_path, monkeypatch):
+        """注册一个初始化缓慢的测试分词器，探测缓存写入临时目录"""
+        import threading
+
+        from cer_tool.tokenizers.probe import CACHE_DIR_ENV
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        monkeypatch.setattr(_SlowTokenizer, 'inits', 0)
+        monkeypatch.setattr(_SlowTokenizer, 'release', threading.Event())
+        monkeypatch.setitem(TokenizerFactory._available_tokenizers, 'slow', _SlowTokenizer)
+        yield
+        _SlowTokenizer.release.set()
+        TokenizerFactory._tokenizers.pop('slow', None)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_concurrent_requests_initialize_once(self):
+        """多个线程同时请求同一分词器 → 只初始化一次，得到同一实例"""
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(get_tokenizer, 'slow') for _ in range(8)]
+            _SlowTokenizer.release.set()
+            tokenizers = [future.result(timeout=10) for future in futures]
+        assert _SlowTokenizer.inits == 1
+        assert all(tok is tokenizers[0] for tok in tokenizers)
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_info_does_not_block_behind_load(self):
+        """分词器加载期间读取信息不等待加载完成"""
+        import threading
+        loader = threading.Thread(target=get_tokenizer, args=('slow',))
+        loader.start()
+        try:
+            for _ in range(500):
+                if TokenizerFactory.is_loading('slow'):
+                    break
+                threading.Event().wait(0.01)
+            assert TokenizerFactory.is_loading('slow')
+            info = get_tokenizer_info('slow')
+            assert info['loading'] is True
+            assert info['initialized'] is False
+            assert get_cached_tokenizer_info('slow') is None
+        finally:
+            _SlowTokenizer.release.set()
+            loader.join(timeout=10)
+        assert get_cached_tokenizer_info('slow')['initialized'] is True
+        assert not TokenizerFactory.is_loading('slow')
+
+
+# ════════════════════════════════════════════════════
+# 第十一组：位置还原与 THULAC 单次分析
+# ════════════════════════════════════════════════════
+
+class _FakeThulac:
+    """记录调用次数、按字切分并标注词性的 THULAC 替身"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def cut(self, oiraw, text=False):
+        self.calls += 1
+        return [[ch, 'n'] for ch in oiraw if not ch.isspace()]
+
+
+class TestTokenOffsets:
+    """locate_tokens 与 THULAC 单次分析测试"""
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_locate_exact_words(self):
+        """词语按顺序精确定位，跳过分词器丢弃的空白"""
+        from cer_tool.tokenizers.offsets import locate_tokens
+        assert locate_tokens("今天 天气很好", ["今天", "天气", "很", "好"]) == [
+            ("今天", 0, 2), ("天气", 3, 5), ("很", 5, 6), ("好", 6, 7)]
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_locate_normalization_drift(self):
+        """分词器改写过的词语按原长度占位，后续词语重新同步"""
+        from cer_tool.tokenizers.offsets import locate_tokens
+        assert locate_tokens("ＡＢ 测试", ["AB", "测试"]) == [("AB", 0, 2), ("测试", 3, 5)]
+        assert locate_tokens("好", ["好", "多余"]) == [("好", 0, 1), ("多余", 1, 1)]
+
+    @pytest.mark.basic
+    @pytest.mark.boundary
+    def test_locate_does_not_jump_far_ahead(self):
+        """找不到的词语不会匹配到远处的同形文本"""
+        from cer_tool.tokenizers.offsets import MAX_SKIPPED_CHARS, locate_tokens
+        text = "甲" + "乙" * (MAX_SKIPPED_CHARS + 5) + "丙"
+        assert locate_tokens(text, ["丁", "乙"]) == [("丁", 0, 1), ("乙", 1, 2)]
+
+    @pytest.mark.basic
+    @pytest.mark.unit
+    def test_thulac_single_analysis(self):
+        """THULAC 的 cut / posseg / tokenize 对同一文本只分析一次"""
+        from cer_tool.tokenizers import ThulacTokenizer
+        tok = ThulacTokenizer()
+        tok.thu, tok.is_initialized = _FakeThulac(), True
+        assert tok.cut(" 你 好 ") == ["你", "好"]
+        assert tok.posseg("你 好") == [("你", "n"), ("好", "n")]
+        assert tok.tokenize("你 好") == [("你", 0, 1), ("好", 2, 3)]
+        assert tok.thu.calls == 1
+        tok.cut("世界")
+        assert tok.thu.calls == 2